@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""Shared functions and classes for benchmarking."""
+
+from __future__ import unicode_literals
+
+import abc
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import timeit
+
+from l2tdevtools import json_file
+
+
+class Benchmark(object):
+  """Benchmark interface.
+
+  A benchmark measures the duration of a single operation, defined by Run.
+  SetUp and TearDown are called once, before and after all the runs.
+  """
+
+  NAME = ''
+
+  DESCRIPTION = ''
+
+  # Note that some code paths, such as the download helpers and RPM spec
+  # file rewriting, currently only support Python 2.
+  PYTHON2_ONLY = False
+
+  _TEST_DATA_PATH = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_data')
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(Benchmark, self).__init__()
+    self._temporary_directory = None
+
+  def _CreateTemporaryDirectory(self):
+    """Creates a temporary directory that is removed by TearDown.
+
+    Returns:
+      str: path of the temporary directory.
+    """
+    self._temporary_directory = tempfile.mkdtemp()
+    return self._temporary_directory
+
+  def _GetTestDataPath(self, path_segments):
+    """Retrieves the path of a file relative to the test data directory.
+
+    Args:
+      path_segments (list[str]): path segments inside the test data directory.
+
+    Returns:
+      str: path of the file.
+    """
+    return os.path.join(self._TEST_DATA_PATH, *path_segments)
+
+  def IsSupported(self):
+    """Determines if the benchmark is supported by the Python interpreter.
+
+    Returns:
+      bool: True if the benchmark is supported.
+    """
+    return not self.PYTHON2_ONLY or sys.version_info[0] < 3
+
+  @abc.abstractmethod
+  def Run(self):
+    """Runs the operation that is measured."""
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    return
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    if self._temporary_directory:
+      shutil.rmtree(self._temporary_directory, True)
+      self._temporary_directory = None
+
+
+class CalibrationBenchmark(Benchmark):
+  """Benchmark that measures the speed of the machine.
+
+  The durations of the other benchmarks are stored relative to the duration
+  of this benchmark, such that the baselines can be compared on machines with
+  a different speed. The operation consists of string formatting, regular
+  expression matching and dictionary and list operations, which resemble
+  the operations of the code that is benchmarked.
+  """
+
+  NAME = 'calibration'
+
+  DESCRIPTION = 'Fixed workload to measure the speed of the machine'
+
+  _VERSION_REGEX = re.compile(r'^([a-z]+[0-9]*)-([0-9]+)[.]([0-9]+)$')
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    versions = {}
+    for index in range(500):
+      filename = 'project{0:d}-{1:d}.{2:d}'.format(
+          index % 50, index // 50, index % 7)
+      match = self._VERSION_REGEX.match(filename)
+      name, major_version, minor_version = match.groups()
+      versions.setdefault(name, []).append(
+          (int(major_version, 10), int(minor_version, 10)))
+
+    for name in sorted(versions.keys()):
+      versions[name] = sorted(versions[name], reverse=True)[0]
+
+
+class BenchmarkResult(object):
+  """Benchmark result.
+
+  Attributes:
+    name (str): name of the benchmark.
+    number_of_loops (int): number of times the operation was run per repeat.
+    seconds_per_loop (float): fastest duration of the operation in seconds.
+  """
+
+  def __init__(self, name, number_of_loops, seconds_per_loop):
+    """Initializes a benchmark result.
+
+    Args:
+      name (str): name of the benchmark.
+      number_of_loops (int): number of times the operation was run per repeat.
+      seconds_per_loop (float): fastest duration of the operation in seconds.
+    """
+    super(BenchmarkResult, self).__init__()
+    self.name = name
+    self.number_of_loops = number_of_loops
+    self.seconds_per_loop = seconds_per_loop
+
+
+class BenchmarkRunner(object):
+  """Runs benchmarks.
+
+  The number of loops is determined automatically, such that a repeat takes
+  at least the minimum time. The fastest repeat is used as result, since
+  slower repeats are typically caused by other processes and not by the code
+  that is measured.
+  """
+
+  def __init__(self, minimum_time=0.2, number_of_repeats=5):
+    """Initializes a benchmark runner.
+
+    Args:
+      minimum_time (Optional[float]): minimum duration of a repeat in seconds.
+      number_of_repeats (Optional[int]): number of repeats.
+    """
+    super(BenchmarkRunner, self).__init__()
+    self._minimum_time = minimum_time
+    self._number_of_repeats = number_of_repeats
+
+  def _GetNumberOfLoops(self, timer):
+    """Determines the number of loops per repeat.
+
+    Args:
+      timer (timeit.Timer): timer of the benchmark.
+
+    Returns:
+      int: number of loops.
+    """
+    number_of_loops = 1
+    while True:
+      for multiplier in (1, 2, 5):
+        number = number_of_loops * multiplier
+        if timer.timeit(number=number) >= self._minimum_time:
+          return number
+
+      number_of_loops *= 10
+
+  def RunBenchmark(self, benchmark):
+    """Runs a benchmark.
+
+    Args:
+      benchmark (Benchmark): benchmark.
+
+    Returns:
+      BenchmarkResult: result of the benchmark.
+    """
+    benchmark.SetUp()
+    try:
+      timer = timeit.Timer(benchmark.Run)
+      number_of_loops = self._GetNumberOfLoops(timer)
+      durations = timer.repeat(
+          repeat=self._number_of_repeats, number=number_of_loops)
+    finally:
+      benchmark.TearDown()
+
+    seconds_per_loop = min(durations) / number_of_loops
+    return BenchmarkResult(benchmark.NAME, number_of_loops, seconds_per_loop)
+
+
+class BenchmarkComparison(object):
+  """Comparison of a benchmark result with its baseline.
+
+  Attributes:
+    baseline (float): baseline duration in seconds, scaled to the speed of
+        the machine, or None if not available.
+    name (str): name of the benchmark.
+    ratio (float): duration relative to the baseline or None if no baseline
+        is available.
+    seconds_per_loop (float): duration in seconds.
+    status (str): status, which is "new", "faster", "ok" or "regression".
+  """
+
+  def __init__(self, name, seconds_per_loop, baseline):
+    """Initializes a benchmark comparison.
+
+    Args:
+      name (str): name of the benchmark.
+      seconds_per_loop (float): duration in seconds.
+      baseline (float): baseline duration in seconds or None if not available.
+    """
+    super(BenchmarkComparison, self).__init__()
+    self.baseline = baseline
+    self.name = name
+    self.ratio = None
+    self.seconds_per_loop = seconds_per_loop
+    self.status = 'new'
+
+    if baseline:
+      self.ratio = seconds_per_loop / baseline
+
+
+class BaselineStore(object):
+  """Stores the baseline durations of the benchmarks.
+
+  The baselines are stored per major Python version, since the durations
+  of the same code can differ significantly between Python 2 and 3.
+
+  The baselines are stored relative to the duration of the calibration
+  benchmark, such that baselines recorded on one machine can be compared
+  with results of another machine.
+  """
+
+  _FORMAT_VERSION = 2
+
+  def __init__(self, path):
+    """Initializes a baseline store.
+
+    Args:
+      path (str): path of the baselines file.
+    """
+    super(BaselineStore, self).__init__()
+    self._baselines = {}
+    self._path = path
+
+  def _GetPythonVersionKey(self):
+    """Retrieves the key of the baselines of the Python interpreter.
+
+    Returns:
+      str: key of the baselines such as "python2".
+    """
+    return 'python{0:d}'.format(sys.version_info[0])
+
+  def CompareResults(self, results, calibration_result, threshold):
+    """Compares benchmark results with their baselines.
+
+    Args:
+      results (list[BenchmarkResult]): benchmark results.
+      calibration_result (BenchmarkResult): result of the calibration
+          benchmark on the machine the results were measured on.
+      threshold (float): fraction the duration may exceed the baseline before
+          it is considered a regression, for example 0.25 for 25%.
+
+    Returns:
+      list[BenchmarkComparison]: comparisons.
+    """
+    baselines = self._baselines.get(self._GetPythonVersionKey(), {})
+
+    comparisons = []
+    for result in results:
+      baseline = baselines.get(result.name, None)
+      if baseline is not None:
+        baseline *= calibration_result.seconds_per_loop
+
+      comparison = BenchmarkComparison(
+          result.name, result.seconds_per_loop, baseline)
+
+      if comparison.ratio is not None:
+        if comparison.ratio > 1.0 + threshold:
+          comparison.status = 'regression'
+        elif comparison.ratio < 1.0 - threshold:
+          comparison.status = 'faster'
+        else:
+          comparison.status = 'ok'
+
+      comparisons.append(comparison)
+
+    return comparisons
+
+  def ReadBaselines(self):
+    """Reads the baselines.
+
+    Returns:
+      bool: True if the baselines were read or False if the baselines file
+          does not exist.
+
+    Raises:
+      ValueError: if the format version of the baselines file is not
+          supported.
+    """
+    if not os.path.exists(self._path):
+      return False
+
+    with io.open(self._path, 'r', encoding='utf-8') as file_object:
+      json_dict = json.load(file_object)
+
+    format_version = json_dict.get('format_version', None)
+    if format_version != self._FORMAT_VERSION:
+      raise ValueError('Unsupported baselines format version: {0!s}'.format(
+          format_version))
+
+    self._baselines = json_dict.get('baselines', {})
+    return True
+
+  def UpdateBaselines(self, results, calibration_result):
+    """Updates the baselines of the Python interpreter with results.
+
+    Args:
+      results (list[BenchmarkResult]): benchmark results.
+      calibration_result (BenchmarkResult): result of the calibration
+          benchmark on the machine the results were measured on.
+    """
+    python_version_key = self._GetPythonVersionKey()
+    baselines = self._baselines.setdefault(python_version_key, {})
+
+    for result in results:
+      baselines[result.name] = (
+          result.seconds_per_loop / calibration_result.seconds_per_loop)
+
+  def WriteBaselines(self):
+    """Writes the baselines."""
+    json_dict = {
+        'baselines': self._baselines,
+        'format_version': self._FORMAT_VERSION}
+
+    json_file.WriteFile(self._path, json_dict)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the download helper object implementations."""
+
+from __future__ import unicode_literals
+
+import os
+
+from l2tdevtools import download_helper
+from l2tdevtools import mirror
+from l2tdevtools import projects
+from l2tdevtools import url_opener
+
+from benchmarks import benchmark_lib
+
+
+class VersionResolutionBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of the version resolution of a download helper.
+
+  The web content is replayed from the URL fixtures in the test data
+  directory, such that the benchmark does not depend on the network.
+  """
+
+  PYTHON2_ONLY = True
+
+  _DOWNLOAD_URL = ''
+  _PROJECT_NAME = ''
+
+  def _CreateDownloadHelper(self):
+    """Creates the download helper.
+
+    Returns:
+      DownloadHelper: download helper.
+    """
+    return download_helper.DownloadHelperFactory.NewDownloadHelper(
+        self._DOWNLOAD_URL)
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    download_helper_object = self._CreateDownloadHelper()
+    project_version = download_helper_object.GetLatestVersion(
+        self._PROJECT_NAME, None)
+    download_helper_object.GetDownloadURL(self._PROJECT_NAME, project_version)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._GetTestDataPath(['url_fixtures'])
+    fixture_store = url_opener.URLFixtureStore(path)
+    url_opener.SetURLOpener(url_opener.ReplayURLOpener(fixture_store))
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    url_opener.SetURLOpener(None)
+    super(VersionResolutionBenchmark, self).TearDown()
+
+
+class GitHubReleasesVersionResolutionBenchmark(VersionResolutionBenchmark):
+  """Benchmark of the GitHub releases version resolution."""
+
+  NAME = 'download_helper.github_releases'
+  DESCRIPTION = 'GitHub releases download helper version resolution'
+
+  _DOWNLOAD_URL = 'https://github.com/log2timeline/dfvfs/releases'
+  _PROJECT_NAME = 'dfvfs'
+
+
+class LibyalGitHubVersionResolutionBenchmark(VersionResolutionBenchmark):
+  """Benchmark of the libyal GitHub version resolution."""
+
+  NAME = 'download_helper.libyal_github'
+  DESCRIPTION = 'libyal GitHub download helper version resolution'
+
+  _DOWNLOAD_URL = 'https://github.com/libyal/libbde/releases'
+  _PROJECT_NAME = 'libbde'
+
+
+class PyPIVersionResolutionBenchmark(VersionResolutionBenchmark):
+  """Benchmark of the PyPI version resolution."""
+
+  NAME = 'download_helper.pypi'
+  DESCRIPTION = 'PyPI download helper version resolution'
+
+  _DOWNLOAD_URL = 'https://pypi.python.org/pypi/construct'
+  _PROJECT_NAME = 'construct'
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    # Note that the PyPI download URL requires the package page, which is
+    # not part of the URL fixtures.
+    download_helper_object = self._CreateDownloadHelper()
+    download_helper_object.GetLatestVersion(self._PROJECT_NAME, None)
+
+
+class SourceForgeVersionResolutionBenchmark(VersionResolutionBenchmark):
+  """Benchmark of the SourceForge version resolution."""
+
+  NAME = 'download_helper.sourceforge'
+  DESCRIPTION = 'SourceForge download helper version resolution'
+
+  _DOWNLOAD_URL = 'https://sourceforge.net/projects/pyparsing/files'
+  _PROJECT_NAME = 'pyparsing'
+
+
+class ZlibVersionResolutionBenchmark(VersionResolutionBenchmark):
+  """Benchmark of the zlib version resolution."""
+
+  NAME = 'download_helper.zlib'
+  DESCRIPTION = 'zlib download helper version resolution'
+
+  _DOWNLOAD_URL = 'http://www.zlib.net'
+  _PROJECT_NAME = 'zlib'
+
+  def _CreateDownloadHelper(self):
+    """Creates the download helper.
+
+    Returns:
+      DownloadHelper: download helper.
+    """
+    # Note that the download helper factory does not create zlib download
+    # helpers.
+    return download_helper.ZlibDownloadHelper(self._DOWNLOAD_URL)
+
+
+class SourceMirrorVersionResolutionBenchmark(VersionResolutionBenchmark):
+  """Benchmark of the source mirror version resolution."""
+
+  NAME = 'download_helper.source_mirror'
+  DESCRIPTION = 'Source mirror download helper version resolution'
+
+  PYTHON2_ONLY = False
+
+  _DOWNLOAD_URL = 'https://github.com/log2timeline/dfvfs/releases'
+  _PROJECT_NAME = 'dfvfs'
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(SourceMirrorVersionResolutionBenchmark, self).__init__()
+    self._source_mirror = None
+
+  def _CreateDownloadHelper(self):
+    """Creates the download helper.
+
+    Returns:
+      DownloadHelper: download helper.
+    """
+    return download_helper.DownloadHelperFactory.NewDownloadHelper(
+        self._DOWNLOAD_URL, source_mirror=self._source_mirror)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    source_package_path = os.path.join(path, 'dfvfs-20170723.tar.gz')
+    with open(source_package_path, 'wb') as file_object:
+      file_object.write(b'dfvfs')
+
+    project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    project_definition.download_url = self._DOWNLOAD_URL
+
+    source_mirror = mirror.SourceMirror(path)
+    source_mirror.AddSourcePackage(
+        project_definition, 'com.github.log2timeline.dfvfs', '20170723',
+        'https://github.com/log2timeline/dfvfs/releases/download/20170723/'
+        'dfvfs-20170723.tar.gz', 'dfvfs-20170723.tar.gz')
+    source_mirror.WriteManifest()
+
+    self._source_mirror = mirror.SourceMirror(path)
+    self._source_mirror.ReadManifest()
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    self._source_mirror = None
+    super(SourceMirrorVersionResolutionBenchmark, self).TearDown()
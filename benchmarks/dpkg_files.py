@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the dpkg build files generator."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+
+from l2tdevtools import dpkg_files
+from l2tdevtools import projects
+
+from benchmarks import benchmark_lib
+
+
+class DPKGBuildFilesGeneratorBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of the dpkg build files generation."""
+
+  _DATA_PATH = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+  # Note that the project definitions are read from data/projects.ini, which
+  # is currently only supported by Python 2.
+  PYTHON2_ONLY = True
+
+  _PROJECT_NAME = ''
+  _PROJECT_VERSION = ''
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(DPKGBuildFilesGeneratorBenchmark, self).__init__()
+    self._current_working_directory = None
+    self._project_definition = None
+
+  def _ReadProjectDefinition(self):
+    """Reads the project definition from data/projects.ini.
+
+    Returns:
+      ProjectDefinition: project definition or None if not available.
+    """
+    projects_file = os.path.join(self._DATA_PATH, 'projects.ini')
+    with open(projects_file, 'rb') as file_object:
+      project_definition_reader = projects.ProjectDefinitionReader()
+      for project_definition in project_definition_reader.Read(file_object):
+        if project_definition.name == self._PROJECT_NAME:
+          return project_definition
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    build_files_generator = dpkg_files.DPKGBuildFilesGenerator(
+        self._PROJECT_NAME, self._PROJECT_VERSION, self._project_definition,
+        self._DATA_PATH)
+    build_files_generator.GenerateFiles('debian')
+    shutil.rmtree('debian')
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    self._project_definition = self._ReadProjectDefinition()
+
+    # Note that the dpkg build files generator checks the source directory
+    # relative to the current working directory.
+    self._current_working_directory = os.getcwd()
+    os.chdir(path)
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    os.chdir(self._current_working_directory)
+    super(DPKGBuildFilesGeneratorBenchmark, self).TearDown()
+
+
+class ConfigureMakeDPKGBuildFilesGeneratorBenchmark(
+    DPKGBuildFilesGeneratorBenchmark):
+  """Benchmark of the dpkg build files generation of a configure_make project.
+  """
+
+  NAME = 'dpkg_files.configure_make'
+  DESCRIPTION = 'Generation of the dpkg build files of a configure_make project'
+
+  _PROJECT_NAME = 'protobuf'
+  _PROJECT_VERSION = '3.4.0'
+
+
+class SetupPyDPKGBuildFilesGeneratorBenchmark(
+    DPKGBuildFilesGeneratorBenchmark):
+  """Benchmark of the dpkg build files generation of a setup_py project."""
+
+  NAME = 'dpkg_files.setup_py'
+  DESCRIPTION = 'Generation of the dpkg build files of a setup_py project'
+
+  _PROJECT_NAME = 'construct'
+  _PROJECT_VERSION = '2.5.3'
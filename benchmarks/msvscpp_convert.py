@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the Visual Studio files conversion tool."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+
+from benchmarks import benchmark_lib
+
+
+class VSSolutionConvertBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of converting a Visual Studio 2008 solution to 2010."""
+
+  NAME = 'msvscpp_convert.vs2008_to_vs2010'
+  DESCRIPTION = 'Conversion of a Visual Studio 2008 solution to 2010'
+
+  # Note that the Visual Studio file writers write strings to files opened
+  # in binary mode, which is not supported by Python 3.
+  PYTHON2_ONLY = True
+
+  _SCRIPT_PATH = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools',
+      'msvscpp-convert.py')
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(VSSolutionConvertBenchmark, self).__init__()
+    self._current_working_directory = None
+    self._solution_class = None
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    solution = self._solution_class()
+    solution.Convert(
+        self._GetTestDataPath(['msvscpp', 'libbde.sln']), '2010')
+    shutil.rmtree('vs2010')
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    # The script name is not a valid module name, hence it is executed
+    # without running its main program function. Note that the script is
+    # compiled without the future statements of this module.
+    with open(self._SCRIPT_PATH, 'rb') as file_object:
+      script_code = compile(
+          file_object.read(), self._SCRIPT_PATH, 'exec', dont_inherit=True)
+
+    script_globals = {'__name__': 'msvscpp_convert'}
+    exec(script_code, script_globals)  # pylint: disable=exec-used
+    self._solution_class = script_globals['VSSolution']
+
+    # Note that the solution is written relative to the current working
+    # directory.
+    self._current_working_directory = os.getcwd()
+    os.chdir(path)
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    os.chdir(self._current_working_directory)
+    super(VSSolutionConvertBenchmark, self).TearDown()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the project definitions."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+
+from l2tdevtools import projects
+
+from benchmarks import benchmark_lib
+
+
+class ProjectDefinitionReaderBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of reading the project definitions of data/projects.ini."""
+
+  NAME = 'projects.read_projects_ini'
+  DESCRIPTION = 'Reading the project definitions of data/projects.ini'
+
+  # Note that the configuration parser of Python 3 does not allow the
+  # duplicate values of the projects.ini configuration file.
+  PYTHON2_ONLY = True
+
+  _PROJECTS_FILE = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data',
+      'projects.ini')
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(ProjectDefinitionReaderBenchmark, self).__init__()
+    self._projects_data = None
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    file_object = io.BytesIO(self._projects_data)
+    project_definition_reader = projects.ProjectDefinitionReader()
+    for _ in project_definition_reader.Read(file_object):
+      pass
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    # The file is read once, such that only the parsing is measured.
+    with open(self._PROJECTS_FILE, 'rb') as file_object:
+      self._projects_data = file_object.read()
+
+
+class ProjectDefinitionStoreBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of reading the project definitions from the store cache."""
+
+  NAME = 'projects.store_read_cached'
+  DESCRIPTION = 'Reading the project definitions from the store cache file'
+
+  # Note that the cache file is created with the project definition reader,
+  # which requires Python 2.
+  PYTHON2_ONLY = True
+
+  _DATA_PATH = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(ProjectDefinitionStoreBenchmark, self).__init__()
+    self._cache_path = None
+    self._presets_path = None
+    self._projects_path = None
+
+  def _CreateStore(self):
+    """Creates a project definition store.
+
+    Returns:
+      ProjectDefinitionStore: project definition store.
+    """
+    return projects.ProjectDefinitionStore(
+        self._projects_path, presets_path=self._presets_path,
+        cache_path=self._cache_path)
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
+    project_definition_store.GetProjectDefinitions(
+        project_names=project_definition_store.GetPresetProjectNames('plaso'))
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    self._presets_path = os.path.join(path, 'presets.ini')
+    shutil.copy(os.path.join(self._DATA_PATH, 'presets.ini'), path)
+
+    self._projects_path = os.path.join(path, 'projects.ini')
+    shutil.copy(os.path.join(self._DATA_PATH, 'projects.ini'), path)
+
+    self._cache_path = os.path.join(path, 'projects.json')
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the source helper object implementations."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import tarfile
+import zipfile
+
+from l2tdevtools import projects
+from l2tdevtools import source_helper
+
+from benchmarks import benchmark_lib
+
+
+class SourcePackageExtractionBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of the source package extraction.
+
+  The source package is synthetic and resembles the layout of a Python
+  project source package.
+  """
+
+  _NUMBER_OF_MODULES = 200
+
+  _PROJECT_NAME = 'benchmark'
+  _PROJECT_VERSION = '20170101'
+
+  _SOURCE_PACKAGE_EXTENSION = ''
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(SourcePackageExtractionBenchmark, self).__init__()
+    self._current_working_directory = None
+    self._source_filename = None
+
+  def _GetMembers(self):
+    """Retrieves the members of the synthetic source package.
+
+    Yields:
+      tuple[str, bytes]: path and data of the member.
+    """
+    directory_name = '{0:s}-{1:s}'.format(
+        self._PROJECT_NAME, self._PROJECT_VERSION)
+
+    yield '{0:s}/setup.py'.format(directory_name), b'import setuptools\n'
+
+    for index in range(self._NUMBER_OF_MODULES):
+      path = '{0:s}/{1:s}/module{2:d}.py'.format(
+          directory_name, self._PROJECT_NAME, index)
+      data = b''.join([b'# -*- coding: utf-8 -*-\n', b'VALUE = 1\n' * 200])
+      yield path, data
+
+  def _WriteSourcePackage(self, path):
+    """Writes the synthetic source package.
+
+    Args:
+      path (str): path of the source package.
+    """
+    with tarfile.open(path, 'w:gz') as tar_file:
+      for member_path, data in self._GetMembers():
+        tar_info = tarfile.TarInfo(name=member_path)
+        tar_info.size = len(data)
+        tar_file.addfile(tar_info, io.BytesIO(data))
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    source_helper_object = source_helper.SourcePackageHelper(
+        self._PROJECT_NAME, project_definition, None)
+
+    # pylint: disable=protected-access
+    source_helper_object._source_filename = self._source_filename
+
+    directory_name = source_helper_object.Create()
+    shutil.rmtree(directory_name)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    self._source_filename = '{0:s}-{1:s}{2:s}'.format(
+        self._PROJECT_NAME, self._PROJECT_VERSION,
+        self._SOURCE_PACKAGE_EXTENSION)
+    self._WriteSourcePackage(os.path.join(path, self._source_filename))
+
+    # Note that the source package helper extracts into the current working
+    # directory.
+    self._current_working_directory = os.getcwd()
+    os.chdir(path)
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    os.chdir(self._current_working_directory)
+    super(SourcePackageExtractionBenchmark, self).TearDown()
+
+
+class TarGzipSourcePackageExtractionBenchmark(SourcePackageExtractionBenchmark):
+  """Benchmark of the .tar.gz source package extraction."""
+
+  NAME = 'source_helper.extract_tar_gz'
+  DESCRIPTION = 'Extraction of a .tar.gz source package'
+
+  # Note that the source package helper decodes the tar member names, which
+  # is currently only supported by Python 2.
+  PYTHON2_ONLY = True
+
+  _SOURCE_PACKAGE_EXTENSION = '.tar.gz'
+
+
+class ZipSourcePackageExtractionBenchmark(SourcePackageExtractionBenchmark):
+  """Benchmark of the .zip source package extraction."""
+
+  NAME = 'source_helper.extract_zip'
+  DESCRIPTION = 'Extraction of a .zip source package'
+
+  _SOURCE_PACKAGE_EXTENSION = '.zip'
+
+  def _WriteSourcePackage(self, path):
+    """Writes the synthetic source package.
+
+    Args:
+      path (str): path of the source package.
+    """
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+      for member_path, data in self._GetMembers():
+        zip_file.writestr(member_path, data)
+
+
+class TarGzipSourcePackageInspectionBenchmark(
+    TarGzipSourcePackageExtractionBenchmark):
+  """Benchmark of reading a single file from a .tar.gz source package."""
+
+  NAME = 'source_helper.read_member_tar_gz'
+  DESCRIPTION = 'Reading of setup.py from a .tar.gz source package'
+
+  PYTHON2_ONLY = False
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    source_helper_object = source_helper.SourcePackageHelper(
+        self._PROJECT_NAME, project_definition, None)
+
+    # pylint: disable=protected-access
+    source_helper_object._source_filename = self._source_filename
+
+    source_helper_object.ReadArchiveMember('setup.py')
+
+
+class ZipSourcePackageInspectionBenchmark(
+    ZipSourcePackageExtractionBenchmark):
+  """Benchmark of reading a single file from a .zip source package."""
+
+  NAME = 'source_helper.read_member_zip'
+  DESCRIPTION = 'Reading of setup.py from a .zip source package'
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    source_helper_object = source_helper.SourcePackageHelper(
+        self._PROJECT_NAME, project_definition, None)
+
+    # pylint: disable=protected-access
+    source_helper_object._source_filename = self._source_filename
+
+    source_helper_object.ReadArchiveMember('setup.py')
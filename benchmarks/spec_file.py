@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the RPM spec file generator."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+
+from l2tdevtools import projects
+from l2tdevtools import spec_file
+
+from benchmarks import benchmark_lib
+
+
+class RPMSpecFileRewriteBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of rewriting a RPM spec file generated with setup.py."""
+
+  NAME = 'spec_file.rewrite_setup_py_generated'
+  DESCRIPTION = 'Rewriting of a RPM spec file generated with setup.py'
+
+  # Note that the RPM spec file generator formats byte strings, which is
+  # not supported by Python 3.
+  PYTHON2_ONLY = True
+
+  _PROJECT_NAME = 'dfvfs'
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(RPMSpecFileRewriteBenchmark, self).__init__()
+    self._input_file = None
+    self._output_file = None
+    self._project_definition = None
+    self._source_directory = None
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+    spec_file_generator.RewriteSetupPyGeneratedFile(
+        self._project_definition, self._source_directory,
+        'dfvfs-20170723.tar.gz', self._PROJECT_NAME, self._input_file,
+        self._output_file)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    self._input_file = self._GetTestDataPath(['dfvfs.spec'])
+    self._output_file = os.path.join(path, 'dfvfs.spec')
+
+    self._project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    self._project_definition.build_system = 'setup_py'
+
+    # The source directory is used to determine the documentation and license
+    # files.
+    self._source_directory = os.path.join(path, 'dfvfs-20170723')
+    os.mkdir(self._source_directory)
+
+    for filename in ('LICENSE', 'README'):
+      with open(os.path.join(self._source_directory, filename), 'wb'):
+        pass
+
+
+class RPMSpecFileRewriteLargeBenchmark(RPMSpecFileRewriteBenchmark):
+  """Benchmark of rewriting a large RPM spec file generated with setup.py.
+
+  The large RPM spec file has a long description and a long files and
+  changelog section, which are replaced when rewriting the spec file.
+  """
+
+  NAME = 'spec_file.rewrite_large_setup_py_generated'
+  DESCRIPTION = 'Rewriting of a large RPM spec file generated with setup.py'
+
+  _NUMBER_OF_LINES = 20000
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    super(RPMSpecFileRewriteLargeBenchmark, self).SetUp()
+
+    with open(self._input_file, 'rb') as file_object:
+      data = file_object.read()
+
+    description_lines = b''.join([
+        'Line {0:d} of the description.\n'.format(line_index).encode('ascii')
+        for line_index in range(self._NUMBER_OF_LINES)])
+    data = data.replace(b'%description\n', b''.join([
+        b'%description\n', description_lines]), 1)
+
+    changelog_lines = b''.join([
+        '- Change {0:d}\n'.format(line_index).encode('ascii')
+        for line_index in range(self._NUMBER_OF_LINES)])
+    data = b''.join([data, b'\n%changelog\n', changelog_lines])
+
+    self._input_file = os.path.join(self._temporary_directory, 'input.spec')
+    with open(self._input_file, 'wb') as file_object:
+      file_object.write(data)
+
+
+class RPMSpecFileGenerateWithMetadataBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of generating a RPM spec file with the static metadata."""
+
+  NAME = 'spec_file.generate_with_metadata'
+  DESCRIPTION = 'Generation of a RPM spec file with PKG-INFO and setup.cfg'
+
+  # Note that the RPM spec file generator formats byte strings, which is
+  # not supported by Python 3.
+  PYTHON2_ONLY = True
+
+  _PROJECT_NAME = 'dfvfs'
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(RPMSpecFileGenerateWithMetadataBenchmark, self).__init__()
+    self._output_file = None
+    self._project_definition = None
+    self._source_directory = None
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+    spec_file_generator.GenerateWithMetadata(
+        self._project_definition, self._source_directory,
+        'dfvfs-20170723.tar.gz', self._PROJECT_NAME, self._output_file)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    path = self._CreateTemporaryDirectory()
+
+    self._output_file = os.path.join(path, 'dfvfs.spec')
+
+    self._project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    self._project_definition.build_system = 'setup_py'
+
+    self._source_directory = self._GetTestDataPath(['dfvfs-20170723'])
+
+
+class RPMSpecFileGenerateWithSetupPyBenchmark(
+    RPMSpecFileGenerateWithMetadataBenchmark):
+  """Benchmark of generating a RPM spec file with setup.py.
+
+  This is the equivalent of RPMSpecFileGenerateWithMetadataBenchmark that
+  runs "setup.py bdist_rpm --spec-only" and rewrites the result.
+  """
+
+  NAME = 'spec_file.generate_with_setup_py'
+  DESCRIPTION = 'Generation of a RPM spec file with setup.py bdist_rpm'
+
+  _SETUP_PY = '\n'.join([
+      'from setuptools import setup',
+      '',
+      'setup(',
+      '    name=\'dfvfs\',',
+      '    version=\'20170723\',',
+      '    description=\'Digital Forensics Virtual File System (dfVFS).\',',
+      '    long_description=\'Digital Forensics Virtual File System.\',',
+      '    license=\'Apache License, Version 2.0\',',
+      '    url=\'https://github.com/log2timeline/dfvfs\',',
+      '    author=\'Log2Timeline maintainers\',',
+      '    author_email=\'log2timeline-maintainers@googlegroups.com\',',
+      '    packages=[])',
+      ''])
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(RPMSpecFileGenerateWithSetupPyBenchmark, self).__init__()
+    self._build_log_file = None
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+    spec_file_generator.GenerateWithSetupPy(
+        self._source_directory, self._build_log_file)
+
+    input_file = os.path.join(self._source_directory, 'dist', 'dfvfs.spec')
+    spec_file_generator.RewriteSetupPyGeneratedFile(
+        self._project_definition, self._source_directory,
+        'dfvfs-20170723.tar.gz', self._PROJECT_NAME, input_file,
+        self._output_file)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    super(RPMSpecFileGenerateWithSetupPyBenchmark, self).SetUp()
+
+    path = self._temporary_directory
+    self._build_log_file = os.path.join(path, 'build.log')
+
+    # setup.py writes the generated RPM spec file to the source directory.
+    source_directory = os.path.join(path, 'dfvfs-20170723')
+    shutil.copytree(self._source_directory, source_directory)
+    self._source_directory = source_directory
+
+    setup_py_path = os.path.join(source_directory, 'setup.py')
+    with open(setup_py_path, 'wb') as file_object:
+      file_object.write(self._SETUP_PY.encode('utf-8'))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the update tool."""
+
+from __future__ import unicode_literals
+
+from benchmarks import benchmark_lib
+
+from tools import update
+
+
+class CompareVersionsBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of comparing versions, as done when checking for updates."""
+
+  NAME = 'update.compare_versions'
+  DESCRIPTION = 'Comparison of versions of installed and available packages'
+
+  _VERSIONS = [
+      '20170723', '20170707', '1.2.11', '1.2.8', '2.8.14', '2.8.10', '2.8.8',
+      '2.5.2', '0.7.1', '0.7.1rc1', '3.0.0b5', '1.10.0', '1.9.0', '2017.2',
+      '2016.10', '5.3.1', '5.3.0', '0.9.8', '1.0.2', '1.0.2l']
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(CompareVersionsBenchmark, self).__init__()
+    self._version_lists = None
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    for first_version_list in self._version_lists:
+      for second_version_list in self._version_lists:
+        update.CompareVersions(first_version_list, second_version_list)
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    self._version_lists = [version.split('.') for version in self._VERSIONS]
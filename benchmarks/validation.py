@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the validation of the project and preset definitions."""
+
+from __future__ import unicode_literals
+
+import os
+
+from l2tdevtools import projects
+from l2tdevtools import validation
+
+from benchmarks import benchmark_lib
+
+
+class ProjectDefinitionValidatorBenchmark(benchmark_lib.Benchmark):
+  """Benchmark of checking the project and preset definitions of data."""
+
+  NAME = 'validation.check_projects'
+  DESCRIPTION = 'Checking the project and preset definitions of data'
+
+  # Note that the configuration parser of Python 3 does not allow the
+  # duplicate values of the projects.ini configuration file.
+  PYTHON2_ONLY = True
+
+  _DATA_PATH = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    project_definition_store = projects.ProjectDefinitionStore(
+        os.path.join(self._DATA_PATH, 'projects.ini'),
+        presets_path=os.path.join(self._DATA_PATH, 'presets.ini'))
+    project_definition_store.Read()
+
+    validator = validation.ProjectDefinitionValidator(self._DATA_PATH)
+    validator.ValidatePresets(project_definition_store)
+    validator.ValidateProjectDefinitions(
+        project_definition_store.GetProjectDefinitions())
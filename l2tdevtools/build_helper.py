@@ -15,6 +15,7 @@ import shutil
 import subprocess
 import sys
 import tarfile
+import tempfile
 import zipfile
 
 from l2tdevtools import dpkg_files
@@ -25,7 +26,11 @@ from l2tdevtools import spec_file
 
 
 class BuildHelper(object):
-  """Helper to build projects from source."""
+  """Helper to build projects from source.
+
+  Attributes:
+    log_filename (str): name of the build log file.
+  """
 
   LOG_FILENAME = 'build.log'
 
@@ -39,6 +44,7 @@ class BuildHelper(object):
     super(BuildHelper, self).__init__()
     self._data_path = os.path.join(l2tdevtools_path, 'data')
     self._project_definition = project_definition
+    self.log_filename = self.LOG_FILENAME
 
   def _IsPython2Only(self):
     """Determines if the project only supports Python version 2.
@@ -116,6 +122,11 @@ class DPKGBuildHelper(BuildHelper):
       'zlib': 'zlib1g-dev'
   }
 
+  # The first line of a dpkg changelog file, in the format:
+  # name (version) distribution; urgency=low
+  _CHANGELOG_HEADER_RE = re.compile(
+      r'^(?P<name>\S+) \((?P<version>[^)]+)\) (?P<distribution>[^;]+);')
+
   def __init__(self, project_definition, l2tdevtools_path):
     """Initializes a build helper.
 
@@ -190,6 +201,98 @@ class DPKGBuildHelper(BuildHelper):
 
     return True
 
+  def _BuildSourcePackages(
+      self, source_helper_object, source_filename, project_name,
+      project_version, distributions):
+    """Builds the source dpkg packages for multiple distributions.
+
+    The source directory and packaging files are prepared once and cloned
+    per distribution, where only the changelog of the clone is changed.
+    The source dpkg packages of the distributions are built concurrently.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+      source_filename (str): name of the source package file.
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      distributions (list[str]): names of the distributions.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    # debuild wants an source package filename without
+    # the status indication and orig indication.
+    self._CreateOriginalSourcePackage(
+        source_filename, source_helper_object.project_name, project_version)
+
+    source_directory = source_helper_object.Create()
+    if not source_directory:
+      logging.error(
+          'Extraction of source package: {0:s} failed'.format(source_filename))
+      return False
+
+    logging.info('Building source deb of: {0:s}'.format(source_filename))
+
+    if not self._CreatePackagingFiles(
+        source_helper_object, source_directory, project_version):
+      return False
+
+    # If there is a temporary packaging directory remove it.
+    temporary_directory = os.path.join(source_directory, 'tmp')
+    if os.path.exists(temporary_directory):
+      logging.info('Removing: {0:s}'.format(temporary_directory))
+      shutil.rmtree(temporary_directory)
+
+    # The clones of all distributions are prepared before any build is
+    # started, such that a failed preparation does not leave builds running.
+    clone_directories = []
+    for distribution in distributions:
+      clone_directory = self._CloneSourceDirectory(
+          source_directory, distribution)
+      clone_directories.append((distribution, clone_directory))
+
+      if not self._PrepareCloneDirectory(
+          clone_directory, project_name, project_version, distribution):
+        for _, clone_directory in clone_directories:
+          logging.info('Removing: {0:s}'.format(clone_directory))
+          shutil.rmtree(clone_directory, True)
+        return False
+
+    processes = []
+    for distribution, clone_directory in clone_directories:
+      log_filename = '{0:s}_{1:s}_{2:s}'.format(
+          project_name, distribution, self.LOG_FILENAME)
+      command = 'debuild -S -sa > {0:s} 2>&1'.format(
+          os.path.join('..', log_filename))
+      process = subprocess.Popen('(cd {0:s} && {1:s})'.format(
+          clone_directory, command), shell=True)
+
+      processes.append((distribution, clone_directory, log_filename, process))
+
+    result = True
+    for distribution, clone_directory, log_filename, process in processes:
+      exit_code = process.wait()
+      if exit_code != 0:
+        logging.error((
+            'Building source deb for: {0:s} failed, for more information '
+            'check {1:s}').format(distribution, log_filename))
+        result = False
+        continue
+
+      if not self._BuildFinalize(
+          clone_directory, project_name, project_version, self.version_suffix,
+          distribution, self.architecture):
+        result = False
+        continue
+
+      logging.info('Removing: {0:s}'.format(clone_directory))
+      shutil.rmtree(clone_directory, True)
+
+      if os.path.exists(log_filename):
+        os.remove(log_filename)
+
+    return result
+
   def _CheckIsInstalled(self, package_name):
     """Checks if a package is installed.
 
@@ -203,6 +306,67 @@ class DPKGBuildHelper(BuildHelper):
     exit_code = subprocess.call(command, shell=True)
     return exit_code == 0
 
+  def _CloneSourceDirectory(self, source_directory, distribution):
+    """Clones a source directory for a specific distribution.
+
+    The files of the source directory are hard linked into the clone, except
+    for the files in the debian sub directory, which are copied such that
+    they can be changed for the distribution.
+
+    Args:
+      source_directory (str): name of the source directory.
+      distribution (str): name of the distribution.
+
+    Returns:
+      str: name of the clone of the source directory.
+    """
+    clone_directory = '{0:s}~{1:s}'.format(source_directory, distribution)
+    if os.path.exists(clone_directory):
+      logging.info('Removing: {0:s}'.format(clone_directory))
+      shutil.rmtree(clone_directory)
+
+    for directory, sub_directories, filenames in os.walk(source_directory):
+      relative_directory = os.path.relpath(directory, source_directory)
+      if relative_directory == '.':
+        # The debian sub directory is copied.
+        if 'debian' in sub_directories:
+          sub_directories.remove('debian')
+
+        clone_sub_directory = clone_directory
+      else:
+        clone_sub_directory = os.path.join(clone_directory, relative_directory)
+
+      os.mkdir(clone_sub_directory)
+
+      for name in list(sub_directories):
+        path = os.path.join(directory, name)
+        if os.path.islink(path):
+          # Note that os.walk() does not follow symbolic links to directories.
+          os.symlink(
+              os.readlink(path), os.path.join(clone_sub_directory, name))
+          sub_directories.remove(name)
+
+      for name in filenames:
+        path = os.path.join(directory, name)
+        clone_path = os.path.join(clone_sub_directory, name)
+        if os.path.islink(path):
+          os.symlink(os.readlink(path), clone_path)
+          continue
+
+        try:
+          os.link(path, clone_path)
+        except (AttributeError, OSError):
+          # Fall back to copying if hard links are not supported.
+          shutil.copy2(path, clone_path)
+
+    debian_directory = os.path.join(source_directory, 'debian')
+    if os.path.isdir(debian_directory):
+      shutil.copytree(
+          debian_directory, os.path.join(clone_directory, 'debian'),
+          symlinks=True)
+
+    return clone_directory
+
   def _CreateOriginalSourcePackage(
       self, source_filename, project_name, project_version):
     """Creates the .orig.tar.gz source package.
@@ -287,6 +451,72 @@ class DPKGBuildHelper(BuildHelper):
 
     return True
 
+  def _UpdateChangelogFile(
+      self, source_directory, version_suffix, distribution):
+    """Updates the changelog file for a specific distribution.
+
+    The version suffix and distribution are added to the version of the
+    first entry of the changelog, for example "1.0-1" becomes
+    "1.0-1ppa1~trusty".
+
+    Args:
+      source_directory (str): name of the source directory.
+      version_suffix (str): version suffix.
+      distribution (str): name of the distribution.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    changelog_path = os.path.join(source_directory, 'debian', 'changelog')
+    with open(changelog_path, 'rb') as file_object:
+      data = file_object.read().decode('utf-8')
+
+    header, _, remainder = data.partition('\n')
+    match = self._CHANGELOG_HEADER_RE.match(header)
+    if not match:
+      logging.error('Unsupported changelog file: {0:s}'.format(
+          changelog_path))
+      return False
+
+    version = '{0:s}{1:s}~{2:s}'.format(
+        match.group('version'), version_suffix, distribution)
+
+    header = '{0:s} ({1:s}) {2:s};{3:s}'.format(
+        match.group('name'), version, distribution, header[match.end():])
+
+    # Note that the changelog file is a copy, hence it does not share its
+    # data with the changelog files of the other distributions.
+    with open(changelog_path, 'wb') as file_object:
+      file_object.write('\n'.join([header, remainder]).encode('utf-8'))
+
+    return True
+
+  def _PrepareCloneDirectory(
+      self, clone_directory, project_name, project_version, distribution):
+    """Prepares the clone of a source directory for a specific distribution.
+
+    If there is a prep script, it is responsible for adding the version
+    suffix and distribution to the changelog, as it was before the source
+    directory was cloned. Otherwise the changelog is updated, such that
+    the version suffix is not added twice.
+
+    Args:
+      clone_directory (str): name of the clone of the source directory.
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      distribution (str): name of the distribution.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if os.path.exists(self._prep_script):
+      return self._BuildPrepare(
+          clone_directory, project_name, project_version, self.version_suffix,
+          distribution, self.architecture)
+
+    return self._UpdateChangelogFile(
+        clone_directory, self.version_suffix, distribution)
+
   def _RemoveOlderDPKGPackages(self, project_name, project_version):
     """Removes previous versions of dpkg packages.
 
@@ -464,7 +694,7 @@ class ConfigureMakeDPKGBuildHelper(DPKGBuildHelper):
         self.version_suffix, self.distribution, self.architecture):
       return False
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'dpkg-buildpackage -uc -us -rfakeroot > {0:s} 2>&1'.format(
         log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
@@ -530,10 +760,22 @@ class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
     self.version_suffix = 'ppa1'
 
   def Build(self, source_helper_object):
-    """Builds the dpkg packages.
+    """Builds the source dpkg packages.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    return self.BuildDistributions(source_helper_object, [self.distribution])
+
+  def BuildDistributions(self, source_helper_object, distributions):
+    """Builds the source dpkg packages for multiple distributions.
 
     Args:
       source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
 
     Returns:
       bool: True if successful, False otherwise.
@@ -546,48 +788,9 @@ class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
 
     project_version = source_helper_object.GetProjectVersion()
 
-    # debuild wants an source package filename without
-    # the status indication and orig indication.
-    self._CreateOriginalSourcePackage(
-        source_filename, source_helper_object.project_name, project_version)
-
-    source_directory = source_helper_object.Create()
-    if not source_directory:
-      logging.error(
-          'Extraction of source package: {0:s} failed'.format(source_filename))
-      return False
-
-    logging.info('Building source deb of: {0:s}'.format(source_filename))
-
-    if not self._CreatePackagingFiles(
-        source_helper_object, source_directory, project_version):
-      return False
-
-    # If there is a temporary packaging directory remove it.
-    temporary_directory = os.path.join(source_directory, 'tmp')
-    if os.path.exists(temporary_directory):
-      logging.info('Removing: {0:s}'.format(temporary_directory))
-      shutil.rmtree(temporary_directory)
-
-    if not self._BuildPrepare(
-        source_directory, source_helper_object.project_name, project_version,
-        self.version_suffix, self.distribution, self.architecture):
-      return False
-
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
-      return False
-
-    if not self._BuildFinalize(
-        source_directory, source_helper_object.project_name, project_version,
-        self.version_suffix, self.distribution, self.architecture):
-      return False
-
-    return True
+    return self._BuildSourcePackages(
+        source_helper_object, source_filename,
+        source_helper_object.project_name, project_version, distributions)
 
   def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
@@ -716,7 +919,7 @@ class SetupPyDPKGBuildHelper(DPKGBuildHelper):
         self.distribution, self.architecture):
       return False
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'dpkg-buildpackage -uc -us -rfakeroot > {0:s} 2>&1'.format(
         log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
@@ -814,11 +1017,23 @@ class SetupPySourceDPKGBuildHelper(DPKGBuildHelper):
     return project_name, project_version
 
   def Build(self, source_helper_object):
-    """Builds the dpkg packages.
+    """Builds the source dpkg packages.
 
     Args:
       source_helper_object (SourceHelper): source helper.
 
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    return self.BuildDistributions(source_helper_object, [self.distribution])
+
+  def BuildDistributions(self, source_helper_object, distributions):
+    """Builds the source dpkg packages for multiple distributions.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
+
     Returns:
       bool: True if successful, False otherwise.
     """
@@ -831,48 +1046,9 @@ class SetupPySourceDPKGBuildHelper(DPKGBuildHelper):
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    # debuild wants an source package filename without
-    # the status indication and orig indication.
-    self._CreateOriginalSourcePackage(
-        source_filename, source_helper_object.project_name, project_version)
-
-    source_directory = source_helper_object.Create()
-    if not source_directory:
-      logging.error(
-          'Extraction of source package: {0:s} failed'.format(source_filename))
-      return False
-
-    logging.info('Building source deb of: {0:s}'.format(source_filename))
-
-    if not self._CreatePackagingFiles(
-        source_helper_object, source_directory, project_version):
-      return False
-
-    # If there is a temporary packaging directory remove it.
-    temporary_directory = os.path.join(source_directory, 'tmp')
-    if os.path.exists(temporary_directory):
-      logging.info('Removing: {0:s}'.format(temporary_directory))
-      shutil.rmtree(temporary_directory)
-
-    if not self._BuildPrepare(
-        source_directory, project_name, project_version, self.version_suffix,
-        self.distribution, self.architecture):
-      return False
-
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
-      return False
-
-    if not self._BuildFinalize(
-        source_directory, project_name, project_version, self.version_suffix,
-        self.distribution, self.architecture):
-      return False
-
-    return True
+    return self._BuildSourcePackages(
+        source_helper_object, source_filename, project_name, project_version,
+        distributions)
 
   def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
@@ -1575,7 +1751,7 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
       if not result:
         return False
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = '\"{0:s}\" setup.py bdist_msi > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
@@ -1783,7 +1959,7 @@ class OSCBuildHelper(BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'osc -q add {0:s} >> {1:s} 2>&1'.format(path, log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         self._OSC_PROJECT, command), shell=True)
@@ -1800,7 +1976,7 @@ class OSCBuildHelper(BuildHelper):
       bool: True if successful, False otherwise.
     """
     command = 'osc -q checkout {0:s} >> {1:s} 2>&1 '.format(
-        self._OSC_PROJECT, self.LOG_FILENAME)
+        self._OSC_PROJECT, self.log_filename)
     exit_code = subprocess.call(command, shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
@@ -1819,7 +1995,7 @@ class OSCBuildHelper(BuildHelper):
     """
     # Running osc commit from the package sub directory is more efficient.
     osc_project_path = os.path.join(self._OSC_PROJECT, package_name)
-    log_file_path = os.path.join('..', '..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', '..', self.log_filename)
     command = 'osc -q commit -n >> {0:s} 2>&1'.format(log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         osc_project_path, command), shell=True)
@@ -1864,7 +2040,7 @@ class OSCBuildHelper(BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'osc -q update >> {0:s} 2>&1'.format(log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         self._OSC_PROJECT, command), shell=True)
@@ -2066,36 +2242,43 @@ class SetupPyOSCBuildHelper(OSCBuildHelper):
       if not self._OSCAdd(osc_source_path):
         return False
 
-    source_directory = source_helper_object.Create()
-    if not source_directory:
-      logging.error(
-          'Extraction of source package: {0:s} failed'.format(source_filename))
-      return False
-
     spec_file_generator = spec_file.RPMSpecFileGenerator()
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    if not spec_file_generator.GenerateWithSetupPy(
-        source_directory, log_file_path):
-      return False
-
     project_name = source_helper_object.project_name
     if project_name.startswith('python-') and project_name != 'python-gflags':
       project_name = project_name[7:]
 
-    input_file_path = self._GetSetupPySpecFilePath(
-        source_helper_object, source_directory)
-
     spec_filename = '{0:s}.spec'.format(project_name)
     output_file_path = os.path.join(osc_package_path, spec_filename)
 
     # Determine if the output file exists before it is generated.
     output_file_exists = os.path.exists(output_file_path)
 
-    if not spec_file_generator.RewriteSetupPyGeneratedFileForOSC(
-        self._project_definition, source_directory, source_filename,
-        project_name, input_file_path, output_file_path):
-      return False
+    # The static metadata is read from the source package, hence extracting
+    # the source package and running setup.py is only needed if the static
+    # metadata is insufficient to generate the spec file.
+    if not spec_file_generator.GenerateWithMetadataForOSC(
+        self._project_definition, None, source_filename, project_name,
+        output_file_path, source_helper_object=source_helper_object):
+      source_directory = source_helper_object.Create()
+      if not source_directory:
+        logging.error(
+            'Extraction of source package: {0:s} failed'.format(
+                source_filename))
+        return False
+
+      log_file_path = os.path.join('..', self.log_filename)
+      if not spec_file_generator.GenerateWithSetupPy(
+          source_directory, log_file_path):
+        return False
+
+      input_file_path = self._GetSetupPySpecFilePath(
+          source_helper_object, source_directory)
+
+      if not spec_file_generator.RewriteSetupPyGeneratedFileForOSC(
+          self._project_definition, source_directory, source_filename,
+          project_name, input_file_path, output_file_path):
+        return False
 
     if not output_file_exists:
       output_file_path = os.path.join(
@@ -2296,7 +2479,7 @@ class ConfigureMakePKGBuildHelper(PKGBuildHelper):
         source_helper_object.project_name, project_version)
     pkg_filename = '{0:s}-{1!s}.pkg'.format(
         source_helper_object.project_name, project_version)
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
 
     sdks_path = os.path.join(
         '/', 'Applications', 'Xcode.app', 'Contents', 'Developer',
@@ -2425,7 +2608,7 @@ class SetupPyPKGBuildHelper(PKGBuildHelper):
         source_helper_object.project_name, project_version)
     pkg_filename = '{0:s}-{1!s}.pkg'.format(
         source_helper_object.project_name, project_version)
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
 
     if not os.path.exists(pkg_filename):
       command = 'python setup.py build > {0:s} 2>&1'.format(log_file_path)
@@ -2519,13 +2702,16 @@ class BaseRPMBuildHelper(BuildHelper):
         project_definition, l2tdevtools_path)
     self.architecture = platform.machine()
 
-    self.rpmbuild_path = os.path.join('~', 'rpmbuild')
-    self.rpmbuild_path = os.path.expanduser(self.rpmbuild_path)
+    # Every build uses its own rpmbuild directory and build log, such that
+    # builds of different projects can run concurrently.
+    self.log_filename = '{0:s}_{1:s}'.format(
+        project_definition.name, self.LOG_FILENAME)
+    self.rpmbuild_path = None
 
-    self._rpmbuild_rpms_path = os.path.join(self.rpmbuild_path, 'RPMS')
-    self._rpmbuild_sources_path = os.path.join(self.rpmbuild_path, 'SOURCES')
-    self._rpmbuild_specs_path = os.path.join(self.rpmbuild_path, 'SPECS')
-    self._rpmbuild_srpms_path = os.path.join(self.rpmbuild_path, 'SRPMS')
+    self._rpmbuild_rpms_path = None
+    self._rpmbuild_sources_path = None
+    self._rpmbuild_specs_path = None
+    self._rpmbuild_srpms_path = None
 
   def _BuildFromSpecFile(self, spec_filename, rpmbuild_flags='-ba'):
     """Builds the rpms directly from a spec file.
@@ -2538,19 +2724,13 @@ class BaseRPMBuildHelper(BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    spec_filename = os.path.join('SPECS', spec_filename)
-
-    current_path = os.getcwd()
-    os.chdir(self.rpmbuild_path)
+    spec_filename = os.path.join(self._rpmbuild_specs_path, spec_filename)
 
-    command = 'rpmbuild {0:s} {1:s} > {2:s} 2>&1'.format(
-        rpmbuild_flags, spec_filename, self.LOG_FILENAME)
+    command = self._GetRPMBuildCommand(rpmbuild_flags, spec_filename)
     exit_code = subprocess.call(command, shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
 
-    os.chdir(current_path)
-
     return exit_code == 0
 
   def _BuildFromSourcePackage(
@@ -2566,8 +2746,7 @@ class BaseRPMBuildHelper(BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    command = 'rpmbuild {0:s} {1:s} > {2:s} 2>&1'.format(
-        rpmbuild_flags, source_package_filename, self.LOG_FILENAME)
+    command = self._GetRPMBuildCommand(rpmbuild_flags, source_package_filename)
     exit_code = subprocess.call(command, shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
@@ -2594,24 +2773,34 @@ class BaseRPMBuildHelper(BuildHelper):
     Args:
       source_package_filename (str): name of the source package file.
     """
+    self._CreateRPMbuildDirectories()
+
     rpm_source_package_path = os.path.join(
         self._rpmbuild_sources_path, source_package_filename)
 
     if not os.path.exists(rpm_source_package_path):
-      self._CreateRPMbuildDirectories()
-
       shutil.copy(source_package_filename, rpm_source_package_path)
 
   def _CreateRPMbuildDirectories(self):
-    """Creates the rpmbuild and sub directories."""
-    if not os.path.exists(self.rpmbuild_path):
-      os.mkdir(self.rpmbuild_path)
+    """Creates the rpmbuild and sub directories.
 
-    if not os.path.exists(self._rpmbuild_sources_path):
-      os.mkdir(self._rpmbuild_sources_path)
+    The rpmbuild directory is a temporary directory that is specific to
+    the build, which is passed to rpmbuild as the _topdir macro.
+    """
+    if self.rpmbuild_path:
+      return
+
+    self.rpmbuild_path = tempfile.mkdtemp(prefix='rpmbuild-')
+
+    self._rpmbuild_rpms_path = os.path.join(self.rpmbuild_path, 'RPMS')
+    self._rpmbuild_sources_path = os.path.join(self.rpmbuild_path, 'SOURCES')
+    self._rpmbuild_specs_path = os.path.join(self.rpmbuild_path, 'SPECS')
+    self._rpmbuild_srpms_path = os.path.join(self.rpmbuild_path, 'SRPMS')
 
-    if not os.path.exists(self._rpmbuild_specs_path):
-      os.mkdir(self._rpmbuild_specs_path)
+    for path in (
+        self._rpmbuild_rpms_path, self._rpmbuild_sources_path,
+        self._rpmbuild_specs_path, self._rpmbuild_srpms_path):
+      os.mkdir(path)
 
   def _CreateSpecFile(self, project_name, spec_file_data):
     """Creates a spec file in the rpmbuild directory.
@@ -2661,6 +2850,19 @@ class BaseRPMBuildHelper(BuildHelper):
 
     return project_name, project_version
 
+  def _GetRPMBuildCommand(self, rpmbuild_flags, path):
+    """Retrieves the rpmbuild command.
+
+    Args:
+      rpmbuild_flags (str): rpmbuild flags.
+      path (str): path of the spec file or source package file.
+
+    Returns:
+      str: rpmbuild command.
+    """
+    return 'rpmbuild --define "_topdir {0:s}" {1:s} {2:s} > {3:s} 2>&1'.format(
+        self.rpmbuild_path, rpmbuild_flags, path, self.log_filename)
+
   def _GetSetupPySpecFilePath(self, source_helper_object, source_directory):
     """Retrieves the path of the setup.py generated .spec file.
 
@@ -2696,6 +2898,21 @@ class BaseRPMBuildHelper(BuildHelper):
 
       shutil.move(filename, '.')
 
+  def _RemoveRPMbuildDirectories(self):
+    """Removes the rpmbuild and sub directories."""
+    if not self.rpmbuild_path:
+      return
+
+    logging.info('Removing: {0:s}'.format(self.rpmbuild_path))
+    shutil.rmtree(self.rpmbuild_path, True)
+
+    self.rpmbuild_path = None
+
+    self._rpmbuild_rpms_path = None
+    self._rpmbuild_sources_path = None
+    self._rpmbuild_specs_path = None
+    self._rpmbuild_srpms_path = None
+
   def CheckBuildDependencies(self):
     """Checks if the build dependencies are met.
 
@@ -2720,43 +2937,6 @@ class BaseRPMBuildHelper(BuildHelper):
 class RPMBuildHelper(BaseRPMBuildHelper):
   """Helper to build RPM packages (.rpm)."""
 
-  def _RemoveBuildDirectory(self, project_name, project_version):
-    """Removes build directory.
-
-    Args:
-      project_name (str): name of the project.
-      project_version (str): version of the project.
-    """
-    filename = '{0:s}-{1!s}'.format(project_name, project_version)
-    filename = os.path.join(self.rpmbuild_path, 'BUILD', filename)
-
-    logging.info('Removing: {0:s}'.format(filename))
-
-    try:
-      shutil.rmtree(filename)
-    except OSError:
-      logging.warning('Unable to remove: {0:s}'.format(filename))
-
-  def _RemoveOlderBuildDirectory(self, project_name, project_version):
-    """Removes previous versions of build directories.
-
-    Args:
-      project_name (str): name of the project.
-      project_version (str): version of the project.
-    """
-    filenames_to_ignore = '{0:s}-{1!s}'.format(
-        project_name, project_version)
-    filenames_to_ignore = re.compile(filenames_to_ignore)
-
-    filenames_glob = os.path.join(
-        self.rpmbuild_path, 'BUILD', '{0:s}-*'.format(project_name))
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        shutil.rmtree(filename)
-
   def _RemoveOlderRPMs(self, project_name, project_version):
     """Removes previous versions of .rpm files.
 
@@ -2777,15 +2957,6 @@ class RPMBuildHelper(BaseRPMBuildHelper):
         logging.info('Removing: {0:s}'.format(filename))
         os.remove(filename)
 
-    filenames_glob = os.path.join(
-        self.rpmbuild_path, 'RPMS', self.architecture, rpm_filenames_glob)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
   def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
 
@@ -2846,12 +3017,16 @@ class ConfigureMakeRPMBuildHelper(RPMBuildHelper):
         project_name, project_version)
     os.rename(source_package_filename, rpm_source_package_filename)
 
-    build_successful = self._BuildFromSourcePackage(
-        rpm_source_package_filename, rpmbuild_flags='-tb')
+    self._CreateRPMbuildDirectories()
+    try:
+      build_successful = self._BuildFromSourcePackage(
+          rpm_source_package_filename, rpmbuild_flags='-tb')
+
+      if build_successful:
+        self._MoveRPMs(project_name, project_version)
 
-    if build_successful:
-      self._MoveRPMs(project_name, project_version)
-      self._RemoveBuildDirectory(project_name, project_version)
+    finally:
+      self._RemoveRPMbuildDirectories()
 
     # Change the source package filename back to the original.
     os.rename(rpm_source_package_filename, source_package_filename)
@@ -2859,7 +3034,7 @@ class ConfigureMakeRPMBuildHelper(RPMBuildHelper):
     return build_successful
 
   def Clean(self, source_helper_object):
-    """Cleans the rpmbuild directory.
+    """Removes previous versions of rpms.
 
     Args:
       source_helper_object (SourceHelper): source helper.
@@ -2867,7 +3042,6 @@ class ConfigureMakeRPMBuildHelper(RPMBuildHelper):
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    self._RemoveOlderBuildDirectory(project_name, project_version)
     self._RemoveOlderRPMs(project_name, project_version)
 
 
@@ -2896,29 +3070,37 @@ class SetupPyRPMBuildHelper(RPMBuildHelper):
     Returns:
       str: path of the generated rpm spec file or None.
     """
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    project_name = source_helper_object.project_name
+    if project_name.startswith('python-'):
+      project_name = project_name[7:]
+
+    spec_filename = '{0:s}.spec'.format(project_name)
+    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
+
+    # The static metadata is read from the source package, hence extracting
+    # the source package and running setup.py is only needed if the static
+    # metadata is insufficient to generate the spec file.
+    if spec_file_generator.GenerateWithMetadata(
+        self._project_definition, None, source_filename, project_name,
+        output_file_path, source_helper_object=source_helper_object):
+      return output_file_path
+
     source_directory = source_helper_object.Create()
     if not source_directory:
       logging.error(
           'Extraction of source package: {0:s} failed'.format(source_filename))
       return
 
-    spec_file_generator = spec_file.RPMSpecFileGenerator()
-
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     if not spec_file_generator.GenerateWithSetupPy(
         source_directory, log_file_path):
       return
 
-    project_name = source_helper_object.project_name
-    if project_name.startswith('python-'):
-      project_name = project_name[7:]
-
     input_file_path = self._GetSetupPySpecFilePath(
         source_helper_object, source_directory)
 
-    spec_filename = '{0:s}.spec'.format(project_name)
-    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
-
     if not spec_file_generator.RewriteSetupPyGeneratedFile(
         self._project_definition, source_directory, source_filename,
         project_name, input_file_path, output_file_path):
@@ -2967,20 +3149,23 @@ class SetupPyRPMBuildHelper(RPMBuildHelper):
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    self._CopySourcePackageToRPMBuildSources(source_filename)
+    try:
+      self._CopySourcePackageToRPMBuildSources(source_filename)
 
-    rpm_spec_file_path = self._GenerateSpecFile(
-        source_filename, source_helper_object)
-    if not rpm_spec_file_path:
-      logging.error('Unable to generate rpm spec file.')
-      return False
+      rpm_spec_file_path = self._GenerateSpecFile(
+          source_filename, source_helper_object)
+      if not rpm_spec_file_path:
+        logging.error('Unable to generate rpm spec file.')
+        return False
+
+      build_successful = self._BuildFromSpecFile(
+          rpm_spec_file_path, rpmbuild_flags='-bb')
 
-    build_successful = self._BuildFromSpecFile(
-        rpm_spec_file_path, rpmbuild_flags='-bb')
+      if build_successful:
+        self._MoveRPMs(project_name, project_version)
 
-    if build_successful:
-      self._MoveRPMs(project_name, project_version)
-      self._RemoveBuildDirectory(project_name, project_version)
+    finally:
+      self._RemoveRPMbuildDirectories()
 
     return build_successful
 
@@ -3000,7 +3185,6 @@ class SetupPyRPMBuildHelper(RPMBuildHelper):
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    self._RemoveOlderBuildDirectory(project_name, project_version)
     self._RemoveOlderRPMs(project_name, project_version)
 
 
@@ -3039,15 +3223,6 @@ class SRPMBuildHelper(BaseRPMBuildHelper):
         logging.info('Removing: {0:s}'.format(filename))
         os.remove(filename)
 
-    filenames_glob = os.path.join(
-        self.rpmbuild_path, 'SRPMS', src_rpm_filenames_glob)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
-
   def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
 
@@ -3066,7 +3241,7 @@ class SRPMBuildHelper(BaseRPMBuildHelper):
     return not os.path.exists(srpm_filename)
 
   def Clean(self, source_helper_object):
-    """Cleans the rpmbuild directory.
+    """Removes previous versions of source rpms.
 
     Args:
       source_helper_object (SourceHelper): source helper.
@@ -3106,13 +3281,18 @@ class ConfigureMakeSRPMBuildHelper(SRPMBuildHelper):
         project_name, project_version)
     os.rename(source_package_filename, rpm_source_package_filename)
 
-    build_successful = self._BuildFromSourcePackage(
-        rpm_source_package_filename, rpmbuild_flags='-ts')
+    self._CreateRPMbuildDirectories()
+    try:
+      build_successful = self._BuildFromSourcePackage(
+          rpm_source_package_filename, rpmbuild_flags='-ts')
+
+      # TODO: test binary build of source package?
 
-    # TODO: test binary build of source package?
+      if build_successful:
+        self._MoveRPMs(project_name, project_version)
 
-    if build_successful:
-      self._MoveRPMs(project_name, project_version)
+    finally:
+      self._RemoveRPMbuildDirectories()
 
     # Change the source package filename back to the original.
     os.rename(rpm_source_package_filename, source_package_filename)
@@ -3145,29 +3325,37 @@ class SetupPySRPMBuildHelper(SRPMBuildHelper):
     Returns:
       str: path of the generated rpm spec file or None.
     """
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    project_name = source_helper_object.project_name
+    if project_name.startswith('python-'):
+      project_name = project_name[7:]
+
+    spec_filename = '{0:s}.spec'.format(project_name)
+    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
+
+    # The static metadata is read from the source package, hence extracting
+    # the source package and running setup.py is only needed if the static
+    # metadata is insufficient to generate the spec file.
+    if spec_file_generator.GenerateWithMetadata(
+        self._project_definition, None, source_filename, project_name,
+        output_file_path, source_helper_object=source_helper_object):
+      return output_file_path
+
     source_directory = source_helper_object.Create()
     if not source_directory:
       logging.error(
           'Extraction of source package: {0:s} failed'.format(source_filename))
       return
 
-    spec_file_generator = spec_file.RPMSpecFileGenerator()
-
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     if not spec_file_generator.GenerateWithSetupPy(
         source_directory, log_file_path):
       return
 
-    project_name = source_helper_object.project_name
-    if project_name.startswith('python-'):
-      project_name = project_name[7:]
-
     input_file_path = self._GetSetupPySpecFilePath(
         source_helper_object, source_directory)
 
-    spec_filename = '{0:s}.spec'.format(project_name)
-    output_file_path = os.path.join(self._rpmbuild_specs_path, spec_filename)
-
     if not spec_file_generator.RewriteSetupPyGeneratedFile(
         self._project_definition, source_directory, source_filename,
         project_name, input_file_path, output_file_path):
@@ -3195,21 +3383,25 @@ class SetupPySRPMBuildHelper(SRPMBuildHelper):
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    self._CopySourcePackageToRPMBuildSources(source_filename)
+    try:
+      self._CopySourcePackageToRPMBuildSources(source_filename)
 
-    rpm_spec_file_path = self._GenerateSpecFile(
-        source_filename, source_helper_object)
-    if not rpm_spec_file_path:
-      logging.error('Unable to generate rpm spec file.')
-      return False
+      rpm_spec_file_path = self._GenerateSpecFile(
+          source_filename, source_helper_object)
+      if not rpm_spec_file_path:
+        logging.error('Unable to generate rpm spec file.')
+        return False
+
+      build_successful = self._BuildFromSpecFile(
+          rpm_spec_file_path, rpmbuild_flags='-bs')
 
-    build_successful = self._BuildFromSpecFile(
-        rpm_spec_file_path, rpmbuild_flags='-bs')
+      # TODO: test binary build of source package?
 
-    # TODO: test binary build of source package?
+      if build_successful:
+        self._MoveRPMs(project_name, project_version)
 
-    if build_successful:
-      self._MoveRPMs(project_name, project_version)
+    finally:
+      self._RemoveRPMbuildDirectories()
 
     return build_successful
 
@@ -3248,7 +3440,7 @@ class ConfigureMakeSourceBuildHelper(SourceBuildHelper):
       # TODO: add self._ApplyPatches
       pass
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = './configure > {0:s} 2>&1'.format(log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         source_directory, command), shell=True)
@@ -3305,7 +3497,7 @@ class SetupPySourceBuildHelper(SourceBuildHelper):
       # TODO: add self._ApplyPatches
       pass
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = '{0:s} setup.py build > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
@@ -4,13 +4,24 @@
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import io
+import json
+import os
 import re
+import sys
+import time
 
 try:
   import ConfigParser as configparser
 except ImportError:
   import configparser  # pylint: disable=import-error
 
+try:
+  import importlib.util as importlib_util
+except ImportError:
+  importlib_util = None
+  import imp
+
 
 class DependencyDefinition(object):
   """Dependency definition.
@@ -102,21 +113,113 @@ class DependencyDefinitionReader(object):
 
 
 class DependencyHelper(object):
-  """Dependency helper."""
+  """Dependency helper.
+
+  The Python modules are imported in a few long-lived worker processes,
+  such that the dependencies are not imported into the process that checks
+  them and not every Python module requires a new interpreter. The
+  metadata of the installed distributions is used to determine the version
+  of a Python module that does not define a version attribute.
+  """
+
+  _DISTRIBUTION_NAME_REGEX = re.compile(r'[-_.]+')
+
+  # Distribution metadata directories and eggs are named:
+  # name-version[-pyX.Y[-platform]].(dist-info|egg-info|egg)
+  _DISTRIBUTION_PATH_REGEX = re.compile(
+      r'^(?P<name>[^-]+)-(?P<version>[^-]+)(-py[0-9.]+)?(-.+)?'
+      r'\.(dist-info|egg-info|egg)$')
+
+  # Maximum number of seconds to wait for a Python module to be imported.
+  _IMPORT_TIMEOUT = 60.0
+
+  # Script of a worker process that imports Python modules. The argument
+  # is the Python module search path. Every line read from stdin is a JSON
+  # request that contains the alternative names of a Python module and its
+  # version attribute or function. The result of every request is written
+  # as a line to stdout, while the output of the Python modules is written
+  # to stderr.
+  _IMPORT_SCRIPT = '\n'.join([
+      'import json',
+      'import os',
+      'import sys',
+      'sys.path = json.loads(sys.argv[1])',
+      'result_file = os.fdopen(os.dup(1), "w")',
+      'os.dup2(2, 1)',
+      'sys.stdout = sys.stderr',
+      'while True:',
+      '  line = sys.stdin.readline()',
+      '  if not line:',
+      '    break',
+      '  request = json.loads(line)',
+      '  result = {}',
+      '  version_property = request["version_property"]',
+      '  for module_name in request["module_names"]:',
+      '    try:',
+      '      module_object = __import__(module_name)',
+      '    except ImportError:',
+      '      continue',
+      '    except (Exception, SystemExit) as exception:',
+      '      result["error"] = "{0!s}".format(exception)',
+      '      continue',
+      '    for submodule_name in module_name.split(".")[1:]:',
+      '      module_object = getattr(module_object, submodule_name, None)',
+      '    if not module_object:',
+      '      continue',
+      '    result = {"module_name": module_name}',
+      '    module_version = None',
+      '    if version_property.endswith("()"):',
+      '      version_method = getattr(',
+      '          module_object, version_property[:-2], None)',
+      '      if version_method:',
+      '        module_version = version_method()',
+      '    elif version_property:',
+      '      module_version = getattr(module_object, version_property, None)',
+      '    if module_version:',
+      '      result["version"] = "{0!s}".format(module_version)',
+      '    break',
+      '  result_file.write("{0:s}{1:s}\\n".format(',
+      '      "@result:", json.dumps(result)))',
+      '  result_file.flush()',
+      'result_file.close()',
+      '',
+      '# Threads started by the Python modules should not keep the worker',
+      '# process alive.',
+      'os._exit(0)',
+      ''])
+
+  _IMPORT_SCRIPT_RESULT_PREFIX = '@result:'
+
+  # The format version was increased when the check results determined
+  # from the distribution metadata, without importing, were dropped.
+  _CACHE_FORMAT_VERSION = 2
 
   _VERSION_NUMBERS_REGEX = re.compile(r'[0-9].+')
   _VERSION_SPLIT_REGEX = re.compile(r'\.|\-')
 
-  def __init__(self, configuration_file='dependencies.ini'):
+  def __init__(
+      self, configuration_file='dependencies.ini', number_of_workers=None,
+      cache_path=None):
     """Initializes a dependency helper.
 
     Args:
       configuration_file (Optional[str]): path to the dependencies
           configuration file.
+      number_of_workers (Optional[int]): maximum number of Python modules
+          that are imported concurrently, where None represents the number
+          of CPUs.
+      cache_path (Optional[str]): path of the file in which the results of
+          the checks are cached, where None represents no cache.
     """
     super(DependencyHelper, self).__init__()
+    self._cache_environment = None
+    self._cache_path = cache_path
     self._dependencies = {}
+    self._distribution_paths = None
+    self._distributions = None
+    self._number_of_workers = number_of_workers
     self._test_dependencies = {}
+    self._top_level_distributions = None
 
     dependency_reader = DependencyDefinitionReader()
 
@@ -129,6 +232,111 @@ class DependencyHelper(object):
     dependency.version_property = '__version__'
     self._test_dependencies['mock'] = dependency
 
+  def _AddDistributionPath(self, match, path):
+    """Adds a distribution metadata path.
+
+    Args:
+      match (re.Match): match of the distribution path regular expression.
+      path (str): path of the distribution metadata directory.
+    """
+    name = self._GetDistributionName(match.group('name'))
+    version = match.group('version')
+
+    self._distributions.setdefault(name, (path, version))
+    self._distribution_paths.append((path, version))
+
+  def _CheckDependencyDefinitions(self, dependencies):
+    """Checks the availability of dependencies.
+
+    The Python modules are imported in separate processes concurrently,
+    since only importing a Python module proves that it is available, for
+    example that the shared library of a binding can be loaded.
+
+    Args:
+      dependencies (list[DependencyDefinition]): dependency definitions.
+
+    Returns:
+      list[tuple[DependencyDefinition, bool, str, float]]: dependency
+          definition, result, status message and duration of the check
+          in seconds, in the order of the dependency definitions.
+    """
+    # A frozen executable, such as created by PyInstaller, cannot run
+    # Python code in separate processes.
+    import_in_process = getattr(sys, 'frozen', False)
+
+    cache_entries = self._ReadCache()
+    fingerprints = {}
+
+    checks = []
+    results = {}
+    for dependency in dependencies:
+      start_time = time.time()
+
+      if dependency.name == 'sqlite3':
+        module_names = ['pysqlite2.dbapi2', 'sqlite3']
+      else:
+        module_names = [dependency.name]
+
+      if cache_entries is not None:
+        fingerprint = self._GetDependencyFingerprint(dependency, module_names)
+        fingerprints[dependency.name] = fingerprint
+
+        cache_entry = cache_entries.get(dependency.name, None)
+        if cache_entry and cache_entry.get('fingerprint', None) == fingerprint:
+          results[dependency.name] = (
+              cache_entry['result'], cache_entry['status_message'],
+              time.time() - start_time)
+          continue
+
+      if dependency.name == 'sqlite3':
+        version_property = 'sqlite_version'
+
+        if import_in_process:
+          result, status_message = self._CheckSQLite3()
+        else:
+          result, status_message = None, None
+
+      else:
+        version_property = dependency.version_property
+
+        if import_in_process:
+          result, status_message = self._CheckPythonModule(dependency)
+        else:
+          result, status_message = None, None
+
+      if result is None:
+        checks.append((dependency.name, module_names, version_property))
+      else:
+        results[dependency.name] = (
+            result, status_message, time.time() - start_time)
+
+    import_results = {}
+    if checks:
+      import_results = self._CheckPythonModulesInProcesses(checks)
+
+    check_results = []
+    for dependency in dependencies:
+      if dependency.name in results:
+        result, status_message, duration = results[dependency.name]
+
+      else:
+        import_result, duration = import_results[dependency.name]
+        result, status_message = self._GetImportScriptCheckResult(
+            dependency, import_result)
+
+      check_results.append((dependency, result, status_message, duration))
+
+      if cache_entries is not None:
+        cache_entries[dependency.name] = {
+            'fingerprint': fingerprints[dependency.name],
+            'result': result,
+            'status_message': status_message}
+
+    if cache_entries is not None:
+      self._WriteCache(cache_entries)
+
+    return check_results
+
   def _CheckPythonModule(self, dependency):
     """Checks the availability of a Python module.
 
@@ -154,6 +362,128 @@ class DependencyHelper(object):
         dependency.name, module_object, dependency.version_property,
         dependency.minimum_version, dependency.maximum_version)
 
+  def _CheckPythonModulesInProcesses(self, checks):
+    """Checks the availability of Python modules in separate processes.
+
+    The Python modules are imported by a few long-lived worker processes,
+    where every Python module is given _IMPORT_TIMEOUT seconds to import.
+    A worker process that does not import a Python module in time or that
+    terminates is replaced by a new worker process.
+
+    Args:
+      checks (list[tuple[str, list[str], str]]): checks to perform, with the
+          name of the check, the alternative names of the Python module and
+          the version attribute or function.
+
+    Returns:
+      dict[str, tuple[dict[str, str], float]]: result of the import and the
+          duration of the check in seconds, per name of the check. The result
+          contains "module_name" and "version" if the Python module could be
+          imported, "error" if the import failed or "timeout" if the import
+          did not finish in time.
+    """
+    # The modules are imported here, since they are only needed to check
+    # the dependencies and slow down the start of every tool otherwise.
+    import multiprocessing
+
+    try:
+      import queue
+    except ImportError:
+      import Queue as queue  # pylint: disable=import-error
+
+    number_of_workers = self._number_of_workers
+    if not number_of_workers:
+      number_of_workers = multiprocessing.cpu_count()
+
+    number_of_workers = min(number_of_workers, len(checks))
+
+    output_queue = queue.Queue()
+    pending_checks = list(reversed(checks))
+    results = {}
+
+    # The name of the check and the start time per worker process, where
+    # None represents a worker process that is waiting for a check.
+    workers = {}
+
+    with open(os.devnull, 'wb') as output_file:
+      try:
+        while pending_checks or workers:
+          while pending_checks and len(workers) < number_of_workers:
+            process = self._StartImportWorker(output_file, output_queue)
+            workers[process] = None
+
+          for process, check in list(workers.items()):
+            if check:
+              continue
+
+            if not pending_checks:
+              self._StopImportWorker(process)
+              del workers[process]
+              continue
+
+            name, module_names, version_property = pending_checks.pop()
+            request = json.dumps({
+                'module_names': module_names,
+                'version_property': version_property or ''})
+
+            try:
+              process.stdin.write('{0:s}\n'.format(request).encode('utf-8'))
+              process.stdin.flush()
+            except (IOError, OSError):
+              # The worker process terminated while waiting for a check.
+              pending_checks.append((name, module_names, version_property))
+              self._StopImportWorker(process, terminate=True)
+              del workers[process]
+              continue
+
+            workers[process] = (name, time.time())
+
+          if not workers:
+            continue
+
+          timeout = min(start_time for _, start_time in workers.values())
+          timeout += self._IMPORT_TIMEOUT - time.time()
+
+          try:
+            process, line = output_queue.get(timeout=max(timeout, 0.0))
+          except queue.Empty:
+            process, line = None, None
+
+          if workers.get(process, None):
+            name, start_time = workers[process]
+
+            if line is None:
+              # The worker process terminated, for example because
+              # the Python module terminated the process.
+              result = {'error': 'import terminated unexpectedly'}
+              self._StopImportWorker(process, terminate=True)
+              del workers[process]
+
+            else:
+              result = self._ParseImportScriptResult(line)
+              if result is not None:
+                workers[process] = None
+
+            if result is not None:
+              results[name] = (result, time.time() - start_time)
+
+          for process, check in list(workers.items()):
+            if not check:
+              continue
+
+            name, start_time = check
+            duration = time.time() - start_time
+            if duration >= self._IMPORT_TIMEOUT:
+              results[name] = ({'timeout': True}, duration)
+              self._StopImportWorker(process, terminate=True)
+              del workers[process]
+
+      finally:
+        for process in workers:
+          self._StopImportWorker(process, terminate=True)
+
+    return results
+
   def _CheckPythonModuleVersion(
       self, module_name, module_object, version_property, minimum_version,
       maximum_version):
@@ -182,6 +512,56 @@ class DependencyHelper(object):
       if version_method:
         module_version = version_method()
 
+    return self._CheckVersion(
+        module_name, module_version, minimum_version, maximum_version)
+
+  def _CheckSQLite3(self):
+    """Checks the availability of sqlite3.
+
+    Returns:
+      tuple: consists:
+
+        bool: True if the Python module is available and conforms to
+            the minimum required version, False otherwise.
+        str: status message.
+    """
+    # On Windows sqlite3 can be provided by both pysqlite2.dbapi2 and
+    # sqlite3. sqlite3 is provided with the Python installation and
+    # pysqlite2.dbapi2 by the pysqlite2 Python module. Typically
+    # pysqlite2.dbapi2 would contain a newer version of sqlite3, hence
+    # we check for its presence first.
+    module_name = 'pysqlite2.dbapi2'
+    minimum_version = '3.7.8'
+
+    module_object = self._ImportPythonModule(module_name)
+    if not module_object:
+      module_name = 'sqlite3'
+
+    module_object = self._ImportPythonModule(module_name)
+    if not module_object:
+      status_message = 'missing: {0:s}.'.format(module_name)
+      return False, status_message
+
+    return self._CheckPythonModuleVersion(
+        module_name, module_object, 'sqlite_version', minimum_version, None)
+
+  def _CheckVersion(
+      self, module_name, module_version, minimum_version, maximum_version):
+    """Checks the version of a Python module.
+
+    Args:
+      module_name (str): name of the Python module.
+      module_version (object): version of the Python module.
+      minimum_version (str): minimum version.
+      maximum_version (str): maximum version.
+
+    Returns:
+      tuple: consists:
+
+        bool: True if the Python module is available and conforms to
+            the minimum required version, False otherwise.
+        str: status message.
+    """
     if not module_version:
       status_message = (
           'unable to determine version information for: {0:s}').format(
@@ -240,8 +620,93 @@ class DependencyHelper(object):
     status_message = '{0:s} version: {1!s}'.format(module_name, module_version)
     return True, status_message
 
-  def _CheckSQLite3(self):
-    """Checks the availability of sqlite3.
+  def _FindPythonModule(self, module_name):
+    """Determines if a Python module can be found without importing it.
+
+    Args:
+      module_name (str): name of the Python module.
+
+    Returns:
+      bool: True if the top-level package of the Python module was found.
+    """
+    return self._GetPythonModulePath(module_name) is not None
+
+  def _GetDependencyFingerprint(self, dependency, module_names):
+    """Determines the fingerprint of a dependency in the environment.
+
+    The fingerprint consists of the dependency definition and the paths and
+    modification times of the Python modules and the distribution metadata,
+    such that installing, upgrading or removing the Python module changes
+    the fingerprint.
+
+    Args:
+      dependency (DependencyDefinition): dependency definition.
+      module_names (list[str]): alternative names of the Python module.
+
+    Returns:
+      dict[str, object]: fingerprint of the dependency.
+    """
+    modules = []
+    for module_name in module_names:
+      path = self._GetPythonModulePath(module_name)
+      modules.append([module_name, path, self._GetModificationTime(path)])
+
+    distribution_path, _ = self._GetDistribution(dependency)
+
+    return {
+        'definition': [
+            dependency.is_optional, dependency.maximum_version,
+            dependency.minimum_version, dependency.pypi_name,
+            dependency.version_property],
+        'distribution': [
+            distribution_path, self._GetModificationTime(distribution_path)],
+        'modules': modules}
+
+  def _GetDistribution(self, dependency):
+    """Retrieves the distribution that provides a dependency.
+
+    Args:
+      dependency (DependencyDefinition): dependency definition.
+
+    Returns:
+      tuple: consists:
+
+        str: path of the distribution metadata or None if not available.
+        str: version of the distribution or None if not available.
+    """
+    if self._distributions is None:
+      self._ReadDistributionPaths()
+
+    for name in (dependency.pypi_name, dependency.name):
+      if name:
+        distribution = self._distributions.get(
+            self._GetDistributionName(name), None)
+        if distribution:
+          return distribution
+
+    if self._top_level_distributions is None:
+      self._ReadTopLevelModuleNames()
+
+    module_name = dependency.name.split('.')[0]
+    return self._top_level_distributions.get(module_name, (None, None))
+
+  def _GetDistributionName(self, name):
+    """Normalizes the name of a distribution.
+
+    Args:
+      name (str): name of a distribution or Python module.
+
+    Returns:
+      str: normalized name, in lower case with "-" as separator.
+    """
+    return self._DISTRIBUTION_NAME_REGEX.sub('-', name).lower()
+
+  def _GetImportScriptCheckResult(self, dependency, import_result):
+    """Determines the check result of a Python module imported by the script.
+
+    Args:
+      dependency (DependencyDefinition): dependency definition.
+      import_result (dict[str, str]): result of the import script.
 
     Returns:
       tuple: consists:
@@ -250,25 +715,107 @@ class DependencyHelper(object):
             the minimum required version, False otherwise.
         str: status message.
     """
-    # On Windows sqlite3 can be provided by both pysqlite2.dbapi2 and
-    # sqlite3. sqlite3 is provided with the Python installation and
-    # pysqlite2.dbapi2 by the pysqlite2 Python module. Typically
-    # pysqlite2.dbapi2 would contain a newer version of sqlite3, hence
-    # we check for its presence first.
-    module_name = 'pysqlite2.dbapi2'
-    minimum_version = '3.7.8'
+    module_name = import_result.get('module_name', None)
+    if not module_name:
+      if import_result.get('timeout', False):
+        status_message = 'timeout importing: {0:s}'.format(dependency.name)
+      elif 'error' in import_result:
+        status_message = 'unable to import: {0:s} with error: {1:s}'.format(
+            dependency.name, import_result['error'])
+      else:
+        status_message = 'missing: {0:s}'.format(dependency.name)
+      return dependency.is_optional, status_message
 
-    module_object = self._ImportPythonModule(module_name)
-    if not module_object:
-      module_name = 'sqlite3'
+    module_version = import_result.get('version', None)
 
-    module_object = self._ImportPythonModule(module_name)
-    if not module_object:
-      status_message = 'missing: {0:s}.'.format(module_name)
-      return False, status_message
+    if dependency.name == 'sqlite3':
+      minimum_version = '3.7.8'
+    elif dependency.version_property and dependency.minimum_version:
+      minimum_version = dependency.minimum_version
+      if not module_version:
+        module_version = self._GetMetadataVersion(dependency)
+    else:
+      return True, dependency.name
 
-    return self._CheckPythonModuleVersion(
-        module_name, module_object, 'sqlite_version', minimum_version, None)
+    return self._CheckVersion(
+        module_name, module_version, minimum_version,
+        dependency.maximum_version)
+
+  def _GetMetadataVersion(self, dependency):
+    """Retrieves the version of a dependency from the distribution metadata.
+
+    The metadata is only used as the source of the version, since it does
+    not prove that the Python module can be imported.
+
+    Args:
+      dependency (DependencyDefinition): dependency definition.
+
+    Returns:
+      str: version of the distribution or None if not available.
+    """
+    if not self._FindPythonModule(dependency.name):
+      return
+
+    _, version = self._GetDistribution(dependency)
+    return version
+
+  def _GetModificationTime(self, path):
+    """Retrieves the modification time of a path.
+
+    Args:
+      path (str): path or None.
+
+    Returns:
+      float: modification time or None if not available.
+    """
+    if not path:
+      return
+
+    try:
+      return os.stat(path).st_mtime
+    except OSError:
+      return
+
+  def _GetPythonModulePath(self, module_name):
+    """Determines the path of a Python module without importing it.
+
+    Args:
+      module_name (str): name of the Python module.
+
+    Returns:
+      str: path of the top-level package or module, an empty string if
+          the Python module has no path, such as a built-in module, or None
+          if the Python module was not found.
+    """
+    # Note that finding a submodule would import the top-level package.
+    module_name = module_name.split('.')[0]
+
+    module_object = sys.modules.get(module_name, None)
+    if module_object:
+      return getattr(module_object, '__file__', None) or ''
+
+    if importlib_util:
+      try:
+        module_spec = importlib_util.find_spec(module_name)
+      except (ImportError, ValueError):
+        return
+
+      if not module_spec:
+        return
+
+      if not module_spec.has_location:
+        return ''
+
+      return module_spec.origin
+
+    try:
+      file_object, path, _ = imp.find_module(module_name)
+    except ImportError:
+      return
+
+    if file_object:
+      file_object.close()
+    return path or ''
 
   def _ImportPythonModule(self, module_name):
     """Imports a Python module.
@@ -291,8 +838,28 @@ class DependencyHelper(object):
 
     return module_object
 
+  def _ParseImportScriptResult(self, line):
+    """Parses a line of output of the import script.
+
+    Args:
+      line (bytes): line of output of the import script.
+
+    Returns:
+      dict[str, str]: result of the import script or None if the line
+          does not contain a result.
+    """
+    line = line.decode('utf-8', 'replace').strip()
+    if not line.startswith(self._IMPORT_SCRIPT_RESULT_PREFIX):
+      return None
+
+    try:
+      return json.loads(line[len(self._IMPORT_SCRIPT_RESULT_PREFIX):])
+    except ValueError:
+      return {'error': 'unsupported import result'}
+
   def _PrintCheckDependencyStatus(
-      self, dependency, result, status_message, verbose_output=True):
+      self, dependency, result, status_message, verbose_output=True,
+      duration=None):
     """Prints the check dependency status.
 
     Args:
@@ -300,7 +867,13 @@ class DependencyHelper(object):
       result (bool): True if the Python module is available and conforms to
             the minimum required version, False otherwise.
       status_message (str): status message.
+      verbose_output (Optional[bool]): True if output should be verbose.
+      duration (Optional[float]): duration of the check in seconds, which is
+          only printed if output is verbose.
     """
+    if verbose_output and duration is not None:
+      status_message = '{0:s} ({1:.3f}s)'.format(status_message, duration)
+
     if not result or dependency.is_optional:
       if dependency.is_optional:
         status_indicator = '[OPTIONAL]'
@@ -312,6 +885,196 @@ class DependencyHelper(object):
     elif verbose_output:
       print('[OK]\t\t{0:s}'.format(status_message))
 
+  def _ReadCache(self):
+    """Reads the cached results of the checks.
+
+    The cached results are only used if the cache was written by the same
+    Python interpreter with the same Python module search path.
+
+    Returns:
+      dict[str, dict[str, object]]: cache entries per name of the dependency,
+          or None if there is no cache.
+    """
+    if not self._cache_path:
+      return
+
+    environment = {
+        'executable': sys.executable,
+        'path': list(sys.path),
+        'version': sys.version}
+
+    self._cache_environment = environment
+
+    try:
+      with io.open(self._cache_path, 'r', encoding='utf-8') as file_object:
+        json_dict = json.load(file_object)
+    except (IOError, OSError, ValueError):
+      return {}
+
+    if (json_dict.get('format_version', None) != self._CACHE_FORMAT_VERSION or
+        json_dict.get('environment', None) != environment):
+      return {}
+
+    return json_dict.get('dependencies', None) or {}
+
+  def _ReadDistributionPaths(self):
+    """Reads the names and versions of the installed distributions.
+
+    The names and versions are determined from the names of the distribution
+    metadata directories and eggs on the Python module search path.
+    """
+    self._distribution_paths = []
+    self._distributions = {}
+
+    for path in sys.path:
+      path = path or '.'
+
+      match = self._DISTRIBUTION_PATH_REGEX.match(os.path.basename(path))
+      if match:
+        self._AddDistributionPath(
+            match, os.path.join(path, 'EGG-INFO'))
+
+      if not os.path.isdir(path):
+        continue
+
+      try:
+        filenames = os.listdir(path)
+      except OSError:
+        continue
+
+      for filename in filenames:
+        match = self._DISTRIBUTION_PATH_REGEX.match(filename)
+        if match:
+          self._AddDistributionPath(match, os.path.join(path, filename))
+
+  def _ReadImportWorkerOutput(self, process, output_queue):
+    """Reads the output of an import worker process.
+
+    Args:
+      process (subprocess.Popen): import worker process.
+      output_queue (Queue): queue to which the lines of output are added as
+          a tuple of the process and the line, where None represents that
+          the process terminated.
+    """
+    for line in iter(process.stdout.readline, b''):
+      output_queue.put((process, line))
+
+    process.stdout.close()
+    output_queue.put((process, None))
+
+  def _ReadTopLevelModuleNames(self):
+    """Reads the names of the top-level modules of the distributions."""
+    if self._distribution_paths is None:
+      self._ReadDistributionPaths()
+
+    self._top_level_distributions = {}
+    for distribution_path, version in self._distribution_paths:
+      path = os.path.join(distribution_path, 'top_level.txt')
+      if not os.path.isfile(path):
+        continue
+
+      try:
+        with io.open(path, 'r', encoding='utf-8') as file_object:
+          module_names = file_object.read().split()
+      except (IOError, UnicodeDecodeError):
+        continue
+
+      for module_name in module_names:
+        self._top_level_distributions.setdefault(
+            module_name, (distribution_path, version))
+
+  def _StartImportWorker(self, output_file, output_queue):
+    """Starts an import worker process.
+
+    Args:
+      output_file (file): file-like object to which the output of
+          the imported Python modules is written.
+      output_queue (Queue): queue to which the lines of output of the import
+          script are added.
+
+    Returns:
+      subprocess.Popen: import worker process.
+    """
+    import subprocess
+    import threading
+
+    command = [sys.executable, '-c', self._IMPORT_SCRIPT, json.dumps(sys.path)]
+
+    # The pipes of the other worker processes should not be inherited,
+    # since a worker process stops when its stdin is closed.
+    process = subprocess.Popen(
+        command, close_fds=(os.name != 'nt'), stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE, stderr=output_file)
+
+    # The output is read by a thread, since reading from a pipe with a
+    # timeout is not supported on all platforms.
+    thread = threading.Thread(
+        target=self._ReadImportWorkerOutput, args=(process, output_queue))
+    thread.daemon = True
+    thread.start()
+
+    return process
+
+  def _StopImportWorker(self, process, terminate=False):
+    """Stops an import worker process.
+
+    Args:
+      process (subprocess.Popen): import worker process.
+      terminate (Optional[bool]): True if the worker process should be
+          terminated instead of waiting for it to stop.
+    """
+    try:
+      process.stdin.close()
+    except (IOError, OSError):
+      pass
+
+    if terminate and process.poll() is None:
+      try:
+        process.kill()
+      except OSError:
+        pass
+
+    process.wait()
+
+  def _WriteCache(self, cache_entries):
+    """Writes the results of the checks to the cache.
+
+    Args:
+      cache_entries (dict[str, dict[str, object]]): cache entries per name of
+          the dependency.
+    """
+    json_dict = {
+        'dependencies': cache_entries,
+        'environment': self._cache_environment,
+        'format_version': self._CACHE_FORMAT_VERSION}
+
+    json_string = json.dumps(
+        json_dict, indent=2, separators=(',', ': '), sort_keys=True)
+
+    # Note that json.dumps returns a byte string on Python 2.
+    if isinstance(json_string, bytes):
+      json_string = json_string.decode('utf-8')
+
+    # The cache is written to a temporary file first, such that concurrent
+    # checks never read a partially written cache.
+    temporary_path = '{0:s}.{1:d}'.format(self._cache_path, os.getpid())
+    try:
+      with io.open(temporary_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(json_string)
+
+      try:
+        os.rename(temporary_path, self._cache_path)
+      except OSError:
+        # On Windows rename fails if the destination exists.
+        os.remove(self._cache_path)
+        os.rename(temporary_path, self._cache_path)
+
+    except (IOError, OSError):
+      # The cache is an optimization, hence a cache that cannot be written
+      # should not fail the checks.
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
   def CheckDependencies(self, verbose_output=True):
     """Checks the availability of the dependencies.
 
@@ -324,17 +1087,16 @@ class DependencyHelper(object):
     print('Checking availability and versions of dependencies.')
     check_result = True
 
-    for module_name, dependency in sorted(self._dependencies.items()):
-      if module_name == 'sqlite3':
-        result, status_message = self._CheckSQLite3()
-      else:
-        result, status_message = self._CheckPythonModule(dependency)
-
+    dependencies = [
+        dependency for _, dependency in sorted(self._dependencies.items())]
+    for dependency, result, status_message, duration in (
+        self._CheckDependencyDefinitions(dependencies)):
       if not result:
         check_result = False
 
       self._PrintCheckDependencyStatus(
-          dependency, result, status_message, verbose_output=verbose_output)
+          dependency, result, status_message, verbose_output=verbose_output,
+          duration=duration)
 
     if check_result and not verbose_output:
       print('[OK]')
@@ -357,15 +1119,17 @@ class DependencyHelper(object):
     print('Checking availability and versions of test dependencies.')
     check_result = True
 
-    for dependency in sorted(
+    dependencies = sorted(
         self._test_dependencies.values(),
-        key=lambda dependency: dependency.name):
-      result, status_message = self._CheckPythonModule(dependency)
+        key=lambda dependency: dependency.name)
+    for dependency, result, status_message, duration in (
+        self._CheckDependencyDefinitions(dependencies)):
       if not result:
         check_result = False
 
       self._PrintCheckDependencyStatus(
-          dependency, result, status_message, verbose_output=verbose_output)
+          dependency, result, status_message, verbose_output=verbose_output,
+          duration=duration)
 
     if check_result and not verbose_output:
       print('[OK]')
@@ -9,22 +9,16 @@ import json
 import logging
 import os
 import re
-import sys
-
-# pylint: disable=import-error,no-name-in-module
-if sys.version_info[0] < 3:
-  import urllib2 as urllib_error
-  import urllib2 as urllib_request
-else:
-  import urllib.error as urllib_error
-  import urllib.request as urllib_request
+import shutil
+import time
 
 try:
   import ConfigParser as configparser
 except ImportError:
   import configparser  # pylint: disable=import-error
 
-import pkg_resources  # pylint: disable=wrong-import-position
+from l2tdevtools import json_file
+from l2tdevtools import url_opener
 
 
 class DownloadHelper(object):
@@ -37,8 +31,10 @@ class DownloadHelper(object):
       download_url (str): download URL.
     """
     super(DownloadHelper, self).__init__()
-    self._cached_url = ''
-    self._cached_page_content = b''
+    # The URL and content of the last downloaded page are stored as a single
+    # tuple, such that the page content can be downloaded from multiple
+    # threads.
+    self._cached_page = ('', b'')
     self._download_url = download_url
 
   def DownloadFile(self, download_url):
@@ -58,15 +54,8 @@ class DownloadHelper(object):
     if not os.path.exists(filename):
       logging.info('Downloading: {0:s}'.format(download_url))
 
-      try:
-        url_object = urllib_request.urlopen(download_url)
-      except urllib_error.URLError as exception:
-        logging.warning(
-            'Unable to download URL: {0:s} with error: {1:s}'.format(
-                download_url, exception))
-        return
-
-      if url_object.code != 200:
+      url_object = url_opener.GetURLOpener().Open(download_url)
+      if not url_object or url_object.code != 200:
         return
 
       file_object = open(filename, 'wb')
@@ -87,22 +76,16 @@ class DownloadHelper(object):
     if not download_url:
       return
 
-    if self._cached_url != download_url:
-      try:
-        url_object = urllib_request.urlopen(download_url)
-      except urllib_error.URLError as exception:
-        logging.warning(
-            'Unable to download URL: {0:s} with error: {1:s}'.format(
-                download_url, exception))
-        return
-
-      if url_object.code != 200:
+    cached_url, page_content = self._cached_page
+    if cached_url != download_url:
+      url_object = url_opener.GetURLOpener().Open(download_url)
+      if not url_object or url_object.code != 200:
         return
 
-      self._cached_page_content = url_object.read()
-      self._cached_url = download_url
+      page_content = url_object.read()
+      self._cached_page = (download_url, page_content)
 
-    return self._cached_page_content
+    return page_content
 
 
 class ProjectDownloadHelper(DownloadHelper):
@@ -192,11 +175,14 @@ class GitHubReleasesDownloadHelper(ProjectDownloadHelper):
       'v[0-9]+[.][0-9]+[.][0-9]+',
       '[0-9]+[.][0-9]+[.][0-9]+[-][0-9]+']
 
-  def __init__(self, download_url):
+  def __init__(self, download_url, page_cache=None):
     """Initializes the download helper.
 
     Args:
       download_url (str): download URL.
+      page_cache (Optional[dict[str, bytes]]): page contents per URL, that
+          can be shared with other download helpers, or None if only the
+          last downloaded page is cached.
 
     Raises:
       ValueError: if download URL is not supported.
@@ -207,8 +193,31 @@ class GitHubReleasesDownloadHelper(ProjectDownloadHelper):
 
     super(GitHubReleasesDownloadHelper, self).__init__(download_url)
     self._organization = url_segments[3]
+    self._page_cache = page_cache
     self._repository = url_segments[4]
 
+  def DownloadPageContent(self, download_url):
+    """Downloads the page content from the URL and caches it.
+
+    Args:
+      download_url (str): URL where to download the page content.
+
+    Returns:
+      str: page content if successful, None otherwise.
+    """
+    if self._page_cache is None:
+      return super(GitHubReleasesDownloadHelper, self).DownloadPageContent(
+          download_url)
+
+    page_content = self._page_cache.get(download_url, None)
+    if page_content is None:
+      page_content = super(
+          GitHubReleasesDownloadHelper, self).DownloadPageContent(download_url)
+      if page_content:
+        self._page_cache[download_url] = page_content
+
+    return page_content
+
   def GetLatestVersion(self, project_name, version_definition):
     """Retrieves the latest version number for a given project name.
 
@@ -402,10 +411,159 @@ class GitHubReleasesDownloadHelper(ProjectDownloadHelper):
         self._organization, self._repository)
 
 
+class LibyalProjectConfigurationIndex(object):
+  """Index of the download URLs from the libyal project configurations.
+
+  The index maps the name of a libyal project to the download URL defined
+  in its project configuration, together with the ETag and Last-Modified
+  values of the project configuration, such that an expired entry can be
+  revalidated with a conditional request.
+  """
+
+  _FORMAT_VERSION = 1
+
+  def __init__(self, path=None, time_to_live=86400):
+    """Initializes a libyal project configuration index.
+
+    Args:
+      path (Optional[str]): path of the index file, where None represents
+          an index that is not persisted.
+      time_to_live (Optional[int]): number of seconds an entry is used without
+          revalidation.
+    """
+    super(LibyalProjectConfigurationIndex, self).__init__()
+    self._entries = {}
+    self._path = path
+    self._time_to_live = time_to_live
+
+  def GetEntry(self, project_name):
+    """Retrieves an entry.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      dict[str, object]: entry, with the values "download_url", "etag",
+          "last_modified" and "timestamp", or None if not available.
+    """
+    return self._entries.get(project_name, None)
+
+  def IsExpired(self, entry):
+    """Determines if an entry has expired and needs to be revalidated.
+
+    Args:
+      entry (dict[str, object]): entry.
+
+    Returns:
+      bool: True if the entry has expired.
+    """
+    timestamp = entry.get('timestamp', None) or 0
+    return time.time() - timestamp > self._time_to_live
+
+  def Read(self):
+    """Reads the index file.
+
+    Returns:
+      bool: True if the index file was read or False if the index is not
+          persisted, or the index file does not exist or is invalid.
+    """
+    if not self._path or not os.path.exists(self._path):
+      return False
+
+    with io.open(self._path, 'r', encoding='utf-8') as file_object:
+      try:
+        json_dict = json.load(file_object)
+      except ValueError as exception:
+        logging.warning((
+            'Unable to read libyal project index: {0:s} with error: '
+            '{1!s}').format(self._path, exception))
+        return False
+
+    if json_dict.get('format_version', None) != self._FORMAT_VERSION:
+      return False
+
+    self._entries = json_dict.get('projects', {})
+    return True
+
+  def Merge(self, project_configuration_index):
+    """Merges the entries of another index, such as of a worker process.
+
+    The most recently validated entry of a project is kept.
+
+    Args:
+      project_configuration_index (LibyalProjectConfigurationIndex): index
+          to merge.
+    """
+    # pylint: disable=protected-access
+    for project_name, entry in project_configuration_index._entries.items():
+      existing_entry = self._entries.get(project_name, None)
+      if existing_entry and (
+          (existing_entry.get('timestamp', None) or 0) >=
+          (entry.get('timestamp', None) or 0)):
+        continue
+
+      self._entries[project_name] = entry
+
+  def SetEntry(self, project_name, download_url, etag, last_modified):
+    """Sets an entry.
+
+    Args:
+      project_name (str): name of the project.
+      download_url (str): download URL defined in the project configuration.
+      etag (str): ETag of the project configuration or None if not available.
+      last_modified (str): Last-Modified of the project configuration or None
+          if not available.
+    """
+    self._entries[project_name] = {
+        'download_url': download_url,
+        'etag': etag,
+        'last_modified': last_modified,
+        'timestamp': time.time()}
+
+  def Touch(self, entry):
+    """Marks an entry as revalidated.
+
+    Args:
+      entry (dict[str, object]): entry.
+    """
+    entry['timestamp'] = time.time()
+
+  def Write(self):
+    """Writes the index file, if the index is persisted.
+
+    The index is not written by the download helpers, such that it is
+    written once by the owner of the index, at the end of a run.
+    """
+    if not self._path:
+      return
+
+    json_dict = {
+        'format_version': self._FORMAT_VERSION,
+        'projects': self._entries}
+
+    try:
+      json_file.WriteFile(self._path, json_dict)
+    except (IOError, OSError) as exception:
+      logging.warning((
+          'Unable to write libyal project index: {0:s} with error: '
+          '{1!s}').format(self._path, exception))
+
+
 # TODO: Merge with GitHubReleasesDownloadHelper.
 # pylint: disable=abstract-method
 class LibyalGitHubDownloadHelper(ProjectDownloadHelper):
-  """Helps in downloading a libyal GitHub project."""
+  """Helps in downloading a libyal GitHub project.
+
+  The download URLs from the libyal project configurations are kept in an
+  index that is shared by all libyal download helpers, and so are the
+  releases pages, such that the project configuration and the releases page
+  of a project are retrieved only once, also if multiple download helpers
+  are created for the project.
+  """
+
+  _page_cache = {}
+
+  _project_configuration_index = None
 
   def __init__(self, download_url):
     """Initializes the download helper.
@@ -416,6 +574,45 @@ class LibyalGitHubDownloadHelper(ProjectDownloadHelper):
     super(LibyalGitHubDownloadHelper, self).__init__(download_url)
     self._download_helper = None
 
+  @classmethod
+  def _GetGitHubDownloadHelper(cls, download_url):
+    """Retrieves a GitHub releases download helper.
+
+    Args:
+      download_url (str): download URL.
+
+    Returns:
+      GitHubReleasesDownloadHelper: download helper, that shares the page
+          contents with the other libyal download helpers.
+    """
+    return GitHubReleasesDownloadHelper(
+        download_url, page_cache=cls._page_cache)
+
+  @classmethod
+  def _GetProjectConfigurationIndex(cls):
+    """Retrieves the project configuration index.
+
+    Returns:
+      LibyalProjectConfigurationIndex: project configuration index.
+    """
+    if not cls._project_configuration_index:
+      cls._project_configuration_index = LibyalProjectConfigurationIndex()
+
+    return cls._project_configuration_index
+
+  @classmethod
+  def SetProjectConfigurationIndex(cls, project_configuration_index):
+    """Sets the project configuration index.
+
+    This also resets the releases pages shared by the download helpers.
+
+    Args:
+      project_configuration_index (LibyalProjectConfigurationIndex): project
+          configuration index or None to use an index that is not persisted.
+    """
+    cls._page_cache = {}
+    cls._project_configuration_index = project_configuration_index
+
   def GetProjectConfigurationSourcePackageURL(self, project_name):
     """Retrieves the source package URL from the libyal project configuration.
 
@@ -425,20 +622,51 @@ class LibyalGitHubDownloadHelper(ProjectDownloadHelper):
     Returns:
       str: source package URL or None on error.
     """
+    project_configuration_index = self._GetProjectConfigurationIndex()
+
+    entry = project_configuration_index.GetEntry(project_name)
+    if entry and not project_configuration_index.IsExpired(entry):
+      return entry['download_url']
+
+    headers = {}
+    if entry and entry.get('etag', None):
+      headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified', None):
+      headers['If-Modified-Since'] = entry['last_modified']
+
     download_url = (
         'https://raw.githubusercontent.com/libyal/{0:s}/master/'
         '{0:s}.ini').format(project_name)
 
-    page_content = self.DownloadPageContent(download_url)
-    if not page_content:
+    url_object = url_opener.GetURLOpener().Open(
+        download_url, headers=headers or None)
+
+    if entry and url_object and url_object.code == 304:
+      project_configuration_index.Touch(entry)
+      return entry['download_url']
+
+    if not url_object or url_object.code != 200:
+      if entry:
+        logging.warning((
+            'Unable to revalidate project configuration of: {0:s}, using '
+            'previous download URL.').format(project_name))
+        return entry['download_url']
       return
 
     config_parser = configparser.RawConfigParser()
     # pylint: disable=deprecated-method
     # TODO: replace readfp by read_file, check if Python 2 compatible
-    config_parser.readfp(io.BytesIO(page_content))
+    config_parser.readfp(io.BytesIO(url_object.read()))
+
+    source_package_url = json.loads(
+        config_parser.get('project', 'download_url'))
+
+    project_configuration_index.SetEntry(
+        project_name, source_package_url,
+        url_object.headers.get('etag', None),
+        url_object.headers.get('last-modified', None))
 
-    return json.loads(config_parser.get('project', 'download_url'))
+    return source_package_url
 
   def GetLatestVersion(self, project_name, version_definition):
     """Retrieves the latest version number for a given project name.
@@ -456,7 +684,7 @@ class LibyalGitHubDownloadHelper(ProjectDownloadHelper):
       if not download_url:
         return
 
-      self._download_helper = GitHubReleasesDownloadHelper(download_url)
+      self._download_helper = self._GetGitHubDownloadHelper(download_url)
 
     return self._download_helper.GetLatestVersion(
         project_name, version_definition)
@@ -478,7 +706,7 @@ class LibyalGitHubDownloadHelper(ProjectDownloadHelper):
       if not download_url:
         return 0
 
-      self._download_helper = GitHubReleasesDownloadHelper(download_url)
+      self._download_helper = self._GetGitHubDownloadHelper(download_url)
 
     return self._download_helper.GetDownloadURL(project_name, project_version)
 
@@ -503,6 +731,36 @@ class PyPIDownloadHelper(ProjectDownloadHelper):
     super(PyPIDownloadHelper, self).__init__(download_url)
     self._project_name = url_segments[4]
 
+  def _GetVersionKey(self, version_string):
+    """Retrieves a key to compare a version string.
+
+    The version strings matched on the PyPI page only consist of numeric
+    parts separated by dots and an optional PEP440 epoch, such as "1!".
+    Comparing the numeric parts directly removes the need for pkg_resources,
+    which is expensive to import.
+
+    Args:
+      version_string (str): version string, such as "1!2.0.1".
+
+    Returns:
+      tuple[int, tuple[int]]: epoch and numeric release parts, where trailing
+          zero parts are stripped, such that "1.0" and "1.0.0" compare equal.
+    """
+    epoch, _, epoch_version_string = version_string.partition('!')
+    if not epoch_version_string:
+      # Per PEP440, if there's no epoch specified, the epoch is 0.
+      epoch_version_string = epoch
+      epoch = 0
+    else:
+      epoch = int(epoch, 10)
+
+    release = [
+        int(part, 10) for part in epoch_version_string.split('.') if part]
+    while release and release[-1] == 0:
+      release.pop()
+
+    return epoch, tuple(release)
+
   def GetLatestVersion(self, unused_project_name, version_definition):
     """Retrieves the latest version number for a given project name.
 
@@ -528,25 +786,13 @@ class PyPIDownloadHelper(ProjectDownloadHelper):
 
     versions = {}
     expression_string = (
-        r'../../packages/.*/{0:s}-(?P<version>[\d\.\!]*)'
+        r'../../packages/.*/{0:s}-(?P<version>(\d+!)?\d+(\.\d+)*)'
         r'\.(tar\.bz2|tar\.gz|zip)#').format(self._project_name)
     for match in re.finditer(expression_string, page_content):
       version_string = match.group('version')
       if version_string:
-        # We need to support PEP440 epoch versioning, which only newly versions
-        # of setuptools support. So this is a bit of hack to handle epochs
-        # but still use setuptools to handle most of the version matching.
-        epoch, _, epoch_version_string = version_string.partition('!')
-        if not epoch_version_string:
-          # Per PEP440, if there's no epoch specified, the epoch is 0.
-          epoch_version_string = epoch
-          epoch = 0
-        else:
-          epoch = int(epoch, 10)
-        version = list(pkg_resources.parse_version(epoch_version_string))
-        # Add the epoch to the version string for comparison.
-        version.insert(0, epoch)
-        version_tuple = (tuple(version), version_string)
+        version_tuple = (
+            self._GetVersionKey(version_string), version_string)
         versions[version_tuple] = version_string
 
     latest_version = max(versions.keys())
@@ -597,6 +843,106 @@ class PyPIDownloadHelper(ProjectDownloadHelper):
     return 'org.python.pypi.{0:s}'.format(self._project_name)
 
 
+class SourceMirrorDownloadHelper(ProjectDownloadHelper):
+  """Helps in downloading a project from a source mirror.
+
+  The version, download URL and project identifier are looked up in
+  the manifest of the source mirror, hence no network access is needed.
+  """
+
+  def __init__(self, download_url, source_mirror):
+    """Initializes the download helper.
+
+    Args:
+      download_url (str): download URL.
+      source_mirror (SourceMirror): source mirror.
+
+    Raises:
+      ValueError: if download URL is not available in the source mirror.
+    """
+    source_package_entry = source_mirror.GetEntryByDownloadURL(download_url)
+    if not source_package_entry:
+      raise ValueError('Download URL not available in source mirror.')
+
+    super(SourceMirrorDownloadHelper, self).__init__(download_url)
+    self._project_name = source_package_entry.project_name
+    self._source_mirror = source_mirror
+    self._source_package_entry = source_package_entry
+
+  def Download(self, project_name, project_version):
+    """Downloads the project for a given project name and version.
+
+    The source package is copied from the source mirror into the current
+    working directory, unless it is already present.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    Returns:
+      str: filename if successful also if the file was already downloaded
+          or None on error.
+    """
+    if project_version != self._source_package_entry.project_version:
+      logging.warning((
+          'Version: {0!s} of: {1:s} not available in source mirror.').format(
+              project_version, project_name))
+      return
+
+    filename = self._source_package_entry.filename
+    source_path = self._source_mirror.GetSourcePackagePath(
+        self._source_package_entry)
+
+    if not os.path.exists(filename):
+      if not self._source_mirror.VerifySourcePackage(
+          self._source_package_entry):
+        logging.warning(
+            'Source package: {0:s} in source mirror is corrupted.'.format(
+                source_path))
+        return
+
+      logging.info('Copying: {0:s}'.format(source_path))
+      shutil.copyfile(source_path, filename)
+
+    return filename
+
+  def GetDownloadURL(self, project_name, project_version):
+    """Retrieves the download URL for a given project name and version.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    Returns:
+      str: download URL of the project or None on error.
+    """
+    if project_version != self._source_package_entry.project_version:
+      return
+
+    return self._source_package_entry.source_url
+
+  def GetLatestVersion(self, unused_project_name, unused_version_definition):
+    """Retrieves the latest version number for a given project name.
+
+    Args:
+      project_name (str): name of the project.
+      version_definition (ProjectVersionDefinition): project version definition
+          or None.
+
+    Returns:
+      str: latest version number or None on error.
+    """
+    return self._source_package_entry.project_version
+
+  def GetProjectIdentifier(self):
+    """Retrieves the project identifier for a given project name.
+
+    Returns:
+      str: project identifier.
+    """
+    return self._source_package_entry.project_identifier
+
+
 class SourceForgeDownloadHelper(ProjectDownloadHelper):
   """Helps in downloading a Source Forge project."""
 
@@ -801,15 +1147,24 @@ class DownloadHelperFactory(object):
   """Factory class for download helpers."""
 
   @classmethod
-  def NewDownloadHelper(cls, download_url):
+  def NewDownloadHelper(cls, download_url, source_mirror=None):
     """Creates a new download helper.
 
     Args:
       download_url (str): download URL.
+      source_mirror (Optional[SourceMirror]): source mirror, where None
+          represents no source mirror. If a source mirror is provided,
+          the download helper is backed by the source mirror.
 
     Returns:
       DownloadHelper: download helper or None.
     """
+    if source_mirror:
+      if not source_mirror.GetEntryByDownloadURL(download_url):
+        return
+
+      return SourceMirrorDownloadHelper(download_url, source_mirror)
+
     if download_url.endswith('/'):
       download_url = download_url[:-1]
 
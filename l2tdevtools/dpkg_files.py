@@ -5,7 +5,6 @@ from __future__ import unicode_literals
 
 import logging
 import os
-import shutil
 import stat
 import time
 
@@ -261,6 +260,10 @@ class DPKGBuildFilesGenerator(object):
       '3.0 (quilt)',
       ''])
 
+  # Cache of the decoded template files, which is shared by all generators
+  # in a process. The key is the path of the template file.
+  _template_files_cache = {}
+
   def __init__(
       self, project_name, project_version, project_definition, data_path,
       distribution='unstable'):
@@ -275,8 +278,10 @@ class DPKGBuildFilesGenerator(object):
       distribution (Optional[str]): name of the distribution.
     """
     super(DPKGBuildFilesGenerator, self).__init__()
+    self._changed_files = set()
     self._data_path = data_path
     self._distribution = distribution
+    self._generated_files = set()
     self._project_definition = project_definition
     self._project_name = project_name
     self._project_version = project_version
@@ -293,20 +298,12 @@ class DPKGBuildFilesGenerator(object):
       output_filename (str): name of the resulting file.
     """
     if template_filename:
-      template_file_path = os.path.join(
-          self._data_path, 'dpkg_templates', template_filename)
-      with open(template_file_path, 'rb') as file_object:
-        template_data = file_object.read()
-
-      template_data = template_data.decode('utf-8')
+      template_data = self._ReadTemplateFile(template_filename)
 
     if template_values:
       template_data = template_data.format(**template_values)
 
-    template_data = template_data.encode('utf-8')
-
-    with open(output_filename, 'wb') as file_object:
-      file_object.write(template_data)
+    self._WriteFile(output_filename, template_data.encode('utf-8'))
 
   def _GenerateChangelogFile(self, dpkg_path):
     """Generates the dpkg build changelog file.
@@ -337,9 +334,24 @@ class DPKGBuildFilesGenerator(object):
         'project_version': self._project_version,
         'source_package_name': source_package_name}
 
+    data = self._CHANGELOG_TEMPLATE.format(**template_values)
+    data = data.encode('utf-8')
+
+    # The date and time of the changelog trailer changes every time the file
+    # is generated, hence an otherwise identical changelog is kept.
     output_filename = os.path.join(dpkg_path, 'changelog')
-    self._GenerateFile(
-        None, self._CHANGELOG_TEMPLATE, template_values, output_filename)
+    existing_data = self._ReadFile(output_filename)
+    if existing_data is not None:
+      existing_lines = [
+          line for line in existing_data.split(b'\n')
+          if not line.startswith(b' -- ')]
+      lines = [line for line in data.split(b'\n')
+               if not line.startswith(b' -- ')]
+      if existing_lines == lines:
+        self._generated_files.add(output_filename)
+        return
+
+    self._WriteFile(output_filename, data)
 
   def _GenerateCleanFile(self, dpkg_path):
     """Generates the dpkg build clean file.
@@ -503,15 +515,13 @@ class DPKGBuildFilesGenerator(object):
         license_file, 'data', 'licenses', 'LICENSE.{0:s}'.format(
             self._project_name))
 
-    filename = os.path.join(dpkg_path, 'copyright')
-
-    if os.path.exists(license_file):
-      shutil.copy(license_file, filename)
-
-    else:
+    data = self._ReadFile(license_file)
+    if data is None:
       logging.warning('Missing license file: {0:s}'.format(license_file))
-      with open(filename, 'wb') as file_object:
-        file_object.write('\n')
+      data = b'\n'
+
+    output_filename = os.path.join(dpkg_path, 'copyright')
+    self._WriteFile(output_filename, data)
 
   def _GenerateInstallFiles(self, dpkg_path):
     """Generates the dpkg build .install files.
@@ -579,7 +589,9 @@ class DPKGBuildFilesGenerator(object):
 
     filename = os.path.join(dpkg_path, 'rules')
     stat_info = os.stat(filename)
-    os.chmod(filename, stat_info.st_mode | stat.S_IEXEC)
+    if not stat_info.st_mode & stat.S_IEXEC:
+      os.chmod(filename, stat_info.st_mode | stat.S_IEXEC)
+      self._changed_files.add(filename)
 
   def _GenerateConfigureMakeRulesFile(self, dpkg_path):
     """Generates the dpkg build rules file.
@@ -651,24 +663,17 @@ class DPKGBuildFilesGenerator(object):
     else:
       rules_template = self._RULES_TEMPLATE_SETUP_PY
 
-    # TODO: replace manual write of rules file by call to _GenerateFile.
     template_filename = self._project_definition.dpkg_template_rules
     if template_filename:
-      template_file_path = os.path.join(
-          self._data_path, 'dpkg_templates', template_filename)
-      with open(template_file_path, 'rb') as file_object:
-        rules_template = file_object.read()
+      rules_template = self._ReadTemplateFile(template_filename)
 
-      rules_template = rules_template.decode('utf-8')
+    # Note that the override does not contain template values.
+    if package_name in ('astroid', 'pylint'):
+      rules_template = ''.join([
+          rules_template, self._RULES_SETUP_PY_PYTHON2_OVERRIDE])
 
     output_filename = os.path.join(dpkg_path, 'rules')
-    with open(output_filename, 'wb') as file_object:
-      data = rules_template.format(**template_values)
-      file_object.write(data.encode('utf-8'))
-
-      if package_name in ('astroid', 'pylint'):
-        data = self._RULES_SETUP_PY_PYTHON2_OVERRIDE
-        file_object.write(data.encode('utf-8'))
+    self._GenerateFile(None, rules_template, template_values, output_filename)
 
   def _GenerateSourceFormatFile(self, dpkg_path):
     """Generates the dpkg build source/format file.
@@ -761,6 +766,97 @@ class DPKGBuildFilesGenerator(object):
 
     return self._project_name
 
+  def _ReadFile(self, path):
+    """Reads the data of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      bytes: data of the file or None if the file does not exist.
+    """
+    if not os.path.isfile(path):
+      return
+
+    with open(path, 'rb') as file_object:
+      return file_object.read()
+
+  def _ReadTemplateFile(self, template_filename):
+    """Reads a template file.
+
+    The template file is only read and decoded the first time it is used,
+    subsequent reads are served from the template files cache.
+
+    Args:
+      template_filename (str): template filename.
+
+    Returns:
+      str: template data.
+    """
+    template_file_path = os.path.join(
+        self._data_path, 'dpkg_templates', template_filename)
+
+    template_data = self._template_files_cache.get(template_file_path, None)
+    if template_data is None:
+      with open(template_file_path, 'rb') as file_object:
+        template_data = file_object.read()
+
+      template_data = template_data.decode('utf-8')
+      self._template_files_cache[template_file_path] = template_data
+
+    return template_data
+
+  def _RemoveStaleFiles(self, dpkg_path):
+    """Removes files and directories that were not generated.
+
+    Stale files, such as a patch that was dropped from the project definition
+    or an .install file of a renamed package, would otherwise remain part of
+    the dpkg build files. Note that this also removes files that were added
+    by hand, hence every removal is logged.
+
+    Args:
+      dpkg_path (str): path to the dpkg files.
+    """
+    generated_files = set([
+        os.path.normpath(path) for path in self._generated_files])
+
+    for directory_path, directory_names, filenames in os.walk(
+        dpkg_path, topdown=False):
+      for filename in filenames:
+        path = os.path.join(directory_path, filename)
+        if os.path.normpath(path) not in generated_files:
+          logging.info('Removing: {0:s}'.format(path))
+          os.remove(path)
+          self._changed_files.add(path)
+
+      for directory_name in directory_names:
+        path = os.path.join(directory_path, directory_name)
+        if os.path.islink(path):
+          logging.info('Removing: {0:s}'.format(path))
+          os.remove(path)
+          self._changed_files.add(path)
+        elif not os.listdir(path):
+          logging.info('Removing: {0:s}'.format(path))
+          os.rmdir(path)
+          self._changed_files.add(path)
+
+  def _WriteFile(self, path, data):
+    """Writes the data of a file if it differs from the existing file.
+
+    Args:
+      path (str): path of the file.
+      data (bytes): data of the file.
+    """
+    self._generated_files.add(path)
+
+    if self._ReadFile(path) == data:
+      return
+
+    with open(path, 'wb') as file_object:
+      file_object.write(data)
+
+    self._changed_files.add(path)
+
   def _IsPython2Only(self):
     """Determines if the project only supports Python version 2.
 
@@ -773,13 +869,26 @@ class DPKGBuildFilesGenerator(object):
     return (self._project_definition.IsPython2Only() or
             self._distribution == 'precise')
 
-  def GenerateFiles(self, dpkg_path):
+  def GenerateFiles(self, dpkg_path, remove_stale_files=False):
     """Generates the dpkg build files.
 
+    Files are only written if their content differs from the existing
+    files, such that unchanged files keep their modification time.
+
     Args:
       dpkg_path (str): path to the dpkg files.
+      remove_stale_files (Optional[bool]): True if existing files and
+          directories that are not generated should be removed.
+
+    Returns:
+      int: number of files and directories that were changed or removed.
     """
-    os.mkdir(dpkg_path)
+    self._changed_files = set()
+    self._generated_files = set()
+
+    if not os.path.isdir(dpkg_path):
+      os.mkdir(dpkg_path)
+
     self._GenerateChangelogFile(dpkg_path)
     self._GenerateCleanFile(dpkg_path)
     self._GenerateCompatFile(dpkg_path)
@@ -788,29 +897,34 @@ class DPKGBuildFilesGenerator(object):
     self._GenerateInstallFiles(dpkg_path)
     self._GenerateRulesFile(dpkg_path)
 
-    os.mkdir(os.path.join(dpkg_path, 'source'))
+    source_path = os.path.join(dpkg_path, 'source')
+    if not os.path.isdir(source_path):
+      os.mkdir(source_path)
+
     self._GenerateSourceFormatFile(dpkg_path)
 
     if self._project_definition.patches:
       patches_directory = os.path.join(dpkg_path, 'patches')
-      os.mkdir(patches_directory)
-
-      current_path = os.getcwd()
-      os.chdir(patches_directory)
+      if not os.path.isdir(patches_directory):
+        os.mkdir(patches_directory)
 
       patch_filenames = []
       for patch_filename in self._project_definition.patches:
         filename = os.path.join(self._data_path, 'patches', patch_filename)
-        if not os.path.exists(filename):
+        data = self._ReadFile(filename)
+        if data is None:
           logging.warning('Missing patch file: {0:s}'.format(filename))
           continue
 
-        shutil.copy(filename, patch_filename)
+        output_filename = os.path.join(patches_directory, patch_filename)
+        self._WriteFile(output_filename, data)
         patch_filenames.append(patch_filename)
 
-      os.chdir(current_path)
+      filename = os.path.join(patches_directory, 'series')
+      data = '\n'.join(patch_filenames)
+      self._WriteFile(filename, data.encode('utf-8'))
+
+    if remove_stale_files:
+      self._RemoveStaleFiles(dpkg_path)
 
-      filename = os.path.join(dpkg_path, 'patches', 'series')
-      with open(filename, 'wb') as file_object:
-        data = '\n'.join(patch_filenames)
-        file_object.write(data.encode('utf-8'))
+    return len(self._changed_files)
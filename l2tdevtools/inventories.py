@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""Package inventories, such as the packages of a COPR project or PPA track."""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import logging
+import re
+
+from l2tdevtools import json_file
+
+
+class InventoryDiff(object):
+  """Difference between a reference package inventory and an inventory.
+
+  Attributes:
+    new_packages (dict[str, str]): names and versions of the packages that
+        are present in the reference inventory but not in the inventory.
+    newer_packages (dict[str, tuple[str, str]]): names, reference versions
+        and versions of the packages that have a newer version in the
+        reference inventory.
+    older_packages (dict[str, tuple[str, str]]): names, reference versions
+        and versions of the packages that have an older version in the
+        reference inventory.
+    removed_packages (dict[str, str]): names and versions of the packages
+        that are present in the inventory but not in the reference inventory.
+  """
+
+  def __init__(self):
+    """Initializes an inventory difference."""
+    super(InventoryDiff, self).__init__()
+    self.new_packages = {}
+    self.newer_packages = {}
+    self.older_packages = {}
+    self.removed_packages = {}
+
+
+class InventoryComparer(object):
+  """Compares package inventories.
+
+  Versions are compared part by part, where numeric parts are compared as
+  numbers, such that "1.10" is newer than "1.9", and pre-release parts, such
+  as "~rc1" or "b1", are older than the release they precede. Pre-release
+  parts are ranked as in PEP440, such that "dev" is older than "a" or
+  "alpha", which is older than "b" or "beta", which is older than "c", "rc",
+  "pre" or "preview".
+  """
+
+  # The ranks of the pre-release parts, where a tilde that is not followed
+  # by a pre-release tag, such as in "1.0~20170723", ranks lowest.
+  _PRE_RELEASE_RANKS = {
+      '~': 0,
+      'dev': 1,
+      'a': 2,
+      'alpha': 2,
+      'b': 3,
+      'beta': 3,
+      'c': 4,
+      'pre': 4,
+      'preview': 4,
+      'rc': 4}
+
+  _VERSION_PARTS_REGEX = re.compile(r'[0-9]+|[A-Za-z]+|~')
+
+  def _GetVersionKey(self, version):
+    """Retrieves a key to compare a version.
+
+    Args:
+      version (str): version, such as "1.0.1", "20170723" or "1:2.0~rc1".
+
+    Returns:
+      tuple[int, tuple[tuple[int, object]]]: epoch and parts of the version,
+          where every part consists of its weight and its value or rank.
+    """
+    epoch = 0
+
+    # Both the dpkg and PEP440 epoch separators are supported.
+    for epoch_separator in (':', '!'):
+      epoch_string, separator, epoch_version = version.partition(
+          epoch_separator)
+      if separator and epoch_string.isdigit():
+        epoch = int(epoch_string, 10)
+        version = epoch_version
+        break
+
+    parts = [
+        part.lower() for part in self._VERSION_PARTS_REGEX.findall(version)]
+
+    version_parts = []
+    for index, part in enumerate(parts):
+      if part.isdigit():
+        version_parts.append((2, int(part, 10)))
+        continue
+
+      rank = self._PRE_RELEASE_RANKS.get(part, None)
+      if rank is None:
+        version_parts.append((1, part))
+        continue
+
+      # A tilde followed by a pre-release tag, such as in "1.0~rc1", is
+      # ignored, such that "1.0~rc1" and "1.0rc1" compare equal.
+      if part == '~' and index + 1 < len(parts) and (
+          parts[index + 1] in self._PRE_RELEASE_RANKS):
+        continue
+
+      version_parts.append((0, rank))
+
+    # Zero parts that are not followed by a numeric part are stripped, such
+    # that "1.0" and "1.0.0" as well as "1.0b1" and "1.0.0b1" compare equal.
+    version_key = []
+    for version_part in reversed(version_parts):
+      if version_part == (2, 0) and (
+          not version_key or version_key[-1][0] != 2):
+        continue
+      version_key.append(version_part)
+
+    version_key.reverse()
+
+    # The end of the version sorts after a pre-release part but before
+    # a numeric part, such that "1.0~rc1" < "1.0" < "1.0.1".
+    version_key.append((1, ''))
+
+    return epoch, tuple(version_key)
+
+  def CompareVersions(self, first_version, second_version):
+    """Compares two versions.
+
+    Args:
+      first_version (str): first version.
+      second_version (str): second version.
+
+    Returns:
+      int: -1 if the first version is older than the second version, 0 if
+          the versions are equivalent and 1 if the first version is newer.
+    """
+    first_key = self._GetVersionKey(first_version)
+    second_key = self._GetVersionKey(second_version)
+
+    if first_key < second_key:
+      return -1
+
+    if first_key > second_key:
+      return 1
+
+    return 0
+
+  def Compare(self, reference_packages, packages):
+    """Compares a reference package inventory with an inventory.
+
+    Args:
+      reference_packages (dict[str, str]): reference package names and
+          versions or None if not available.
+      packages (dict[str, str]): package names and versions or None if not
+          available.
+
+    Returns:
+      InventoryDiff: difference between the inventories.
+    """
+    reference_packages = reference_packages or {}
+    packages = packages or {}
+
+    inventory_diff = InventoryDiff()
+    for name, reference_version in reference_packages.items():
+      version = packages.get(name, None)
+      if version is None:
+        inventory_diff.new_packages[name] = reference_version
+        continue
+
+      result = self.CompareVersions(reference_version, version)
+      if result > 0:
+        inventory_diff.newer_packages[name] = (reference_version, version)
+      elif result < 0:
+        inventory_diff.older_packages[name] = (reference_version, version)
+
+    for name, version in packages.items():
+      if name not in reference_packages:
+        inventory_diff.removed_packages[name] = version
+
+    return inventory_diff
+
+
+class InventorySnapshot(object):
+  """Snapshot of package inventories.
+
+  A package inventory is identified by a key that consists of the type of
+  the repository, such as "copr", and the name of the project, track, sub
+  directory or directory, where the name is None if the type identifies
+  the repository, such as for PyPI.
+  """
+
+  _FORMAT_VERSION = 1
+
+  def __init__(self):
+    """Initializes an inventory snapshot."""
+    super(InventorySnapshot, self).__init__()
+    self._inventories = {}
+
+  def AddInventory(self, inventory_key, packages):
+    """Adds a package inventory.
+
+    An inventory of which the packages could not be determined is not added,
+    such that it cannot be mistaken for an inventory without packages.
+
+    Args:
+      inventory_key (tuple[str, str]): key of the inventory.
+      packages (dict[str, str]): package names and versions or None if
+          the packages could not be determined.
+    """
+    if packages is not None:
+      self._inventories[inventory_key] = packages
+
+  def GetInventory(self, inventory_key):
+    """Retrieves a package inventory.
+
+    Args:
+      inventory_key (tuple[str, str]): key of the inventory.
+
+    Returns:
+      dict[str, str]: package names and versions.
+
+    Raises:
+      KeyError: if the snapshot does not contain the inventory.
+    """
+    return self._inventories[inventory_key]
+
+  def GetInventoryKeys(self):
+    """Retrieves the keys of the package inventories.
+
+    Returns:
+      list[tuple[str, str]]: keys of the inventories sorted by type and name.
+    """
+    return sorted(
+        self._inventories.keys(), key=lambda inventory_key: (
+            inventory_key[0], inventory_key[1] or ''))
+
+  def HasInventory(self, inventory_key):
+    """Determines if the snapshot contains a package inventory.
+
+    Args:
+      inventory_key (tuple[str, str]): key of the inventory.
+
+    Returns:
+      bool: True if the snapshot contains the inventory.
+    """
+    return inventory_key in self._inventories
+
+  def ReadFromFile(self, path):
+    """Reads the snapshot from a file.
+
+    Args:
+      path (str): path of the snapshot file.
+
+    Returns:
+      bool: True if the snapshot was read or False if the file is invalid.
+    """
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      try:
+        json_dict = json.load(file_object)
+      except ValueError as exception:
+        logging.error((
+            'Unable to read inventory snapshot: {0:s} with error: '
+            '{1!s}').format(path, exception))
+        return False
+
+    format_version = json_dict.get('format_version', None)
+    if format_version != self._FORMAT_VERSION:
+      logging.error(
+          'Unsupported inventory snapshot format version: {0!s}'.format(
+              format_version))
+      return False
+
+    self._inventories = {}
+    for inventory_dict in json_dict.get('inventories', []):
+      inventory_type = inventory_dict.get('type', None)
+      if not inventory_type:
+        continue
+
+      packages = inventory_dict.get('packages', None)
+      if packages is None:
+        continue
+
+      inventory_key = (inventory_type, inventory_dict.get('name', None))
+      self._inventories[inventory_key] = packages
+
+    return True
+
+  def WriteToFile(self, path):
+    """Writes the snapshot to a file.
+
+    Args:
+      path (str): path of the snapshot file.
+    """
+    inventories = []
+    for inventory_key in self.GetInventoryKeys():
+      inventory_type, name = inventory_key
+      inventories.append({
+          'name': name,
+          'packages': self._inventories[inventory_key],
+          'type': inventory_type})
+
+    json_dict = {
+        'format_version': self._FORMAT_VERSION,
+        'inventories': inventories}
+
+    # The snapshot is written without indentation to keep it compact, since
+    # an inventory can contain hundreds of packages.
+    json_file.WriteFile(path, json_dict, compact=True)
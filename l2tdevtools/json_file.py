@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Helper functions for JSON files, such as caches and configuration indexes."""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+
+
+def WriteFile(path, json_dict, compact=False):
+  """Writes a JSON file.
+
+  The JSON file is written to a temporary file first, which is then renamed,
+  such that concurrent readers never read a partially written file.
+
+  Args:
+    path (str): path of the JSON file.
+    json_dict (dict[str, object]): JSON serializable values.
+    compact (Optional[bool]): True if the JSON file should be written without
+        indentation, for example because it contains many values.
+
+  Raises:
+    IOError: if the JSON file cannot be written.
+    OSError: if the JSON file cannot be written.
+  """
+  if compact:
+    json_string = json.dumps(json_dict, separators=(',', ':'), sort_keys=True)
+  else:
+    json_string = json.dumps(
+        json_dict, indent=2, separators=(',', ': '), sort_keys=True)
+
+  # Note that json.dumps returns a byte string on Python 2.
+  if isinstance(json_string, bytes):
+    json_string = json_string.decode('utf-8')
+
+  temporary_path = '{0:s}.{1:d}'.format(path, os.getpid())
+  try:
+    with io.open(temporary_path, 'w', encoding='utf-8') as file_object:
+      file_object.write(json_string)
+      file_object.write('\n')
+
+    try:
+      os.rename(temporary_path, path)
+    except OSError:
+      # On Windows rename fails if the destination exists.
+      os.remove(path)
+      os.rename(temporary_path, path)
+
+  except (IOError, OSError):
+    if os.path.exists(temporary_path):
+      os.remove(temporary_path)
+    raise
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""Source package mirror."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import json
+import logging
+import os
+
+from l2tdevtools import json_file
+
+
+class SourcePackageEntry(object):
+  """Source package entry of the source mirror manifest.
+
+  Attributes:
+    download_url (str): download URL of the project, as defined in
+        the project definition.
+    filename (str): name of the source package file in the mirror.
+    project_identifier (str): project identifier.
+    project_name (str): name of the project.
+    project_version (str): resolved version of the project.
+    sha256 (str): SHA-256 hash of the source package.
+    size (int): size of the source package in bytes.
+    source_url (str): URL the source package was downloaded from.
+  """
+
+  _ATTRIBUTE_NAMES = frozenset([
+      'download_url',
+      'filename',
+      'project_identifier',
+      'project_name',
+      'project_version',
+      'sha256',
+      'size',
+      'source_url'])
+
+  def __init__(self, project_name):
+    """Initializes a source package entry.
+
+    Args:
+      project_name (str): name of the project.
+    """
+    super(SourcePackageEntry, self).__init__()
+    self.download_url = None
+    self.filename = None
+    self.project_identifier = None
+    self.project_name = project_name
+    self.project_version = None
+    self.sha256 = None
+    self.size = None
+    self.source_url = None
+
+  def CopyFromDict(self, json_dict):
+    """Copies the attribute values from a JSON dictionary.
+
+    Args:
+      json_dict (dict[str, object]): JSON dictionary.
+    """
+    for name, value in json_dict.items():
+      if name in self._ATTRIBUTE_NAMES:
+        setattr(self, name, value)
+
+  def CopyToDict(self):
+    """Copies the attribute values to a JSON dictionary.
+
+    Returns:
+      dict[str, object]: JSON dictionary.
+    """
+    return {
+        name: getattr(self, name) for name in sorted(self._ATTRIBUTE_NAMES)}
+
+
+class SourceMirror(object):
+  """Source package mirror.
+
+  The source mirror is a directory that contains source packages and
+  a manifest that maps the download URL of every project to the resolved
+  version and source package, such that projects can be built without
+  network access.
+  """
+
+  MANIFEST_FILENAME = 'manifest.json'
+
+  _FORMAT_VERSION = 1
+
+  _READ_BUFFER_SIZE = 1024 * 1024
+
+  def __init__(self, path):
+    """Initializes a source mirror.
+
+    Args:
+      path (str): path of the source mirror directory.
+    """
+    super(SourceMirror, self).__init__()
+    self._entries = {}
+    self._entries_per_download_url = {}
+    self._path = path
+
+  def _CalculateSHA256(self, path):
+    """Calculates the SHA-256 hash of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: hexadecimal SHA-256 hash.
+    """
+    hash_context = hashlib.sha256()
+    with open(path, 'rb') as file_object:
+      data = file_object.read(self._READ_BUFFER_SIZE)
+      while data:
+        hash_context.update(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+    return hash_context.hexdigest()
+
+  def _GetNormalizedDownloadURL(self, download_url):
+    """Normalizes a download URL for look up.
+
+    The normalization is the same as that of the download helper factory.
+
+    Args:
+      download_url (str): download URL.
+
+    Returns:
+      str: normalized download URL.
+    """
+    if download_url.endswith('/'):
+      download_url = download_url[:-1]
+
+    if download_url.startswith('https://'):
+      download_url = 'http://{0:s}'.format(download_url[8:])
+
+    download_url, _, _ = download_url.partition('?')
+    return download_url
+
+  def AddSourcePackage(
+      self, project_definition, project_identifier, project_version,
+      source_url, filename):
+    """Adds a source package that was downloaded into the mirror.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      project_identifier (str): project identifier.
+      project_version (str): resolved version of the project.
+      source_url (str): URL the source package was downloaded from.
+      filename (str): name of the source package file in the mirror.
+
+    Returns:
+      SourcePackageEntry: source package entry.
+    """
+    path = os.path.join(self._path, filename)
+
+    entry = SourcePackageEntry(project_definition.name)
+    entry.download_url = project_definition.download_url
+    entry.filename = filename
+    entry.project_identifier = project_identifier
+    entry.project_version = project_version
+    entry.sha256 = self._CalculateSHA256(path)
+    entry.size = os.path.getsize(path)
+    entry.source_url = source_url
+
+    self._entries[entry.project_name] = entry
+
+    download_url = self._GetNormalizedDownloadURL(entry.download_url)
+    self._entries_per_download_url[download_url] = entry
+
+    return entry
+
+  def GetEntries(self):
+    """Retrieves the source package entries.
+
+    Yields:
+      SourcePackageEntry: source package entry.
+    """
+    for project_name in sorted(self._entries.keys()):
+      yield self._entries[project_name]
+
+  def GetEntryByDownloadURL(self, download_url):
+    """Retrieves a source package entry by the download URL of the project.
+
+    Args:
+      download_url (str): download URL of the project.
+
+    Returns:
+      SourcePackageEntry: source package entry or None if not available.
+    """
+    download_url = self._GetNormalizedDownloadURL(download_url)
+    return self._entries_per_download_url.get(download_url, None)
+
+  def GetSourcePackagePath(self, entry):
+    """Retrieves the path of a source package in the mirror.
+
+    Args:
+      entry (SourcePackageEntry): source package entry.
+
+    Returns:
+      str: path of the source package.
+    """
+    return os.path.join(self._path, entry.filename)
+
+  def ReadManifest(self):
+    """Reads the manifest of the mirror.
+
+    Returns:
+      bool: True if the manifest was read or False if it does not exist
+          or is invalid.
+    """
+    path = os.path.join(self._path, self.MANIFEST_FILENAME)
+    if not os.path.exists(path):
+      return False
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      try:
+        json_dict = json.load(file_object)
+      except ValueError as exception:
+        logging.error('Unable to read manifest: {0:s} with error: {1!s}'.format(
+            path, exception))
+        return False
+
+    format_version = json_dict.get('format_version', None)
+    if format_version != self._FORMAT_VERSION:
+      logging.error('Unsupported manifest format version: {0!s}'.format(
+          format_version))
+      return False
+
+    self._entries = {}
+    self._entries_per_download_url = {}
+
+    for entry_dict in json_dict.get('source_packages', []):
+      entry = SourcePackageEntry(entry_dict.get('project_name', None))
+      entry.CopyFromDict(entry_dict)
+      if not entry.project_name or not entry.download_url:
+        continue
+
+      self._entries[entry.project_name] = entry
+
+      download_url = self._GetNormalizedDownloadURL(entry.download_url)
+      self._entries_per_download_url[download_url] = entry
+
+    return True
+
+  def VerifySourcePackage(self, entry):
+    """Verifies that a source package in the mirror matches its entry.
+
+    Args:
+      entry (SourcePackageEntry): source package entry.
+
+    Returns:
+      bool: True if the size and SHA-256 hash of the source package match.
+    """
+    path = self.GetSourcePackagePath(entry)
+    if not os.path.exists(path) or os.path.getsize(path) != entry.size:
+      return False
+
+    return self._CalculateSHA256(path) == entry.sha256
+
+  def WriteManifest(self):
+    """Writes the manifest of the mirror."""
+    json_dict = {
+        'format_version': self._FORMAT_VERSION,
+        'source_packages': [
+            entry.CopyToDict() for entry in self.GetEntries()]}
+
+    path = os.path.join(self._path, self.MANIFEST_FILENAME)
+    json_file.WriteFile(path, json_dict)
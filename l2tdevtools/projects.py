@@ -3,7 +3,11 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+import io
+import json
 import logging
+import os
 import re
 
 try:
@@ -11,6 +15,13 @@ try:
 except ImportError:
   import configparser  # pylint: disable=import-error
 
+try:
+  from urlparse import urlparse
+except ImportError:
+  from urllib.parse import urlparse  # pylint: disable=no-name-in-module
+
+from l2tdevtools import json_file
+from l2tdevtools import presets
 from l2tdevtools import py2to3
 
 
@@ -119,11 +130,15 @@ class ProjectVersionDefinition(object):
       version_string (str): version string.
     """
     super(ProjectVersionDefinition, self).__init__()
+    self._is_supported = True
+    self._version_string = None
     self._version_string_parts = []
 
     if not version_string:
       return
 
+    self._is_supported = False
+
     version_string_parts = version_string.split(',')
     number_of_version_string_parts = len(version_string_parts)
     if number_of_version_string_parts > 2:
@@ -147,11 +162,17 @@ class ProjectVersionDefinition(object):
       self._version_string_parts.append([
           match for match in matches[0] if match or match == 0])
 
+    self._is_supported = True
     self._version_string = version_string
 
+  @property
+  def is_supported(self):
+    """bool: True if the version string is supported or not set."""
+    return self._is_supported
+
   @property
   def version_string(self):
-    """str: string representation of the object."""
+    """str: string representation of the object or None if not set."""
     return self._version_string
 
   def GetEarliestVersion(self):
@@ -355,3 +376,623 @@ class ProjectDefinitionReader(object):
 
       project_definition.version = ProjectVersionDefinition(
           project_definition.version)
+
+
+class PresetResolution(object):
+  """Resolution of the projects of a preset.
+
+  Attributes:
+    cycles (list[list[str]]): dependency cycles, as names of projects, where
+        the first project is repeated at the end of the cycle.
+    dependency_project_names (list[str]): names of the projects that are not
+        part of the preset but are required by projects of the preset.
+    external_dependencies (dict[str, list[str]]): names of the dependencies
+        that are not provided by a project, such as system packages, per
+        name of the project that depends on them.
+    name (str): name of the preset.
+    preset_project_names (list[str]): names of the projects of the preset.
+    project_names (list[str]): names of the projects of the preset and their
+        dependencies, where a project precedes the projects that depend
+        on it.
+    unknown_project_names (list[str]): names of the projects of the preset
+        that are not defined.
+  """
+
+  def __init__(self, name):
+    """Initializes a preset resolution.
+
+    Args:
+      name (str): name of the preset.
+    """
+    super(PresetResolution, self).__init__()
+    self.cycles = []
+    self.dependency_project_names = []
+    self.external_dependencies = {}
+    self.name = name
+    self.preset_project_names = []
+    self.project_names = []
+    self.unknown_project_names = []
+
+
+class ProjectDefinitionStore(object):
+  """Store of the project definitions indexed by name.
+
+  The project and preset definitions are read from the configuration files
+  and compiled into a cache file, which is used instead of the configuration
+  files for as long as they do not change. A project definition is only
+  created when it is first retrieved from the store.
+  """
+
+  _FORMAT_VERSION = 2
+
+  # Names of the project definition attributes that are stored in the cache
+  # file, other than the name and the version.
+  _ATTRIBUTE_NAMES = (
+      'architecture_dependent', 'build_dependencies', 'build_options',
+      'build_system', 'configure_options', 'description_long',
+      'description_short', 'disabled', 'dpkg_build_dependencies',
+      'dpkg_configure_options', 'dpkg_dependencies', 'dpkg_name',
+      'dpkg_source_name', 'dpkg_template_control',
+      'dpkg_template_install_python2', 'dpkg_template_install_python3',
+      'dpkg_template_rules', 'download_url', 'git_url', 'homepage_url',
+      'maintainer', 'msi_name', 'msi_prebuild', 'patches',
+      'pkg_configure_options', 'rpm_build_dependencies', 'rpm_name',
+      'rpm_python2_prefix', 'setup_name')
+
+  # Names of the project definition attributes that contain the names of
+  # dependencies that determine the build order.
+  _DEPENDENCY_ATTRIBUTE_NAMES = (
+      'build_dependencies', 'dpkg_build_dependencies', 'dpkg_dependencies')
+
+  def __init__(self, projects_path, presets_path=None, cache_path=None):
+    """Initializes a project definition store.
+
+    Args:
+      projects_path (str): path of the projects.ini configuration file.
+      presets_path (Optional[str]): path of the presets.ini configuration
+          file, where None represents no preset definitions.
+      cache_path (Optional[str]): path of the cache file, where None
+          represents a store that is not persisted.
+    """
+    super(ProjectDefinitionStore, self).__init__()
+    self._cache_path = cache_path
+    self._cache_outdated = False
+    self._dependencies = None
+    self._dependency_name_index = None
+    self._download_host_index = None
+    self._build_system_index = None
+    self._presets = {}
+    self._presets_path = presets_path
+    self._project_definitions = {}
+    self._project_names = []
+    self._project_values = {}
+    self._projects_path = projects_path
+
+  def _BuildIndexes(self):
+    """Builds the build system and download host indexes."""
+    self._build_system_index = {}
+    self._download_host_index = {}
+
+    for project_name in self._project_names:
+      project_values = self._project_values[project_name]
+
+      build_system = project_values.get('build_system', None)
+      self._build_system_index.setdefault(build_system, []).append(
+          project_name)
+
+      download_host = self._GetDownloadHost(
+          project_values.get('download_url', None))
+      self._download_host_index.setdefault(download_host, []).append(
+          project_name)
+
+  def _BuildDependencyIndexes(self):
+    """Builds the dependency name index and the project dependencies.
+
+    The dependency name index maps the names by which other projects refer
+    to a project, such as its dpkg package names, to the name of the project.
+    Dependencies that are not provided by a project are considered external.
+    """
+    self._dependency_name_index = {}
+    for project_name in self._project_names:
+      project_values = self._project_values[project_name]
+      for dependency_name in self._GetDependencyNames(
+          project_name, project_values):
+        self._dependency_name_index.setdefault(
+            dependency_name.lower(), project_name)
+
+    self._dependencies = {}
+    for project_name in self._project_names:
+      project_values = self._project_values[project_name]
+
+      project_dependencies = set()
+      external_dependencies = set()
+      for attribute_name in self._DEPENDENCY_ATTRIBUTE_NAMES:
+        for dependency_name in project_values.get(attribute_name, None) or []:
+          dependency_name = dependency_name.strip()
+          if not dependency_name:
+            continue
+
+          dependency_project_name = self._dependency_name_index.get(
+              dependency_name.lower(), None)
+          if not dependency_project_name:
+            external_dependencies.add(dependency_name)
+          elif dependency_project_name != project_name:
+            project_dependencies.add(dependency_project_name)
+
+      self._dependencies[project_name] = (
+          sorted(project_dependencies), sorted(external_dependencies))
+
+  def _GetDependencyNames(self, project_name, project_values):
+    """Retrieves the names by which other projects can depend on a project.
+
+    Args:
+      project_name (str): name of the project.
+      project_values (dict[str, object]): values of the project definition.
+
+    Returns:
+      list[str]: names of the project, and its setup.py, dpkg and RPM
+          packages.
+    """
+    dependency_names = [project_name]
+    for attribute_name in (
+        'dpkg_name', 'dpkg_source_name', 'rpm_name', 'setup_name'):
+      attribute_value = project_values.get(attribute_name, None)
+      if attribute_value:
+        dependency_names.append(attribute_value)
+
+    # Note that the Python package names are derived the same way as by
+    # the dpkg build files generator.
+    package_name = project_values.get('dpkg_name', None) or project_name
+    if package_name.startswith('python-'):
+      package_name = package_name[7:]
+
+    dependency_names.extend([
+        'python-{0:s}'.format(package_name),
+        'python3-{0:s}'.format(package_name),
+        '{0:s}-python'.format(project_name),
+        '{0:s}-python3'.format(project_name)])
+
+    return dependency_names
+
+  def _GetDownloadHost(self, download_url):
+    """Determines the host of a download URL.
+
+    Args:
+      download_url (str): download URL.
+
+    Returns:
+      str: host of the download URL in lower case or None if not available.
+    """
+    if not download_url:
+      return
+
+    host = urlparse(download_url).netloc.lower()
+    return host or None
+
+  def _GetFileFingerprint(self, path, sha256=None):
+    """Determines the fingerprint of a file.
+
+    Args:
+      path (str): path of the file.
+      sha256 (Optional[str]): SHA-256 of the file, where None represents
+          that the SHA-256 should be calculated.
+
+    Returns:
+      dict[str, object]: fingerprint, with the values "mtime", "path",
+          "sha256" and "size".
+    """
+    stat_object = os.stat(path)
+
+    if sha256 is None:
+      hash_context = hashlib.sha256()
+      with open(path, 'rb') as file_object:
+        hash_context.update(file_object.read())
+      sha256 = hash_context.hexdigest()
+
+    return {
+        'mtime': stat_object.st_mtime,
+        'path': os.path.abspath(path),
+        'sha256': sha256,
+        'size': stat_object.st_size}
+
+  def _GetProjectValues(self, project_definition):
+    """Retrieves the values of a project definition.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      dict[str, object]: values of the project definition.
+    """
+    project_values = {
+        attribute_name: getattr(project_definition, attribute_name)
+        for attribute_name in self._ATTRIBUTE_NAMES}
+
+    version = project_definition.version
+    if isinstance(version, ProjectVersionDefinition):
+      version = version.version_string
+
+    project_values['version'] = version
+    return project_values
+
+  def _IsFingerprintValid(self, path, fingerprint):
+    """Determines if the fingerprint of a configuration file is still valid.
+
+    The SHA-256 of the configuration file is only calculated if its
+    modification time or size has changed.
+
+    Args:
+      path (str): path of the configuration file or None if not set.
+      fingerprint (dict[str, object]): fingerprint stored in the cache file
+          or None if not set.
+
+    Returns:
+      bool: True if the fingerprint is still valid.
+    """
+    if not path or not fingerprint:
+      return not path and not fingerprint
+
+    if not os.path.exists(path):
+      return False
+
+    stat_object = os.stat(path)
+    if (fingerprint.get('path', None) == os.path.abspath(path) and
+        fingerprint.get('mtime', None) == stat_object.st_mtime and
+        fingerprint.get('size', None) == stat_object.st_size):
+      return True
+
+    current_fingerprint = self._GetFileFingerprint(path)
+    if current_fingerprint['sha256'] != fingerprint.get('sha256', None):
+      return False
+
+    # The configuration file was touched or moved but not changed, hence
+    # the cache file is still valid but its fingerprint should be updated.
+    self._cache_outdated = True
+    return True
+
+  def _ResolveProject(self, project_name, resolution, visited, path):
+    """Resolves a project and its dependencies.
+
+    The dependencies are resolved depth-first, such that a project is only
+    added to the resolution after its dependencies.
+
+    Args:
+      project_name (str): name of the project.
+      resolution (PresetResolution): preset resolution.
+      visited (set[str]): names of the projects that have been resolved.
+      path (list[str]): names of the projects that are being resolved, where
+          a project depends on the project that follows it.
+    """
+    if project_name in path:
+      cycle = path[path.index(project_name):]
+
+      # Rotate the cycle to start with its smallest project name, such that
+      # the same cycle is only reported once.
+      start_index = cycle.index(min(cycle))
+      cycle = cycle[start_index:] + cycle[:start_index]
+      cycle.append(cycle[0])
+
+      if cycle not in resolution.cycles:
+        resolution.cycles.append(cycle)
+      return
+
+    if project_name in visited:
+      return
+
+    project_dependencies, external_dependencies = self._dependencies[
+        project_name]
+
+    path.append(project_name)
+    for dependency_project_name in project_dependencies:
+      self._ResolveProject(dependency_project_name, resolution, visited, path)
+    path.pop()
+
+    visited.add(project_name)
+    resolution.project_names.append(project_name)
+
+    if external_dependencies:
+      resolution.external_dependencies[project_name] = list(
+          external_dependencies)
+
+  def _ReadCache(self):
+    """Reads the cache file.
+
+    Returns:
+      bool: True if the cache file was read or False if the store is not
+          persisted, or the cache file does not exist, is invalid or does
+          not match the configuration files.
+    """
+    if not self._cache_path or not os.path.exists(self._cache_path):
+      return False
+
+    with io.open(self._cache_path, 'r', encoding='utf-8') as file_object:
+      try:
+        json_dict = json.load(file_object)
+      except ValueError as exception:
+        logging.warning((
+            'Unable to read project definitions cache: {0:s} with error: '
+            '{1!s}').format(self._cache_path, exception))
+        return False
+
+    if json_dict.get('format_version', None) != self._FORMAT_VERSION:
+      return False
+
+    projects_fingerprint = json_dict.get('projects_fingerprint', None)
+    presets_fingerprint = json_dict.get('presets_fingerprint', None)
+
+    if (not self._IsFingerprintValid(
+        self._projects_path, projects_fingerprint) or
+        not self._IsFingerprintValid(
+            self._presets_path, presets_fingerprint)):
+      return False
+
+    self._presets = json_dict.get('presets', {})
+    self._project_names = json_dict.get('project_names', [])
+    self._project_values = json_dict.get('projects', {})
+
+    return True
+
+  def _ReadConfigurationFiles(self):
+    """Reads the configuration files."""
+    self._presets = {}
+    self._project_definitions = {}
+    self._project_names = []
+    self._project_values = {}
+
+    with open(self._projects_path) as file_object:
+      project_definition_reader = ProjectDefinitionReader()
+      for project_definition in project_definition_reader.Read(file_object):
+        project_name = project_definition.name
+        if project_name not in self._project_values:
+          self._project_names.append(project_name)
+
+        # Note that the reader only sets the version of a project definition
+        # after it has been yielded, hence the values contain the version
+        # string as defined in the configuration file.
+        self._project_definitions[project_name] = project_definition
+        self._project_values[project_name] = self._GetProjectValues(
+            project_definition)
+
+    if self._presets_path:
+      with open(self._presets_path) as file_object:
+        preset_definition_reader = presets.PresetDefinitionReader()
+        for preset_definition in preset_definition_reader.Read(file_object):
+          self._presets[preset_definition.name] = (
+              preset_definition.project_names)
+
+  def _WriteCache(self):
+    """Writes the cache file, if the store is persisted."""
+    if not self._cache_path:
+      return
+
+    presets_fingerprint = None
+    if self._presets_path:
+      presets_fingerprint = self._GetFileFingerprint(self._presets_path)
+
+    json_dict = {
+        'format_version': self._FORMAT_VERSION,
+        'presets': self._presets,
+        'presets_fingerprint': presets_fingerprint,
+        'project_names': self._project_names,
+        'projects': self._project_values,
+        'projects_fingerprint': self._GetFileFingerprint(self._projects_path)}
+
+    json_file.WriteFile(self._cache_path, json_dict)
+
+  def GetPresetNames(self):
+    """Retrieves the names of the presets.
+
+    Returns:
+      list[str]: names of the presets, sorted alphabetically.
+    """
+    return sorted(self._presets.keys())
+
+  def GetPresetProjectNames(self, preset_name):
+    """Retrieves the names of the projects of a preset.
+
+    Args:
+      preset_name (str): name of the preset.
+
+    Returns:
+      list[str]: names of the projects, as defined by the preset, or None
+          if the preset is not defined.
+    """
+    project_names = self._presets.get(preset_name, None)
+    if project_names is None:
+      return
+
+    return list(project_names)
+
+  def GetProjectDefinition(self, project_name):
+    """Retrieves a project definition.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      ProjectDefinition: project definition or None if not available.
+    """
+    project_definition = self._project_definitions.get(project_name, None)
+    if project_definition:
+      return project_definition
+
+    project_values = self._project_values.get(project_name, None)
+    if project_values is None:
+      return
+
+    project_definition = ProjectDefinition(project_name)
+    for attribute_name in self._ATTRIBUTE_NAMES:
+      attribute_value = project_values.get(attribute_name, None)
+      if isinstance(attribute_value, list):
+        # Prevent changes of the project definition to affect the store.
+        attribute_value = list(attribute_value)
+
+      setattr(project_definition, attribute_name, attribute_value)
+
+    project_definition.version = ProjectVersionDefinition(
+        project_values.get('version', None))
+
+    self._project_definitions[project_name] = project_definition
+    return project_definition
+
+  def GetProjectDefinitions(self, project_names=None):
+    """Retrieves project definitions.
+
+    Args:
+      project_names (Optional[list[str]]): names of the projects, where None
+          represents all projects.
+
+    Returns:
+      list[ProjectDefinition]: project definitions in the order of the
+          projects.ini configuration file. Projects that are not defined are
+          ignored.
+    """
+    if project_names is None:
+      selected_names = self._project_names
+    else:
+      project_names = set(project_names)
+      selected_names = [
+          project_name for project_name in self._project_names
+          if project_name in project_names]
+
+    return [
+        self.GetProjectDefinition(project_name)
+        for project_name in selected_names]
+
+  def GetProjectDefinitionsByBuildSystem(self, build_system):
+    """Retrieves the project definitions that use a specific build system.
+
+    Args:
+      build_system (str): build system, such as "configure_make" or
+          "setup_py".
+
+    Returns:
+      list[ProjectDefinition]: project definitions.
+    """
+    if self._build_system_index is None:
+      self._BuildIndexes()
+
+    return [
+        self.GetProjectDefinition(project_name)
+        for project_name in self._build_system_index.get(build_system, [])]
+
+  def GetProjectDefinitionsByDownloadHost(self, download_host):
+    """Retrieves the project definitions that download from a specific host.
+
+    Args:
+      download_host (str): host of the download URL, such as "github.com".
+
+    Returns:
+      list[ProjectDefinition]: project definitions.
+    """
+    if self._download_host_index is None:
+      self._BuildIndexes()
+
+    return [
+        self.GetProjectDefinition(project_name)
+        for project_name in self._download_host_index.get(
+            download_host.lower(), [])]
+
+  def GetProjectDefinitionsByPreset(self, preset_name):
+    """Retrieves the project definitions of a preset.
+
+    Args:
+      preset_name (str): name of the preset.
+
+    Returns:
+      list[ProjectDefinition]: project definitions in the order of the
+          projects.ini configuration file. Projects of the preset that are
+          not defined are ignored.
+    """
+    project_names = self._presets.get(preset_name, None) or []
+    return self.GetProjectDefinitions(project_names=project_names)
+
+  def GetProjectNames(self):
+    """Retrieves the names of the projects.
+
+    Returns:
+      list[str]: names of the projects in the order of the projects.ini
+          configuration file.
+    """
+    return list(self._project_names)
+
+  def ResolvePreset(self, preset_name):
+    """Resolves the projects of a preset and their dependencies.
+
+    The transitive closure of the projects of the preset is determined from
+    the build and dpkg dependencies of the project definitions. The projects
+    of the preset can be referred to by any name by which other projects can
+    depend on them, such as their dpkg package name.
+
+    Args:
+      preset_name (str): name of the preset.
+
+    Returns:
+      PresetResolution: preset resolution or None if the preset is not
+          defined.
+    """
+    preset_project_names = self._presets.get(preset_name, None)
+    if preset_project_names is None:
+      return
+
+    if self._dependencies is None:
+      self._BuildDependencyIndexes()
+
+    resolution = PresetResolution(preset_name)
+    for project_name in preset_project_names:
+      resolved_project_name = self._dependency_name_index.get(
+          project_name.lower(), None)
+      if not resolved_project_name:
+        if project_name not in resolution.unknown_project_names:
+          resolution.unknown_project_names.append(project_name)
+
+      elif resolved_project_name not in resolution.preset_project_names:
+        resolution.preset_project_names.append(resolved_project_name)
+
+    visited = set()
+    for project_name in resolution.preset_project_names:
+      self._ResolveProject(project_name, resolution, visited, [])
+
+    preset_project_names = set(resolution.preset_project_names)
+    resolution.dependency_project_names = [
+        project_name for project_name in resolution.project_names
+        if project_name not in preset_project_names]
+
+    return resolution
+
+  def HasProject(self, project_name):
+    """Determines if a project is defined.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      bool: True if the project is defined.
+    """
+    return project_name in self._project_values
+
+  def Read(self):
+    """Reads the project definitions.
+
+    The project definitions are read from the cache file if it matches the
+    configuration files, otherwise they are read from the configuration
+    files and the cache file is updated.
+
+    Returns:
+      bool: True if the project definitions were read from the cache file.
+    """
+    self._build_system_index = None
+    self._cache_outdated = False
+    self._dependencies = None
+    self._dependency_name_index = None
+    self._download_host_index = None
+    self._project_definitions = {}
+
+    if self._ReadCache():
+      if self._cache_outdated:
+        self._WriteCache()
+      return True
+
+    self._ReadConfigurationFiles()
+    self._WriteCache()
+    return False
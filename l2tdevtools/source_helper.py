@@ -152,6 +152,8 @@ class SourcePackageHelper(SourceHelper):
       download_helper_object (DownloadHelper): download helper.
     """
     super(SourcePackageHelper, self).__init__(project_name, project_definition)
+    self._archive_filename = None
+    self._archive_members = None
     self._download_helper = download_helper_object
     self._project_version = None
     self._source_filename = None
@@ -252,6 +254,144 @@ class SourcePackageHelper(SourceHelper):
 
     return directory_name
 
+  def _GetArchiveMembers(self):
+    """Retrieves the members of the source package.
+
+    The member index is only determined once per source package, such that
+    subsequent lookups do not need to read the source package.
+
+    Returns:
+      dict[str, object]: tar or zip member information per path relative to
+          the source directory in the source package or None on error.
+    """
+    if not self._source_filename:
+      _ = self.Download()
+
+    if not self._source_filename or not os.path.exists(self._source_filename):
+      return
+
+    if self._archive_filename != self._source_filename:
+      self._archive_filename = self._source_filename
+      self._archive_members = None
+
+      if (self._source_filename.endswith('.tar.bz2') or
+          self._source_filename.endswith('.tar.gz') or
+          self._source_filename.endswith('.tgz')):
+        self._archive_members = self._GetTarArchiveMembers(
+            self._source_filename)
+
+      elif self._source_filename.endswith('.zip'):
+        self._archive_members = self._GetZipArchiveMembers(
+            self._source_filename)
+
+    return self._archive_members
+
+  def _GetArchiveMembersFromPaths(self, source_filename, members_per_path):
+    """Retrieves the members relative to the source directory.
+
+    Args:
+      source_filename (str): filename of the source package.
+      members_per_path (list[tuple[str, object]]): paths in the source
+          package and corresponding tar or zip member information.
+
+    Returns:
+      dict[str, object]: tar or zip member information per path relative to
+          the source directory in the source package or None if the source
+          package does not contain a single source directory.
+    """
+    archive_members = {}
+    directory_name = ''
+
+    for path, member in members_per_path:
+      if not directory_name:
+        directory_name, _, _ = path.partition('/')
+        if not directory_name or directory_name.startswith('..'):
+          logging.error(
+              'Unsupported directory name in source package: {0:s}'.format(
+                  source_filename))
+          return
+
+      _, _, relative_path = path.partition('/')
+      if not path.startswith('{0:s}/'.format(directory_name)):
+        logging.warning('Skipping: {0:s} in source package: {1:s}'.format(
+            path, source_filename))
+        continue
+
+      if relative_path:
+        archive_members[relative_path] = member
+
+    return archive_members
+
+  def _GetTarArchiveMembers(self, source_filename):
+    """Retrieves the members of a .tar source package.
+
+    Args:
+      source_filename (str): filename of the source package.
+
+    Returns:
+      dict[str, tarfile.TarInfo]: tar member information per path relative to
+          the source directory in the source package or None on error.
+    """
+    members_per_path = []
+    try:
+      archive = tarfile.open(source_filename, 'r:*', encoding='utf-8')
+    except (IOError, tarfile.TarError) as exception:
+      logging.error('Unable to open tar file: {0:s} with error: {1!s}'.format(
+          source_filename, exception))
+      return
+
+    try:
+      for tar_info in archive.getmembers():
+        if not tar_info.isfile():
+          continue
+
+        path = tar_info.name
+        if isinstance(path, bytes):
+          try:
+            path = path.decode(self.ENCODING)
+          except UnicodeDecodeError:
+            logging.warning(
+                'Unable to decode filename in tar file: {0:s}'.format(
+                    source_filename))
+            continue
+
+        members_per_path.append((path, tar_info))
+
+    finally:
+      archive.close()
+
+    return self._GetArchiveMembersFromPaths(source_filename, members_per_path)
+
+  def _GetZipArchiveMembers(self, source_filename):
+    """Retrieves the members of a .zip source package.
+
+    Args:
+      source_filename (str): filename of the source package.
+
+    Returns:
+      dict[str, zipfile.ZipInfo]: zip member information per path relative to
+          the source directory in the source package or None on error.
+    """
+    members_per_path = []
+    try:
+      archive = zipfile.ZipFile(source_filename, 'r')
+    except (IOError, zipfile.BadZipfile) as exception:
+      logging.error('Unable to open zip file: {0:s} with error: {1!s}'.format(
+          source_filename, exception))
+      return
+
+    try:
+      for zip_info in archive.infolist():
+        if zip_info.filename.endswith('/'):
+          continue
+
+        members_per_path.append((zip_info.filename, zip_info))
+
+    finally:
+      archive.close()
+
+    return self._GetArchiveMembersFromPaths(source_filename, members_per_path)
+
   def Clean(self):
     """Removes previous versions of source packages and directories."""
     project_version = self.GetProjectVersion()
@@ -333,6 +473,21 @@ class SourcePackageHelper(SourceHelper):
 
     return self._source_filename
 
+  def GetArchiveMemberPaths(self):
+    """Retrieves the paths of the files in the source package.
+
+    The source package is not extracted.
+
+    Returns:
+      list[str]: paths of the files relative to the source directory in the
+          source package or None on error.
+    """
+    archive_members = self._GetArchiveMembers()
+    if archive_members is None:
+      return
+
+    return sorted(archive_members.keys())
+
   def GetProjectIdentifier(self):
     """Retrieves the project identifier for a given project name.
 
@@ -353,3 +508,75 @@ class SourcePackageHelper(SourceHelper):
           self.project_name, version_definition)
 
     return self._project_version
+
+  def ReadArchiveMember(self, path):
+    """Reads a file from the source package.
+
+    The source package is not extracted.
+
+    Args:
+      path (str): path of the file relative to the source directory in
+          the source package.
+
+    Returns:
+      bytes: data of the file or None if not available.
+    """
+    archive_members_data = self.ReadArchiveMembers([path])
+    if not archive_members_data:
+      return
+
+    return archive_members_data.get(path, None)
+
+  def ReadArchiveMembers(self, paths):
+    """Reads multiple files from the source package.
+
+    The source package is not extracted and is opened only once, such that
+    reading multiple files does not decompress a .tar source package over
+    and over again.
+
+    Args:
+      paths (iterable[str]): paths of the files relative to the source
+          directory in the source package.
+
+    Returns:
+      dict[str, bytes]: data of the files per path, where paths that are not
+          in the source package are omitted, or None if the source package
+          is not available.
+    """
+    archive_members = self._GetArchiveMembers()
+    if archive_members is None:
+      return
+
+    members_per_path = []
+    for path in paths:
+      member = archive_members.get(path, None)
+      if member:
+        members_per_path.append((path, member))
+
+    archive_members_data = {}
+    if not members_per_path:
+      return archive_members_data
+
+    if isinstance(members_per_path[0][1], zipfile.ZipInfo):
+      archive = zipfile.ZipFile(self._archive_filename, 'r')
+      try:
+        for path, zip_info in members_per_path:
+          archive_members_data[path] = archive.read(zip_info)
+      finally:
+        archive.close()
+
+      return archive_members_data
+
+    # The members are read in the order they are stored in the source package
+    # since seeking backwards in a compressed stream restarts decompression.
+    members_per_path.sort(key=lambda path_and_member: path_and_member[1].offset)
+
+    archive = tarfile.open(self._archive_filename, 'r:*', encoding='utf-8')
+    try:
+      for path, tar_info in members_per_path:
+        file_object = archive.extractfile(tar_info)
+        archive_members_data[path] = file_object.read()
+    finally:
+      archive.close()
+
+    return archive_members_data
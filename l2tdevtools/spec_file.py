@@ -4,11 +4,97 @@
 from __future__ import unicode_literals
 
 import datetime
+import io
 import logging
 import os
+import re
 import subprocess
 import sys
 
+try:
+  import ConfigParser as configparser
+except ImportError:
+  import configparser  # pylint: disable=import-error
+
+
+class RPMSpecFileRewriteState(object):
+  """State of the rewrite of a RPM spec file generated with setup.py.
+
+  Attributes:
+    description (bytes): description used for the package definitions.
+    description_lines (list[bytes]): lines of the description section.
+    has_build_requires (bool): True if the build requirements were written.
+    has_description (bool): True if the description section was read.
+    has_python2_package (bool): True if the spec file defines a Python 2
+        package.
+    has_python3_package (bool): True if the spec file defines a Python 3
+        package.
+    has_unmangled_version (bool): True if the unmangled version was defined.
+    in_description (bool): True if the lines of the description section are
+        being read.
+    in_python_package (bool): True if the lines of a Python package
+        definition are being removed.
+    package_name (str): package name without "python-" prefix.
+    project_definition (ProjectDefinition): project definition.
+    project_name (str): name of the project.
+    python2_only (bool): True if the spec file should build Python 2
+        packages only.
+    python2_package_prefix (str): name prefix for Python 2 packages.
+    requires (bytes): Requires tag line used for the package definitions.
+    rpm_build_dependencies (list[str]): RPM build dependencies.
+    source_filename (str): name of the source package.
+    summary (bytes): Summary tag line used for the package definitions.
+    unmangled_name (str): unmangled name of the project.
+    version (bytes): version of the project.
+  """
+
+  def __init__(
+      self, project_definition, project_name, source_filename,
+      rpm_build_dependencies, python2_package_prefix):
+    """Initializes the rewrite state.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      project_name (str): name of the project.
+      source_filename (str): name of the source package.
+      rpm_build_dependencies (list[str]): RPM build dependencies.
+      python2_package_prefix (str): name prefix for Python 2 packages.
+    """
+    super(RPMSpecFileRewriteState, self).__init__()
+    self.description = b''
+    self.description_lines = []
+    self.has_build_requires = False
+    self.has_description = False
+    self.has_python2_package = False
+    self.has_python3_package = False
+    self.has_unmangled_version = False
+    self.in_description = False
+    self.in_python_package = False
+    self.project_definition = project_definition
+    self.project_name = project_name
+    self.python2_only = project_definition.IsPython2Only()
+    self.python2_package_prefix = python2_package_prefix
+    self.requires = b''
+    self.rpm_build_dependencies = rpm_build_dependencies
+    self.source_filename = source_filename
+    self.summary = b''
+    self.version = b''
+
+    if project_definition.rpm_name:
+      package_name = project_definition.rpm_name
+    else:
+      package_name = project_name
+
+    if package_name.startswith('python-'):
+      package_name = package_name[7:]
+
+    self.package_name = package_name
+
+    if project_definition.setup_name and project_name != 'dateutil':
+      self.unmangled_name = project_definition.setup_name
+    else:
+      self.unmangled_name = project_name
+
 
 class RPMSpecFileGenerator(object):
   """Class that helps in generating RPM spec files."""
@@ -23,6 +109,84 @@ class RPMSpecFileGenerator(object):
   _LICENSE_FILENAMES = [
       'LICENSE', 'LICENSE.txt', 'LICENSE.TXT']
 
+  # Names of the files that contain the static metadata.
+  _METADATA_FILENAMES = frozenset(['PKG-INFO', 'setup.cfg', 'setup.py'])
+
+  # Names of the sections in a RPM spec file.
+  _SECTION_NAMES = frozenset([
+      b'%build', b'%changelog', b'%check', b'%clean', b'%description',
+      b'%files', b'%install', b'%package', b'%post', b'%postun', b'%pre',
+      b'%prep', b'%preun'])
+
+  # Rules to rewrite the lines of a RPM spec file generated with setup.py per
+  # section, where the preamble has an empty section name. A rule consists
+  # of the prefix of the line and the name of the rewrite method.
+  _SETUP_PY_REWRITE_RULES = {
+      b'': [
+          (b'%define name ', '_RewriteDefineNameLine'),
+          (b'%define version ', '_RewriteDefineVersionLine'),
+          (b'%define unmangled_version ',
+           '_RewriteDefineUnmangledVersionLine'),
+          (b'Summary: ', '_RewriteSummaryLine'),
+          (b'Source0: ', '_RewriteSource0Line'),
+          (b'BuildRoot: ', '_RewriteBuildRootLine'),
+          (b'Requires: ', '_RewriteRequiresLine'),
+          (b'BuildArch: noarch', '_RewriteBuildArchLine'),
+          (b'BuildRequires: ', '_RewriteBuildRequiresLine'),
+          (b'\n', '_RewriteEmptyLine')],
+      b'%prep': [
+          (b'%setup -n %{name}-%{unmangled_version}', '_RewriteSetupLine')],
+      b'%build': [
+          (b'python setup.py build', '_RewriteBuildLine')],
+      b'%install': [
+          (b'python setup.py install', '_RewriteInstallLine'),
+          (b'rm -rf $RPM_BUILD_ROOT\n', '_RewriteRemoveBuildRootLine')],
+      b'%clean': [
+          (b'rm -rf $RPM_BUILD_ROOT\n', '_RewriteRemoveBuildRootLine')]}
+
+  # Options of the bdist_rpm section in setup.cfg that are supported when
+  # generating the RPM spec file from the static metadata.
+  _BDIST_RPM_SUPPORTED_OPTIONS = frozenset([
+      'build_requires', 'conflicts', 'group', 'obsoletes', 'packager',
+      'provides', 'release', 'requires', 'vendor'])
+
+  # Options of the metadata section in setup.cfg and the corresponding
+  # PKG-INFO field names.
+  _SETUP_CONFIGURATION_METADATA_FIELDS = {
+      'author': 'author',
+      'author_email': 'author-email',
+      'description': 'summary',
+      'home_page': 'home-page',
+      'license': 'license',
+      'long_description': 'description',
+      'maintainer': 'maintainer',
+      'maintainer_email': 'maintainer-email',
+      'name': 'name',
+      'url': 'home-page',
+      'version': 'version'}
+
+  # Regular expression to split a bdist_rpm list option, as is done by
+  # distutils.
+  _STRING_LIST_SPLIT_RE = re.compile(r',\s*|\s+')
+
+  def _EndSetupPySpecFileSection(self, state, output_file_object):
+    """Ends a section of a RPM spec file generated with setup.py.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      output_file_object (file): output file-like object to write to.
+    """
+    if state.in_description:
+      state.in_description = False
+
+      if state.project_definition.description_long:
+        state.description = b'{0:s}\n\n'.format(
+            state.project_definition.description_long)
+      else:
+        state.description = b''.join(state.description_lines)
+
+      output_file_object.write(state.description)
+
   def _GetBuildDefinition(self, python2_only):
     """Retrieves the build definition.
 
@@ -40,19 +204,19 @@ class RPMSpecFileGenerator(object):
     lines.append(b'')
     return b'\n'.join(lines)
 
-  def _GetDocumentationFilesDefinition(self, source_directory):
+  def _GetDocumentationFilesDefinition(self, source_filenames):
     """Retrieves the documentation files definition.
 
     Args:
-      source_directory (str): path of the source directory.
+      source_filenames (set[str]): names of the files in the source
+          directory.
 
     Returns:
       str: documentation files definition.
     """
     doc_files = []
     for doc_file in self._DOC_FILENAMES:
-      doc_file_path = os.path.join(source_directory, doc_file)
-      if os.path.exists(doc_file_path):
+      if doc_file in source_filenames:
         doc_files.append(doc_file)
 
     doc_file_definition = b''
@@ -91,24 +255,779 @@ class RPMSpecFileGenerator(object):
     lines.append(b'')
     return b'\n'.join(lines)
 
-  def _GetLicenseFileDefinition(self, source_directory):
+  def _GetLicenseFileDefinition(self, source_filenames):
     """Retrieves the license file definition.
 
     Args:
-      source_directory (str): path of the source directory.
+      source_filenames (set[str]): names of the files in the source
+          directory.
 
     Returns:
       str: license file definition.
     """
     license_file_definition = b''
     for license_file in self._LICENSE_FILENAMES:
-      license_file_path = os.path.join(source_directory, license_file)
-      if os.path.exists(license_file_path):
+      if license_file in source_filenames:
         license_file_definition = b'%license {0:s}\n'.format(license_file)
         break
 
     return license_file_definition
 
+  def _GetMetadataSpecFileData(self, source_directory, source_helper_object):
+    """Retrieves the RPM spec file data from the static metadata.
+
+    Args:
+      source_directory (str): path of the source directory or None if the
+          files should be read from the source package.
+      source_helper_object (SourcePackageHelper): source package helper, used
+          to read the files from the source package without extracting it,
+          or None if the files should be read from the source directory.
+
+    Returns:
+      tuple: containing:
+
+        set[str]: names of the files in the source directory or None if not
+            available.
+        bytes: RPM spec file data or None if the static metadata is not
+            available or insufficient to generate the RPM spec file.
+    """
+    if source_helper_object:
+      source_filenames, metadata_files = self._ReadSourcePackage(
+          source_helper_object)
+    else:
+      source_filenames, metadata_files = self._ReadSourceDirectory(
+          source_directory)
+
+    if not metadata_files:
+      return source_filenames, None
+
+    return source_filenames, self._GetSetupPySpecFileData(metadata_files)
+
+  def _GetSetupPySpecFileData(self, metadata_files):
+    """Retrieves the RPM spec file data from the static metadata.
+
+    The static metadata is read from PKG-INFO and setup.cfg. The resulting
+    data is equivalent to the output of "setup.py bdist_rpm --spec-only".
+
+    Args:
+      metadata_files (dict[str, bytes]): data of the PKG-INFO, setup.cfg and
+          setup.py files in the source directory per filename. Files that are
+          not present are omitted.
+
+    Returns:
+      bytes: RPM spec file data or None if the static metadata is
+          insufficient to generate the RPM spec file.
+    """
+    # A setup.py that customizes bdist_rpm, for example with a custom
+    # command class, could generate a different RPM spec file.
+    setup_py_data = metadata_files.get('setup.py', None)
+    if setup_py_data and b'bdist_rpm' in setup_py_data:
+      return
+
+    metadata = {}
+    package_information_data = metadata_files.get('PKG-INFO', None)
+    if package_information_data is not None:
+      metadata = self._ReadPackageInformation(package_information_data)
+      if metadata is None:
+        return
+
+    setup_configuration = {}
+    setup_configuration_data = metadata_files.get('setup.cfg', None)
+    if setup_configuration_data is not None:
+      setup_configuration = self._ReadSetupConfiguration(
+          setup_configuration_data)
+      if setup_configuration is None:
+        return
+
+    for option_name, value in setup_configuration.get('metadata', {}).items():
+      field_name = self._SETUP_CONFIGURATION_METADATA_FIELDS.get(
+          option_name, None)
+      if not field_name or field_name in metadata:
+        continue
+
+      # Values that refer to attributes or files require setuptools.
+      if value.startswith('attr:') or value.startswith('file:'):
+        return
+
+      metadata[field_name] = value
+
+    name = metadata.get('name', 'UNKNOWN')
+    version = metadata.get('version', 'UNKNOWN')
+    if 'UNKNOWN' in (name, version):
+      return
+
+    bdist_rpm_options = setup_configuration.get('bdist_rpm', {})
+    for option_name in bdist_rpm_options.keys():
+      if option_name not in self._BDIST_RPM_SUPPORTED_OPTIONS:
+        return
+
+    release = bdist_rpm_options.get('release', '1')
+    group = bdist_rpm_options.get('group', 'Development/Libraries')
+
+    # Note that unmangled_version is defined twice on purpose. The setuptools
+    # version of bdist_rpm inserts its own definition after the one of
+    # the distutils version, and the generated RPM spec file must be identical
+    # to the one of "setup.py bdist_rpm --spec-only".
+    lines = [
+        '%define name {0:s}'.format(name),
+        '%define version {0:s}'.format(version.replace('-', '_')),
+        '%define unmangled_version {0:s}'.format(version),
+        '%define unmangled_version {0:s}'.format(version),
+        '%define release {0:s}'.format(release.replace('-', '_')),
+        '',
+        'Summary: {0:s}'.format(metadata.get('summary', 'UNKNOWN')),
+        'Name: %{name}',
+        'Version: %{version}',
+        'Release: %{release}',
+        'Source0: %{name}-%{unmangled_version}.tar.gz',
+        'License: {0:s}'.format(metadata.get('license', 'UNKNOWN')),
+        'Group: {0:s}'.format(group),
+        'BuildRoot: %{_tmppath}/%{name}-%{version}-%{release}-buildroot',
+        'Prefix: %{_prefix}',
+        # Note that the build architecture of architecture dependent projects
+        # is removed when the RPM spec file is rewritten.
+        'BuildArch: noarch']
+
+    vendor = bdist_rpm_options.get('vendor', None)
+    if not vendor:
+      contact = metadata.get(
+          'maintainer', None) or metadata.get('author', 'UNKNOWN')
+      contact_email = metadata.get(
+          'maintainer-email', None) or metadata.get('author-email', 'UNKNOWN')
+      vendor = '{0:s} <{1:s}>'.format(contact, contact_email)
+
+    lines.append('Vendor: {0:s}'.format(vendor))
+
+    packager = bdist_rpm_options.get('packager', None)
+    if packager:
+      lines.append('Packager: {0:s}'.format(packager))
+
+    for field_name, option_name in (
+        ('Provides', 'provides'), ('Requires', 'requires'),
+        ('Conflicts', 'conflicts'), ('Obsoletes', 'obsoletes')):
+      values = self._SplitStringList(bdist_rpm_options.get(option_name, ''))
+      if values:
+        lines.append('{0:s}: {1:s}'.format(field_name, ' '.join(values)))
+
+    url = metadata.get('home-page', 'UNKNOWN')
+    if url != 'UNKNOWN':
+      lines.append('Url: {0:s}'.format(url))
+
+    build_requires = self._SplitStringList(
+        bdist_rpm_options.get('build_requires', ''))
+    if build_requires:
+      lines.append('BuildRequires: {0:s}'.format(' '.join(build_requires)))
+
+    lines.extend([
+        '',
+        '%description',
+        metadata.get('description', 'UNKNOWN'),
+        '',
+        '%prep',
+        '%setup -n %{name}-%{unmangled_version}',
+        '',
+        '%build',
+        'python setup.py build',
+        '',
+        '%install',
+        ('python setup.py install --single-version-externally-managed -O1 '
+         '--root=$RPM_BUILD_ROOT --record=INSTALLED_FILES'),
+        '',
+        '%clean',
+        'rm -rf $RPM_BUILD_ROOT',
+        '',
+        '%files -f INSTALLED_FILES',
+        '%defattr(-,root,root)',
+        ''])
+
+    return '\n'.join(lines).encode('utf-8')
+
+  def _ReadPackageInformation(self, data):
+    """Reads the data of a PKG-INFO file.
+
+    Args:
+      data (bytes): data of the PKG-INFO file.
+
+    Returns:
+      dict[str, str]: values per lower case field name or None if the data
+          could not be read.
+    """
+    try:
+      data = data.decode('utf-8')
+    except UnicodeDecodeError:
+      logging.warning('Unable to decode PKG-INFO file.')
+      return
+
+    metadata = {}
+    field_name = None
+
+    lines = data.split('\n')
+    for line_index, line in enumerate(lines):
+      if not line:
+        # As of metadata version 2.1 the description can be stored in
+        # the message body.
+        description = '\n'.join(lines[line_index + 1:]).rstrip('\n')
+        if description and 'description' not in metadata:
+          metadata['description'] = description
+        break
+
+      if line[0] in (' ', '\t'):
+        # Continuation lines are prefixed with 8 spaces or 7 spaces and "|".
+        if field_name:
+          if line.startswith('        ') or line.startswith('       |'):
+            line = line[8:]
+          else:
+            line = line.lstrip()
+
+          metadata[field_name] = '\n'.join([metadata[field_name], line])
+        continue
+
+      field_name, _, value = line.partition(':')
+      field_name = field_name.strip().lower()
+
+      # Only the first value of fields that can be defined multiple times,
+      # such as Classifier, is used.
+      if field_name in metadata:
+        field_name = None
+        continue
+
+      metadata[field_name] = value.strip()
+
+    return metadata
+
+  def _ReadSetupConfiguration(self, data):
+    """Reads the data of a setup.cfg file.
+
+    Args:
+      data (bytes): data of the setup.cfg file.
+
+    Returns:
+      dict[str, dict[str, str]]: values per option name per section name or
+          None if the data could not be read.
+    """
+    try:
+      data = data.decode('utf-8')
+    except UnicodeDecodeError:
+      logging.warning('Unable to decode setup.cfg file.')
+      return
+
+    config_parser = configparser.RawConfigParser()
+
+    try:
+      # TODO: replace readfp by read_file, check if Python 2 compatible
+      config_parser.readfp(io.StringIO(data))
+    except configparser.Error as exception:
+      logging.warning('Unable to read setup.cfg file with error: {0!s}'.format(
+          exception))
+      return
+
+    setup_configuration = {}
+    for section_name in config_parser.sections():
+      setup_configuration[section_name] = dict(
+          config_parser.items(section_name))
+
+    return setup_configuration
+
+  def _ReadSourceDirectory(self, source_directory):
+    """Reads the files used for generating from a source directory.
+
+    Args:
+      source_directory (str): path of the source directory.
+
+    Returns:
+      tuple: containing:
+
+        set[str]: names of the files in the source directory.
+        dict[str, bytes]: data of the PKG-INFO, setup.cfg and setup.py files
+            per filename.
+    """
+    source_filenames = set()
+    for filename in os.listdir(source_directory):
+      if os.path.isfile(os.path.join(source_directory, filename)):
+        source_filenames.add(filename)
+
+    metadata_files = {}
+    for filename in self._METADATA_FILENAMES.intersection(source_filenames):
+      path = os.path.join(source_directory, filename)
+      with open(path, 'rb') as file_object:
+        metadata_files[filename] = file_object.read()
+
+    return source_filenames, metadata_files
+
+  def _ReadSourcePackage(self, source_helper_object):
+    """Reads the files used for generating from a source package.
+
+    The source package is not extracted.
+
+    Args:
+      source_helper_object (SourcePackageHelper): source package helper.
+
+    Returns:
+      tuple: containing:
+
+        set[str]: names of the files in the source directory in the source
+            package or None if not available.
+        dict[str, bytes]: data of the PKG-INFO, setup.cfg and setup.py files
+            per filename or None if not available.
+    """
+    paths = source_helper_object.GetArchiveMemberPaths()
+    if paths is None:
+      return None, None
+
+    source_filenames = set([path for path in paths if '/' not in path])
+
+    metadata_filenames = self._METADATA_FILENAMES.intersection(
+        source_filenames)
+
+    metadata_files = source_helper_object.ReadArchiveMembers(
+        metadata_filenames)
+    if metadata_files is None or len(metadata_files) != len(
+        metadata_filenames):
+      return None, None
+
+    return source_filenames, metadata_files
+
+  def _ReadSpecFileSections(self, input_file_object):
+    """Reads the sections of a RPM spec file.
+
+    The RPM spec file is read line by line, hence only the current line is
+    kept in memory.
+
+    Args:
+      input_file_object (file): input file-like object to read from.
+
+    Yields:
+      tuple[bytes, bool, bytes]: name of the section, such as "%prep",
+          True if the line is the header of the section and the line. The
+          name of the preamble is an empty string.
+    """
+    section_name = b''
+    for line in input_file_object:
+      is_header = False
+      if line.startswith(b'%'):
+        keyword = line.split(None, 1)[0]
+        if keyword in self._SECTION_NAMES:
+          section_name = keyword
+          is_header = True
+
+      yield section_name, is_header, line
+
+  def _RewriteBuildArchLine(self, state, line):
+    """Rewrites the BuildArch tag line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if state.project_definition.architecture_dependent:
+      return
+
+    return line
+
+  def _RewriteBuildLine(self, state, unused_line):
+    """Rewrites the setup.py build line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    return self._GetBuildDefinition(state.python2_only)
+
+  def _RewriteBuildRequiresLine(self, state, unused_line):
+    """Rewrites the BuildRequires tag line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    state.has_build_requires = True
+    return b'BuildRequires: {0:s}\n'.format(b', '.join(
+        state.rpm_build_dependencies))
+
+  def _RewriteBuildRootLine(self, state, unused_line):
+    """Rewrites the BuildRoot tag line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if state.project_name == 'efilter':
+      return (
+          b'BuildRoot: %{_tmppath}/'
+          b'dotty-%{version}-%{release}-buildroot\n')
+
+    if state.project_name == 'psutil':
+      return (
+          b'BuildRoot: %{_tmppath}/'
+          b'%{name}-release-%{version}-%{release}-buildroot\n')
+
+    return (
+        b'BuildRoot: %{_tmppath}/'
+        b'%{unmangled_name}-release-%{version}-%{release}-buildroot\n')
+
+  def _RewriteDefineNameLine(self, state, unused_line):
+    """Rewrites the name define line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    # Need to override the project name for projects that prefix
+    # their name with "python-" (or equivalent) in setup.py but
+    # do not use it for their source package name.
+    return b'%define name {0:s}\n'.format(state.project_name)
+
+  def _RewriteDefineUnmangledVersionLine(self, state, line):
+    """Rewrites the unmangled version define line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    # setup.py generates %define unmangled_version twice ignore
+    # the second define.
+    if state.has_unmangled_version:
+      return
+
+    state.has_unmangled_version = True
+
+    if state.project_name == 'efilter':
+      line = b'%define unmangled_version {0:s}\n'.format(state.version)
+
+    return b''.join([
+        b'%define unmangled_name {0:s}\n'.format(state.unmangled_name), line])
+
+  def _RewriteDefineVersionLine(self, state, line):
+    """Rewrites the version define line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    version = line[16:-1]
+    if version.startswith(b'1!'):
+      version = version[2:]
+
+    state.version = version
+
+    if state.project_name == 'efilter':
+      line = b'%define version {0:s}\n'.format(version)
+
+    return line
+
+  def _RewriteEmptyLine(self, state, line):
+    """Rewrites an empty line.
+
+    The build requirements are inserted at the first empty line after the
+    Summary tag line, if the spec file does not define them.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if not state.summary or state.has_build_requires:
+      return line
+
+    state.has_build_requires = True
+    return b'BuildRequires: {0:s}\n\n'.format(b', '.join(
+        state.rpm_build_dependencies))
+
+  def _RewriteInstallLine(self, state, unused_line):
+    """Rewrites the setup.py install line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    return self._GetInstallDefinition(state.project_name, state.python2_only)
+
+  def _RewriteRemoveBuildRootLine(self, unused_state, unused_line):
+    """Rewrites the line that removes the build root.
+
+    Args:
+      unused_state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    return b'rm -rf %{buildroot}\n'
+
+  def _RewriteRequiresLine(self, state, line):
+    """Rewrites the Requires tag line.
+
+    The first Requires tag line is removed and used for the Python package
+    definitions.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if state.requires:
+      return line
+
+    state.requires = line
+    return
+
+  def _RewriteSetupLine(self, state, unused_line):
+    """Rewrites the setup macro line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if state.project_name == 'efilter':
+      return b'%autosetup -n dotty-%{unmangled_version}\n'
+
+    if state.project_name == 'psutil':
+      return b'%autosetup -n %{name}-release-%{unmangled_version}\n'
+
+    return b'%autosetup -n %{unmangled_name}-%{unmangled_version}\n'
+
+  def _RewriteSetupPyGeneratedFile(
+      self, project_definition, source_filenames, source_filename,
+      project_name, rpm_build_dependencies, input_file_object,
+      output_file_object, python2_package_prefix='python-'):
+    """Rewrites the RPM spec file generated with setup.py.
+
+    The RPM spec file is rewritten in a single pass, where the sections of
+    the spec file are read as events and the lines are rewritten by the
+    rewrite rules of the section.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      source_filenames (set[str]): names of the files in the source
+          directory.
+      source_filename (str): name of the source package.
+      project_name (str): name of the project.
+      rpm_build_dependencies (list[str]): RPM build dependencies.
+      input_file_object (file): input file-like object to read from.
+      output_file_object (file): output file-like object to write to.
+      python2_package_prefix (Optional[str]): name prefix for Python 2 packages.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    state = RPMSpecFileRewriteState(
+        project_definition, project_name, source_filename,
+        rpm_build_dependencies, python2_package_prefix)
+
+    for section_name, is_header, line in self._ReadSpecFileSections(
+        input_file_object):
+      if is_header:
+        self._EndSetupPySpecFileSection(state, output_file_object)
+
+        # The files sections are generated based on the project definition.
+        if section_name == b'%files':
+          break
+
+        line = self._StartSetupPySpecFileSection(
+            state, output_file_object, section_name, line)
+
+      elif state.in_python_package:
+        continue
+
+      else:
+        line = self._RewriteSetupPySpecFileLine(state, section_name, line)
+
+      if line:
+        output_file_object.write(line)
+
+    python2_only = state.python2_only
+    package_name = state.package_name
+    version = state.version
+
+    license_line = self._GetLicenseFileDefinition(source_filenames)
+
+    doc_line = self._GetDocumentationFilesDefinition(source_filenames)
+
+    if project_name != package_name:
+      python_package_name = b'{0:s}{1:s}'.format(
+          python2_package_prefix, package_name)
+    else:
+      python_package_name = b'{0:s}%{{name}}'.format(python2_package_prefix)
+
+    self._WritePython2PackageFiles(
+        output_file_object, project_definition, project_name,
+        python_package_name, license_line, doc_line)
+
+    if not python2_only:
+      if project_name != package_name:
+        python_package_name = b'python3-{0:s}'.format(package_name)
+      else:
+        python_package_name = b'python3-%{name}'
+
+      self._WritePython3PackageFiles(
+          output_file_object, project_definition, project_name,
+          python_package_name, license_line, doc_line)
+
+    if project_name in ('artifacts', 'plaso'):
+      output_file_object.write(
+          b'\n'
+          b'%files -n %{name}-data\n'
+          b'%{_datadir}/%{name}/*\n')
+
+    # TODO: add bindir support.
+    output_file_object.write((
+        b'\n'
+        b'%exclude %{_bindir}/*\n'))
+
+    if project_name == 'pysqlite':
+      output_file_object.write(b'%exclude /usr/pysqlite2-doc/*\n')
+
+    # TODO: add shared data support.
+
+    self._WriteChangeLog(output_file_object, version)
+
+    return True
+
+  def _RewriteSetupPySpecFileLine(self, state, section_name, line):
+    """Rewrites a line of a RPM spec file generated with setup.py.
+
+    The first rewrite rule of the section of which the prefix matches
+    the line is applied.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      section_name (bytes): name of the section.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if state.in_description:
+      # Ignore leading white lines in the description.
+      if state.description_lines or line != b'\n':
+        state.description_lines.append(line)
+      return
+
+    for prefix, method_name in self._SETUP_PY_REWRITE_RULES.get(
+        section_name, []):
+      if line.startswith(prefix):
+        rewrite_method = getattr(self, method_name)
+        return rewrite_method(state, line)
+
+    return line
+
+  def _RewriteSource0Line(self, state, unused_line):
+    """Rewrites the Source0 tag line.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      unused_line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if state.source_filename.endswith('.zip'):
+      return b'Source0: %{unmangled_name}-%{unmangled_version}.zip\n'
+
+    return b'Source0: %{unmangled_name}-%{unmangled_version}.tar.gz\n'
+
+  def _RewriteSummaryLine(self, state, line):
+    """Rewrites the Summary tag line.
+
+    The first Summary tag line is used for the Python package definitions.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      line (bytes): line.
+
+    Returns:
+      bytes: rewritten line or None if the line should be removed.
+    """
+    if not state.summary:
+      state.summary = line
+
+    return line
+
+  def _SplitStringList(self, value):
+    """Splits a bdist_rpm list option.
+
+    Args:
+      value (str): value of the option.
+
+    Returns:
+      list[str]: values in the option.
+    """
+    return [
+        string for string in self._STRING_LIST_SPLIT_RE.split(value.strip())
+        if string]
+
+  def _StartSetupPySpecFileSection(
+      self, state, output_file_object, section_name, line):
+    """Starts a section of a RPM spec file generated with setup.py.
+
+    Args:
+      state (RPMSpecFileRewriteState): rewrite state.
+      output_file_object (file): output file-like object to write to.
+      section_name (bytes): name of the section.
+      line (bytes): header line of the section.
+
+    Returns:
+      bytes: rewritten header line or None if the line should be removed.
+    """
+    if state.in_python_package:
+      if section_name != b'%prep':
+        return
+
+      state.in_python_package = False
+
+    if section_name == b'%description':
+      if not state.has_description:
+        state.has_description = True
+        state.in_description = True
+
+    elif section_name == b'%package':
+      if (line.startswith(b'%package -n python-') or
+          line.startswith(b'%package -n python2-')):
+        if state.project_name in ('artifacts', 'plaso'):
+          state.in_python_package = True
+          return
+
+        state.has_python2_package = True
+
+      elif line.startswith(b'%package -n python3-'):
+        state.has_python3_package = True
+
+    elif section_name == b'%prep':
+      self._WriteSetupPyPackageDefinitions(state, output_file_object)
+
+    return line
+
   def _WriteChangeLog(self, output_file_object, version):
     """Writes the change log.
 
@@ -306,311 +1225,78 @@ class RPMSpecFileGenerator(object):
           b'/usr/lib/python3*/site-packages/{3:s}*.egg-info\n').format(
               name, license_line, doc_line, setup_name))
 
-  def GenerateWithSetupPy(self, source_directory, build_log_file):
-    """Generates the RPM spec file with setup.py.
+  def _WriteSetupPyPackageDefinitions(self, state, output_file_object):
+    """Writes the package definitions missing from the setup.py spec file.
 
     Args:
-      source_directory (str): path of the source directory.
-      build_log_file (str): path of the build log file.
-
-    Returns:
-      bool: True if successful, False otherwise.
-    """
-    command = '{0:s} setup.py bdist_rpm --spec-only >> {1:s} 2>&1'.format(
-        sys.executable, build_log_file)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
-      return False
-
-    return True
-
-  def _RewriteSetupPyGeneratedFile(
-      self, project_definition, source_directory, source_filename,
-      project_name, rpm_build_dependencies, input_file, output_file_object,
-      python2_package_prefix='python-'):
-    """Rewrites the RPM spec file generated with setup.py.
-
-    Args:
-      project_definition (ProjectDefinition): project definition.
-      source_directory (str): path of the source directory.
-      source_filename (str): name of the source package.
-      project_name (str): name of the project.
-      rpm_build_dependencies (list[str]): RPM build dependencies.
-      input_file (str): path of the input RPM spec file.
+      state (RPMSpecFileRewriteState): rewrite state.
       output_file_object (file): output file-like object to write to.
-      python2_package_prefix (Optional[str]): name prefix for Python 2 packages.
-
-    Returns:
-      bool: True if successful, False otherwise.
     """
-    description = b''
-    requires = b''
-    summary = b''
-    version = b''
-
-    in_description = False
-    in_python_package = False
-    has_build_requires = False
-    has_python2_package = False
-    has_python3_package = False
-    has_unmangled_version = False
-
-    python2_only = project_definition.IsPython2Only()
-
-    if project_definition.rpm_name:
-      package_name = project_definition.rpm_name
-    else:
-      package_name = project_name
-
-    if package_name.startswith('python-'):
-      package_name = package_name[7:]
-
-    if project_definition.setup_name and project_name != 'dateutil':
-      unmangled_name = project_definition.setup_name
-    else:
-      unmangled_name = project_name
-
-    with open(input_file, 'r+b') as input_file_object:
-      for line in input_file_object.readlines():
-        if line.startswith(b'%') and in_description:
-          in_description = False
-
-          if project_definition.description_long:
-            description = b'{0:s}\n\n'.format(
-                project_definition.description_long)
-
-          output_file_object.write(description)
-
-        if line.startswith(b'%prep') and in_python_package:
-          in_python_package = False
+    project_name = state.project_name
+    package_name = state.package_name
 
-        if in_python_package:
-          continue
-
-        if line.startswith(b'%define name '):
-          # Need to override the project name for projects that prefix
-          # their name with "python-" (or equivalent) in setup.py but
-          # do not use it for their source package name.
-          line = b'%define name {0:s}\n'.format(project_name)
-
-        elif line.startswith(b'%define version '):
-          version = line[16:-1]
-          if version.startswith(b'1!'):
-            version = version[2:]
-
-          if project_name == 'efilter':
-            line = b'%define version {0:s}\n'.format(version)
-
-        elif line.startswith(b'%define unmangled_version '):
-          # setup.py generates %define unmangled_version twice ignore
-          # the second define.
-          if has_unmangled_version:
-            continue
-
-          output_file_object.write(
-              b'%define unmangled_name {0:s}\n'.format(unmangled_name))
-
-          if project_name == 'efilter':
-            line = b'%define unmangled_version {0:s}\n'.format(version)
-
-          has_unmangled_version = True
-
-        elif not summary and line.startswith(b'Summary: '):
-          summary = line
-
-        elif line.startswith(b'Source0: '):
-          if source_filename.endswith('.zip'):
-            line = b'Source0: %{unmangled_name}-%{unmangled_version}.zip\n'
-          else:
-            line = b'Source0: %{unmangled_name}-%{unmangled_version}.tar.gz\n'
-
-        elif line.startswith(b'BuildRoot: '):
-          if project_name == 'efilter':
-            line = (
-                b'BuildRoot: %{_tmppath}/'
-                b'dotty-%{version}-%{release}-buildroot\n')
-
-          elif project_name == 'psutil':
-            line = (
-                b'BuildRoot: %{_tmppath}/'
-                b'%{name}-release-%{version}-%{release}-buildroot\n')
-
-          else:
-            line = (
-                b'BuildRoot: %{_tmppath}/'
-                b'%{unmangled_name}-release-%{version}-%{release}-buildroot\n')
-
-        elif (not description and not requires and
-              line.startswith(b'Requires: ')):
-          requires = line
-          continue
-
-        elif line.startswith(b'BuildArch: noarch'):
-          if project_definition.architecture_dependent:
-            continue
-
-        elif line.startswith(b'BuildRequires: '):
-          has_build_requires = True
-          line = b'BuildRequires: {0:s}\n'.format(b', '.join(
-              rpm_build_dependencies))
-
-        elif line == b'\n' and summary and not has_build_requires:
-          has_build_requires = True
-          line = b'BuildRequires: {0:s}\n\n'.format(b', '.join(
-              rpm_build_dependencies))
-
-        elif line.startswith(b'%description') and not description:
-          in_description = True
-
-        elif (line.startswith(b'%package -n python-') or
-              line.startswith(b'%package -n python2-')):
-          if project_name in ('artifacts', 'plaso'):
-            in_python_package = True
-            continue
-
-          has_python2_package = True
-
-        elif line.startswith(b'%package -n python3-'):
-          has_python3_package = True
-
-        elif line.startswith(b'%prep'):
-          if project_name in ('artifacts', 'plaso'):
-            requires = b'{0:s}, {1:s}-data\n'.format(
-                requires[:-1], project_name)
-
-          if not has_python2_package:
-            if project_name != package_name:
-              python_package_name = b'{0:s}{1:s}'.format(
-                  python2_package_prefix, package_name)
-            else:
-              python_package_name = b'{0:s}%{{name}}'.format(
-                  python2_package_prefix)
-
-            if python_package_name != b'%{name}':
-              self._WritePython2PackageDefinition(
-                  output_file_object, python_package_name, summary, requires,
-                  description)
-
-          if not python2_only and not has_python3_package:
-            if project_name != package_name:
-              python_package_name = b'python3-{0:s}'.format(package_name)
-            else:
-              python_package_name = b'python3-%{name}'
-
-            # TODO: convert python 2 package names to python 3
-            self._WritePython3PackageDefinition(
-                output_file_object, python_package_name, summary, requires,
-                description)
-
-          if project_name in ('artifacts', 'plaso'):
-            output_file_object.write((
-                b'%package -n %{{name}}-data\n'
-                b'{0:s}'
-                b'\n'
-                b'%description -n %{{name}}-data\n'
-                b'{1:s}').format(summary, description))
-
-          elif project_name == 'efilter':
-            output_file_object.write((
-                b'%package -n %{{name}}-data\n'
-                b'{0:s}'
-                b'Requires: python-dateutil, python-six >= 1.4.0, pytz'
-                b'\n'
-                b'%description -n %{{name}}-data\n'
-                b'{1:s}').format(summary, description))
-
-          elif project_name == 'PyYAML':
-            output_file_object.write(
-                b'%global debug_package %{nil}\n'
-                b'\n')
-
-        elif line.startswith(b'%setup -n %{name}-%{unmangled_version}'):
-          if project_name == 'efilter':
-            line = b'%autosetup -n dotty-%{unmangled_version}\n'
-          elif project_name == 'psutil':
-            line = b'%autosetup -n %{name}-release-%{unmangled_version}\n'
-          else:
-            line = b'%autosetup -n %{unmangled_name}-%{unmangled_version}\n'
-
-        elif line.startswith(b'python setup.py build'):
-          line = self._GetBuildDefinition(python2_only)
-
-        elif line.startswith(b'python setup.py install'):
-          line = self._GetInstallDefinition(project_name, python2_only)
-
-        elif line == b'rm -rf $RPM_BUILD_ROOT\n':
-          line = b'rm -rf %{buildroot}\n'
-
-        elif line.startswith(b'%files'):
-          break
-
-        elif in_description:
-          # Ignore leading white lines in the description.
-          if not description and line == b'\n':
-            continue
-
-          description = b''.join([description, line])
-          continue
-
-        output_file_object.write(line)
-
-    license_line = self._GetLicenseFileDefinition(source_directory)
-
-    doc_line = self._GetDocumentationFilesDefinition(source_directory)
+    if project_name in ('artifacts', 'plaso'):
+      state.requires = b'{0:s}, {1:s}-data\n'.format(
+          state.requires[:-1], project_name)
 
-    if project_name != package_name:
-      python_package_name = b'{0:s}{1:s}'.format(
-          python2_package_prefix, package_name)
-    else:
-      python_package_name = b'{0:s}%{{name}}'.format(python2_package_prefix)
+    if not state.has_python2_package:
+      if project_name != package_name:
+        python_package_name = b'{0:s}{1:s}'.format(
+            state.python2_package_prefix, package_name)
+      else:
+        python_package_name = b'{0:s}%{{name}}'.format(
+            state.python2_package_prefix)
 
-    self._WritePython2PackageFiles(
-        output_file_object, project_definition, project_name,
-        python_package_name, license_line, doc_line)
+      if python_package_name != b'%{name}':
+        self._WritePython2PackageDefinition(
+            output_file_object, python_package_name, state.summary,
+            state.requires, state.description)
 
-    if not python2_only:
+    if not state.python2_only and not state.has_python3_package:
       if project_name != package_name:
         python_package_name = b'python3-{0:s}'.format(package_name)
       else:
         python_package_name = b'python3-%{name}'
 
-      self._WritePython3PackageFiles(
-          output_file_object, project_definition, project_name,
-          python_package_name, license_line, doc_line)
+      # TODO: convert python 2 package names to python 3
+      self._WritePython3PackageDefinition(
+          output_file_object, python_package_name, state.summary,
+          state.requires, state.description)
 
     if project_name in ('artifacts', 'plaso'):
-      output_file_object.write(
+      output_file_object.write((
+          b'%package -n %{{name}}-data\n'
+          b'{0:s}'
           b'\n'
-          b'%files -n %{name}-data\n'
-          b'%{_datadir}/%{name}/*\n')
-
-    # TODO: add bindir support.
-    output_file_object.write((
-        b'\n'
-        b'%exclude %{_bindir}/*\n'))
-
-    if project_name == 'pysqlite':
-      output_file_object.write(b'%exclude /usr/pysqlite2-doc/*\n')
+          b'%description -n %{{name}}-data\n'
+          b'{1:s}').format(state.summary, state.description))
 
-    # TODO: add shared data support.
+    elif project_name == 'efilter':
+      output_file_object.write((
+          b'%package -n %{{name}}-data\n'
+          b'{0:s}'
+          b'Requires: python-dateutil, python-six >= 1.4.0, pytz'
+          b'\n'
+          b'%description -n %{{name}}-data\n'
+          b'{1:s}').format(state.summary, state.description))
 
-    self._WriteChangeLog(output_file_object, version)
+    elif project_name == 'PyYAML':
+      output_file_object.write(
+          b'%global debug_package %{nil}\n'
+          b'\n')
 
-    return True
-
-  def RewriteSetupPyGeneratedFile(
-      self, project_definition, source_directory, source_filename,
-      project_name, input_file, output_file):
-    """Rewrites the RPM spec file generated with setup.py.
+  def _WriteSetupPySpecFile(
+      self, project_definition, source_filenames, source_filename,
+      project_name, input_file_object, output_file):
+    """Writes the RPM spec file based on a setup.py generated RPM spec file.
 
     Args:
       project_definition (ProjectDefinition): project definition.
-      source_directory (str): path of the source directory.
+      source_filenames (set[str]): names of the files in the source
+          directory.
       source_filename (str): name of the source package.
       project_name (str): name of the project.
-      input_file (str): path of the input RPM spec file.
+      input_file_object (file): input file-like object to read from.
       output_file (str): path of the output RPM spec file.
 
     Returns:
@@ -654,25 +1340,26 @@ class RPMSpecFileGenerator(object):
       python2_package_prefix = 'python-'
 
     result = self._RewriteSetupPyGeneratedFile(
-        project_definition, source_directory, source_filename, project_name,
-        rpm_build_dependencies, input_file, output_file_object,
+        project_definition, source_filenames, source_filename, project_name,
+        rpm_build_dependencies, input_file_object, output_file_object,
         python2_package_prefix=python2_package_prefix)
 
     output_file_object.close()
 
     return result
 
-  def RewriteSetupPyGeneratedFileForOSC(
-      self, project_definition, source_directory, source_filename,
-      project_name, input_file, output_file):
-    """Rewrites the RPM spec file generated with setup.py for OSC.
+  def _WriteSetupPySpecFileForOSC(
+      self, project_definition, source_filenames, source_filename,
+      project_name, input_file_object, output_file):
+    """Writes the OSC RPM spec file based on a setup.py generated RPM spec file.
 
     Args:
       project_definition (ProjectDefinition): project definition.
-      source_directory (str): path of the source directory.
+      source_filenames (set[str]): names of the files in the source
+          directory.
       source_filename (str): name of the source package.
       project_name (str): name of the project.
-      input_file (str): path of the input RPM spec file.
+      input_file_object (file): input file-like object to read from.
       output_file (str): path of the output RPM spec file.
 
     Returns:
@@ -695,9 +1382,138 @@ class RPMSpecFileGenerator(object):
     output_file_object = open(output_file, 'wb')
 
     result = self._RewriteSetupPyGeneratedFile(
-        project_definition, source_directory, source_filename, project_name,
-        rpm_build_dependencies, input_file, output_file_object)
+        project_definition, source_filenames, source_filename, project_name,
+        rpm_build_dependencies, input_file_object, output_file_object)
 
     output_file_object.close()
 
     return result
+
+  def GenerateWithMetadata(
+      self, project_definition, source_directory, source_filename,
+      project_name, output_file, source_helper_object=None):
+    """Generates the RPM spec file with the static metadata.
+
+    The static metadata is read from PKG-INFO and setup.cfg, which does not
+    require setup.py to be run. If the static metadata is insufficient
+    GenerateWithSetupPy and RewriteSetupPyGeneratedFile should be used
+    instead.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      source_directory (str): path of the source directory or None if the
+          files should be read from the source package.
+      source_filename (str): name of the source package.
+      project_name (str): name of the project.
+      output_file (str): path of the output RPM spec file.
+      source_helper_object (Optional[SourcePackageHelper]): source package
+          helper, used to read the files from the source package without
+          extracting it.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    source_filenames, spec_file_data = self._GetMetadataSpecFileData(
+        source_directory, source_helper_object)
+    if not spec_file_data:
+      return False
+
+    input_file_object = io.BytesIO(spec_file_data)
+    return self._WriteSetupPySpecFile(
+        project_definition, source_filenames, source_filename, project_name,
+        input_file_object, output_file)
+
+  def GenerateWithMetadataForOSC(
+      self, project_definition, source_directory, source_filename,
+      project_name, output_file, source_helper_object=None):
+    """Generates the RPM spec file with the static metadata for OSC.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      source_directory (str): path of the source directory or None if the
+          files should be read from the source package.
+      source_filename (str): name of the source package.
+      project_name (str): name of the project.
+      output_file (str): path of the output RPM spec file.
+      source_helper_object (Optional[SourcePackageHelper]): source package
+          helper, used to read the files from the source package without
+          extracting it.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    source_filenames, spec_file_data = self._GetMetadataSpecFileData(
+        source_directory, source_helper_object)
+    if not spec_file_data:
+      return False
+
+    input_file_object = io.BytesIO(spec_file_data)
+    return self._WriteSetupPySpecFileForOSC(
+        project_definition, source_filenames, source_filename, project_name,
+        input_file_object, output_file)
+
+  def GenerateWithSetupPy(self, source_directory, build_log_file):
+    """Generates the RPM spec file with setup.py.
+
+    Args:
+      source_directory (str): path of the source directory.
+      build_log_file (str): path of the build log file.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    command = '{0:s} setup.py bdist_rpm --spec-only >> {1:s} 2>&1'.format(
+        sys.executable, build_log_file)
+    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+        source_directory, command), shell=True)
+    if exit_code != 0:
+      logging.error('Running: "{0:s}" failed.'.format(command))
+      return False
+
+    return True
+
+  def RewriteSetupPyGeneratedFile(
+      self, project_definition, source_directory, source_filename,
+      project_name, input_file, output_file):
+    """Rewrites the RPM spec file generated with setup.py.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      source_directory (str): path of the source directory.
+      source_filename (str): name of the source package.
+      project_name (str): name of the project.
+      input_file (str): path of the input RPM spec file.
+      output_file (str): path of the output RPM spec file.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    source_filenames, _ = self._ReadSourceDirectory(source_directory)
+
+    with open(input_file, 'rb') as input_file_object:
+      return self._WriteSetupPySpecFile(
+          project_definition, source_filenames, source_filename, project_name,
+          input_file_object, output_file)
+
+  def RewriteSetupPyGeneratedFileForOSC(
+      self, project_definition, source_directory, source_filename,
+      project_name, input_file, output_file):
+    """Rewrites the RPM spec file generated with setup.py for OSC.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      source_directory (str): path of the source directory.
+      source_filename (str): name of the source package.
+      project_name (str): name of the project.
+      input_file (str): path of the input RPM spec file.
+      output_file (str): path of the output RPM spec file.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    source_filenames, _ = self._ReadSourceDirectory(source_directory)
+
+    with open(input_file, 'rb') as input_file_object:
+      return self._WriteSetupPySpecFileForOSC(
+          project_definition, source_filenames, source_filename, project_name,
+          input_file_object, output_file)
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""URL opener object implementations.
+
+The URL openers are used by the download helpers and tools to retrieve web
+content. Besides opening URLs on the network, responses can be recorded to
+and replayed from a fixture directory, which allows running the download
+helpers offline and deterministically.
+
+The URL opener used by default can be set with the L2TDEVTOOLS_URL_FIXTURES
+environment variable, in the form "record:PATH" or "replay:PATH".
+"""
+
+from __future__ import unicode_literals
+
+import abc
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+
+# pylint: disable=import-error,no-name-in-module
+if sys.version_info[0] < 3:
+  import urllib2 as urllib_error
+  import urllib2 as urllib_request
+else:
+  import urllib.error as urllib_error
+  import urllib.request as urllib_request
+
+from l2tdevtools import json_file
+
+
+class URLResponse(object):
+  """URL response.
+
+  Attributes:
+    code (int): HTTP status code.
+    headers (dict[str, str]): response headers, with lower case names.
+    url (str): URL.
+  """
+
+  def __init__(self, url, code, headers, data):
+    """Initializes a URL response.
+
+    Args:
+      url (str): URL.
+      code (int): HTTP status code.
+      headers (dict[str, str]): response headers.
+      data (bytes): response data.
+    """
+    super(URLResponse, self).__init__()
+    self._data = data
+    self.code = code
+    self.headers = {
+        name.lower(): value for name, value in headers.items()}
+    self.url = url
+
+  def read(self):  # pylint: disable=invalid-name
+    """Reads the response data.
+
+    The name of this method matches that of file-like objects.
+
+    Returns:
+      bytes: response data.
+    """
+    return self._data
+
+
+class URLOpener(object):
+  """URL opener interface."""
+
+  @abc.abstractmethod
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      URLResponse: response or None if the URL could not be opened.
+    """
+
+
+class LiveURLOpener(URLOpener):
+  """URL opener that opens URLs on the network."""
+
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Note that HTTP errors, such as 404 (Not Found) or 304 (Not Modified),
+    are returned as responses with the corresponding status code.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      URLResponse: response or None if the URL could not be opened.
+    """
+    request = urllib_request.Request(url, headers=headers or {})
+
+    try:
+      url_object = urllib_request.urlopen(request)
+    except urllib_error.HTTPError as exception:
+      url_object = exception
+    except urllib_error.URLError as exception:
+      logging.warning('Unable to download URL: {0:s} with error: {1!s}'.format(
+          url, exception))
+      return
+
+    response_headers = dict(url_object.info().items())
+    return URLResponse(
+        url, url_object.code, response_headers, url_object.read())
+
+
+class URLFixtureStore(object):
+  """Directory with recorded URL responses.
+
+  Every response is stored as a JSON file with the URL, status code and
+  headers, and a data file with the response data. The file names are
+  derived from the SHA-256 hash of the URL, such that a response can be
+  looked up without an index.
+  """
+
+  # The response headers that are recorded, other headers like cookies
+  # and rate limits are not needed to replay the responses.
+  _RECORDED_HEADERS = frozenset([
+      'content-type', 'etag', 'last-modified', 'link'])
+
+  def __init__(self, path):
+    """Initializes an URL fixture store.
+
+    Args:
+      path (str): path of the fixture directory.
+    """
+    super(URLFixtureStore, self).__init__()
+    self._path = path
+
+  def _GetPathPrefix(self, url):
+    """Retrieves the path prefix of the files of an URL.
+
+    Args:
+      url (str): URL.
+
+    Returns:
+      str: path prefix.
+    """
+    url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(self._path, url_hash)
+
+  def AddResponse(self, response):
+    """Adds a response.
+
+    Args:
+      response (URLResponse): response.
+    """
+    if not os.path.exists(self._path):
+      os.makedirs(self._path)
+
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name in self._RECORDED_HEADERS}
+
+    json_dict = {
+        'code': response.code,
+        'headers': headers,
+        'url': response.url}
+
+    path_prefix = self._GetPathPrefix(response.url)
+    json_file.WriteFile('{0:s}.json'.format(path_prefix), json_dict)
+
+    with open('{0:s}.data'.format(path_prefix), 'wb') as file_object:
+      file_object.write(response.read())
+
+  def GetResponse(self, url):
+    """Retrieves a recorded response.
+
+    Args:
+      url (str): URL.
+
+    Returns:
+      URLResponse: response or None if no response was recorded.
+    """
+    path_prefix = self._GetPathPrefix(url)
+
+    json_path = '{0:s}.json'.format(path_prefix)
+    if not os.path.exists(json_path):
+      return
+
+    with io.open(json_path, 'r', encoding='utf-8') as file_object:
+      json_dict = json.load(file_object)
+
+    with open('{0:s}.data'.format(path_prefix), 'rb') as file_object:
+      data = file_object.read()
+
+    return URLResponse(
+        json_dict['url'], json_dict['code'], json_dict['headers'], data)
+
+
+class RecordingURLOpener(URLOpener):
+  """URL opener that records the responses of another URL opener."""
+
+  def __init__(self, fixture_store, url_opener=None):
+    """Initializes a recording URL opener.
+
+    Args:
+      fixture_store (URLFixtureStore): store to record the responses to.
+      url_opener (Optional[URLOpener]): URL opener to record, where None
+          represents a live URL opener.
+    """
+    super(RecordingURLOpener, self).__init__()
+    self._fixture_store = fixture_store
+    self._url_opener = url_opener or LiveURLOpener()
+
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      URLResponse: response or None if the URL could not be opened.
+    """
+    response = self._url_opener.Open(url, headers=headers)
+    # Conditional requests are not recorded, since their responses depend
+    # on the state of the client.
+    if response and not headers:
+      self._fixture_store.AddResponse(response)
+
+    return response
+
+
+class ReplayURLOpener(URLOpener):
+  """URL opener that replays recorded responses."""
+
+  def __init__(self, fixture_store):
+    """Initializes a replay URL opener.
+
+    Args:
+      fixture_store (URLFixtureStore): store to replay the responses from.
+    """
+    super(ReplayURLOpener, self).__init__()
+    self._fixture_store = fixture_store
+
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers, which are ignored.
+
+    Returns:
+      URLResponse: response or None if no response was recorded.
+    """
+    response = self._fixture_store.GetResponse(url)
+    if not response:
+      logging.warning('No recorded response for URL: {0:s}'.format(url))
+
+    return response
+
+
+_url_opener = None
+
+
+def GetURLOpener():
+  """Retrieves the URL opener.
+
+  Returns:
+    URLOpener: URL opener set by SetURLOpener or otherwise the URL opener
+        defined by the L2TDEVTOOLS_URL_FIXTURES environment variable.
+
+  Raises:
+    ValueError: if the environment variable contains an unsupported value.
+  """
+  global _url_opener  # pylint: disable=global-statement
+
+  if not _url_opener:
+    fixtures = os.environ.get('L2TDEVTOOLS_URL_FIXTURES', None)
+    if not fixtures:
+      _url_opener = LiveURLOpener()
+
+    else:
+      mode, _, path = fixtures.partition(':')
+      if not path or mode not in ('record', 'replay'):
+        raise ValueError(
+            'Unsupported L2TDEVTOOLS_URL_FIXTURES value: {0:s}'.format(
+                fixtures))
+
+      fixture_store = URLFixtureStore(path)
+      if mode == 'record':
+        _url_opener = RecordingURLOpener(fixture_store)
+      else:
+        _url_opener = ReplayURLOpener(fixture_store)
+
+  return _url_opener
+
+
+def SetURLOpener(url_opener):
+  """Sets the URL opener.
+
+  Args:
+    url_opener (URLOpener): URL opener or None to reset to the URL opener
+        defined by the environment.
+  """
+  global _url_opener  # pylint: disable=global-statement
+
+  _url_opener = url_opener
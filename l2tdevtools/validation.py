@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""Validation of the project and preset definitions."""
+
+from __future__ import unicode_literals
+
+import os
+
+from l2tdevtools import download_helper
+
+
+class ValidationIssue(object):
+  """Issue found while validating a project or preset definition.
+
+  Attributes:
+    attribute_name (str): name of the attribute that has the issue.
+    definition_name (str): name of the project or preset.
+    message (str): description of the issue.
+  """
+
+  def __init__(self, definition_name, attribute_name, message):
+    """Initializes a validation issue.
+
+    Args:
+      definition_name (str): name of the project or preset.
+      attribute_name (str): name of the attribute that has the issue.
+      message (str): description of the issue.
+    """
+    super(ValidationIssue, self).__init__()
+    self.attribute_name = attribute_name
+    self.definition_name = definition_name
+    self.message = message
+
+
+class ProjectDefinitionValidator(object):
+  """Validator of the project and preset definitions.
+
+  The names of the files in the data directory that can be referred to by
+  a project definition are indexed once, such that every check of a project
+  definition is a lookup.
+  """
+
+  _BUILD_SYSTEMS = frozenset(['configure_make', 'setup_py'])
+
+  # Names of the project definition attributes that refer to a dpkg
+  # template file.
+  _DPKG_TEMPLATE_ATTRIBUTE_NAMES = (
+      'dpkg_template_control', 'dpkg_template_install_python2',
+      'dpkg_template_install_python3', 'dpkg_template_rules')
+
+  def __init__(self, data_path):
+    """Initializes a project definition validator.
+
+    Args:
+      data_path (str): path of the data directory, which contains the
+          dpkg_templates, msi_prebuild and patches directories.
+    """
+    super(ProjectDefinitionValidator, self).__init__()
+    self._dpkg_template_filenames = self._GetFilenames(
+        data_path, 'dpkg_templates')
+    self._msi_prebuild_filenames = self._GetFilenames(
+        data_path, 'msi_prebuild')
+    self._patch_filenames = self._GetFilenames(data_path, 'patches')
+
+  def _CheckDownloadURL(self, project_definition):
+    """Checks if the download URL of a project definition is supported.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      list[ValidationIssue]: issues of the download URL.
+    """
+    download_url = project_definition.download_url
+    if not download_url:
+      return [ValidationIssue(
+          project_definition.name, 'download_url', 'missing download URL')]
+
+    try:
+      download_helper_object = (
+          download_helper.DownloadHelperFactory.NewDownloadHelper(
+              download_url))
+    except ValueError:
+      download_helper_object = None
+
+    if not download_helper_object:
+      return [ValidationIssue(
+          project_definition.name, 'download_url',
+          'unsupported download URL: {0:s}'.format(download_url))]
+
+    return []
+
+  def _CheckFilenames(
+      self, project_definition, attribute_name, filenames, description):
+    """Checks if the files referred to by a project definition exist.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      attribute_name (str): name of the attribute that contains a filename
+          or a list of filenames.
+      filenames (set[str]): names of the files that exist.
+      description (str): description of the files, such as "patch file".
+
+    Returns:
+      list[ValidationIssue]: issues of the attribute.
+    """
+    attribute_value = getattr(project_definition, attribute_name, None)
+    if not attribute_value:
+      return []
+
+    if not isinstance(attribute_value, list):
+      attribute_value = [attribute_value]
+
+    return [
+        ValidationIssue(
+            project_definition.name, attribute_name,
+            'no such {0:s}: {1:s}'.format(description, filename))
+        for filename in attribute_value if filename not in filenames]
+
+  def _GetFilenames(self, data_path, directory_name):
+    """Retrieves the names of the files in a data directory.
+
+    Args:
+      data_path (str): path of the data directory.
+      directory_name (str): name of the directory in the data directory.
+
+    Returns:
+      set[str]: names of the files.
+    """
+    path = os.path.join(data_path, directory_name)
+    if not os.path.isdir(path):
+      return set()
+
+    return set(os.listdir(path))
+
+  def ValidatePresets(self, project_definition_store):
+    """Validates the preset definitions.
+
+    Args:
+      project_definition_store (ProjectDefinitionStore): project definition
+          store.
+
+    Returns:
+      list[ValidationIssue]: issues of the preset definitions.
+    """
+    issues = []
+    for preset_name in project_definition_store.GetPresetNames():
+      preset_resolution = project_definition_store.ResolvePreset(preset_name)
+
+      for project_name in preset_resolution.unknown_project_names:
+        issues.append(ValidationIssue(
+            preset_name, 'projects',
+            'no such project: {0:s}'.format(project_name)))
+
+      for cycle in preset_resolution.cycles:
+        issues.append(ValidationIssue(
+            preset_name, 'projects',
+            'dependency cycle: {0:s}'.format(' -> '.join(cycle))))
+
+    return issues
+
+  def ValidateProjectDefinition(self, project_definition):
+    """Validates a project definition.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      list[ValidationIssue]: issues of the project definition.
+    """
+    issues = []
+
+    if project_definition.build_system not in self._BUILD_SYSTEMS:
+      issues.append(ValidationIssue(
+          project_definition.name, 'build_system',
+          'unsupported build system: {0!s}'.format(
+              project_definition.build_system)))
+
+    issues.extend(self._CheckDownloadURL(project_definition))
+
+    version = project_definition.version
+    if version and not version.is_supported:
+      issues.append(ValidationIssue(
+          project_definition.name, 'version', 'unsupported version string'))
+
+    for attribute_name in self._DPKG_TEMPLATE_ATTRIBUTE_NAMES:
+      issues.extend(self._CheckFilenames(
+          project_definition, attribute_name, self._dpkg_template_filenames,
+          'dpkg template file'))
+
+    issues.extend(self._CheckFilenames(
+        project_definition, 'msi_prebuild', self._msi_prebuild_filenames,
+        'msi prebuild script'))
+    issues.extend(self._CheckFilenames(
+        project_definition, 'patches', self._patch_filenames, 'patch file'))
+
+    return issues
+
+  def ValidateProjectDefinitions(self, project_definitions):
+    """Validates project definitions.
+
+    Args:
+      project_definitions (list[ProjectDefinition]): project definitions.
+
+    Returns:
+      list[ValidationIssue]: issues of the project definitions.
+    """
+    issues = []
+    for project_definition in project_definitions:
+      issues.extend(self.ValidateProjectDefinition(project_definition))
+
+    return issues
@@ -0,0 +1,193 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to run the benchmarks."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import logging
+import os
+import sys
+
+from benchmarks import benchmark_lib
+from benchmarks import download_helper
+from benchmarks import dpkg_files
+from benchmarks import msvscpp_convert
+from benchmarks import projects
+from benchmarks import source_helper
+from benchmarks import spec_file
+from benchmarks import update
+from benchmarks import validation
+
+
+_BENCHMARK_CLASSES = [
+    download_helper.GitHubReleasesVersionResolutionBenchmark,
+    download_helper.LibyalGitHubVersionResolutionBenchmark,
+    download_helper.PyPIVersionResolutionBenchmark,
+    download_helper.SourceForgeVersionResolutionBenchmark,
+    download_helper.SourceMirrorVersionResolutionBenchmark,
+    download_helper.ZlibVersionResolutionBenchmark,
+    dpkg_files.ConfigureMakeDPKGBuildFilesGeneratorBenchmark,
+    dpkg_files.SetupPyDPKGBuildFilesGeneratorBenchmark,
+    msvscpp_convert.VSSolutionConvertBenchmark,
+    projects.ProjectDefinitionReaderBenchmark,
+    projects.ProjectDefinitionStoreBenchmark,
+    source_helper.TarGzipSourcePackageExtractionBenchmark,
+    source_helper.TarGzipSourcePackageInspectionBenchmark,
+    source_helper.ZipSourcePackageExtractionBenchmark,
+    source_helper.ZipSourcePackageInspectionBenchmark,
+    spec_file.RPMSpecFileGenerateWithMetadataBenchmark,
+    spec_file.RPMSpecFileGenerateWithSetupPyBenchmark,
+    spec_file.RPMSpecFileRewriteBenchmark,
+    spec_file.RPMSpecFileRewriteLargeBenchmark,
+    update.CompareVersionsBenchmark,
+    validation.ProjectDefinitionValidatorBenchmark]
+
+
+def _FormatDuration(seconds):
+  """Formats a duration for the report.
+
+  Args:
+    seconds (float): duration in seconds.
+
+  Returns:
+    str: formatted duration.
+  """
+  if seconds < 0.001:
+    return '{0:.1f} us'.format(seconds * 1000000)
+
+  if seconds < 1.0:
+    return '{0:.2f} ms'.format(seconds * 1000)
+
+  return '{0:.2f} s'.format(seconds)
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful and no regressions were detected or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Runs the benchmarks and compares the results with the stored '
+      'baselines.'))
+
+  argument_parser.add_argument(
+      '--baselines', dest='baselines_file', action='store',
+      metavar='PATH', default=os.path.join(
+          os.path.dirname(os.path.abspath(__file__)), 'benchmarks',
+          'baselines.json'), help='path of the baselines file.')
+
+  argument_parser.add_argument(
+      '--filter', dest='filter', action='store', metavar='NAME',
+      default=None, help=(
+          'only run the benchmarks of which the name contains NAME.'))
+
+  argument_parser.add_argument(
+      '--minimum-time', dest='minimum_time', type=float, action='store',
+      metavar='SECONDS', default=0.2, help=(
+          'minimum duration in seconds of a repeat of a benchmark.'))
+
+  argument_parser.add_argument(
+      '--repeats', dest='number_of_repeats', type=int, action='store',
+      metavar='NUMBER', default=5, help=(
+          'number of repeats of a benchmark, of which the fastest is used.'))
+
+  argument_parser.add_argument(
+      '--threshold', dest='threshold', type=float, action='store',
+      metavar='PERCENTAGE', default=25.0, help=(
+          'percentage a benchmark may be slower than its baseline before '
+          'it is reported as a regression.'))
+
+  argument_parser.add_argument(
+      '--update-baselines', dest='update_baselines', action='store_true',
+      default=False, help=(
+          'store the results as the baselines of the Python version.'))
+
+  options = argument_parser.parse_args()
+
+  logging.basicConfig(
+      level=logging.WARNING, format='[%(levelname)s] %(message)s')
+
+  baseline_store = benchmark_lib.BaselineStore(options.baselines_file)
+  try:
+    baseline_store.ReadBaselines()
+  except ValueError as exception:
+    print('Unable to read baselines with error: {0!s}'.format(exception))
+    return False
+
+  benchmark_runner = benchmark_lib.BenchmarkRunner(
+      minimum_time=options.minimum_time,
+      number_of_repeats=options.number_of_repeats)
+
+  # The calibration benchmark measures the speed of the machine, relative
+  # to which the baselines are stored.
+  calibration_result = benchmark_runner.RunBenchmark(
+      benchmark_lib.CalibrationBenchmark())
+
+  results = []
+  for benchmark_class in _BENCHMARK_CLASSES:
+    benchmark = benchmark_class()
+    if options.filter and options.filter not in benchmark.NAME:
+      continue
+
+    if not benchmark.IsSupported():
+      print('Skipping: {0:s} (not supported by Python {1:d})'.format(
+          benchmark.NAME, sys.version_info[0]))
+      continue
+
+    result = benchmark_runner.RunBenchmark(benchmark)
+    results.append(result)
+
+  threshold = options.threshold / 100.0
+  comparisons = baseline_store.CompareResults(
+      results, calibration_result, threshold)
+
+  print('')
+  print('Calibration: {0:s}'.format(
+      _FormatDuration(calibration_result.seconds_per_loop)))
+  print('')
+  print('{0:<40s} {1:>12s} {2:>12s} {3:>8s}  {4:s}'.format(
+      'Benchmark', 'Duration', 'Baseline', 'Ratio', 'Status'))
+
+  regressions = []
+  for comparison in comparisons:
+    if comparison.baseline is None:
+      baseline = '-'
+      ratio = '-'
+    else:
+      baseline = _FormatDuration(comparison.baseline)
+      ratio = '{0:.2f}'.format(comparison.ratio)
+
+    print('{0:<40s} {1:>12s} {2:>12s} {3:>8s}  {4:s}'.format(
+        comparison.name, _FormatDuration(comparison.seconds_per_loop),
+        baseline, ratio, comparison.status))
+
+    if comparison.status == 'regression':
+      regressions.append(comparison.name)
+
+  print('')
+
+  if options.update_baselines:
+    baseline_store.UpdateBaselines(results, calibration_result)
+    baseline_store.WriteBaselines()
+    print('Baselines updated: {0:s}'.format(options.baselines_file))
+    return True
+
+  if regressions:
+    print('Regressions, slower than baseline by more than {0:.0f}%:'.format(
+        options.threshold))
+    for name in regressions:
+      print('\t{0:s}'.format(name))
+    print('')
+    return False
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
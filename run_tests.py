@@ -2,14 +2,366 @@
 # -*- coding: utf-8 -*-
 """Script to run the tests."""
 
+from __future__ import print_function
 from __future__ import unicode_literals
 
+import argparse
+import multiprocessing
+import os
+import time
 import unittest
 import sys
 
 
+# The directory that contains the tests.
+TESTS_PATH = 'tests'
+
+
+class OutputWriter(object):
+  """Output writer that buffers the output of a test result."""
+
+  def __init__(self):
+    """Initializes an output writer."""
+    super(OutputWriter, self).__init__()
+    self._output = []
+
+  def flush(self):
+    """Flushes the output."""
+    return
+
+  def getvalue(self):
+    """Retrieves the buffered output.
+
+    Returns:
+      str: buffered output.
+    """
+    return ''.join(self._output)
+
+  def write(self, string):
+    """Writes a string to the output.
+
+    Args:
+      string (str): string to write.
+    """
+    if isinstance(string, bytes):
+      string = string.decode('utf-8', 'replace')
+    self._output.append(string)
+
+  def writeln(self, string=None):
+    """Writes a string and an end-of-line to the output.
+
+    Args:
+      string (Optional[str]): string to write.
+    """
+    if string:
+      self.write(string)
+    self.write('\n')
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+  """Text test result that measures the duration of every test.
+
+  Attributes:
+    durations (list[tuple[str, float]]): descriptions and durations in seconds
+        of the tests that were run.
+  """
+
+  def __init__(self, stream, descriptions, verbosity):
+    """Initializes a test result.
+
+    Args:
+      stream (file): stream to write the output to.
+      descriptions (bool): True if the descriptions of the tests should be
+          written.
+      verbosity (int): verbosity of the output.
+    """
+    super(TimedTextTestResult, self).__init__(stream, descriptions, verbosity)
+    self._start_time = None
+    self.durations = []
+
+  def startTest(self, test):
+    """Called when a test is started.
+
+    Args:
+      test (unittest.TestCase): test.
+    """
+    self._start_time = time.time()
+    super(TimedTextTestResult, self).startTest(test)
+
+  def stopTest(self, test):
+    """Called when a test has stopped.
+
+    Args:
+      test (unittest.TestCase): test.
+    """
+    super(TimedTextTestResult, self).stopTest(test)
+    self.durations.append((
+        '{0!s}'.format(test), time.time() - self._start_time))
+
+
+def GetTestFiles(tests_path):
+  """Retrieves the paths of the test files.
+
+  Args:
+    tests_path (str): path of the directory that contains the tests.
+
+  Returns:
+    list[str]: paths of the test files in the order the tests are run.
+  """
+  test_files = []
+  for directory, directory_names, filenames in os.walk(tests_path):
+    # Only packages are searched for tests.
+    directory_names[:] = sorted([
+        directory_name for directory_name in directory_names
+        if os.path.exists(os.path.join(
+            directory, directory_name, '__init__.py'))])
+
+    for filename in sorted(filenames):
+      if filename.endswith('.py') and filename != '__init__.py':
+        test_files.append(os.path.join(directory, filename))
+
+  return test_files
+
+
+def LoadTests(test_file):
+  """Loads the tests of a test file.
+
+  Args:
+    test_file (str): path of the test file.
+
+  Returns:
+    unittest.TestSuite: tests of the test file.
+  """
+  # Note that the tests are loaded relative to the tests directory such that
+  # the names of the tests are the same as when all tests are loaded.
+  test_loader = unittest.TestLoader()
+  return test_loader.discover(
+      os.path.dirname(test_file), pattern=os.path.basename(test_file),
+      top_level_dir=TESTS_PATH)
+
+
+def RunTests(test_file):
+  """Runs the tests of a test file.
+
+  This function is run in a worker process.
+
+  Args:
+    test_file (str): path of the test file.
+
+  Returns:
+    dict[str, object]: results of the tests, such as the output and the
+        durations of the tests.
+  """
+  output_writer = OutputWriter()
+  test_result = TimedTextTestResult(output_writer, True, 2)
+
+  LoadTests(test_file).run(test_result)
+
+  # Note that tracebacks and tests cannot be passed between processes hence
+  # only their descriptions are returned.
+  errors = [
+      ('ERROR', test_result.getDescription(test), traceback)
+      for test, traceback in test_result.errors]
+  errors.extend([
+      ('FAIL', test_result.getDescription(test), traceback)
+      for test, traceback in test_result.failures])
+
+  return {
+      'durations': test_result.durations,
+      'errors': errors,
+      'number_of_errors': len(test_result.errors),
+      'number_of_expected_failures': len(test_result.expectedFailures),
+      'number_of_failures': len(test_result.failures),
+      'number_of_skipped': len(test_result.skipped),
+      'number_of_tests': test_result.testsRun,
+      'number_of_unexpected_successes': len(
+          test_result.unexpectedSuccesses),
+      'output': output_writer.getvalue()}
+
+
+def RunTestsInProcesses(test_files, number_of_workers):
+  """Runs the tests of test files in multiple processes.
+
+  The output is written in the same format as unittest.TextTestRunner.
+
+  Args:
+    test_files (list[str]): paths of the test files.
+    number_of_workers (int): number of worker processes, where None
+        represents the number of CPUs.
+
+  Returns:
+    tuple[bool, list[tuple[str, float]]]: True if the tests were successful
+        and the descriptions and durations in seconds of the tests.
+  """
+  start_time = time.time()
+
+  durations = []
+  errors = []
+  totals = {}
+
+  pool = multiprocessing.Pool(processes=number_of_workers)
+  try:
+    # Note that the output is written in the order of the test files.
+    for results in pool.imap(RunTests, test_files):
+      sys.stderr.write(results['output'])
+      sys.stderr.flush()
+
+      durations.extend(results['durations'])
+      errors.extend(results['errors'])
+      for key, value in results.items():
+        if key.startswith('number_of_'):
+          totals[key] = totals.get(key, 0) + value
+
+  finally:
+    pool.close()
+    pool.join()
+
+  duration = time.time() - start_time
+
+  separator1 = '=' * 70
+  separator2 = '-' * 70
+
+  output_lines = ['']
+  for flavour, description, traceback in errors:
+    output_lines.extend([
+        separator1, '{0:s}: {1:s}'.format(flavour, description),
+        separator2, '{0:s}'.format(traceback)])
+
+  number_of_tests = totals.get('number_of_tests', 0)
+  output_lines.extend([
+      separator2, 'Ran {0:d} test{1:s} in {2:.3f}s'.format(
+          number_of_tests, 's' if number_of_tests != 1 else '', duration),
+      ''])
+
+  information = []
+  for key, description in (
+      ('number_of_failures', 'failures'),
+      ('number_of_errors', 'errors'),
+      ('number_of_skipped', 'skipped'),
+      ('number_of_expected_failures', 'expected failures'),
+      ('number_of_unexpected_successes', 'unexpected successes')):
+    if totals.get(key, 0):
+      information.append('{0:s}={1:d}'.format(description, totals[key]))
+
+  result = not errors
+  status = 'OK' if result else 'FAILED'
+  if information:
+    status = '{0:s} ({1:s})'.format(status, ', '.join(information))
+  output_lines.append(status)
+
+  sys.stderr.write('\n'.join(output_lines))
+  sys.stderr.write('\n')
+
+  return result, durations
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Runs the tests.'))
+
+  argument_parser.add_argument(
+      'test_files', action='store', metavar='PATH', type=str, nargs='*',
+      help=(
+          'paths of the test files to run. The default is to run the tests '
+          'of all test files in the tests directory.'))
+
+  argument_parser.add_argument(
+      '-j', '--jobs', dest='jobs', action='store', type=int,
+      metavar='NUMBER', default=1, help=(
+          'number of worker processes that run test files concurrently, '
+          'where 0 represents the number of CPUs. The default is to run '
+          'all tests in the current process.'))
+
+  argument_parser.add_argument(
+      '--shard', dest='shard', action='store', type=str,
+      metavar='INDEX/NUMBER', default=None, help=(
+          'only run the test files of a shard, for example "2/4" to run the '
+          'second of 4 shards. The test files are distributed over the '
+          'shards in order.'))
+
+  argument_parser.add_argument(
+      '--slowest', dest='slowest', action='store', type=int,
+      metavar='NUMBER', default=0, help=(
+          'number of the slowest tests of which the duration should be '
+          'reported.'))
+
+  options = argument_parser.parse_args()
+
+  if options.jobs < 0:
+    print('Unsupported number of worker processes: {0:d}.'.format(
+        options.jobs))
+    print('')
+    return False
+
+  # Test files that are specified explicitly must exist and contain tests,
+  # such that a wrong path is not reported as a successful test run.
+  for test_file in options.test_files:
+    if not os.path.isfile(test_file):
+      print('No such test file: {0:s}.'.format(test_file))
+      print('')
+      return False
+
+    if not LoadTests(test_file).countTestCases():
+      print('No tests in test file: {0:s}.'.format(test_file))
+      print('')
+      return False
+
+  test_files = options.test_files or GetTestFiles(TESTS_PATH)
+
+  if options.shard:
+    shard_index, _, number_of_shards = options.shard.partition('/')
+    try:
+      shard_index = int(shard_index, 10)
+      number_of_shards = int(number_of_shards, 10)
+    except ValueError:
+      shard_index = 0
+      number_of_shards = 0
+
+    if shard_index < 1 or shard_index > number_of_shards:
+      print('Unsupported shard: {0:s}.'.format(options.shard))
+      print('')
+      return False
+
+    test_files = [
+        test_file for index, test_file in enumerate(test_files)
+        if index % number_of_shards == shard_index - 1]
+
+  if options.jobs == 1 or len(test_files) <= 1:
+    test_suite = unittest.TestSuite()
+    for test_file in test_files:
+      test_suite.addTests(LoadTests(test_file))
+
+    test_runner = unittest.TextTestRunner(
+        resultclass=TimedTextTestResult, verbosity=2)
+    test_results = test_runner.run(test_suite)
+
+    result = test_results.wasSuccessful()
+    durations = test_results.durations
+
+  else:
+    result, durations = RunTestsInProcesses(test_files, options.jobs or None)
+
+  if options.slowest:
+    durations = sorted(
+        durations, key=lambda description_and_duration: (
+            description_and_duration[1]), reverse=True)
+
+    print('')
+    print('Slowest tests:')
+    for description, duration in durations[:options.slowest]:
+      print('{0:.3f}s {1:s}'.format(duration, description))
+    print('')
+
+  return result
+
+
 if __name__ == '__main__':
-  test_suite = unittest.TestLoader().discover('tests', pattern='*.py')
-  test_results = unittest.TextTestRunner(verbosity=2).run(test_suite)
-  if not test_results.wasSuccessful():
+  if not Main():
     sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,41 @@
+%define name dfvfs
+%define version 20170723
+%define unmangled_version 20170723
+%define unmangled_version 20170723
+%define release 1
+
+Summary: Digital Forensics Virtual File System (dfVFS).
+Name: %{name}
+Version: %{version}
+Release: %{release}
+Source0: %{name}-%{unmangled_version}.tar.gz
+License: Apache License, Version 2.0
+Group: Development/Libraries
+BuildRoot: %{_tmppath}/%{name}-%{version}-%{release}-buildroot
+Prefix: %{_prefix}
+BuildArch: noarch
+Vendor: Log2Timeline maintainers <log2timeline-maintainers@googlegroups.com>
+Requires: libbde-python >= 20140531 libewf-python >= 20131210 python-construct >= 2.5.2 python-six >= 1.1.0
+Url: https://github.com/log2timeline/dfvfs
+
+%description
+dfVFS, or Digital Forensics Virtual File System, provides read-only access to
+file-system objects from various storage media types and file formats. The goal
+of dfVFS is to provide a generic interface for accessing file-system objects,
+for which it uses several back-ends that provide the actual implementation of
+the various storage media types, volume systems and file systems.
+
+%prep
+%setup -n %{name}-%{unmangled_version}
+
+%build
+python setup.py build
+
+%install
+python setup.py install --single-version-externally-managed -O1 --root=$RPM_BUILD_ROOT --record=INSTALLED_FILES
+
+%clean
+rm -rf $RPM_BUILD_ROOT
+
+%files -f INSTALLED_FILES
+%defattr(-,root,root)
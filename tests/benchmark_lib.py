@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the shared functions and classes for benchmarking."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import benchmark_lib
+
+
+class TestBenchmark(benchmark_lib.Benchmark):
+  """Benchmark that counts the number of runs."""
+
+  NAME = 'test'
+
+  def __init__(self):
+    """Initializes a benchmark."""
+    super(TestBenchmark, self).__init__()
+    self.number_of_runs = 0
+    self.was_set_up = False
+    self.was_torn_down = False
+
+  def Run(self):
+    """Runs the operation that is measured."""
+    self.number_of_runs += 1
+
+  def SetUp(self):
+    """Sets up the benchmark."""
+    self.was_set_up = True
+
+  def TearDown(self):
+    """Cleans up the benchmark."""
+    self.was_torn_down = True
+
+
+class CalibrationBenchmarkTest(unittest.TestCase):
+  """Tests for the calibration benchmark."""
+
+  def testRun(self):
+    """Tests the Run function."""
+    benchmark = benchmark_lib.CalibrationBenchmark()
+    benchmark.Run()
+
+
+class BenchmarkRunnerTest(unittest.TestCase):
+  """Tests for the benchmark runner."""
+
+  def testRunBenchmark(self):
+    """Tests the RunBenchmark function."""
+    benchmark = TestBenchmark()
+    benchmark_runner = benchmark_lib.BenchmarkRunner(
+        minimum_time=0.001, number_of_repeats=2)
+
+    result = benchmark_runner.RunBenchmark(benchmark)
+
+    self.assertEqual(result.name, 'test')
+    self.assertGreaterEqual(result.number_of_loops, 1)
+    self.assertGreaterEqual(
+        benchmark.number_of_runs, result.number_of_loops * 2)
+    self.assertTrue(benchmark.was_set_up)
+    self.assertTrue(benchmark.was_torn_down)
+
+
+class BaselineStoreTest(unittest.TestCase):
+  """Tests for the baseline store."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testCompareResults(self):
+    """Tests the CompareResults function."""
+    path = os.path.join(self._temporary_directory, 'baselines.json')
+    baseline_store = benchmark_lib.BaselineStore(path)
+    baseline_store.UpdateBaselines([
+        benchmark_lib.BenchmarkResult('faster', 1, 1.0),
+        benchmark_lib.BenchmarkResult('ok', 1, 1.0),
+        benchmark_lib.BenchmarkResult('regression', 1, 1.0)],
+        benchmark_lib.BenchmarkResult('calibration', 1, 0.1))
+
+    # The results are measured on a machine that is twice as slow.
+    comparisons = baseline_store.CompareResults([
+        benchmark_lib.BenchmarkResult('faster', 1, 1.0),
+        benchmark_lib.BenchmarkResult('new', 1, 2.0),
+        benchmark_lib.BenchmarkResult('ok', 1, 2.4),
+        benchmark_lib.BenchmarkResult('regression', 1, 2.6)],
+        benchmark_lib.BenchmarkResult('calibration', 1, 0.2), 0.25)
+
+    statuses = {
+        comparison.name: comparison.status for comparison in comparisons}
+    expected_statuses = {
+        'faster': 'faster',
+        'new': 'new',
+        'ok': 'ok',
+        'regression': 'regression'}
+    self.assertEqual(statuses, expected_statuses)
+
+  def testReadAndWriteBaselines(self):
+    """Tests the ReadBaselines and WriteBaselines functions."""
+    path = os.path.join(self._temporary_directory, 'baselines.json')
+    baseline_store = benchmark_lib.BaselineStore(path)
+
+    result = baseline_store.ReadBaselines()
+    self.assertFalse(result)
+
+    calibration_result = benchmark_lib.BenchmarkResult('calibration', 1, 0.5)
+    baseline_store.UpdateBaselines([
+        benchmark_lib.BenchmarkResult('test', 1, 1.0)], calibration_result)
+    baseline_store.WriteBaselines()
+
+    baseline_store = benchmark_lib.BaselineStore(path)
+    result = baseline_store.ReadBaselines()
+    self.assertTrue(result)
+
+    comparisons = baseline_store.CompareResults([
+        benchmark_lib.BenchmarkResult('test', 1, 1.0)], calibration_result,
+        0.25)
+    self.assertEqual(len(comparisons), 1)
+    self.assertEqual(comparisons[0].baseline, 1.0)
+    self.assertEqual(comparisons[0].status, 'ok')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -4,6 +4,9 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from l2tdevtools import build_helper
@@ -33,7 +36,123 @@ class BuildHelperTest(unittest.TestCase):
 class DPKGBuildHelperTest(unittest.TestCase):
   """Tests for the helper to build dpkg packages (.deb)."""
 
-  # TODO: add tests.
+  _CHANGELOG = '\n'.join([
+      'test (1.0-1) unstable; urgency=low',
+      '',
+      '  * Auto-generated',
+      '',
+      ' -- Test <test@example.com>  Sat, 01 Jul 2017 00:00:00 +0000',
+      ''])
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+    self._source_directory = os.path.join(
+        self._temporary_directory, 'test-1.0')
+    os.makedirs(os.path.join(self._source_directory, 'debian'))
+    os.makedirs(os.path.join(self._source_directory, 'test'))
+
+    for path_segments in (['setup.py'], ['test', '__init__.py']):
+      path = os.path.join(self._source_directory, *path_segments)
+      with open(path, 'wb') as file_object:
+        file_object.write(b'# test\n')
+
+    path = os.path.join(self._source_directory, 'debian', 'changelog')
+    with open(path, 'wb') as file_object:
+      file_object.write(self._CHANGELOG.encode('utf-8'))
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testCloneSourceDirectory(self):
+    """Tests the _CloneSourceDirectory function."""
+    project_definition = projects.ProjectDefinition('test')
+    build_helper_object = build_helper.DPKGBuildHelper(project_definition, '')
+
+    clone_directory = build_helper_object._CloneSourceDirectory(
+        self._source_directory, 'trusty')
+    self.assertEqual(clone_directory, '{0:s}~trusty'.format(
+        self._source_directory))
+
+    path = os.path.join(self._source_directory, 'test', '__init__.py')
+    clone_path = os.path.join(clone_directory, 'test', '__init__.py')
+    self.assertTrue(os.path.exists(clone_path))
+    self.assertTrue(os.path.samefile(path, clone_path))
+
+    # The files in the debian sub directory are copied.
+    path = os.path.join(self._source_directory, 'debian', 'changelog')
+    clone_path = os.path.join(clone_directory, 'debian', 'changelog')
+    self.assertTrue(os.path.exists(clone_path))
+    self.assertFalse(os.path.samefile(path, clone_path))
+
+  def testPrepareCloneDirectory(self):
+    """Tests the _PrepareCloneDirectory function."""
+    project_definition = projects.ProjectDefinition('test')
+    build_helper_object = build_helper.DPKGBuildHelper(project_definition, '')
+    build_helper_object.architecture = 'source'
+    build_helper_object.version_suffix = 'ppa1'
+
+    path = os.path.join(self._source_directory, 'debian', 'changelog')
+
+    current_working_directory = os.getcwd()
+    os.chdir(self._temporary_directory)
+    try:
+      # Without a prep script the changelog is updated.
+      result = build_helper_object._PrepareCloneDirectory(
+          self._source_directory, 'test', '1.0', 'trusty')
+      self.assertTrue(result)
+
+      with open(path, 'rb') as file_object:
+        lines = file_object.read().decode('utf-8').split('\n')
+
+      self.assertEqual(
+          lines[0], 'test (1.0-1ppa1~trusty) trusty; urgency=low')
+
+      with open(path, 'wb') as file_object:
+        file_object.write(self._CHANGELOG.encode('utf-8'))
+
+      # With a prep script the changelog is left to the prep script.
+      with open('prep-dpkg.sh', 'wb') as file_object:
+        file_object.write(b'touch prepared\n')
+
+      result = build_helper_object._PrepareCloneDirectory(
+          self._source_directory, 'test', '1.0', 'trusty')
+      self.assertTrue(result)
+
+    finally:
+      os.chdir(current_working_directory)
+
+    with open(path, 'rb') as file_object:
+      data = file_object.read().decode('utf-8')
+
+    self.assertEqual(data, self._CHANGELOG)
+    self.assertTrue(os.path.exists(
+        os.path.join(self._source_directory, 'prepared')))
+
+  def testUpdateChangelogFile(self):
+    """Tests the _UpdateChangelogFile function."""
+    project_definition = projects.ProjectDefinition('test')
+    build_helper_object = build_helper.DPKGBuildHelper(project_definition, '')
+
+    result = build_helper_object._UpdateChangelogFile(
+        self._source_directory, 'ppa1', 'trusty')
+    self.assertTrue(result)
+
+    path = os.path.join(self._source_directory, 'debian', 'changelog')
+    with open(path, 'rb') as file_object:
+      lines = file_object.read().decode('utf-8').split('\n')
+
+    self.assertEqual(lines[0], 'test (1.0-1ppa1~trusty) trusty; urgency=low')
+    self.assertEqual(lines[1:], self._CHANGELOG.split('\n')[1:])
+
+    with open(path, 'wb') as file_object:
+      file_object.write(b'Unsupported\n')
+
+    result = build_helper_object._UpdateChangelogFile(
+        self._source_directory, 'ppa1', 'trusty')
+    self.assertFalse(result)
 
 
 class ConfigureMakeDPKGBuildHelperTest(unittest.TestCase):
@@ -99,7 +218,47 @@ class SetupPyOSCBuildHelperTest(unittest.TestCase):
 # TODO: add ConfigureMakePKGBuildHelper tests.
 # TODO: add SetupPyPKGBuildHelper tests.
 
-# TODO: add BaseRPMBuildHelper tests.
+class BaseRPMBuildHelperTest(unittest.TestCase):
+  """Tests for the helper to build RPM packages (.rpm)."""
+
+  def testCreateRPMbuildDirectories(self):
+    """Tests the _CreateRPMbuildDirectories function."""
+    project_definition = projects.ProjectDefinition('test')
+
+    build_helper_object = build_helper.BaseRPMBuildHelper(
+        project_definition, '')
+    self.assertEqual(build_helper_object.log_filename, 'test_build.log')
+    self.assertIsNone(build_helper_object.rpmbuild_path)
+
+    other_build_helper_object = build_helper.BaseRPMBuildHelper(
+        project_definition, '')
+
+    build_helper_object._CreateRPMbuildDirectories()
+    other_build_helper_object._CreateRPMbuildDirectories()
+
+    try:
+      rpmbuild_path = build_helper_object.rpmbuild_path
+      self.assertIsNotNone(rpmbuild_path)
+      self.assertNotEqual(
+          rpmbuild_path, other_build_helper_object.rpmbuild_path)
+
+      self.assertTrue(os.path.isdir(os.path.join(rpmbuild_path, 'SPECS')))
+      self.assertTrue(os.path.isdir(os.path.join(rpmbuild_path, 'SOURCES')))
+
+      command = build_helper_object._GetRPMBuildCommand('-bs', 'test.spec')
+      expected_command = (
+          'rpmbuild --define "_topdir {0:s}" -bs test.spec > test_build.log '
+          '2>&1').format(rpmbuild_path)
+      self.assertEqual(command, expected_command)
+
+    finally:
+      build_helper_object._RemoveRPMbuildDirectories()
+      other_build_helper_object._RemoveRPMbuildDirectories()
+
+    self.assertFalse(os.path.exists(rpmbuild_path))
+    self.assertIsNone(build_helper_object.rpmbuild_path)
+
+
 # TODO: add RPMBuildHelper tests.
 # TODO: add ConfigureMakeRPMBuildHelper tests.
 # TODO: add SetupPyRPMBuildHelper tests.
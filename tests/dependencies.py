@@ -4,6 +4,10 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 
 from l2tdevtools import dependencies
@@ -73,6 +77,174 @@ class DependencyHelperTest(test_lib.BaseTestCase):
 
     # TODO: add test with version with suffix 17.0.0b1
 
+  def testCheckDependencyDefinitions(self):
+    """Tests the _CheckDependencyDefinitions function."""
+    configuration_file = self._GetTestFilePath(['dependencies.ini'])
+    dependency_helper = dependencies.DependencyHelper(
+        configuration_file=configuration_file)
+
+    bogus_dependency = dependencies.DependencyDefinition('bogus')
+    json_dependency = dependencies.DependencyDefinition('json')
+    json_dependency.minimum_version = '1.0'
+    json_dependency.version_property = '__version__'
+    sqlite3_dependency = dependencies.DependencyDefinition('sqlite3')
+
+    check_results = dependency_helper._CheckDependencyDefinitions([
+        bogus_dependency, json_dependency, sqlite3_dependency])
+    self.assertEqual(len(check_results), 3)
+
+    dependency, result, status_message, _ = check_results[0]
+    self.assertEqual(dependency, bogus_dependency)
+    self.assertFalse(result)
+    self.assertEqual(status_message, 'missing: bogus')
+
+    dependency, result, status_message, _ = check_results[1]
+    self.assertEqual(dependency, json_dependency)
+    self.assertTrue(result)
+    self.assertTrue(status_message.startswith('json version: '))
+
+    dependency, result, _, _ = check_results[2]
+    self.assertEqual(dependency, sqlite3_dependency)
+    self.assertTrue(result)
+
+  def testCheckDependencyDefinitionsWithBrokenModule(self):
+    """Tests the _CheckDependencyDefinitions function with a broken module."""
+    configuration_file = self._GetTestFilePath(['dependencies.ini'])
+
+    temporary_directory = tempfile.mkdtemp()
+    sys.path.insert(0, temporary_directory)
+    try:
+      # A Python module with distribution metadata that cannot be imported,
+      # such as a binding of which the shared library is missing.
+      module_path = os.path.join(temporary_directory, 'l2tdevtools_broken')
+      os.mkdir(module_path)
+      with open(os.path.join(module_path, '__init__.py'), 'w') as file_object:
+        file_object.write('raise ImportError("missing shared library")\n')
+
+      os.mkdir(os.path.join(
+          temporary_directory, 'l2tdevtools_broken-1.0.dist-info'))
+
+      dependency = dependencies.DependencyDefinition('l2tdevtools_broken')
+      dependency.minimum_version = '1.0'
+      dependency.version_property = '__version__'
+
+      dependency_helper = dependencies.DependencyHelper(
+          configuration_file=configuration_file)
+      check_results = dependency_helper._CheckDependencyDefinitions(
+          [dependency])
+      self.assertFalse(check_results[0][1])
+
+      # The version is determined from the distribution metadata if
+      # the Python module can be imported but has no version attribute.
+      with open(os.path.join(module_path, '__init__.py'), 'w') as file_object:
+        file_object.write('\n')
+
+      dependency_helper = dependencies.DependencyHelper(
+          configuration_file=configuration_file)
+      check_results = dependency_helper._CheckDependencyDefinitions(
+          [dependency])
+      self.assertTrue(check_results[0][1])
+      self.assertEqual(
+          check_results[0][2], 'l2tdevtools_broken version: 1.0')
+
+    finally:
+      sys.path.remove(temporary_directory)
+      shutil.rmtree(temporary_directory, True)
+
+  def testCheckDependencyDefinitionsWithCache(self):
+    """Tests the _CheckDependencyDefinitions function with a cache."""
+    configuration_file = self._GetTestFilePath(['dependencies.ini'])
+
+    temporary_directory = tempfile.mkdtemp()
+    sys.path.insert(0, temporary_directory)
+    try:
+      cache_path = os.path.join(temporary_directory, 'dependencies.json')
+      dependency = dependencies.DependencyDefinition('l2tdevtools_test')
+
+      dependency_helper = dependencies.DependencyHelper(
+          configuration_file=configuration_file, cache_path=cache_path)
+      check_results = dependency_helper._CheckDependencyDefinitions(
+          [dependency])
+      self.assertFalse(check_results[0][1])
+      self.assertTrue(os.path.exists(cache_path))
+
+      # The cached result should be used without importing the module.
+      dependency_helper = dependencies.DependencyHelper(
+          configuration_file=configuration_file, cache_path=cache_path)
+      dependency_helper._CheckPythonModulesInProcesses = None
+      check_results = dependency_helper._CheckDependencyDefinitions(
+          [dependency])
+      self.assertFalse(check_results[0][1])
+
+      # Installing the module should invalidate the cached result.
+      module_path = os.path.join(temporary_directory, 'l2tdevtools_test.py')
+      with open(module_path, 'w') as file_object:
+        file_object.write('\n')
+
+      dependency_helper = dependencies.DependencyHelper(
+          configuration_file=configuration_file, cache_path=cache_path)
+      check_results = dependency_helper._CheckDependencyDefinitions(
+          [dependency])
+      self.assertTrue(check_results[0][1])
+
+    finally:
+      sys.path.remove(temporary_directory)
+      shutil.rmtree(temporary_directory, True)
+
+  def testCheckPythonModulesInProcesses(self):
+    """Tests the _CheckPythonModulesInProcesses function."""
+    configuration_file = self._GetTestFilePath(['dependencies.ini'])
+    dependency_helper = dependencies.DependencyHelper(
+        configuration_file=configuration_file, number_of_workers=2)
+
+    results = dependency_helper._CheckPythonModulesInProcesses([
+        ('bogus', ['bogus'], None),
+        ('json', ['json'], '__version__'),
+        ('xml', ['bogus', 'xml.etree'], None)])
+
+    self.assertEqual(sorted(results.keys()), ['bogus', 'json', 'xml'])
+
+    import_result, _ = results['bogus']
+    self.assertEqual(import_result, {})
+
+    import_result, _ = results['json']
+    self.assertEqual(import_result['module_name'], 'json')
+    self.assertIsNotNone(import_result.get('version', None))
+
+    import_result, _ = results['xml']
+    self.assertEqual(import_result, {'module_name': 'xml.etree'})
+
+  def testCheckPythonModulesInProcessesWithTerminatingModule(self):
+    """Tests the _CheckPythonModulesInProcesses function with termination."""
+    configuration_file = self._GetTestFilePath(['dependencies.ini'])
+
+    temporary_directory = tempfile.mkdtemp()
+    sys.path.insert(0, temporary_directory)
+    try:
+      module_path = os.path.join(temporary_directory, 'l2tdevtools_exit.py')
+      with open(module_path, 'w') as file_object:
+        file_object.write('import os\nos._exit(1)\n')
+
+      # The worker process should be replaced after the Python module
+      # terminated it.
+      dependency_helper = dependencies.DependencyHelper(
+          configuration_file=configuration_file, number_of_workers=1)
+
+      results = dependency_helper._CheckPythonModulesInProcesses([
+          ('l2tdevtools_exit', ['l2tdevtools_exit'], None),
+          ('json', ['json'], None)])
+
+      import_result, _ = results['l2tdevtools_exit']
+      self.assertEqual(
+          import_result, {'error': 'import terminated unexpectedly'})
+
+      import_result, _ = results['json']
+      self.assertEqual(import_result, {'module_name': 'json'})
+
+    finally:
+      sys.path.remove(temporary_directory)
+      shutil.rmtree(temporary_directory, True)
+
   def testCheckSQLite3(self):
     """Tests the _CheckSQLite3 function."""
     configuration_file = self._GetTestFilePath(['dependencies.ini'])
@@ -81,6 +253,18 @@ class DependencyHelperTest(test_lib.BaseTestCase):
 
     dependency_helper._CheckSQLite3()
 
+  def testFindPythonModule(self):
+    """Tests the _FindPythonModule function."""
+    configuration_file = self._GetTestFilePath(['dependencies.ini'])
+    dependency_helper = dependencies.DependencyHelper(
+        configuration_file=configuration_file)
+
+    result = dependency_helper._FindPythonModule('xml.etree')
+    self.assertTrue(result)
+
+    result = dependency_helper._FindPythonModule('bogus')
+    self.assertFalse(result)
+
   def testImportPythonModule(self):
     """Tests the _ImportPythonModule function."""
     configuration_file = self._GetTestFilePath(['dependencies.ini'])
@@ -10,6 +10,11 @@ import tempfile
 import unittest
 
 from l2tdevtools import download_helper
+from l2tdevtools import mirror
+from l2tdevtools import projects
+from l2tdevtools import url_opener
+
+from tests import test_lib
 
 
 class TempDirectory(object):
@@ -30,6 +35,55 @@ class TempDirectory(object):
     shutil.rmtree(self.name, True)
 
 
+class CountingURLOpener(url_opener.URLOpener):
+  """URL opener that counts the requests of another URL opener."""
+
+  def __init__(self, url_opener_object):
+    """Initializes a counting URL opener.
+
+    Args:
+      url_opener_object (URLOpener): URL opener.
+    """
+    super(CountingURLOpener, self).__init__()
+    self._url_opener = url_opener_object
+    self.number_of_requests = 0
+
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      URLResponse: response or None if the URL could not be opened.
+    """
+    self.number_of_requests += 1
+    return self._url_opener.Open(url, headers=headers)
+
+
+class NotModifiedURLOpener(url_opener.URLOpener):
+  """URL opener that responds with 304 (Not Modified) to every request."""
+
+  def __init__(self):
+    """Initializes a not modified URL opener."""
+    super(NotModifiedURLOpener, self).__init__()
+    self.headers = None
+
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      URLResponse: response.
+    """
+    self.headers = headers
+    return url_opener.URLResponse(url, 304, {}, b'')
+
+
 class DownloadHelperTest(unittest.TestCase):
   """Tests for the download helper."""
 
@@ -64,12 +118,14 @@ class DownloadHelperTest(unittest.TestCase):
     page_content = b''
     with TempDirectory() as temporary_directory:
       os.chdir(temporary_directory)
-      filename = download_helper_object.DownloadFile(self._download_url)
+      try:
+        filename = download_helper_object.DownloadFile(self._download_url)
 
-      with open(filename, 'rb') as file_object:
-        page_content = file_object.read()
+        with open(filename, 'rb') as file_object:
+          page_content = file_object.read()
 
-    os.chdir(current_working_directory)
+      finally:
+        os.chdir(current_working_directory)
 
     expected_page_content = b''
     with open(self._FILENAME, 'rb') as file_object:
@@ -174,6 +230,81 @@ class LibyalGitHubReleasesDownloadHelperTest(unittest.TestCase):
     self.assertEqual(project_identifier, expected_project_identifier)
 
 
+class LibyalProjectConfigurationIndexTest(unittest.TestCase):
+  """Tests for the libyal project configuration index."""
+
+  def testIsExpired(self):
+    """Tests the IsExpired function."""
+    project_configuration_index = (
+        download_helper.LibyalProjectConfigurationIndex())
+    project_configuration_index.SetEntry(
+        'libbde', 'https://github.com/libyal/libbde/releases', '"1234"', None)
+
+    entry = project_configuration_index.GetEntry('libbde')
+    self.assertFalse(project_configuration_index.IsExpired(entry))
+
+    project_configuration_index = (
+        download_helper.LibyalProjectConfigurationIndex(time_to_live=-1))
+    self.assertTrue(project_configuration_index.IsExpired(entry))
+
+  def testMerge(self):
+    """Tests the Merge function."""
+    project_configuration_index = (
+        download_helper.LibyalProjectConfigurationIndex())
+    project_configuration_index.SetEntry(
+        'libbde', 'https://github.com/libyal/libbde/releases', '"1234"', None)
+    project_configuration_index.SetEntry(
+        'libevt', 'https://github.com/libyal/libevt/releases', None, None)
+
+    worker_configuration_index = (
+        download_helper.LibyalProjectConfigurationIndex())
+    worker_configuration_index.SetEntry(
+        'libbde', 'https://github.com/libyal/libbde/releases', '"5678"', None)
+    worker_configuration_index.SetEntry(
+        'libevt', 'https://github.com/libyal/libevt/releases', '"5678"', None)
+    worker_configuration_index.SetEntry(
+        'libewf', 'https://github.com/libyal/libewf/releases', None, None)
+
+    # The entry of libevt is older than the entry in the index.
+    worker_entry = worker_configuration_index.GetEntry('libevt')
+    worker_entry['timestamp'] = 0
+
+    project_configuration_index.Merge(worker_configuration_index)
+
+    entry = project_configuration_index.GetEntry('libbde')
+    self.assertEqual(entry['etag'], '"5678"')
+
+    entry = project_configuration_index.GetEntry('libevt')
+    self.assertIsNone(entry['etag'])
+
+    entry = project_configuration_index.GetEntry('libewf')
+    self.assertIsNotNone(entry)
+
+  def testReadAndWrite(self):
+    """Tests the Read and Write functions."""
+    with TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'libyal_projects.json')
+
+      project_configuration_index = (
+          download_helper.LibyalProjectConfigurationIndex(path=path))
+      self.assertFalse(project_configuration_index.Read())
+
+      project_configuration_index.SetEntry(
+          'libbde', 'https://github.com/libyal/libbde/releases', '"1234"',
+          None)
+      project_configuration_index.Write()
+
+      project_configuration_index = (
+          download_helper.LibyalProjectConfigurationIndex(path=path))
+      self.assertTrue(project_configuration_index.Read())
+
+      entry = project_configuration_index.GetEntry('libbde')
+      self.assertIsNotNone(entry)
+      self.assertEqual(
+          entry['download_url'], 'https://github.com/libyal/libbde/releases')
+      self.assertEqual(entry['etag'], '"1234"')
+
+
 class Log2TimelineGitHubReleasesDownloadHelperTest(unittest.TestCase):
   """Tests for the log2timeline GitHub releases download helper."""
 
@@ -226,11 +357,34 @@ class Log2TimelineGitHubReleasesDownloadHelperTest(unittest.TestCase):
 class PyPIDownloadHelperTest(unittest.TestCase):
   """Tests for the PyPi download helper."""
 
+  # pylint: disable=protected-access
+
   _DOWNLOAD_URL = 'https://pypi.python.org/pypi/construct'
 
   _PROJECT_NAME = 'construct'
   _PROJECT_VERSION = '2.8.14'
 
+  def testGetVersionKey(self):
+    """Tests the _GetVersionKey function."""
+    download_helper_object = download_helper.PyPIDownloadHelper(
+        self._DOWNLOAD_URL)
+
+    version_key = download_helper_object._GetVersionKey('2.8.14')
+    self.assertEqual(version_key, (0, (2, 8, 14)))
+
+    version_key = download_helper_object._GetVersionKey('1!2.0.0')
+    self.assertEqual(version_key, (1, (2, )))
+
+    self.assertEqual(
+        download_helper_object._GetVersionKey('1.0'),
+        download_helper_object._GetVersionKey('1.0.0'))
+    self.assertGreater(
+        download_helper_object._GetVersionKey('2.10'),
+        download_helper_object._GetVersionKey('2.9.1'))
+    self.assertGreater(
+        download_helper_object._GetVersionKey('1!0.1'),
+        download_helper_object._GetVersionKey('2.0'))
+
   def testGetLatestVersion(self):
     """Tests the GetLatestVersion functions."""
     download_helper_object = download_helper.PyPIDownloadHelper(
@@ -318,5 +472,284 @@ class SourceForgeDownloadHelperTest(unittest.TestCase):
     self.assertEqual(project_identifier, expected_project_identifier)
 
 
+class SourceMirrorDownloadHelperTest(unittest.TestCase):
+  """Tests for the source mirror download helper."""
+
+  _DOWNLOAD_URL = 'https://github.com/log2timeline/test/releases'
+
+  _PROJECT_NAME = 'test'
+  _PROJECT_VERSION = '1.0'
+
+  def _CreateSourceMirror(self, path):
+    """Creates a source mirror with a single source package.
+
+    Args:
+      path (str): path of the source mirror directory.
+
+    Returns:
+      SourceMirror: source mirror.
+    """
+    source_package_path = os.path.join(path, 'test-1.0.tar.gz')
+    with open(source_package_path, 'wb') as file_object:
+      file_object.write(b'test')
+
+    project_definition = projects.ProjectDefinition(self._PROJECT_NAME)
+    project_definition.download_url = self._DOWNLOAD_URL
+
+    source_mirror = mirror.SourceMirror(path)
+    source_mirror.AddSourcePackage(
+        project_definition, 'com.github.log2timeline.test',
+        self._PROJECT_VERSION,
+        'https://github.com/log2timeline/test/test-1.0.tar.gz',
+        'test-1.0.tar.gz')
+    return source_mirror
+
+  def testDownload(self):
+    """Tests the Download functions."""
+    with TempDirectory() as mirror_path, TempDirectory() as temp_directory:
+      source_mirror = self._CreateSourceMirror(mirror_path)
+
+      download_helper_object = download_helper.SourceMirrorDownloadHelper(
+          self._DOWNLOAD_URL, source_mirror)
+
+      current_working_directory = os.getcwd()
+      os.chdir(temp_directory)
+      try:
+        filename = download_helper_object.Download(
+            self._PROJECT_NAME, self._PROJECT_VERSION)
+        self.assertEqual(filename, 'test-1.0.tar.gz')
+        self.assertTrue(os.path.exists(filename))
+
+        filename = download_helper_object.Download(self._PROJECT_NAME, '2.0')
+        self.assertIsNone(filename)
+
+      finally:
+        os.chdir(current_working_directory)
+
+  def testGetLatestVersion(self):
+    """Tests the GetLatestVersion functions."""
+    with TempDirectory() as mirror_path:
+      source_mirror = self._CreateSourceMirror(mirror_path)
+
+      download_helper_object = download_helper.SourceMirrorDownloadHelper(
+          self._DOWNLOAD_URL, source_mirror)
+
+      latest_version = download_helper_object.GetLatestVersion(
+          self._PROJECT_NAME, None)
+
+    self.assertEqual(latest_version, self._PROJECT_VERSION)
+
+  def testGetProjectIdentifier(self):
+    """Tests the GetProjectIdentifier functions."""
+    with TempDirectory() as mirror_path:
+      source_mirror = self._CreateSourceMirror(mirror_path)
+
+      download_helper_object = download_helper.SourceMirrorDownloadHelper(
+          self._DOWNLOAD_URL, source_mirror)
+
+      project_identifier = download_helper_object.GetProjectIdentifier()
+
+    self.assertEqual(project_identifier, 'com.github.log2timeline.test')
+
+
+class DownloadHelperFactoryTest(unittest.TestCase):
+  """Tests for the download helper factory."""
+
+  def testNewDownloadHelper(self):
+    """Tests the NewDownloadHelper function."""
+    download_helper_object = (
+        download_helper.DownloadHelperFactory.NewDownloadHelper(
+            'https://github.com/log2timeline/test/releases'))
+    self.assertIsInstance(
+        download_helper_object, download_helper.GitHubReleasesDownloadHelper)
+
+    with TempDirectory() as mirror_path:
+      source_mirror = mirror.SourceMirror(mirror_path)
+
+      download_helper_object = (
+          download_helper.DownloadHelperFactory.NewDownloadHelper(
+              'https://github.com/log2timeline/test/releases',
+              source_mirror=source_mirror))
+      self.assertIsNone(download_helper_object)
+
+
+@test_lib.skipUnlessHasTestFile(['url_fixtures'])
+class ReplayDownloadHelperTest(test_lib.BaseTestCase):
+  """Tests for the download helpers with replayed URL fixtures."""
+
+  def setUp(self):
+    """Sets up a test case."""
+    path = self._GetTestFilePath(['url_fixtures'])
+    fixture_store = url_opener.URLFixtureStore(path)
+    url_opener.SetURLOpener(url_opener.ReplayURLOpener(fixture_store))
+
+  def tearDown(self):
+    """Cleans up a test case."""
+    url_opener.SetURLOpener(None)
+
+  def testDownloadPageContent(self):
+    """Tests the DownloadPageContent functions."""
+    download_helper_object = download_helper.DownloadHelper('')
+
+    page_content = download_helper_object.DownloadPageContent(
+        'https://raw.githubusercontent.com/log2timeline/devtools/master/'
+        'LICENSE')
+
+    expected_page_content = b''
+    with open('LICENSE', 'rb') as file_object:
+      expected_page_content = file_object.read()
+
+    self.assertEqual(page_content, expected_page_content)
+
+    page_content = download_helper_object.DownloadPageContent(
+        'https://example.com/bogus')
+    self.assertIsNone(page_content)
+
+  @test_lib.skipUnlessPython2()
+  def testGitHubReleasesGetLatestVersion(self):
+    """Tests the GitHub releases GetLatestVersion and GetDownloadURL."""
+    download_helper_object = download_helper.GitHubReleasesDownloadHelper(
+        'https://github.com/log2timeline/dfvfs/releases')
+
+    latest_version = download_helper_object.GetLatestVersion('dfvfs', None)
+    self.assertEqual(latest_version, '20170723')
+
+    download_url = download_helper_object.GetDownloadURL(
+        'dfvfs', latest_version)
+
+    expected_download_url = (
+        'https://github.com/log2timeline/dfvfs/releases/download/20170723/'
+        'dfvfs-20170723.tar.gz')
+    self.assertEqual(download_url, expected_download_url)
+
+  @test_lib.skipUnlessPython2()
+  def testLibyalGitHubGetLatestVersion(self):
+    """Tests the libyal GitHub GetLatestVersion and GetDownloadURL."""
+    fixture_store = url_opener.URLFixtureStore(
+        self._GetTestFilePath(['url_fixtures']))
+    counting_url_opener = CountingURLOpener(
+        url_opener.ReplayURLOpener(fixture_store))
+    url_opener.SetURLOpener(counting_url_opener)
+
+    download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+        download_helper.LibyalProjectConfigurationIndex())
+
+    try:
+      for _ in range(2):
+        download_helper_object = download_helper.LibyalGitHubDownloadHelper(
+            'https://github.com/libyal/libbde/releases')
+
+        latest_version = download_helper_object.GetLatestVersion(
+            'libbde', None)
+        self.assertEqual(latest_version, '20170902')
+
+        download_url = download_helper_object.GetDownloadURL(
+            'libbde', latest_version)
+
+        expected_download_url = (
+            'https://github.com/libyal/libbde/releases/download/20170902/'
+            'libbde-alpha-20170902.tar.gz')
+        self.assertEqual(download_url, expected_download_url)
+
+      # The project configuration and releases page are retrieved once.
+      self.assertEqual(counting_url_opener.number_of_requests, 2)
+
+    finally:
+      download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+          None)
+
+  def testLibyalGitHubSharedPageCache(self):
+    """Tests that the releases pages are shared by the download helpers."""
+    # pylint: disable=protected-access
+    download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+        download_helper.LibyalProjectConfigurationIndex())
+
+    try:
+      libbde_download_helper = (
+          download_helper.LibyalGitHubDownloadHelper._GetGitHubDownloadHelper(
+              'https://github.com/libyal/libbde/releases'))
+      libevt_download_helper = (
+          download_helper.LibyalGitHubDownloadHelper._GetGitHubDownloadHelper(
+              'https://github.com/libyal/libevt/releases'))
+
+      self.assertIs(
+          libbde_download_helper._page_cache,
+          libevt_download_helper._page_cache)
+
+      # Setting the project configuration index resets the releases pages.
+      download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+          download_helper.LibyalProjectConfigurationIndex())
+
+      libevt_download_helper = (
+          download_helper.LibyalGitHubDownloadHelper._GetGitHubDownloadHelper(
+              'https://github.com/libyal/libevt/releases'))
+
+      self.assertIsNot(
+          libbde_download_helper._page_cache,
+          libevt_download_helper._page_cache)
+
+    finally:
+      download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+          None)
+
+  def testLibyalGitHubRevalidation(self):
+    """Tests the revalidation of the libyal project configuration."""
+    not_modified_url_opener = NotModifiedURLOpener()
+    url_opener.SetURLOpener(not_modified_url_opener)
+
+    project_configuration_index = (
+        download_helper.LibyalProjectConfigurationIndex(time_to_live=-1))
+    project_configuration_index.SetEntry(
+        'libbde', 'https://github.com/libyal/libbde/releases', '"1234"', None)
+    download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+        project_configuration_index)
+
+    try:
+      download_helper_object = download_helper.LibyalGitHubDownloadHelper(
+          'https://github.com/libyal/libbde/releases')
+
+      download_url = (
+          download_helper_object.GetProjectConfigurationSourcePackageURL(
+              'libbde'))
+      self.assertEqual(
+          download_url, 'https://github.com/libyal/libbde/releases')
+
+      self.assertEqual(
+          not_modified_url_opener.headers, {'If-None-Match': '"1234"'})
+
+    finally:
+      download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+          None)
+
+  @test_lib.skipUnlessPython2()
+  def testPyPIGetLatestVersion(self):
+    """Tests the PyPI GetLatestVersion function."""
+    download_helper_object = download_helper.PyPIDownloadHelper(
+        'https://pypi.python.org/pypi/construct')
+
+    latest_version = download_helper_object.GetLatestVersion(
+        'construct', None)
+    self.assertEqual(latest_version, '2.8.14')
+
+  @test_lib.skipUnlessPython2()
+  def testPyPIGetLatestVersionWithInvalidVersions(self):
+    """Tests the PyPI GetLatestVersion function with invalid versions."""
+    # pylint: disable=protected-access
+    download_helper_object = download_helper.PyPIDownloadHelper(
+        'https://pypi.python.org/pypi/construct')
+
+    page_content = b'\n'.join([
+        b'<a href="../../packages/ab/cd/construct-!.tar.gz#md5=0">',
+        b'<a href="../../packages/ab/cd/construct-1!2!3.tar.gz#md5=0">',
+        b'<a href="../../packages/ab/cd/construct-2.8.14.tar.gz#md5=0">',
+        b'<a href="../../packages/ab/cd/construct-1!0.1.zip#md5=0">'])
+    download_helper_object._cached_page = (
+        'https://pypi.python.org/simple/construct', page_content)
+
+    latest_version = download_helper_object.GetLatestVersion(
+        'construct', None)
+    self.assertEqual(latest_version, '1!0.1')
+
+
 if __name__ == '__main__':
   unittest.main()
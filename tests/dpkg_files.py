@@ -4,9 +4,13 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from l2tdevtools import dpkg_files
+from l2tdevtools import projects
 
 
 class DPKGBuildFilesGeneratorTest(unittest.TestCase):
@@ -29,7 +33,91 @@ class DPKGBuildFilesGeneratorTest(unittest.TestCase):
   # TODO: test _GenerateSetupPyRulesFile function.
   # TODO: test _GenerateSourceFormatFile function.
   # TODO: test _IsPython2Only function.
-  # TODO: test GenerateFiles function.
+
+  def testReadTemplateFile(self):
+    """Tests the _ReadTemplateFile function."""
+    # pylint: disable=protected-access
+    data_path = os.path.join(os.getcwd(), 'data')
+    dpkg_files_generator = dpkg_files.DPKGBuildFilesGenerator(
+        'pylint', '1.7.1', None, data_path)
+
+    template_data = dpkg_files_generator._ReadTemplateFile('pylint.install')
+    self.assertIsNotNone(template_data)
+
+    template_file_path = os.path.join(
+        data_path, 'dpkg_templates', 'pylint.install')
+    self.assertIn(
+        template_file_path,
+        dpkg_files.DPKGBuildFilesGenerator._template_files_cache)
+
+    cached_template_data = dpkg_files_generator._ReadTemplateFile(
+        'pylint.install')
+    self.assertIs(cached_template_data, template_data)
+
+  def testGenerateFiles(self):
+    """Tests the GenerateFiles function."""
+    project_definition = projects.ProjectDefinition('test')
+    project_definition.build_system = 'setup_py'
+    project_definition.description_long = 'Test project.'
+    project_definition.description_short = 'Test project'
+    project_definition.dpkg_build_dependencies = []
+    project_definition.dpkg_dependencies = []
+    project_definition.homepage_url = 'https://github.com/log2timeline/test'
+    project_definition.maintainer = 'Test <test@example.com>'
+
+    data_path = os.path.join(os.getcwd(), 'data')
+
+    temporary_directory = tempfile.mkdtemp()
+    current_working_directory = os.getcwd()
+    os.chdir(temporary_directory)
+    try:
+      dpkg_files_generator = dpkg_files.DPKGBuildFilesGenerator(
+          'test', '1.0', project_definition, data_path)
+
+      number_of_changed_files = dpkg_files_generator.GenerateFiles('dpkg')
+      self.assertEqual(number_of_changed_files, 9)
+
+      rules_file = os.path.join('dpkg', 'rules')
+      os.utime(rules_file, (1000000000, 1000000000))
+
+      # Files that did not change should not be written.
+      number_of_changed_files = dpkg_files_generator.GenerateFiles('dpkg')
+      self.assertEqual(number_of_changed_files, 0)
+      self.assertEqual(int(os.stat(rules_file).st_mtime), 1000000000)
+
+      with open(os.path.join('dpkg', 'compat'), 'wb') as file_object:
+        file_object.write(b'9\n')
+
+      number_of_changed_files = dpkg_files_generator.GenerateFiles('dpkg')
+      self.assertEqual(number_of_changed_files, 1)
+
+      patches_directory = os.path.join('dpkg', 'patches')
+      os.mkdir(patches_directory)
+      stale_files = [
+          os.path.join('dpkg', 'python-old.install'),
+          os.path.join(patches_directory, 'dropped.patch')]
+      for stale_file in stale_files:
+        with open(stale_file, 'wb') as file_object:
+          file_object.write(b'stale\n')
+
+      # Files and directories that are not generated should be kept, unless
+      # explicitly requested otherwise.
+      number_of_changed_files = dpkg_files_generator.GenerateFiles('dpkg')
+      self.assertEqual(number_of_changed_files, 0)
+      for stale_file in stale_files:
+        self.assertTrue(os.path.exists(stale_file))
+
+      number_of_changed_files = dpkg_files_generator.GenerateFiles(
+          'dpkg', remove_stale_files=True)
+      self.assertEqual(number_of_changed_files, 3)
+      self.assertFalse(os.path.exists(patches_directory))
+      self.assertTrue(os.path.exists(os.path.join('dpkg', 'source')))
+      for stale_file in stale_files:
+        self.assertFalse(os.path.exists(stale_file))
+
+    finally:
+      os.chdir(current_working_directory)
+      shutil.rmtree(temporary_directory, True)
 
 
 if __name__ == '__main__':
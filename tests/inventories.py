@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the package inventories."""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from l2tdevtools import inventories
+
+
+class InventoryComparerTest(unittest.TestCase):
+  """Tests for the inventory comparer."""
+
+  def testCompareVersions(self):
+    """Tests the CompareVersions function."""
+    inventory_comparer = inventories.InventoryComparer()
+
+    for older_version, newer_version in (
+        ('1.9', '1.10'),
+        ('1.0', '1.0.1'),
+        ('1.0~rc1', '1.0'),
+        ('1.0b1', '1.0'),
+        ('1.0rc1', '1.0rc2'),
+        ('20170723', '20171231'),
+        ('2.0', '1:1.0'),
+        ('2.0', '1!1.0'),
+        ('1.0.dev1', '1.0a1'),
+        ('1.0a1', '1.0b1'),
+        ('1.0b1', '1.0rc1'),
+        ('1.0alpha2', '1.0beta1'),
+        ('1.0~20170723', '1.0~dev1'),
+        ('1.0~dev1', '1.0~rc1'),
+        ('1.0rc1', '1.0')):
+      result = inventory_comparer.CompareVersions(older_version, newer_version)
+      self.assertEqual(result, -1)
+
+      result = inventory_comparer.CompareVersions(newer_version, older_version)
+      self.assertEqual(result, 1)
+
+    for first_version, second_version in (
+        ('1.0', '1.0.0'),
+        ('1.0a1', '1.0alpha1'),
+        ('1.0b1', '1.0beta1'),
+        ('1.0c1', '1.0rc1'),
+        ('1.0pre1', '1.0rc1'),
+        ('1.0~rc1', '1.0rc1')):
+      result = inventory_comparer.CompareVersions(first_version, second_version)
+      self.assertEqual(result, 0)
+
+  def testCompare(self):
+    """Tests the Compare function."""
+    inventory_comparer = inventories.InventoryComparer()
+
+    reference_packages = {
+        'dfvfs': '20171231', 'new': '1.0', 'pytsk3': '20170802',
+        'six': '1.10.0'}
+    packages = {
+        'dfvfs': '20170723', 'pytsk3': '20170802', 'removed': '2.0',
+        'six': '1.9.0'}
+
+    inventory_diff = inventory_comparer.Compare(reference_packages, packages)
+    self.assertEqual(inventory_diff.new_packages, {'new': '1.0'})
+    self.assertEqual(inventory_diff.newer_packages, {
+        'dfvfs': ('20171231', '20170723'), 'six': ('1.10.0', '1.9.0')})
+    self.assertEqual(inventory_diff.older_packages, {})
+    self.assertEqual(inventory_diff.removed_packages, {'removed': '2.0'})
+
+    inventory_diff = inventory_comparer.Compare(packages, reference_packages)
+    self.assertEqual(inventory_diff.older_packages, {
+        'dfvfs': ('20170723', '20171231'), 'six': ('1.9.0', '1.10.0')})
+
+    inventory_diff = inventory_comparer.Compare(reference_packages, None)
+    self.assertEqual(inventory_diff.new_packages, reference_packages)
+
+
+class InventorySnapshotTest(unittest.TestCase):
+  """Tests for the inventory snapshot."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testReadAndWriteFile(self):
+    """Tests the ReadFromFile and WriteToFile functions."""
+    snapshot = inventories.InventorySnapshot()
+    snapshot.AddInventory(('copr', 'dev'), {'dfvfs': '20170723'})
+    snapshot.AddInventory(('launchpad', 'stable'), None)
+    snapshot.AddInventory(('pypi', None), {'six': '1.10.0'})
+
+    path = os.path.join(self._temporary_directory, 'snapshot.json')
+    snapshot.WriteToFile(path)
+
+    snapshot = inventories.InventorySnapshot()
+    result = snapshot.ReadFromFile(path)
+    self.assertTrue(result)
+
+    # An inventory of which the packages could not be determined should
+    # not be written to the snapshot.
+    self.assertEqual(snapshot.GetInventoryKeys(), [
+        ('copr', 'dev'), ('pypi', None)])
+    self.assertEqual(
+        snapshot.GetInventory(('copr', 'dev')), {'dfvfs': '20170723'})
+    self.assertEqual(snapshot.GetInventory(('pypi', None)), {'six': '1.10.0'})
+
+    self.assertTrue(snapshot.HasInventory(('copr', 'dev')))
+    self.assertFalse(snapshot.HasInventory(('copr', 'stable')))
+    self.assertFalse(snapshot.HasInventory(('launchpad', 'stable')))
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      json_dict = json.load(file_object)
+
+    for inventory_dict in json_dict['inventories']:
+      self.assertIsNotNone(inventory_dict['packages'])
+
+  def testReadFromFileWithoutPackages(self):
+    """Tests the ReadFromFile function with an inventory without packages."""
+    path = os.path.join(self._temporary_directory, 'snapshot.json')
+    with io.open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write((
+          '{"format_version": 1, "inventories": [{"name": "stable", '
+          '"packages": null, "type": "launchpad"}]}\n'))
+
+    snapshot = inventories.InventorySnapshot()
+    result = snapshot.ReadFromFile(path)
+    self.assertTrue(result)
+
+    self.assertFalse(snapshot.HasInventory(('launchpad', 'stable')))
+
+  def testReadFromFileUnsupportedFormatVersion(self):
+    """Tests the ReadFromFile function with an unsupported format version."""
+    path = os.path.join(self._temporary_directory, 'snapshot.json')
+    with io.open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write('{"format_version": 0, "inventories": []}\n')
+
+    snapshot = inventories.InventorySnapshot()
+    result = snapshot.ReadFromFile(path)
+    self.assertFalse(result)
+
+
+if __name__ == '__main__':
+  unittest.main()
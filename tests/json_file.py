@@ -0,0 +1,68 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the JSON file helper functions."""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from l2tdevtools import json_file
+
+
+class WriteFileTest(unittest.TestCase):
+  """Tests for the WriteFile function."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testWriteFile(self):
+    """Tests the WriteFile function."""
+    path = os.path.join(self._temporary_directory, 'test.json')
+
+    json_file.WriteFile(path, {'format_version': 1})
+    json_file.WriteFile(path, {'format_version': 2})
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      json_dict = json.load(file_object)
+
+    self.assertEqual(json_dict, {'format_version': 2})
+    self.assertEqual(os.listdir(self._temporary_directory), ['test.json'])
+
+  def testWriteFileCompact(self):
+    """Tests the WriteFile function without indentation."""
+    path = os.path.join(self._temporary_directory, 'test.json')
+
+    json_file.WriteFile(
+        path, {'format_version': 1, 'names': ['a']}, compact=True)
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      json_string = file_object.read()
+
+    self.assertEqual(json_string, '{"format_version":1,"names":["a"]}\n')
+
+  def testWriteFileWithError(self):
+    """Tests the WriteFile function when the file cannot be written."""
+    # Renaming a file over a non-empty directory fails.
+    path = os.path.join(self._temporary_directory, 'test.json')
+    os.mkdir(path)
+    with io.open(os.path.join(path, 'file'), 'w', encoding='utf-8'):
+      pass
+
+    with self.assertRaises((IOError, OSError)):
+      json_file.WriteFile(path, {'format_version': 1})
+
+    self.assertEqual(os.listdir(self._temporary_directory), ['test.json'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the source package mirror."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from l2tdevtools import mirror
+from l2tdevtools import projects
+
+
+class SourcePackageEntryTest(unittest.TestCase):
+  """Tests for the source package entry."""
+
+  def testCopyToAndFromDict(self):
+    """Tests the CopyToDict and CopyFromDict functions."""
+    entry = mirror.SourcePackageEntry('test')
+    entry.project_version = '1.0'
+    entry.size = 4
+
+    json_dict = entry.CopyToDict()
+    self.assertEqual(json_dict['project_name'], 'test')
+    self.assertEqual(json_dict['project_version'], '1.0')
+
+    json_dict['bogus'] = 'value'
+
+    entry = mirror.SourcePackageEntry(None)
+    entry.CopyFromDict(json_dict)
+    self.assertEqual(entry.project_name, 'test')
+    self.assertEqual(entry.size, 4)
+    self.assertFalse(hasattr(entry, 'bogus'))
+
+
+class SourceMirrorTest(unittest.TestCase):
+  """Tests for the source mirror."""
+
+  _DOWNLOAD_URL = 'https://github.com/log2timeline/test/releases'
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+    path = os.path.join(self._temporary_directory, 'test-1.0.tar.gz')
+    with open(path, 'wb') as file_object:
+      file_object.write(b'test')
+
+    self._project_definition = projects.ProjectDefinition('test')
+    self._project_definition.download_url = self._DOWNLOAD_URL
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testAddSourcePackage(self):
+    """Tests the AddSourcePackage function."""
+    source_mirror = mirror.SourceMirror(self._temporary_directory)
+
+    entry = source_mirror.AddSourcePackage(
+        self._project_definition, 'com.github.log2timeline.test', '1.0',
+        'https://github.com/log2timeline/test/test-1.0.tar.gz',
+        'test-1.0.tar.gz')
+
+    expected_sha256 = (
+        '9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08')
+    self.assertEqual(entry.sha256, expected_sha256)
+    self.assertEqual(entry.size, 4)
+
+    self.assertTrue(source_mirror.VerifySourcePackage(entry))
+
+  def testGetEntryByDownloadURL(self):
+    """Tests the GetEntryByDownloadURL function."""
+    source_mirror = mirror.SourceMirror(self._temporary_directory)
+    source_mirror.AddSourcePackage(
+        self._project_definition, 'com.github.log2timeline.test', '1.0',
+        'https://github.com/log2timeline/test/test-1.0.tar.gz',
+        'test-1.0.tar.gz')
+
+    entry = source_mirror.GetEntryByDownloadURL(self._DOWNLOAD_URL)
+    self.assertIsNotNone(entry)
+
+    entry = source_mirror.GetEntryByDownloadURL(
+        'http://github.com/log2timeline/test/releases/')
+    self.assertIsNotNone(entry)
+
+    entry = source_mirror.GetEntryByDownloadURL(
+        'https://github.com/log2timeline/bogus/releases')
+    self.assertIsNone(entry)
+
+  def testReadAndWriteManifest(self):
+    """Tests the ReadManifest and WriteManifest functions."""
+    source_mirror = mirror.SourceMirror(self._temporary_directory)
+    result = source_mirror.ReadManifest()
+    self.assertFalse(result)
+
+    source_mirror.AddSourcePackage(
+        self._project_definition, 'com.github.log2timeline.test', '1.0',
+        'https://github.com/log2timeline/test/test-1.0.tar.gz',
+        'test-1.0.tar.gz')
+    source_mirror.WriteManifest()
+
+    source_mirror = mirror.SourceMirror(self._temporary_directory)
+    result = source_mirror.ReadManifest()
+    self.assertTrue(result)
+
+    entries = list(source_mirror.GetEntries())
+    self.assertEqual(len(entries), 1)
+    self.assertEqual(entries[0].project_name, 'test')
+    self.assertEqual(entries[0].project_version, '1.0')
+    self.assertEqual(entries[0].filename, 'test-1.0.tar.gz')
+
+    self.assertTrue(source_mirror.VerifySourcePackage(entries[0]))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -5,10 +5,14 @@
 from __future__ import unicode_literals
 
 import os
+import shutil
+import tempfile
 import unittest
 
 from l2tdevtools import projects
 
+from tests import test_lib
+
 
 class ProjectDefinitionTest(unittest.TestCase):
   """Tests for the project definition."""
@@ -50,6 +54,18 @@ class ProjectVersionDefinitionTest(unittest.TestCase):
     project_version_definition = projects.ProjectVersionDefinition('bogus')
     self.assertIsNotNone(project_version_definition)
 
+  def testIsSupportedAttribute(self):
+    """Tests the is_supported attribute."""
+    project_version_definition = projects.ProjectVersionDefinition('')
+    self.assertTrue(project_version_definition.is_supported)
+
+    project_version_definition = projects.ProjectVersionDefinition(
+        '>=1.0,<2.0')
+    self.assertTrue(project_version_definition.is_supported)
+
+    project_version_definition = projects.ProjectVersionDefinition('bogus')
+    self.assertFalse(project_version_definition.is_supported)
+
   def testVersionStringAttribute(self):
     """Tests the version_string attribute."""
     project_version_definition = projects.ProjectVersionDefinition('>1.0')
@@ -98,5 +114,206 @@ class ProjectDefinitionReaderTest(unittest.TestCase):
     self.assertEqual(project_definition.download_url, expected_download_url)
 
 
+@test_lib.skipUnlessPython2()
+class ProjectDefinitionStoreTest(unittest.TestCase):
+  """Tests for the project definition store."""
+
+  _PROJECTS_INI = '\n'.join([
+      '[dfvfs]',
+      'build_system: setup_py',
+      'version: >=20160108',
+      'download_url: https://github.com/log2timeline/dfvfs/releases',
+      'dpkg_dependencies: libbde-python,pytsk3',
+      '',
+      '[libbde]',
+      'build_system: configure_make',
+      'download_url: https://github.com/libyal/libbde/releases',
+      '',
+      '[pytsk3]',
+      'build_system: setup_py',
+      'download_url: https://pypi.python.org/pypi/pytsk3',
+      ''])
+
+  _PRESETS_INI = '\n'.join([
+      '[dfvfs]',
+      'projects: libbde,pytsk3,dfvfs',
+      '',
+      '[incomplete]',
+      'projects: dfvfs,bogus',
+      ''])
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+    self._cache_path = os.path.join(self._temporary_directory, 'projects.json')
+    self._presets_path = os.path.join(self._temporary_directory, 'presets.ini')
+    self._projects_path = os.path.join(
+        self._temporary_directory, 'projects.ini')
+
+    with open(self._presets_path, 'w') as file_object:
+      file_object.write(self._PRESETS_INI)
+
+    with open(self._projects_path, 'w') as file_object:
+      file_object.write(self._PROJECTS_INI)
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _CreateStore(self):
+    """Creates a project definition store.
+
+    Returns:
+      ProjectDefinitionStore: project definition store.
+    """
+    return projects.ProjectDefinitionStore(
+        self._projects_path, presets_path=self._presets_path,
+        cache_path=self._cache_path)
+
+  def testGetProjectDefinition(self):
+    """Tests the GetProjectDefinition function."""
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
+
+    # Retrieve the project definition from the cache file.
+    project_definition_store = self._CreateStore()
+    result = project_definition_store.Read()
+    self.assertTrue(result)
+
+    project_definition = project_definition_store.GetProjectDefinition(
+        'dfvfs')
+    self.assertIsNotNone(project_definition)
+    self.assertEqual(project_definition.build_system, 'setup_py')
+    self.assertEqual(
+        project_definition.dpkg_dependencies, ['libbde-python', 'pytsk3'])
+    self.assertEqual(project_definition.version.version_string, '>=20160108')
+
+    project_definition = project_definition_store.GetProjectDefinition(
+        'libbde')
+    self.assertIsNotNone(project_definition)
+    self.assertIsNone(project_definition.version.version_string)
+
+    project_definition = project_definition_store.GetProjectDefinition(
+        'bogus')
+    self.assertIsNone(project_definition)
+
+  def testGetProjectDefinitionsByIndex(self):
+    """Tests the GetProjectDefinitionsBy* functions."""
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
+
+    project_definitions = (
+        project_definition_store.GetProjectDefinitionsByBuildSystem(
+            'setup_py'))
+    project_names = [
+        project_definition.name for project_definition in project_definitions]
+    self.assertEqual(project_names, ['dfvfs', 'pytsk3'])
+
+    project_definitions = (
+        project_definition_store.GetProjectDefinitionsByDownloadHost(
+            'GitHub.com'))
+    project_names = [
+        project_definition.name for project_definition in project_definitions]
+    self.assertEqual(project_names, ['dfvfs', 'libbde'])
+
+    project_definitions = (
+        project_definition_store.GetProjectDefinitionsByPreset('dfvfs'))
+    project_names = [
+        project_definition.name for project_definition in project_definitions]
+    self.assertEqual(project_names, ['dfvfs', 'libbde', 'pytsk3'])
+
+  def testGetPresetProjectNames(self):
+    """Tests the GetPresetProjectNames function."""
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
+
+    self.assertEqual(
+        project_definition_store.GetPresetNames(), ['dfvfs', 'incomplete'])
+
+    project_names = project_definition_store.GetPresetProjectNames('dfvfs')
+    self.assertEqual(project_names, ['libbde', 'pytsk3', 'dfvfs'])
+
+    project_names = project_definition_store.GetPresetProjectNames('bogus')
+    self.assertIsNone(project_names)
+
+  def testRead(self):
+    """Tests the Read function."""
+    project_definition_store = self._CreateStore()
+    result = project_definition_store.Read()
+    self.assertFalse(result)
+    self.assertTrue(os.path.exists(self._cache_path))
+
+    self.assertEqual(
+        project_definition_store.GetProjectNames(),
+        ['dfvfs', 'libbde', 'pytsk3'])
+    self.assertTrue(project_definition_store.HasProject('libbde'))
+    self.assertFalse(project_definition_store.HasProject('bogus'))
+
+    project_definition_store = self._CreateStore()
+    result = project_definition_store.Read()
+    self.assertTrue(result)
+
+    # A change of the configuration file should invalidate the cache file.
+    with open(self._projects_path, 'a') as file_object:
+      file_object.write('\n'.join([
+          '[pyparsing]',
+          'build_system: setup_py',
+          'download_url: https://pypi.python.org/pypi/pyparsing',
+          '']))
+
+    project_definition_store = self._CreateStore()
+    result = project_definition_store.Read()
+    self.assertFalse(result)
+    self.assertTrue(project_definition_store.HasProject('pyparsing'))
+
+  def testResolvePreset(self):
+    """Tests the ResolvePreset function."""
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
+
+    preset_resolution = project_definition_store.ResolvePreset('incomplete')
+    self.assertIsNotNone(preset_resolution)
+    self.assertEqual(preset_resolution.cycles, [])
+    self.assertEqual(
+        preset_resolution.dependency_project_names, ['libbde', 'pytsk3'])
+    self.assertEqual(preset_resolution.preset_project_names, ['dfvfs'])
+    self.assertEqual(
+        preset_resolution.project_names, ['libbde', 'pytsk3', 'dfvfs'])
+    self.assertEqual(preset_resolution.unknown_project_names, ['bogus'])
+
+    preset_resolution = project_definition_store.ResolvePreset('bogus')
+    self.assertIsNone(preset_resolution)
+
+  def testResolvePresetWithCycle(self):
+    """Tests the ResolvePreset function with a dependency cycle."""
+    with open(self._projects_path, 'a') as file_object:
+      file_object.write('\n'.join([
+          '[libbde]',
+          'build_system: configure_make',
+          'download_url: https://github.com/libyal/libbde/releases',
+          'build_dependencies: fuse,dfvfs',
+          '']))
+
+    project_definition_store = self._CreateStore()
+    project_definition_store.Read()
+
+    preset_resolution = project_definition_store.ResolvePreset('dfvfs')
+    self.assertIsNotNone(preset_resolution)
+    self.assertEqual(preset_resolution.cycles, [['dfvfs', 'libbde', 'dfvfs']])
+    self.assertEqual(
+        preset_resolution.external_dependencies, {'libbde': ['fuse']})
+
+  def testReadWithoutCache(self):
+    """Tests the Read function without a cache file."""
+    project_definition_store = projects.ProjectDefinitionStore(
+        self._projects_path)
+    result = project_definition_store.Read()
+    self.assertFalse(result)
+    self.assertFalse(os.path.exists(self._cache_path))
+
+    self.assertEqual(len(project_definition_store.GetProjectDefinitions()), 3)
+    self.assertEqual(project_definition_store.GetPresetNames(), [])
+
+
 if __name__ == '__main__':
   unittest.main()
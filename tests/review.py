@@ -5,6 +5,8 @@
 from __future__ import unicode_literals
 
 import os
+import shutil
+import tempfile
 import unittest
 
 from utils import review
@@ -99,14 +101,24 @@ class ErrorGitHelper(review.GitHelper):
 
 
 class TestGitHelper(review.GitHelper):
-  """Git command helper for testing."""
+  """Git command helper for testing.
+
+  Attributes:
+    commands (list[str]): commands that were run.
+  """
 
   _GIT_BRANCH_DATA = (
       b'  cleanup\n'
       b'* feature\n'
       b'  master\n')
 
-  _GIT_EMAIL_DATA = b'username@example.com\n'
+  _GIT_CONFIG_DATA = (
+      b'user.email=username@example.com\n'
+      b'core.bare=false\n'
+      b'remote.origin.url=https://github.com/username/l2tdevtools.git\n'
+      b'remote.origin.fetch=+refs/heads/*:refs/remotes/origin/*\n'
+      b'remote.upstream.url=https://github.com/log2timeline/l2tdevtools.git\n'
+      b'remote.upstream.fetch=+refs/heads/*:refs/remotes/upstream/*\n')
 
   _GIT_LAST_LOG_DATA = (
       b'commit 79a78f3f0044192a0354ad682733a7996c15e89c\n'
@@ -115,11 +127,14 @@ class TestGitHelper(review.GitHelper):
       b'\n'
       b'    Made changes\n')
 
-  _GIT_REMOTE_DATA = (
-      b'origin\thttps://github.com/username/l2tdevtools.git (fetch)\n'
-      b'origin\thttps://github.com/username/l2tdevtools.git (push)\n'
-      b'upstream\thttps://github.com/log2timeline/l2tdevtools.git (fetch)\n'
-      b'upstream\thttps://github.com/log2timeline/l2tdevtools.git (push)\n')
+  def __init__(self, git_repo_url):
+    """Initializes a git helper for testing.
+
+    Args:
+      git_repo_url (str): git repo URL.
+    """
+    super(TestGitHelper, self).__init__(git_repo_url)
+    self.commands = []
 
   def RunCommand(self, command):
     """Runs a command.
@@ -130,20 +145,25 @@ class TestGitHelper(review.GitHelper):
     Returns:
       tuple[int, bytes, bytes]: exit code, stdout and stderr data.
     """
+    self.commands.append(command)
+
     if command == 'git branch':
       return 0, self._GIT_BRANCH_DATA, b''
 
     if command == 'git checkout master':
       return 0, b'', b''
 
-    if command == 'git config user.email':
-      return 0, self._GIT_EMAIL_DATA, b''
+    if command == 'git config --list':
+      return 0, self._GIT_CONFIG_DATA, b''
+
+    if command == 'git ls-files':
+      return 0, b'README\nutils/review.py\n', b''
 
     if command == 'git log -1':
       return 0, self._GIT_LAST_LOG_DATA, b''
 
-    if command == 'git remote -v':
-      return 0, self._GIT_REMOTE_DATA, b''
+    if command == 'git status -s':
+      return 0, b' M README\n', b''
 
     if command.startswith('git add -A '):
       return 0, b'', b''
@@ -164,6 +184,56 @@ class TestGitHelper(review.GitHelper):
       return 0, b'', b''
 
 
+class TestPylintHelper(review.PylintHelper):
+  """Pylint helper for testing.
+
+  Files of which the name contains "fail" are linted with errors.
+
+  Attributes:
+    linted_filenames (list[str]): names of the files that were linted.
+  """
+
+  def __init__(self, cache_path=None, number_of_workers=None):
+    """Initializes a pylint helper for testing.
+
+    Args:
+      cache_path (Optional[str]): path of the file in which the files that
+          were linted without errors are cached, where None represents
+          no cache.
+      number_of_workers (Optional[int]): maximum number of pylint processes
+          that are run concurrently, where None represents the number of
+          CPUs.
+    """
+    super(TestPylintHelper, self).__init__(
+        cache_path=cache_path, number_of_workers=number_of_workers)
+    self.linted_filenames = []
+    self.version = '1.7.1'
+
+  def _GetVersion(self):
+    """Retrieves the pylint version.
+
+    Returns:
+      str: pylint version or None if not available.
+    """
+    return self.version
+
+  def _LintFile(self, filename):
+    """Lints a file using pylint.
+
+    Args:
+      filename (str): name of the file to lint.
+
+    Returns:
+      tuple[str, int, bytes, float]: name of the file, exit code of pylint,
+          output of pylint and duration of the linting in seconds.
+    """
+    self.linted_filenames.append(filename)
+    if 'fail' in os.path.basename(filename):
+      return filename, 1, b'C:  1, 0: Error (error)', 0.0
+
+    return filename, 0, b'', 0.0
+
+
 class GitHelperTest(unittest.TestCase):
   """Tests for the git helper class."""
 
@@ -178,6 +248,40 @@ class GitHelperTest(unittest.TestCase):
     remotes = git_helper._GetRemotes()
     self.assertEqual(len(remotes), 4)
 
+    expected_remote = (
+        b'upstream\thttps://github.com/log2timeline/l2tdevtools.git (push)')
+    self.assertEqual(remotes[3], expected_remote)
+
+  def testGetSnapshot(self):
+    """Tests the _GetSnapshot function."""
+    git_helper = TestGitHelper(self._GIT_REPO_URL)
+
+    snapshot = git_helper._GetSnapshot()
+    self.assertEqual(snapshot.active_branch, b'feature')
+    self.assertEqual(snapshot.branches, [b'cleanup', b'feature', b'master'])
+    self.assertEqual(
+        snapshot.configuration[b'user.email'], b'username@example.com')
+    self.assertEqual(snapshot.status, [b' M README'])
+
+    # The queries are served from the snapshot.
+    git_helper.CheckHasBranch('master')
+    git_helper.CheckHasProjectUpstream()
+    git_helper.CheckHasUncommittedChanges()
+    git_helper.GetActiveBranch()
+    git_helper.GetChangedFiles()
+    git_helper.GetChangedFiles()
+    git_helper.GetEmailAddress()
+    git_helper.GetRemoteOrigin()
+
+    expected_commands = [
+        'git branch', 'git status -s', 'git config --list', 'git ls-files']
+    self.assertEqual(git_helper.commands, expected_commands)
+
+    # Operations that change the state invalidate the snapshot.
+    git_helper.SwitchToMasterBranch()
+    git_helper.GetActiveBranch()
+    self.assertEqual(git_helper.commands[-3:], expected_commands[:3])
+
   def testAddPath(self):
     """Tests the AddPath function."""
     git_helper = TestGitHelper(self._GIT_REPO_URL)
@@ -414,6 +518,51 @@ class PylintHelperTest(unittest.TestCase):
 
     # TODO: capture output and compare.
 
+  def testCheckFilesWithCache(self):
+    """Tests the CheckFiles function with a cache."""
+    temporary_directory = tempfile.mkdtemp()
+    try:
+      cache_path = os.path.join(temporary_directory, 'pylint.json')
+
+      filenames = []
+      for name in ('fail.py', 'pass1.py', 'pass2.py'):
+        path = os.path.join(temporary_directory, name)
+        with open(path, 'wb') as file_object:
+          file_object.write(b'# -*- coding: utf-8 -*-\n')
+        filenames.append(path)
+
+      pylint_helper = TestPylintHelper(cache_path=cache_path)
+      result = pylint_helper.CheckFiles(filenames)
+      self.assertFalse(result)
+      self.assertEqual(sorted(pylint_helper.linted_filenames), filenames)
+
+      # Only the file linted with errors is linted again.
+      pylint_helper = TestPylintHelper(
+          cache_path=cache_path, number_of_workers=1)
+      result = pylint_helper.CheckFiles(filenames)
+      self.assertFalse(result)
+      self.assertEqual(pylint_helper.linted_filenames, filenames[:1])
+
+      # A changed file is linted again.
+      with open(filenames[1], 'ab') as file_object:
+        file_object.write(b'\n')
+
+      pylint_helper = TestPylintHelper(cache_path=cache_path)
+      result = pylint_helper.CheckFiles(filenames[1:])
+      self.assertTrue(result)
+      self.assertEqual(pylint_helper.linted_filenames, filenames[1:2])
+
+      # A different pylint version invalidates the cache.
+      pylint_helper = TestPylintHelper(cache_path=cache_path)
+      pylint_helper.version = '1.8.0'
+      result = pylint_helper.CheckFiles(filenames[1:])
+      self.assertTrue(result)
+      self.assertEqual(
+          sorted(pylint_helper.linted_filenames), filenames[1:])
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
   def testCheckUpToDateVersion(self):
     """Tests the CheckUpToDateVersion function."""
     result = self._pylint_helper.CheckUpToDateVersion()
@@ -442,6 +591,171 @@ class SphinxAPIDocHelperTest(unittest.TestCase):
   # TODO: add UpdateAPIDocs test.
 
 
+class UnitTestHelperTest(unittest.TestCase):
+  """Tests for the unit test helper class."""
+
+  # pylint: disable=protected-access
+
+  def _GetPythonFiles(self):
+    """Retrieves the paths of the Python files of the project.
+
+    Returns:
+      list[str]: paths of the Python files.
+    """
+    python_files = []
+    for directory in ('l2tdevtools', 'tests', 'utils'):
+      for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.py'):
+          python_files.append(os.path.join(directory, filename))
+
+    return python_files
+
+  def testDefinesTests(self):
+    """Tests the _DefinesTests function."""
+    unit_test_helper = review.UnitTestHelper()
+
+    result = unit_test_helper._DefinesTests(os.path.join('tests', 'review.py'))
+    self.assertTrue(result)
+
+    result = unit_test_helper._DefinesTests(
+        os.path.join('tests', 'test_lib.py'))
+    self.assertFalse(result)
+
+  def testGetImportedModuleNames(self):
+    """Tests the _GetImportedModuleNames function."""
+    unit_test_helper = review.UnitTestHelper()
+
+    test_file = os.path.join('tests', 'review.py')
+    module_names = unit_test_helper._GetImportedModuleNames(test_file)
+    self.assertIn('unittest', module_names)
+    self.assertIn('utils.review', module_names)
+
+  def testGetImportedModuleNamesImportForms(self):
+    """Tests the _GetImportedModuleNames function with various import forms."""
+    unit_test_helper = review.UnitTestHelper()
+
+    temporary_directory = tempfile.mkdtemp()
+    current_working_directory = os.getcwd()
+    os.chdir(temporary_directory)
+    try:
+      os.mkdir('pkg')
+      with open(os.path.join('pkg', 'mod.py'), 'wb') as file_object:
+        file_object.write(b'\n'.join([
+            b'import a.b, c.d',
+            b'from pkg import first as alias',
+            b'from pkg import (',
+            b'    second,',
+            b'    third)',
+            b'from . import sibling',
+            b'from .sub import name',
+            b'']))
+
+      module_names = unit_test_helper._GetImportedModuleNames(
+          os.path.join('pkg', 'mod.py'))
+
+      with open(os.path.join('pkg', 'broken.py'), 'wb') as file_object:
+        file_object.write(b'import (\n')
+
+      broken_module_names = unit_test_helper._GetImportedModuleNames(
+          os.path.join('pkg', 'broken.py'))
+
+    finally:
+      os.chdir(current_working_directory)
+      shutil.rmtree(temporary_directory, True)
+
+    self.assertEqual(module_names, set([
+        'a.b', 'c.d', 'pkg', 'pkg.first', 'pkg.second', 'pkg.third',
+        'pkg.sibling', 'pkg.sub', 'pkg.sub.name']))
+    self.assertIsNone(broken_module_names)
+
+  def testGetModuleName(self):
+    """Tests the _GetModuleName function."""
+    unit_test_helper = review.UnitTestHelper()
+
+    module_name = unit_test_helper._GetModuleName(
+        os.path.join('l2tdevtools', 'projects.py'))
+    self.assertEqual(module_name, 'l2tdevtools.projects')
+
+    module_name = unit_test_helper._GetModuleName(
+        os.path.join('l2tdevtools', '__init__.py'))
+    self.assertEqual(module_name, 'l2tdevtools')
+
+  def testGetAffectedTestFiles(self):
+    """Tests the GetAffectedTestFiles function."""
+    unit_test_helper = review.UnitTestHelper()
+    python_files = self._GetPythonFiles()
+
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        [os.path.join('l2tdevtools', 'validation.py')], python_files)
+    self.assertIn(os.path.join('tests', 'validation.py'), test_files)
+    self.assertNotIn(os.path.join('tests', 'review.py'), test_files)
+
+    # Test files without tests, such as test_lib.py, are not affected.
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        [os.path.join('tests', 'test_lib.py')], python_files)
+    self.assertNotIn(os.path.join('tests', 'test_lib.py'), test_files)
+    self.assertIn(os.path.join('tests', 'download_helper.py'), test_files)
+
+    # A test file is affected by a module it imports indirectly.
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        [os.path.join('l2tdevtools', 'download_helper.py')], python_files)
+    self.assertIn(os.path.join('tests', 'validation.py'), test_files)
+
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        [os.path.join('tests', 'test_lib.py')], python_files)
+    self.assertIn(os.path.join('tests', 'spec_file.py'), test_files)
+
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        ['AUTHORS'], python_files)
+    self.assertEqual(test_files, [])
+
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        ['run_tests.py'], python_files)
+    self.assertIsNone(test_files)
+
+    test_files = unit_test_helper.GetAffectedTestFiles(
+        [os.path.join('test_data', 'dependencies.ini')], python_files)
+    self.assertIsNone(test_files)
+
+  def testGetAffectedTestFilesImportForms(self):
+    """Tests the GetAffectedTestFiles function with various import forms."""
+    unit_test_helper = review.UnitTestHelper()
+
+    python_files = [
+        os.path.join('pkg', '__init__.py'), os.path.join('pkg', 'mod.py'),
+        os.path.join('tests', '__init__.py'), os.path.join('tests', 'mod.py'),
+        os.path.join('tests', 'mod2.py'), os.path.join('tests', 'mod3.py'),
+        os.path.join('tests', 'other.py')]
+
+    test_case_data = b'class Test(object):\n  def testRun(self):\n    return\n'
+    test_file_data = {
+        'mod.py': b'from pkg import mod as m\n' + test_case_data,
+        'mod2.py': b'from pkg import (\n    mod)\n' + test_case_data,
+        'mod3.py': b'import os, pkg.mod\n' + test_case_data,
+        'other.py': b'import os\n' + test_case_data}
+
+    temporary_directory = tempfile.mkdtemp()
+    current_working_directory = os.getcwd()
+    os.chdir(temporary_directory)
+    try:
+      os.mkdir('pkg')
+      os.mkdir('tests')
+      for path in python_files:
+        with open(path, 'wb') as file_object:
+          file_object.write(test_file_data.get(os.path.basename(path), b''))
+
+      test_files = unit_test_helper.GetAffectedTestFiles(
+          [os.path.join('pkg', 'mod.py')], python_files)
+
+    finally:
+      os.chdir(current_working_directory)
+      shutil.rmtree(temporary_directory, True)
+
+    self.assertEqual(test_files, [
+        os.path.join('tests', 'mod.py'), os.path.join('tests', 'mod2.py'),
+        os.path.join('tests', 'mod3.py')])
+
+
 class NetRCFileTest(unittest.TestCase):
   """Tests for the .netrc file class."""
 
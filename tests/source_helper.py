@@ -4,8 +4,15 @@
 
 from __future__ import unicode_literals
 
+import io
+import os
+import shutil
+import tarfile
+import tempfile
 import unittest
+import zipfile
 
+from l2tdevtools import projects
 from l2tdevtools import source_helper
 
 
@@ -18,7 +25,148 @@ class SourceHelperTest(unittest.TestCase):
     self.assertIsNotNone(source_helper_object)
 
 
-# TODO: add tests.
+class SourcePackageHelperTest(unittest.TestCase):
+  """Tests for the helper to manager the source code from a source package."""
+
+  _MEMBERS = [
+      ('test-1.0/PKG-INFO', b'Name: test\nVersion: 1.0\n'),
+      ('test-1.0/setup.py', b'import setuptools\n'),
+      ('test-1.0/test/__init__.py', b'')]
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _CreateSourcePackageHelper(self, source_filename):
+    """Creates a source package helper for a source package.
+
+    Args:
+      source_filename (str): filename of the source package.
+
+    Returns:
+      SourcePackageHelper: source package helper.
+    """
+    project_definition = projects.ProjectDefinition('test')
+    source_helper_object = source_helper.SourcePackageHelper(
+        'test', project_definition, None)
+    source_helper_object._source_filename = source_filename
+    return source_helper_object
+
+  def _WriteTarFile(self, path):
+    """Writes a .tar.gz source package.
+
+    Args:
+      path (str): path of the source package.
+    """
+    with tarfile.open(path, 'w:gz') as tar_file:
+      tar_info = tarfile.TarInfo(name='test-1.0/test')
+      tar_info.type = tarfile.DIRTYPE
+      tar_file.addfile(tar_info)
+
+      for member_path, data in self._MEMBERS:
+        tar_info = tarfile.TarInfo(name=member_path)
+        tar_info.size = len(data)
+        tar_file.addfile(tar_info, io.BytesIO(data))
+
+  def _WriteZipFile(self, path):
+    """Writes a .zip source package.
+
+    Args:
+      path (str): path of the source package.
+    """
+    with zipfile.ZipFile(path, 'w') as zip_file:
+      zip_file.writestr('test-1.0/test/', b'')
+
+      for member_path, data in self._MEMBERS:
+        zip_file.writestr(member_path, data)
+
+  def testGetArchiveMemberPathsTar(self):
+    """Tests the GetArchiveMemberPaths function on a .tar.gz file."""
+    source_filename = os.path.join(
+        self._temporary_directory, 'test-1.0.tar.gz')
+    self._WriteTarFile(source_filename)
+
+    source_helper_object = self._CreateSourcePackageHelper(source_filename)
+
+    paths = source_helper_object.GetArchiveMemberPaths()
+    self.assertEqual(paths, ['PKG-INFO', 'setup.py', 'test/__init__.py'])
+
+    # The source package should not have been extracted.
+    self.assertFalse(os.path.exists('test-1.0'))
+
+  def testGetArchiveMemberPathsZip(self):
+    """Tests the GetArchiveMemberPaths function on a .zip file."""
+    source_filename = os.path.join(self._temporary_directory, 'test-1.0.zip')
+    self._WriteZipFile(source_filename)
+
+    source_helper_object = self._CreateSourcePackageHelper(source_filename)
+
+    paths = source_helper_object.GetArchiveMemberPaths()
+    self.assertEqual(paths, ['PKG-INFO', 'setup.py', 'test/__init__.py'])
+
+  def testReadArchiveMemberTar(self):
+    """Tests the ReadArchiveMember function on a .tar.gz file."""
+    source_filename = os.path.join(
+        self._temporary_directory, 'test-1.0.tar.gz')
+    self._WriteTarFile(source_filename)
+
+    source_helper_object = self._CreateSourcePackageHelper(source_filename)
+
+    data = source_helper_object.ReadArchiveMember('setup.py')
+    self.assertEqual(data, b'import setuptools\n')
+
+    data = source_helper_object.ReadArchiveMember('PKG-INFO')
+    self.assertEqual(data, b'Name: test\nVersion: 1.0\n')
+
+    data = source_helper_object.ReadArchiveMember('bogus')
+    self.assertIsNone(data)
+
+  def testReadArchiveMemberZip(self):
+    """Tests the ReadArchiveMember function on a .zip file."""
+    source_filename = os.path.join(self._temporary_directory, 'test-1.0.zip')
+    self._WriteZipFile(source_filename)
+
+    source_helper_object = self._CreateSourcePackageHelper(source_filename)
+
+    data = source_helper_object.ReadArchiveMember('setup.py')
+    self.assertEqual(data, b'import setuptools\n')
+
+    data = source_helper_object.ReadArchiveMember('bogus')
+    self.assertIsNone(data)
+
+  def testReadArchiveMembersTar(self):
+    """Tests the ReadArchiveMembers function on a .tar.gz file."""
+    source_filename = os.path.join(
+        self._temporary_directory, 'test-1.0.tar.gz')
+    self._WriteTarFile(source_filename)
+
+    source_helper_object = self._CreateSourcePackageHelper(source_filename)
+
+    archive_members_data = source_helper_object.ReadArchiveMembers(
+        ['setup.py', 'PKG-INFO', 'bogus'])
+    self.assertEqual(archive_members_data, {
+        'PKG-INFO': b'Name: test\nVersion: 1.0\n',
+        'setup.py': b'import setuptools\n'})
+
+    archive_members_data = source_helper_object.ReadArchiveMembers([])
+    self.assertEqual(archive_members_data, {})
+
+  def testReadArchiveMembersZip(self):
+    """Tests the ReadArchiveMembers function on a .zip file."""
+    source_filename = os.path.join(self._temporary_directory, 'test-1.0.zip')
+    self._WriteZipFile(source_filename)
+
+    source_helper_object = self._CreateSourcePackageHelper(source_filename)
+
+    archive_members_data = source_helper_object.ReadArchiveMembers(
+        ['setup.py', 'PKG-INFO', 'bogus'])
+    self.assertEqual(archive_members_data, {
+        'PKG-INFO': b'Name: test\nVersion: 1.0\n',
+        'setup.py': b'import setuptools\n'})
 
 
 if __name__ == '__main__':
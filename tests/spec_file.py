@@ -4,12 +4,21 @@
 
 from __future__ import unicode_literals
 
+import io
+import os
+import shutil
+import tarfile
+import tempfile
 import unittest
 
+from l2tdevtools import projects
+from l2tdevtools import source_helper
 from l2tdevtools import spec_file
 
+from tests import test_lib
 
-class RPMSpecFileGeneratorTest(unittest.TestCase):
+
+class RPMSpecFileGeneratorTest(test_lib.BaseTestCase):
   """Tests for the RPM spec file generator."""
 
   def testGetBuildDefinition(self):
@@ -22,11 +31,184 @@ class RPMSpecFileGeneratorTest(unittest.TestCase):
   # TODO: test _GetDocumentationFilesDefinition function.
   # TODO: test _GetInstallDefinition function.
   # TODO: test _GetLicenseFileDefinition function.
+
+  @test_lib.skipUnlessHasTestFile(['dfvfs-20170723', 'PKG-INFO'])
+  @test_lib.skipUnlessHasTestFile(['dfvfs.spec'])
+  def testGetSetupPySpecFileData(self):
+    """Tests the _GetSetupPySpecFileData function."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    source_directory = self._GetTestFilePath(['dfvfs-20170723'])
+    _, metadata_files = spec_file_generator._ReadSourceDirectory(
+        source_directory)
+    spec_file_data = spec_file_generator._GetSetupPySpecFileData(
+        metadata_files)
+
+    # The data should be equivalent to: setup.py bdist_rpm --spec-only
+    test_file_path = self._GetTestFilePath(['dfvfs.spec'])
+    with open(test_file_path, 'rb') as file_object:
+      expected_spec_file_data = file_object.read()
+
+    self.assertEqual(spec_file_data, expected_spec_file_data)
+
+  def testGetSetupPySpecFileDataInsufficientMetadata(self):
+    """Tests the _GetSetupPySpecFileData function without metadata."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    spec_file_data = spec_file_generator._GetSetupPySpecFileData({})
+    self.assertIsNone(spec_file_data)
+
+    metadata_files = {'PKG-INFO': b'Name: test\nVersion: 1.0\n'}
+    spec_file_data = spec_file_generator._GetSetupPySpecFileData(
+        metadata_files)
+    self.assertIsNotNone(spec_file_data)
+
+    # A customized bdist_rpm requires setup.py to be run.
+    metadata_files['setup.py'] = b'cmdclass = {"bdist_rpm": BdistRPMCommand}\n'
+    spec_file_data = spec_file_generator._GetSetupPySpecFileData(
+        metadata_files)
+    self.assertIsNone(spec_file_data)
+
+    # An attribute reference requires setuptools.
+    metadata_files = {'setup.cfg': (
+        b'[metadata]\nname = test\nversion = attr: test.__version__\n')}
+    spec_file_data = spec_file_generator._GetSetupPySpecFileData(
+        metadata_files)
+    self.assertIsNone(spec_file_data)
+
+  @test_lib.skipUnlessHasTestFile(['dfvfs-20170723', 'PKG-INFO'])
+  def testReadPackageInformation(self):
+    """Tests the _ReadPackageInformation function."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    test_file_path = self._GetTestFilePath(['dfvfs-20170723', 'PKG-INFO'])
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    metadata = spec_file_generator._ReadPackageInformation(data)
+
+    self.assertEqual(metadata['name'], 'dfvfs')
+    self.assertEqual(metadata['version'], '20170723')
+    self.assertEqual(metadata['classifier'], 'Development Status :: 3 - Alpha')
+
+    description_lines = metadata['description'].split('\n')
+    self.assertEqual(len(description_lines), 5)
+    self.assertEqual(description_lines[1], (
+        'file-system objects from various storage media types and file '
+        'formats. The goal'))
+
+  @test_lib.skipUnlessHasTestFile(['dfvfs.spec'])
+  def testReadSpecFileSections(self):
+    """Tests the _ReadSpecFileSections function."""
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    test_file_path = self._GetTestFilePath(['dfvfs.spec'])
+    with open(test_file_path, 'rb') as file_object:
+      sections = list(spec_file_generator._ReadSpecFileSections(file_object))
+
+    self.assertEqual(len(sections), 41)
+    self.assertEqual(sections[0], (b'', False, b'%define name dfvfs\n'))
+
+    section_headers = [
+        line for _, is_header, line in sections if is_header]
+    expected_section_headers = [
+        b'%description\n', b'%prep\n', b'%build\n', b'%install\n',
+        b'%clean\n', b'%files -f INSTALLED_FILES\n']
+    self.assertEqual(section_headers, expected_section_headers)
+
+    # Lines that start with a macro do not start a section.
+    self.assertEqual(sections[28], (
+        b'%prep', False, b'%setup -n %{name}-%{unmangled_version}\n'))
+
   # TODO: test _WriteChangeLog function.
   # TODO: test _WritePython2PackageDefinition function.
   # TODO: test _WritePython2PackageFiles function.
   # TODO: test _WritePython3PackageDefinition function.
   # TODO: test _WritePython3PackageFiles function.
+
+  @test_lib.skipUnlessPython2()
+  @test_lib.skipUnlessHasTestFile(['dfvfs-20170723', 'PKG-INFO'])
+  @test_lib.skipUnlessHasTestFile(['dfvfs.spec'])
+  def testGenerateWithMetadata(self):
+    """Tests the GenerateWithMetadata function."""
+    project_definition = projects.ProjectDefinition('dfvfs')
+    project_definition.build_system = 'setup_py'
+
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    source_directory = self._GetTestFilePath(['dfvfs-20170723'])
+    input_file = self._GetTestFilePath(['dfvfs.spec'])
+
+    temporary_directory = tempfile.mkdtemp()
+    try:
+      output_file = os.path.join(temporary_directory, 'metadata.spec')
+      result = spec_file_generator.GenerateWithMetadata(
+          project_definition, source_directory, 'dfvfs-20170723.tar.gz',
+          'dfvfs', output_file)
+      self.assertTrue(result)
+
+      with io.open(output_file, 'rb') as file_object:
+        spec_file_data = file_object.read()
+
+      output_file = os.path.join(temporary_directory, 'setup_py.spec')
+      result = spec_file_generator.RewriteSetupPyGeneratedFile(
+          project_definition, source_directory, 'dfvfs-20170723.tar.gz',
+          'dfvfs', input_file, output_file)
+      self.assertTrue(result)
+
+      with io.open(output_file, 'rb') as file_object:
+        expected_spec_file_data = file_object.read()
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
+    self.assertEqual(spec_file_data, expected_spec_file_data)
+
+  @test_lib.skipUnlessPython2()
+  @test_lib.skipUnlessHasTestFile(['dfvfs-20170723', 'PKG-INFO'])
+  def testGenerateWithMetadataFromSourcePackage(self):
+    """Tests the GenerateWithMetadata function with a source package."""
+    project_definition = projects.ProjectDefinition('dfvfs')
+    project_definition.build_system = 'setup_py'
+
+    spec_file_generator = spec_file.RPMSpecFileGenerator()
+
+    source_directory = self._GetTestFilePath(['dfvfs-20170723'])
+
+    temporary_directory = tempfile.mkdtemp()
+    try:
+      source_filename = os.path.join(
+          temporary_directory, 'dfvfs-20170723.tar.gz')
+      with tarfile.open(source_filename, 'w:gz') as tar_file:
+        tar_file.add(source_directory, arcname='dfvfs-20170723')
+
+      source_helper_object = source_helper.SourcePackageHelper(
+          'dfvfs', project_definition, None)
+      source_helper_object._source_filename = source_filename
+
+      output_file = os.path.join(temporary_directory, 'source_package.spec')
+      result = spec_file_generator.GenerateWithMetadata(
+          project_definition, None, 'dfvfs-20170723.tar.gz', 'dfvfs',
+          output_file, source_helper_object=source_helper_object)
+      self.assertTrue(result)
+
+      with io.open(output_file, 'rb') as file_object:
+        spec_file_data = file_object.read()
+
+      output_file = os.path.join(temporary_directory, 'source_directory.spec')
+      result = spec_file_generator.GenerateWithMetadata(
+          project_definition, source_directory, 'dfvfs-20170723.tar.gz',
+          'dfvfs', output_file)
+      self.assertTrue(result)
+
+      with io.open(output_file, 'rb') as file_object:
+        expected_spec_file_data = file_object.read()
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
+    self.assertEqual(spec_file_data, expected_spec_file_data)
+
   # TODO: test GenerateWithSetupPy function.
   # TODO: test _RewriteSetupPyGeneratedFile function.
   # TODO: test RewriteSetupPyGeneratedFile function.
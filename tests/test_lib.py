@@ -32,6 +32,19 @@ def skipUnlessHasTestFile(path_segments):
   return unittest.skip('missing test file: {0:s}'.format(path))
 
 
+def skipUnlessPython2():
+  """Decorator to skip a test if the Python version is not 2.
+
+  The download helpers, the project definition reader, the RPM spec file
+  generator and the upload script do not support Python 3 yet.
+
+  Returns:
+    function: to invoke.
+  """
+  # TODO: remove when the tested code supports Python 3.
+  return unittest.skipIf(sys.version_info[0] > 2, 'Python 2 only')
+
+
 class BaseTestCase(unittest.TestCase):
   """The base test case."""
 
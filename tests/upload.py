@@ -0,0 +1,256 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the upload script."""
+
+from __future__ import unicode_literals
+
+import io
+import subprocess
+import sys
+import unittest
+
+from tests import test_lib
+
+if sys.version_info[0] < 3:
+  from utils import upload  # pylint: disable=ungrouped-imports
+else:
+  upload = None
+
+
+class TestProcess(object):
+  """Git cat-file process for testing.
+
+  Attributes:
+    stdin (io.BytesIO): input of the process.
+    stdout (io.BytesIO): output of the process.
+  """
+
+  def __init__(self, output):
+    """Initializes a process for testing.
+
+    Args:
+      output (bytes): output of the process.
+    """
+    super(TestProcess, self).__init__()
+    self.stdin = io.BytesIO()
+    self.stdout = io.BytesIO(output)
+
+    # The written object names are kept when the input is closed.
+    self.stdin.close = lambda: None
+
+  def wait(self):
+    """Waits for the process to terminate.
+
+    Returns:
+      int: exit code.
+    """
+    return 0
+
+
+class TestSubprocessModule(object):
+  """Subprocess module that runs a process for testing.
+
+  Attributes:
+    PIPE (int): value that indicates that a pipe should be created.
+    process (TestProcess): process for testing.
+  """
+
+  PIPE = subprocess.PIPE
+
+  def __init__(self, output):
+    """Initializes a subprocess module for testing.
+
+    Args:
+      output (bytes): output of the process.
+    """
+    super(TestSubprocessModule, self).__init__()
+    self.process = TestProcess(output)
+
+  # pylint: disable=invalid-name,unused-argument
+  def Popen(self, command, **kwargs):
+    """Runs a process for testing.
+
+    Args:
+      command (list[str]): command.
+      kwargs (dict[str, object]): keyword arguments.
+
+    Returns:
+      TestProcess: process for testing.
+    """
+    return self.process
+
+
+@test_lib.skipUnlessPython2()
+class GitBatchObjectReaderTest(unittest.TestCase):
+  """Tests for the git batch object reader."""
+
+  def _ReadObjects(self, object_names, output):
+    """Reads objects from the output of a git cat-file process for testing.
+
+    Args:
+      object_names (list[bytes]): object names.
+      output (bytes): output of the git cat-file process.
+
+    Returns:
+      tuple[dict[bytes, bytes], bytes]: content per object name or None if
+          the objects could not be read, and the object names written to
+          the git cat-file process.
+    """
+    subprocess_module = TestSubprocessModule(output)
+
+    upload.subprocess = subprocess_module
+    try:
+      reader = upload.GitBatchObjectReader()
+      contents = reader.ReadObjects(object_names)
+    finally:
+      upload.subprocess = subprocess
+
+    return contents, subprocess_module.process.stdin.getvalue()
+
+  def testReadObjects(self):
+    """Tests the ReadObjects function."""
+    object_names = [b'HEAD:first', b'HEAD:bogus', b'0123', b'HEAD:second']
+    output = b''.join([
+        b'1111111111111111111111111111111111111111 blob 6\n',
+        b'first\n\n',
+        b'HEAD:bogus missing\n',
+        b'0123 ambiguous\n',
+        b'2222222222222222222222222222222222222222 blob 0\n',
+        b'\n'])
+
+    contents, input_data = self._ReadObjects(object_names, output)
+
+    self.assertEqual(contents, {b'HEAD:first': b'first\n', b'HEAD:second': b''})
+    self.assertEqual(
+        input_data, b'HEAD:first\nHEAD:bogus\n0123\nHEAD:second\n')
+
+  def testReadObjectsWithGit(self):
+    """Tests the ReadObjects function with git."""
+    command = ['git', 'show', 'HEAD:run_tests.py']
+    expected_content = subprocess.check_output(command)
+
+    reader = upload.GitBatchObjectReader()
+    contents = reader.ReadObjects([b'HEAD:run_tests.py', b'HEAD:bogus'])
+
+    self.assertEqual(contents, {b'HEAD:run_tests.py': expected_content})
+
+  def testReadObjectsWithoutObjectNames(self):
+    """Tests the ReadObjects function without object names."""
+    contents, input_data = self._ReadObjects([], b'')
+
+    self.assertEqual(contents, {})
+    self.assertEqual(input_data, b'')
+
+  def testReadObjectsWithTruncatedOutput(self):
+    """Tests the ReadObjects function with truncated output."""
+    object_names = [b'HEAD:first', b'HEAD:second']
+    output = b''.join([
+        b'1111111111111111111111111111111111111111 blob 6\n',
+        b'first\n\n'])
+
+    contents, _ = self._ReadObjects(object_names, output)
+
+    self.assertIsNone(contents)
+
+
+@test_lib.skipUnlessPython2()
+class MultipartFormDataBodyTest(unittest.TestCase):
+  """Tests for the multipart/form-data request body."""
+
+  def testEncodeMultipartFormData(self):
+    """Tests the EncodeMultipartFormData function."""
+    fields = [(b'subject', b'Test'), (b'description', 'é')]
+    files = [(b'data', b'data', b'diff\r\n')]
+
+    content_type, body = upload.EncodeMultipartFormData(fields, files)
+
+    self.assertEqual(content_type, (
+        b'multipart/form-data; boundary=-M-A-G-I-C---B-O-U-N-D-A-R-Y-'))
+
+    # The body should be identical to the lines joined by CRLF, as the body
+    # was encoded before it was streamed.
+    expected_body = b'\r\n'.join([
+        b'---M-A-G-I-C---B-O-U-N-D-A-R-Y-',
+        b'Content-Disposition: form-data; name="subject"',
+        b'',
+        b'Test',
+        b'---M-A-G-I-C---B-O-U-N-D-A-R-Y-',
+        b'Content-Disposition: form-data; name="description"',
+        b'',
+        b'\xc3\xa9',
+        b'---M-A-G-I-C---B-O-U-N-D-A-R-Y-',
+        (b'Content-Disposition: form-data; name="data"; '
+         b'filename="data"'),
+        b'Content-Type: application/octet-stream',
+        b'',
+        b'diff\r\n',
+        b'---M-A-G-I-C---B-O-U-N-D-A-R-Y---',
+        b''])
+
+    self.assertEqual(len(body), len(expected_body))
+    self.assertEqual(str(body), expected_body)
+    self.assertEqual(body.read(), expected_body)
+
+  def testRead(self):
+    """Tests the read function."""
+    body = upload.MultipartFormDataBody([b'abc', b'', b'de', b'fghij'])
+
+    self.assertEqual(len(body), 10)
+    self.assertEqual(body.read(2), b'ab')
+    self.assertEqual(body.tell(), 2)
+
+    # A read that spans multiple chunks.
+    self.assertEqual(body.read(4), b'cdef')
+    self.assertEqual(body.tell(), 6)
+
+    self.assertEqual(body.read(), b'ghij')
+    self.assertEqual(body.tell(), 10)
+
+    self.assertEqual(body.read(), b'')
+    self.assertEqual(body.read(5), b'')
+
+    body = upload.MultipartFormDataBody([b'abc', b'de', b'fghij'])
+    data = []
+    while True:
+      block = body.read(3)
+      if not block:
+        break
+      data.append(block)
+
+    self.assertEqual(data, [b'abc', b'def', b'ghi', b'j'])
+
+  def testSeek(self):
+    """Tests the seek and tell functions."""
+    body = upload.MultipartFormDataBody([b'abc', b'de', b'fghij'])
+
+    body.seek(4)
+    self.assertEqual(body.tell(), 4)
+    self.assertEqual(body.read(3), b'efg')
+
+    body.seek(-2, 1)
+    self.assertEqual(body.tell(), 5)
+    self.assertEqual(body.read(1), b'f')
+
+    body.seek(-3, 2)
+    self.assertEqual(body.tell(), 7)
+    self.assertEqual(body.read(), b'hij')
+
+    # Seeking to an offset at the start of a chunk.
+    body.seek(3)
+    self.assertEqual(body.read(2), b'de')
+
+    # Seeking outside the body is clamped to the body.
+    body.seek(-1)
+    self.assertEqual(body.tell(), 0)
+    self.assertEqual(body.read(1), b'a')
+
+    body.seek(20)
+    self.assertEqual(body.tell(), 10)
+    self.assertEqual(body.read(), b'')
+
+    body.seek(0)
+    self.assertEqual(body.read(), b'abcdefghij')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the URL opener object implementations."""
+
+from __future__ import unicode_literals
+
+import shutil
+import tempfile
+import unittest
+
+from l2tdevtools import url_opener
+
+from tests import test_lib
+
+
+class TestURLOpener(url_opener.URLOpener):
+  """URL opener that returns the same response for every URL."""
+
+  def Open(self, url, headers=None):
+    """Opens an URL.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      URLResponse: response.
+    """
+    return url_opener.URLResponse(
+        url, 200, {'Content-Type': 'text/plain', 'Set-Cookie': 'bogus'},
+        b'test')
+
+
+class URLResponseTest(unittest.TestCase):
+  """Tests for the URL response."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    response = url_opener.URLResponse(
+        'https://example.com', 200, {'ETag': '"1234"'}, b'test')
+
+    self.assertEqual(response.code, 200)
+    self.assertEqual(response.headers, {'etag': '"1234"'})
+    self.assertEqual(response.read(), b'test')
+
+
+class URLFixtureStoreTest(unittest.TestCase):
+  """Tests for the URL fixture store."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testAddAndGetResponse(self):
+    """Tests the AddResponse and GetResponse functions."""
+    fixture_store = url_opener.URLFixtureStore(self._temporary_directory)
+
+    response = fixture_store.GetResponse('https://example.com')
+    self.assertIsNone(response)
+
+    response = url_opener.URLResponse(
+        'https://example.com', 404,
+        {'Content-Type': 'text/plain', 'Set-Cookie': 'bogus'}, b'test')
+    fixture_store.AddResponse(response)
+
+    response = fixture_store.GetResponse('https://example.com')
+    self.assertIsNotNone(response)
+    self.assertEqual(response.code, 404)
+    self.assertEqual(response.headers, {'content-type': 'text/plain'})
+    self.assertEqual(response.read(), b'test')
+
+
+class RecordingURLOpenerTest(unittest.TestCase):
+  """Tests for the recording URL opener."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testOpen(self):
+    """Tests the Open function."""
+    fixture_store = url_opener.URLFixtureStore(self._temporary_directory)
+    recording_url_opener = url_opener.RecordingURLOpener(
+        fixture_store, url_opener=TestURLOpener())
+
+    response = recording_url_opener.Open(
+        'https://example.com/conditional', headers={'If-None-Match': '"1"'})
+    self.assertIsNotNone(response)
+
+    response = fixture_store.GetResponse('https://example.com/conditional')
+    self.assertIsNone(response)
+
+    response = recording_url_opener.Open('https://example.com')
+    self.assertIsNotNone(response)
+
+    replay_url_opener = url_opener.ReplayURLOpener(fixture_store)
+    response = replay_url_opener.Open('https://example.com')
+    self.assertIsNotNone(response)
+    self.assertEqual(response.read(), b'test')
+
+
+@test_lib.skipUnlessHasTestFile(['url_fixtures'])
+class ReplayURLOpenerTest(test_lib.BaseTestCase):
+  """Tests for the replay URL opener."""
+
+  def testOpen(self):
+    """Tests the Open function."""
+    path = self._GetTestFilePath(['url_fixtures'])
+    fixture_store = url_opener.URLFixtureStore(path)
+    replay_url_opener = url_opener.ReplayURLOpener(fixture_store)
+
+    response = replay_url_opener.Open(
+        'https://pypi.python.org/simple/construct')
+    self.assertIsNotNone(response)
+    self.assertEqual(response.code, 200)
+
+    response = replay_url_opener.Open('https://example.com/bogus')
+    self.assertIsNone(response)
+
+
+class URLOpenerFunctionsTest(unittest.TestCase):
+  """Tests for the URL opener functions."""
+
+  def testGetAndSetURLOpener(self):
+    """Tests the GetURLOpener and SetURLOpener functions."""
+    test_url_opener = TestURLOpener()
+
+    url_opener.SetURLOpener(test_url_opener)
+    try:
+      self.assertEqual(url_opener.GetURLOpener(), test_url_opener)
+    finally:
+      url_opener.SetURLOpener(None)
+
+
+if __name__ == '__main__':
+  unittest.main()
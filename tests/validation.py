@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the validation of the project and preset definitions."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from l2tdevtools import projects
+from l2tdevtools import validation
+
+from tests import test_lib
+
+
+class ProjectDefinitionValidatorTest(unittest.TestCase):
+  """Tests for the project definition validator."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+    for directory_name, filename in (
+        ('dpkg_templates', 'python-test.install'),
+        ('msi_prebuild', 'msi_test.py'),
+        ('patches', 'test-1.0-setup.patch')):
+      path = os.path.join(self._temporary_directory, directory_name)
+      os.mkdir(path)
+      with open(os.path.join(path, filename), 'w'):
+        pass
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _CreateProjectDefinition(self):
+    """Creates a valid project definition.
+
+    Returns:
+      ProjectDefinition: project definition.
+    """
+    project_definition = projects.ProjectDefinition('test')
+    project_definition.build_system = 'setup_py'
+    project_definition.download_url = 'https://pypi.python.org/pypi/test'
+    project_definition.dpkg_template_install_python2 = ['python-test.install']
+    project_definition.msi_prebuild = 'msi_test.py'
+    project_definition.patches = ['test-1.0-setup.patch']
+    project_definition.version = projects.ProjectVersionDefinition('>=1.0')
+    return project_definition
+
+  def testValidateProjectDefinition(self):
+    """Tests the ValidateProjectDefinition function."""
+    validator = validation.ProjectDefinitionValidator(
+        self._temporary_directory)
+
+    project_definition = self._CreateProjectDefinition()
+    issues = validator.ValidateProjectDefinition(project_definition)
+    self.assertEqual(issues, [])
+
+    project_definition.build_system = 'bogus'
+    project_definition.download_url = 'http://www.example.com/test'
+    project_definition.dpkg_template_install_python2 = ['bogus.install']
+    project_definition.msi_prebuild = 'bogus.py'
+    project_definition.patches = ['test-1.0-setup.patch', 'bogus.patch']
+    project_definition.version = projects.ProjectVersionDefinition('bogus')
+
+    issues = validator.ValidateProjectDefinition(project_definition)
+    attribute_names = sorted([issue.attribute_name for issue in issues])
+    expected_attribute_names = [
+        'build_system', 'download_url', 'dpkg_template_install_python2',
+        'msi_prebuild', 'patches', 'version']
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+    project_definition.download_url = None
+    issues = validator.ValidateProjectDefinition(project_definition)
+    messages = [
+        issue.message for issue in issues
+        if issue.attribute_name == 'download_url']
+    self.assertEqual(messages, ['missing download URL'])
+
+  @test_lib.skipUnlessPython2()
+  def testValidatePresets(self):
+    """Tests the ValidatePresets function."""
+    presets_path = os.path.join(self._temporary_directory, 'presets.ini')
+    with open(presets_path, 'w') as file_object:
+      file_object.write('[test]\nprojects: test,bogus\n')
+
+    projects_path = os.path.join(self._temporary_directory, 'projects.ini')
+    with open(projects_path, 'w') as file_object:
+      file_object.write('\n'.join([
+          '[test]',
+          'build_system: setup_py',
+          'download_url: https://pypi.python.org/pypi/test',
+          '']))
+
+    project_definition_store = projects.ProjectDefinitionStore(
+        projects_path, presets_path=presets_path)
+    project_definition_store.Read()
+
+    validator = validation.ProjectDefinitionValidator(
+        self._temporary_directory)
+    issues = validator.ValidatePresets(project_definition_store)
+
+    self.assertEqual(len(issues), 1)
+    self.assertEqual(issues[0].definition_name, 'test')
+    self.assertEqual(issues[0].message, 'no such project: bogus')
+
+
+if __name__ == '__main__':
+  unittest.main()
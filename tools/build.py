@@ -5,15 +5,17 @@
 from __future__ import print_function
 import argparse
 import logging
+import multiprocessing
 import os
 import subprocess
 import sys
 
 from l2tdevtools import build_helper
 from l2tdevtools import download_helper
-from l2tdevtools import presets
+from l2tdevtools import mirror
 from l2tdevtools import projects
 from l2tdevtools import source_helper
+from l2tdevtools import validation
 
 
 # Since os.path.abspath() uses the current working directory (cwd)
@@ -22,6 +24,10 @@ from l2tdevtools import source_helper
 __file__ = os.path.abspath(__file__)
 
 
+# The build targets that support building projects concurrently.
+CONCURRENT_BUILD_TARGETS = frozenset([u'rpm', u'srpm'])
+
+
 # TODO: look into merging functionality with update script.
 
 class ProjectBuilder(object):
@@ -31,15 +37,21 @@ class ProjectBuilder(object):
   _DPKG_SOURCE_DISTRIBUTIONS = frozenset([
       u'trusty', u'xenial'])
 
-  def __init__(self, build_target):
+  def __init__(self, build_target, source_mirror=None):
     """Initializes the project builder.
 
     Args:
       build_target (str): build target.
+      source_mirror (Optional[SourceMirror]): source mirror, where None
+          represents no source mirror. For the mirror build target
+          the downloaded source packages are added to the source mirror,
+          for other build targets the source packages are retrieved from
+          the source mirror instead of the network.
     """
     super(ProjectBuilder, self).__init__()
     self._build_target = build_target
     self._l2tdevtools_path = os.path.dirname(os.path.dirname(__file__))
+    self._source_mirror = source_mirror
 
   def _BuildProject(self, download_helper_object, project_definition):
     """Builds a project.
@@ -79,6 +91,10 @@ class ProjectBuilder(object):
 
       return True
 
+    if self._build_target == u'mirror':
+      return self._MirrorProject(
+          download_helper_object, source_helper_object, project_definition)
+
     build_helper_object = build_helper.BuildHelperFactory.NewBuildHelper(
         project_definition, self._build_target, self._l2tdevtools_path)
     if not build_helper_object:
@@ -94,19 +110,19 @@ class ProjectBuilder(object):
       return False
 
     if self._build_target == u'dpkg-source':
-      distributions = self._DPKG_SOURCE_DISTRIBUTIONS
-    else:
-      distributions = [None]
-
-    for distribution in distributions:
-      if not self._BuildProjectForDistribution(
-          build_helper_object, source_helper_object, distribution):
+      if not self._BuildProjectForDistributions(
+          build_helper_object, source_helper_object,
+          sorted(self._DPKG_SOURCE_DISTRIBUTIONS)):
         return False
 
-    if os.path.exists(build_helper_object.LOG_FILENAME):
+    elif not self._BuildProjectForDistribution(
+        build_helper_object, source_helper_object, None):
+      return False
+
+    if os.path.exists(build_helper_object.log_filename):
       logging.info(u'Removing: {0:s}'.format(
-          build_helper_object.LOG_FILENAME))
-      os.remove(build_helper_object.LOG_FILENAME)
+          build_helper_object.log_filename))
+      os.remove(build_helper_object.log_filename)
 
     return True
 
@@ -133,7 +149,7 @@ class ProjectBuilder(object):
     if not build_required or build_helper_object.Build(source_helper_object):
       return True
 
-    if not os.path.exists(build_helper_object.LOG_FILENAME):
+    if not os.path.exists(build_helper_object.log_filename):
       logging.warning(u'Build of: {0:s} failed.'.format(
           source_helper_object.project_name))
     else:
@@ -141,12 +157,16 @@ class ProjectBuilder(object):
           source_helper_object.project_name,
           build_helper_object.LOG_FILENAME)
 
-      # Remove older logfiles if they exists otherwise the rename
-      # fails on Windows.
-      if os.path.exists(log_filename):
-        os.remove(log_filename)
+      # Note that build helpers that support concurrent builds already
+      # use a build log file per project.
+      if build_helper_object.log_filename != log_filename:
+        # Remove older logfiles if they exists otherwise the rename
+        # fails on Windows.
+        if os.path.exists(log_filename):
+          os.remove(log_filename)
+
+        os.rename(build_helper_object.log_filename, log_filename)
 
-      os.rename(build_helper_object.LOG_FILENAME, log_filename)
       logging.warning((
           u'Build of: {0:s} failed, for more information check '
           u'{1:s}').format(
@@ -154,6 +174,73 @@ class ProjectBuilder(object):
 
     return False
 
+  def _BuildProjectForDistributions(
+      self, build_helper_object, source_helper_object, distributions):
+    """Builds a project for multiple distributions.
+
+    The build helper prepares the source directory once and builds
+    the distributions concurrently.
+
+    Args:
+      build_helper_object (BuildHelper): build helper, which must support
+          building multiple distributions.
+      source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
+
+    Returns:
+      bool: True if the build is successful or False on error.
+    """
+    required_distributions = []
+    for distribution in distributions:
+      build_helper_object.distribution = distribution
+
+      if build_helper_object.CheckBuildRequired(source_helper_object):
+        required_distributions.append(distribution)
+
+      build_helper_object.Clean(source_helper_object)
+
+    if not required_distributions:
+      return True
+
+    if build_helper_object.BuildDistributions(
+        source_helper_object, required_distributions):
+      return True
+
+    logging.warning(u'Build of: {0:s} failed.'.format(
+        source_helper_object.project_name))
+    return False
+
+  def _MirrorProject(
+      self, download_helper_object, source_helper_object, project_definition):
+    """Downloads the source package of a project into the source mirror.
+
+    Args:
+      download_helper_object (DownloadHelper): download helper.
+      source_helper_object (SourceHelper): source helper.
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      bool: True if the source package was added to the source mirror or
+          False on error.
+    """
+    source_filename = source_helper_object.Download()
+    if not source_filename:
+      logging.warning(u'Unable to download source package of: {0:s}'.format(
+          project_definition.name))
+      return False
+
+    project_version = source_helper_object.GetProjectVersion()
+
+    # The download URL is cached by the download helper.
+    source_url = download_helper_object.GetDownloadURL(
+        project_definition.name, project_version)
+
+    self._source_mirror.AddSourcePackage(
+        project_definition, download_helper_object.GetProjectIdentifier(),
+        project_version, source_url, source_filename)
+
+    return True
+
   def Build(self, project_definition):
     """Builds a project.
 
@@ -166,9 +253,18 @@ class ProjectBuilder(object):
     Raises:
       ValueError: if the project type is unsupported.
     """
+    source_mirror = None
+    if self._build_target != u'mirror':
+      source_mirror = self._source_mirror
+
     download_helper_object = (
         download_helper.DownloadHelperFactory.NewDownloadHelper(
-            project_definition.download_url))
+            project_definition.download_url, source_mirror=source_mirror))
+
+    if not download_helper_object and source_mirror:
+      logging.warning(u'Project: {0:s} not available in source mirror.'.format(
+          project_definition.name))
+      return False
 
     if not download_helper_object:
       raise ValueError(u'Unsupported download URL: {0:s}.'.format(
@@ -177,6 +273,80 @@ class ProjectBuilder(object):
     return self._BuildProject(download_helper_object, project_definition)
 
 
+def BuildProject(arguments):
+  """Builds a project.
+
+  This function is run in a worker process.
+
+  Args:
+    arguments (tuple[str, SourceMirror, LibyalProjectConfigurationIndex,
+        ProjectDefinition]): build target, source mirror, libyal project
+        configuration index or None if not available and project definition.
+
+  Returns:
+    tuple[str, bool, LibyalProjectConfigurationIndex]: name of the project,
+        True if the build is successful or False on error and the libyal
+        project configuration index, which is written by the main process.
+  """
+  (build_target, source_mirror, project_configuration_index,
+   project_definition) = arguments
+
+  if project_configuration_index:
+    download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+        project_configuration_index)
+
+  logging.info(u'Processing: {0:s}'.format(project_definition.name))
+
+  project_builder = ProjectBuilder(build_target, source_mirror=source_mirror)
+  try:
+    result = project_builder.Build(project_definition)
+  except ValueError as exception:
+    logging.warning(u'Unable to build: {0:s} with error: {1!s}'.format(
+        project_definition.name, exception))
+    result = False
+
+  return project_definition.name, result, project_configuration_index
+
+
+def _CheckPresetResolution(preset_resolution):
+  """Checks if a preset could be resolved.
+
+  Projects of the preset that are not defined are reported as a warning and
+  listed with the undefined packages after the build, as for projects that
+  are specified on the command line.
+
+  Args:
+    preset_resolution (PresetResolution): preset resolution.
+
+  Returns:
+    bool: True if the dependencies of the projects of the preset do not
+        contain cycles.
+  """
+  if preset_resolution.dependency_project_names:
+    logging.info(u'Added dependencies of preset: {0:s}: {1:s}'.format(
+        preset_resolution.name,
+        u', '.join(preset_resolution.dependency_project_names)))
+
+  for project_name, dependency_names in sorted(
+      preset_resolution.external_dependencies.items()):
+    logging.debug(u'External dependencies of: {0:s}: {1:s}'.format(
+        project_name, u', '.join(dependency_names)))
+
+  if preset_resolution.unknown_project_names:
+    logging.warning(u'Undefined packages in preset: {0:s}: {1:s}'.format(
+        preset_resolution.name,
+        u', '.join(preset_resolution.unknown_project_names)))
+
+  if preset_resolution.cycles:
+    print(u'Dependency cycles in preset: {0:s}:'.format(
+        preset_resolution.name))
+    for cycle in preset_resolution.cycles:
+      print(u'\t{0:s}'.format(u' -> '.join(cycle)))
+    print(u'')
+
+  return not preset_resolution.cycles
+
+
 def Main():
   """The main program function.
 
@@ -184,8 +354,8 @@ def Main():
     bool: True if successful or False if not.
   """
   build_targets = frozenset([
-      u'download', u'dpkg', u'dpkg-source', u'msi', u'osc', u'pkg',
-      u'rpm', u'source', u'srpm'])
+      u'download', u'dpkg', u'dpkg-source', u'mirror', u'msi', u'osc',
+      u'pkg', u'rpm', u'source', u'srpm'])
 
   argument_parser = argparse.ArgumentParser(description=(
       u'Downloads and builds the latest versions of projects.'))
@@ -205,12 +375,35 @@ def Main():
           u'path of the directory containing the build configuration '
           u'files e.g. projects.ini.'))
 
+  argument_parser.add_argument(
+      u'-j', u'--jobs', dest=u'jobs', action=u'store', type=int,
+      metavar=u'NUMBER', default=1, help=(
+          u'number of projects to build concurrently, only supported by the '
+          u'rpm and srpm build targets. The default is 1.'))
+
+  argument_parser.add_argument(
+      u'--mirror-directory', u'--mirror_directory', action=u'store',
+      metavar=u'DIRECTORY', dest=u'mirror_directory', type=str,
+      default=None, help=(
+          u'The location of the source mirror directory, used by the mirror '
+          u'build target and in offline mode. The default is the build '
+          u'directory.'))
+
+  argument_parser.add_argument(
+      u'--offline', dest=u'offline', action=u'store_true', default=False,
+      help=(
+          u'build without network access, using the versions and source '
+          u'packages in the source mirror created by the mirror build '
+          u'target.'))
+
   argument_parser.add_argument(
       u'--preset', dest=u'preset', action=u'store',
       metavar=u'PRESET_NAME', default=None, help=(
           u'name of the preset of project names to build. The default is to '
           u'build all project defined in the projects.ini configuration file. '
-          u'The presets are defined in the preset.ini configuration file.'))
+          u'The presets are defined in the preset.ini configuration file. '
+          u'The dependencies of the projects of the preset are built as '
+          u'well.'))
 
   argument_parser.add_argument(
       u'--projects', dest=u'projects', action=u'store',
@@ -253,10 +446,44 @@ def Main():
     print(u'')
     return False
 
+  if options.jobs < 1:
+    print(u'Number of jobs must be 1 or more.')
+    print(u'')
+    return False
+
+  if (options.jobs > 1 and
+      options.build_target not in CONCURRENT_BUILD_TARGETS):
+    print(u'Concurrent builds are not supported by the {0:s} build '
+          u'target.'.format(options.build_target))
+    print(u'')
+    return False
+
+  if options.offline and options.build_target == u'mirror':
+    print(u'Offline mode is not supported by the mirror build target.')
+    print(u'')
+    return False
+
+  mirror_directory = options.mirror_directory or options.build_directory
+  if options.offline and not os.path.isdir(mirror_directory):
+    print(u'No such source mirror directory: {0:s}.'.format(mirror_directory))
+    print(u'')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format=u'[%(levelname)s] %(message)s')
 
-  project_builder = ProjectBuilder(options.build_target)
+  source_mirror = None
+  if options.build_target == u'mirror' or options.offline:
+    source_mirror = mirror.SourceMirror(os.path.abspath(mirror_directory))
+    has_manifest = source_mirror.ReadManifest()
+    if options.offline and not has_manifest:
+      print(u'Unable to read source mirror manifest in: {0:s}.'.format(
+          mirror_directory))
+      print(u'')
+      return False
+
+  project_builder = ProjectBuilder(
+      options.build_target, source_mirror=source_mirror)
 
   # TODO: package ipython.
 
@@ -276,56 +503,129 @@ def Main():
   # TODO: rpm build of psutil is broken, fix upstream or add patching.
   # (u'psutil', ProjectBuilder.PROJECT_TYPE_PYPI),
 
+  if options.build_target == u'mirror':
+    build_directory = mirror_directory
+  else:
+    build_directory = options.build_directory
+
+  if not os.path.exists(build_directory):
+    os.mkdir(build_directory)
+
+  presets_path = None
+  if os.path.exists(presets_file):
+    presets_path = presets_file
+
+  # Keep the compiled project definitions in the build directory, such that
+  # the configuration files are only parsed when they have changed.
+  cache_path = os.path.abspath(os.path.join(
+      build_directory, u'projects.json'))
+  project_definition_store = projects.ProjectDefinitionStore(
+      projects_file, presets_path=presets_path, cache_path=cache_path)
+  project_definition_store.Read()
+
   project_names = []
   if options.preset:
-    with open(presets_file) as file_object:
-      preset_definition_reader = presets.PresetDefinitionReader()
-      for preset_definition in preset_definition_reader.Read(file_object):
-        if preset_definition.name == options.preset:
-          project_names = preset_definition.project_names
-          break
-
-    if not project_names:
+    preset_resolution = project_definition_store.ResolvePreset(options.preset)
+    if not preset_resolution:
       print(u'Undefined preset: {0:s}'.format(options.preset))
       print(u'')
       return False
 
-  elif options.projects:
-    project_names = options.projects.split(u',')
+    # Report dependency cycles before building any of the projects.
+    if not _CheckPresetResolution(preset_resolution):
+      return False
+
+    project_names = preset_resolution.project_names
+    project_definitions = [
+        project_definition_store.GetProjectDefinition(project_name)
+        for project_name in project_names]
+
+  else:
+    if options.projects:
+      project_names = options.projects.split(u',')
+
+    project_definitions = project_definition_store.GetProjectDefinitions(
+        project_names=project_names or None)
 
   builds = []
-  with open(projects_file) as file_object:
-    project_definition_reader = projects.ProjectDefinitionReader()
-    for project_definition in project_definition_reader.Read(file_object):
-      is_disabled = False
-      if (options.build_target in project_definition.disabled or
-          u'all' in project_definition.disabled):
-        if project_definition.name not in project_names:
+  for project_definition in project_definitions:
+    is_disabled = False
+    if (options.build_target in project_definition.disabled or
+        u'all' in project_definition.disabled):
+      if options.preset:
+        # Dependencies that were added to the preset are not built if they
+        # are disabled.
+        if project_definition.name not in (
+            preset_resolution.preset_project_names):
           is_disabled = True
 
-        elif not options.preset:
-          # If a project is manually specified ignore the disabled status.
-          logging.info(u'Ignoring disabled status for: {0:s}'.format(
-              project_definition.name))
+      elif project_definition.name not in project_names:
+        is_disabled = True
+
+      elif not options.preset:
+        # If a project is manually specified ignore the disabled status.
+        logging.info(u'Ignoring disabled status for: {0:s}'.format(
+            project_definition.name))
 
-      if not is_disabled:
-        builds.append(project_definition)
+    if not is_disabled:
+      builds.append(project_definition)
 
-  if not os.path.exists(options.build_directory):
-    os.mkdir(options.build_directory)
+  # Reject invalid project definitions before building any of the projects.
+  data_path = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), u'data')
+  validator = validation.ProjectDefinitionValidator(data_path)
+  issues = validator.ValidateProjectDefinitions(builds)
+
+  invalid_projects = []
+  for issue in issues:
+    print(u'Invalid project definition: {0:s}: {1:s}: {2:s}'.format(
+        issue.definition_name, issue.attribute_name, issue.message))
+    if issue.definition_name not in invalid_projects:
+      invalid_projects.append(issue.definition_name)
+
+  if invalid_projects:
+    print(u'')
+    builds = [
+        project_definition for project_definition in builds
+        if project_definition.name not in invalid_projects]
+
+  project_configuration_index = None
+  if not options.offline:
+    # Keep the download URLs of the libyal projects in the build directory,
+    # such that the libyal project configurations are not retrieved for
+    # every build.
+    index_path = os.path.abspath(os.path.join(
+        build_directory, u'libyal_projects.json'))
+    project_configuration_index = (
+        download_helper.LibyalProjectConfigurationIndex(path=index_path))
+    project_configuration_index.Read()
+    download_helper.LibyalGitHubDownloadHelper.SetProjectConfigurationIndex(
+        project_configuration_index)
 
   current_working_directory = os.getcwd()
-  os.chdir(options.build_directory)
+  os.chdir(build_directory)
 
-  failed_builds = []
-  undefined_packages = list(project_names)
+  failed_builds = list(invalid_projects)
+  if options.preset:
+    undefined_packages = list(preset_resolution.unknown_project_names)
+  else:
+    undefined_packages = [
+        project_name for project_name in project_names
+        if project_name not in invalid_projects]
+
+  tasks = []
   for project_definition in builds:
     if project_names and project_definition.name not in project_names:
       continue
 
-    if undefined_packages:
-      project_index = undefined_packages.index(project_definition.name)
-      del undefined_packages[project_index]
+    if project_definition.name in undefined_packages:
+      undefined_packages.remove(project_definition.name)
+
+    if options.jobs > 1:
+      tasks.append((
+          options.build_target, source_mirror, project_configuration_index,
+          project_definition))
+      continue
 
     logging.info(u'Processing: {0:s}'.format(project_definition.name))
 
@@ -335,6 +635,32 @@ def Main():
       print(u'Failed building: {0:s}'.format(project_definition.name))
       failed_builds.append(project_definition.name)
 
+  if tasks:
+    # Every build uses its own rpmbuild directory and build log file, hence
+    # the builds do not share mutable state.
+    pool = multiprocessing.Pool(processes=options.jobs)
+    try:
+      results = pool.map(BuildProject, tasks)
+    finally:
+      pool.close()
+      pool.join()
+
+    for project_name, result, worker_configuration_index in results:
+      if not result:
+        print(u'Failed building: {0:s}'.format(project_name))
+        failed_builds.append(project_name)
+
+      # The index is written only by the main process, such that the entries
+      # determined by the worker processes do not overwrite each other.
+      if project_configuration_index and worker_configuration_index:
+        project_configuration_index.Merge(worker_configuration_index)
+
+  if options.build_target == u'mirror':
+    source_mirror.WriteManifest()
+
+  if project_configuration_index:
+    project_configuration_index.Write()
+
   os.chdir(current_working_directory)
 
   if undefined_packages:
@@ -0,0 +1,104 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to check the project and preset definitions."""
+
+from __future__ import print_function
+import argparse
+import logging
+import os
+import sys
+import time
+
+from l2tdevtools import projects
+from l2tdevtools import validation
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Checks the project definitions of projects.ini and the preset '
+      u'definitions of presets.ini.'))
+
+  argument_parser.add_argument(
+      u'project_names', action=u'store', metavar=u'NAME', type=str,
+      nargs=u'*', help=(
+          u'Names of the projects to check. The default is to check all '
+          u'projects and presets.'))
+
+  argument_parser.add_argument(
+      u'-c', u'--config', dest=u'config_path', action=u'store',
+      metavar=u'CONFIG_PATH', default=None, help=(
+          u'path of the directory containing the build configuration '
+          u'files e.g. projects.ini.'))
+
+  options = argument_parser.parse_args()
+
+  logging.basicConfig(
+      level=logging.INFO, format=u'[%(levelname)s] %(message)s')
+
+  data_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  data_path = os.path.join(data_path, u'data')
+
+  config_path = options.config_path or data_path
+
+  projects_file = os.path.join(config_path, u'projects.ini')
+  if not os.path.exists(projects_file):
+    print(u'No such config file: {0:s}.'.format(projects_file))
+    print(u'')
+    return False
+
+  presets_file = os.path.join(config_path, u'presets.ini')
+  if not os.path.exists(presets_file):
+    presets_file = None
+
+  start_time = time.time()
+
+  # The configuration files are parsed once and the data files are indexed
+  # once for all projects.
+  project_definition_store = projects.ProjectDefinitionStore(
+      projects_file, presets_path=presets_file)
+  project_definition_store.Read()
+
+  validator = validation.ProjectDefinitionValidator(data_path)
+
+  issues = []
+  if options.project_names:
+    for project_name in options.project_names:
+      if not project_definition_store.HasProject(project_name):
+        issues.append(validation.ValidationIssue(
+            project_name, u'name', u'no such project'))
+
+    project_definitions = project_definition_store.GetProjectDefinitions(
+        project_names=options.project_names)
+
+  else:
+    project_definitions = project_definition_store.GetProjectDefinitions()
+    issues.extend(validator.ValidatePresets(project_definition_store))
+
+  issues.extend(validator.ValidateProjectDefinitions(project_definitions))
+
+  duration = time.time() - start_time
+
+  for issue in issues:
+    print(u'{0:s}: {1:s}: {2:s}'.format(
+        issue.definition_name, issue.attribute_name, issue.message))
+
+  if issues:
+    print(u'')
+
+  print(u'Checked {0:d} projects in {1:.3f} seconds: {2:d} issues.'.format(
+      len(project_definitions), duration, len(issues)))
+  print(u'')
+
+  return not issues
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -6,6 +6,7 @@ from __future__ import print_function
 import argparse
 import glob
 import logging
+import multiprocessing
 import os
 import sys
 
@@ -13,6 +14,89 @@ from l2tdevtools import dpkg_files
 from l2tdevtools import projects
 
 
+# Status values of the generation of the dpkg packaging files of a project.
+STATUS_FAILED = u'failed'
+STATUS_UNCHANGED = u'unchanged'
+STATUS_WRITTEN = u'written'
+
+
+def GenerateFiles(arguments):
+  """Generates the dpkg packaging files of a project.
+
+  Only the dpkg packaging files that have changed are written. This function
+  is run in a worker process.
+
+  Args:
+    arguments (tuple[ProjectDefinition, str, str, bool]): project definition,
+        path of the source directory, path of the data directory and True if
+        files that are not generated, such as dropped patches, should be
+        removed.
+
+  Returns:
+    tuple[str, str, str]: name of the project, status and message.
+  """
+  project_definition, source_path, data_path, prune = arguments
+
+  project_version = os.path.basename(source_path)
+  prefix = u'{0:s}-'.format(project_definition.name)
+  if not project_version.startswith(prefix):
+    return project_definition.name, STATUS_FAILED, (
+        u'unable to determine project version based on source directory: '
+        u'{0:s}').format(source_path)
+
+  project_version = project_version[len(prefix):]
+
+  dpkg_path = os.path.join(source_path, u'dpkg')
+
+  build_files_generator = dpkg_files.DPKGBuildFilesGenerator(
+      project_definition.name, project_version, project_definition,
+      data_path)
+
+  # Note that the dpkg build files generator checks the source directory
+  # relative to the current working directory.
+  current_working_directory = os.getcwd()
+  os.chdir(source_path)
+  try:
+    number_of_changed_files = build_files_generator.GenerateFiles(
+        dpkg_path, remove_stale_files=prune)
+  except Exception as exception:  # pylint: disable=broad-except
+    # A failure of a single project should not stop the generation of
+    # the other projects.
+    return project_definition.name, STATUS_FAILED, (
+        u'unable to generate dpkg files with error: {0!s}'.format(exception))
+  finally:
+    os.chdir(current_working_directory)
+
+  if not number_of_changed_files:
+    return project_definition.name, STATUS_UNCHANGED, dpkg_path
+
+  return project_definition.name, STATUS_WRITTEN, u'{0:s} ({1:d} files)'.format(
+      dpkg_path, number_of_changed_files)
+
+
+def _GetSourcePath(sources_path, project_name):
+  """Determines the source directory of a project.
+
+  Args:
+    sources_path (str): path of the directory that contains the source
+        directories.
+    project_name (str): name of the project.
+
+  Returns:
+    str: path of the source directory or None if not available.
+  """
+  globbed_paths = []
+  for path in glob.glob(os.path.join(
+      sources_path, u'{0:s}-*'.format(project_name))):
+    if os.path.isdir(path):
+      globbed_paths.append(path)
+
+  if len(globbed_paths) != 1:
+    return
+
+  return os.path.abspath(globbed_paths[0])
+
+
 def Main():
   """The main program function.
 
@@ -20,25 +104,76 @@ def Main():
     A boolean containing True if successful or False if not.
   """
   argument_parser = argparse.ArgumentParser(description=(
-      u'Generates dpkg packaging files for a project.'))
+      u'Generates dpkg packaging files for one or more projects.'))
 
   argument_parser.add_argument(
-      u'project_name', action=u'store', metavar=u'NAME', type=str, help=(
-          u'Project name for which the dpkg packaging files should be '
-          u'generated.'))
+      u'project_names', action=u'store', metavar=u'NAME', type=str,
+      nargs=u'*', help=(
+          u'Names of the projects for which the dpkg packaging files should '
+          u'be generated.'))
+
+  argument_parser.add_argument(
+      u'--all', dest=u'all_projects', action=u'store_true', default=False,
+      help=(
+          u'generate the dpkg packaging files of all projects of which a '
+          u'source directory is available.'))
 
   argument_parser.add_argument(
       u'-c', u'--config', dest=u'config_file', action=u'store',
       metavar=u'CONFIG_FILE', default=None,
       help=u'path of the build configuration file.')
 
+  argument_parser.add_argument(
+      u'-j', u'--jobs', dest=u'jobs', action=u'store', type=int,
+      metavar=u'NUMBER', default=None, help=(
+          u'number of worker processes. The default is the number of CPUs.'))
+
+  argument_parser.add_argument(
+      u'--preset', dest=u'preset', action=u'store',
+      metavar=u'PRESET_NAME', default=None, help=(
+          u'name of the preset of project names for which the dpkg packaging '
+          u'files should be generated. The presets are defined in the '
+          u'presets.ini configuration file.'))
+
+  argument_parser.add_argument(
+      u'--prune', dest=u'prune', action=u'store_true', default=False, help=(
+          u'remove files in the dpkg directory that are not generated, such '
+          u'as patches that are no longer used. Note that this also removes '
+          u'files that were added by hand.'))
+
   argument_parser.add_argument(
       u'--source-directory', u'--source_directory', action=u'store',
       metavar=u'DIRECTORY', dest=u'source_directory', type=str,
-      default=None, help=u'The location of the the source directory.')
+      default=None, help=(
+          u'The location of the the source directory, only supported for '
+          u'a single project.'))
+
+  argument_parser.add_argument(
+      u'--sources-directory', u'--sources_directory', action=u'store',
+      metavar=u'DIRECTORY', dest=u'sources_directory', type=str,
+      default=u'.', help=(
+          u'The location of the directory that contains the source '
+          u'directories, named {project name}-{version}. The default is the '
+          u'current working directory.'))
 
   options = argument_parser.parse_args()
 
+  number_of_selections = len([
+      selection for selection in (
+          options.project_names, options.all_projects, options.preset)
+      if selection])
+  if number_of_selections != 1:
+    print(u'Specify project names, --all or --preset.')
+    print(u'')
+    argument_parser.print_help()
+    print(u'')
+    return False
+
+  if options.source_directory and len(options.project_names) != 1:
+    print(u'Source directory is only supported for a single project.')
+    print(u'')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format=u'[%(levelname)s] %(message)s')
 
@@ -53,69 +188,116 @@ def Main():
     print(u'')
     return False
 
-  project_definition_match = None
-  with open(options.config_file) as file_object:
-    project_definition_reader = projects.ProjectDefinitionReader()
-    for project_definition in project_definition_reader.Read(file_object):
-      if options.project_name == project_definition.name:
-        project_definition_match = project_definition
-
-  if not project_definition_match:
-    print(u'No such package name: {0:s}.'.format(options.project_name))
-    print(u'')
-    return False
+  presets_file = None
+  if options.preset:
+    presets_file = os.path.join(
+        os.path.dirname(options.config_file), u'presets.ini')
+    if not os.path.exists(presets_file):
+      print(u'No such config file: {0:s}.'.format(presets_file))
+      print(u'')
+      return False
 
-  source_path = options.source_directory
-  if not source_path:
-    globbed_paths = []
-    for path in glob.glob(u'{0:s}*'.format(options.project_name)):
-      if not os.path.isdir(path):
-        continue
-      globbed_paths.append(path)
+  # The configuration is parsed once for all projects.
+  project_definition_store = projects.ProjectDefinitionStore(
+      options.config_file, presets_path=presets_file)
+  project_definition_store.Read()
 
-    if not len(globbed_paths) == 1:
-      print(u'Unable to determine source directory.')
+  project_names = options.project_names
+  if options.preset:
+    project_names = project_definition_store.GetPresetProjectNames(
+        options.preset)
+    if not project_names:
+      print(u'Undefined preset: {0:s}'.format(options.preset))
       print(u'')
       return False
 
-    source_path = globbed_paths[0]
+  if options.all_projects:
+    project_names = sorted(project_definition_store.GetProjectNames())
 
-  if not os.path.exists(source_path):
-    print(u'No such source directory: {0:s}.'.format(source_path))
-    print(u'')
-    return False
+  tools_path = os.path.dirname(os.path.abspath(__file__))
+  data_path = os.path.join(os.path.dirname(tools_path), u'data')
 
-  source_path = os.path.abspath(source_path)
-  project_version = os.path.basename(source_path)
-  if not project_version.startswith(u'{0:s}-'.format(options.project_name)):
-    print((
-        u'Unable to determine project version based on source '
-        u'directory: {0:s}.').format(source_path))
-    print(u'')
-    return False
+  failed_projects = []
+  skipped_projects = []
+  tasks = []
+  for project_name in project_names:
+    project_definition = project_definition_store.GetProjectDefinition(
+        project_name)
+    if not project_definition:
+      print(u'No such package name: {0:s}.'.format(project_name))
+      failed_projects.append(project_name)
+      continue
 
-  _, _, project_version = project_version.partition(u'-')
+    if not options.project_names and (
+        u'dpkg' in project_definition.disabled or
+        u'all' in project_definition.disabled):
+      skipped_projects.append(project_name)
+      continue
 
-  dpkg_path = os.path.join(source_path, u'dpkg')
-  if os.path.exists(dpkg_path):
-    print(u'Destination dpkg directory: {0:s} already exists.'.format(
-        dpkg_path))
-    print(u'')
-    return False
+    if options.source_directory:
+      source_path = os.path.abspath(options.source_directory)
+      if not os.path.exists(source_path):
+        print(u'No such source directory: {0:s}.'.format(source_path))
+        failed_projects.append(project_name)
+        continue
 
-  tools_path = os.path.dirname(__file__)
-  data_path = os.path.join(os.path.dirname(tools_path), u'data')
+    else:
+      source_path = _GetSourcePath(options.sources_directory, project_name)
+      if not source_path:
+        # Only report a missing source directory if the project was
+        # explicitly requested.
+        if not options.project_names:
+          skipped_projects.append(project_name)
+        else:
+          print(u'Unable to determine source directory of: {0:s}.'.format(
+              project_name))
+          failed_projects.append(project_name)
+        continue
 
-  build_files_generator = dpkg_files.DPKGBuildFilesGenerator(
-      options.project_name, project_version,
-      project_definition_match, data_path)
+    tasks.append((project_definition, source_path, data_path, options.prune))
+
+  if len(tasks) > 1 and options.jobs != 1:
+    pool = multiprocessing.Pool(processes=options.jobs)
+    try:
+      results = pool.map(GenerateFiles, tasks)
+    finally:
+      pool.close()
+      pool.join()
+
+  else:
+    results = [GenerateFiles(task) for task in tasks]
+
+  written_projects = []
+  unchanged_projects = []
+  for project_name, status, message in results:
+    if status == STATUS_WRITTEN:
+      logging.info(u'Written: {0:s}'.format(message))
+      written_projects.append(project_name)
+
+    elif status == STATUS_UNCHANGED:
+      logging.info(u'Unchanged: {0:s}'.format(message))
+      unchanged_projects.append(project_name)
+
+    else:
+      print(u'Failed: {0:s}: {1:s}'.format(project_name, message))
+      failed_projects.append(project_name)
+
+  print(u'')
+  print((
+      u'Generated dpkg files of {0:d} projects: {1:d} written, '
+      u'{2:d} unchanged, {3:d} failed, {4:d} skipped.').format(
+          len(results), len(written_projects), len(unchanged_projects),
+          len(failed_projects), len(skipped_projects)))
+
+  if failed_projects:
+    print(u'')
+    print(u'Failed projects:')
+    for project_name in failed_projects:
+      print(u'\t{0:s}'.format(project_name))
 
-  print(u'Generating dpkg files for: {0:s} {1:s} in: {2:s}'.format(
-      options.project_name, project_version, dpkg_path))
-  build_files_generator.GenerateFiles(dpkg_path)
   print(u'')
 
-  return True
+  return not failed_projects
 
 
 if __name__ == '__main__':
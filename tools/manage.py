@@ -12,7 +12,24 @@ import re
 import sys
 import zlib
 
+from multiprocessing import pool as multiprocessing_pool
+
 from l2tdevtools import download_helper
+from l2tdevtools import inventories
+
+
+# Types of the repositories of which the package inventories are retrieved.
+INVENTORY_TYPE_COPR = u'copr'
+INVENTORY_TYPE_GITHUB = u'github'
+INVENTORY_TYPE_LAUNCHPAD = u'launchpad'
+INVENTORY_TYPE_PYPI = u'pypi'
+
+# Types of the reference directories of which the package inventories are
+# retrieved, which differ in the type of packages they contain.
+INVENTORY_TYPE_BINARIES_DIRECTORY = u'binaries-directory'
+INVENTORY_TYPE_DPKG_DIRECTORY = u'dpkg-directory'
+INVENTORY_TYPE_RPM_DIRECTORY = u'rpm-directory'
+INVENTORY_TYPE_SDIST_DIRECTORY = u'sdist-directory'
 
 
 class COPRProjectManager(object):
@@ -32,6 +49,7 @@ class COPRProjectManager(object):
     """
     super(COPRProjectManager, self).__init__()
     self._download_helper = download_helper.DownloadHelper(u'')
+    self._inventory_comparer = inventories.InventoryComparer()
     self._name = name
 
   def GetPackages(self, project):
@@ -103,8 +121,8 @@ class COPRProjectManager(object):
         continue
 
       package_version, _, _ = package_version.rpartition(u'-')
-      # TODO: improve version check.
-      if package_name in packages and packages[package_name] > package_version:
+      if package_name in packages and self._inventory_comparer.CompareVersions(
+          packages[package_name], package_version) > 0:
         continue
 
       packages[package_name] = package_version
@@ -370,10 +388,61 @@ class PyPIManager(object):
       u'wrapt': u'wrapt',
       u'XlsxWriter': u'XlsxWriter'}
 
-  def __init__(self):
-    """Initializes the PyPI manager object."""
+  # The default number of threads that download the package pages.
+  _DEFAULT_NUMBER_OF_WORKERS = 8
+
+  def __init__(self, number_of_workers=None):
+    """Initializes the PyPI manager object.
+
+    Args:
+      number_of_workers (Optional[int]): number of threads that download
+          the package pages concurrently, where None represents the default.
+    """
     super(PyPIManager, self).__init__()
     self._download_helper = download_helper.DownloadHelper(u'')
+    self._number_of_workers = (
+        number_of_workers or self._DEFAULT_NUMBER_OF_WORKERS)
+
+  def _GetPackageVersion(self, package_name):
+    """Retrieves the version of a package.
+
+    This method is run in a worker thread.
+
+    Args:
+      package_name (str): name of the package on PyPI.
+
+    Returns:
+      tuple[str, str]: name of the package on PyPI and version or None if
+          the version cannot be determined.
+    """
+    kwargs = {u'package_name': package_name}
+    download_url = self._PYPI_URL.format(**kwargs)
+
+    page_content = self._download_helper.DownloadPageContent(download_url)
+    if not page_content:
+      logging.error(u'Unable to retrieve PyPI package: {0:s} page.'.format(
+          package_name))
+      return package_name, None
+
+    try:
+      page_content = page_content.decode(u'utf-8')
+    except UnicodeDecodeError as exception:
+      logging.error((
+          u'Unable to decode PyPI package: {0:s} page with error: '
+          u'{1!s}').format(package_name, exception))
+      return package_name, None
+
+    expression_string = (
+        u'<title>{0:s} ([^ ]*) : Python Package Index</title>'.format(
+            package_name))
+    matches = re.findall(expression_string, page_content)
+    if not matches or len(matches) != 1:
+      logging.warning(
+          u'Unable to determine PyPI package: {0:s} information.'.format(
+              package_name))
+      return package_name, None
+
+    return package_name, matches[0]
 
   def CopyPackages(self):
     """Copies packages."""
@@ -389,37 +458,23 @@ class PyPIManager(object):
       dict[str, str]: package names and versions as values or None if
           the packages cannot be determined.
     """
-    packages = {}
-    for package_name in iter(self._PYPI_PACKAGE_NAMES.keys()):
-      kwargs = {u'package_name': package_name}
-      download_url = self._PYPI_URL.format(**kwargs)
-
-      page_content = self._download_helper.DownloadPageContent(download_url)
-      if not page_content:
-        logging.error(u'Unable to retrieve PyPI package: {0:s} page.'.format(
-            package_name))
-        continue
+    package_names = sorted(self._PYPI_PACKAGE_NAMES.keys())
 
-      try:
-        page_content = page_content.decode(u'utf-8')
-      except UnicodeDecodeError as exception:
-        logging.error((
-            u'Unable to decode PyPI package: {0:s} page with error: '
-            u'{1:s}').format(package_name, exception))
-        continue
-
-      expression_string = (
-          u'<title>{0:s} ([^ ]*) : Python Package Index</title>'.format(
-              package_name))
-      matches = re.findall(expression_string, page_content)
-      if not matches or len(matches) != 1:
-        logging.warning(
-            u'Unable to determine PyPI package: {0:s} information.'.format(
-                package_name))
-        continue
+    # The package pages are downloaded concurrently since every package
+    # requires a separate request.
+    pool = multiprocessing_pool.ThreadPool(processes=min(
+        self._number_of_workers, len(package_names)))
+    try:
+      results = pool.map(self._GetPackageVersion, package_names)
+    finally:
+      pool.close()
+      pool.join()
 
-      package_name = self._PYPI_PACKAGE_NAMES[package_name]
-      packages[package_name] = matches
+    packages = {}
+    for package_name, version in results:
+      if version:
+        package_name = self._PYPI_PACKAGE_NAMES[package_name]
+        packages[package_name] = version
 
     return packages
 
@@ -427,72 +482,169 @@ class PyPIManager(object):
 class BinariesManager(object):
   """Defines the binaries manager."""
 
-  def __init__(self):
-    """Initializes the binaries manager object."""
+  def __init__(self, number_of_workers=None, snapshot=None):
+    """Initializes the binaries manager object.
+
+    Args:
+      number_of_workers (Optional[int]): maximum number of threads that
+          download concurrently, where None represents one thread per
+          package inventory.
+      snapshot (Optional[InventorySnapshot]): snapshot to retrieve the package
+          inventories from instead of their repositories and reference
+          directories.
+    """
     super(BinariesManager, self).__init__()
     self._copr_project_manager = COPRProjectManager(u'gift')
     self._github_repo_manager = GithubRepoManager()
+    self._inventories = {}
+    self._inventory_comparer = inventories.InventoryComparer()
     self._launchpad_ppa_manager = LaunchpadPPAManager(u'gift')
-    self._pypi_manager = PyPIManager()
+    self._number_of_workers = number_of_workers
+    self._pypi_manager = PyPIManager(number_of_workers=number_of_workers)
+    self._snapshot = snapshot
 
-  def _ComparePackages(self, reference_packages, packages):
-    """Compares the packages.
+  def _GetDirectoryPackages(self, inventory_type, reference_directory):
+    """Retrieves the packages in a reference directory.
 
     Args:
-      reference_packages (dict[str, str]): reference package names and versions.
-      packages (dict[str, str]): package names and versions.
+      inventory_type (str): type of the reference directory, such as
+          "rpm-directory".
+      reference_directory (str): path of the reference directory.
 
     Returns:
-      tuple: containing:
+      dict[str, str]: package names and versions or None if the packages
+          cannot be determined.
+    """
+    try:
+      directory_entries = os.listdir(reference_directory)
+    except OSError as exception:
+      logging.error(
+          u'Unable to list reference directory: {0:s} with error: {1!s}'.format(
+              reference_directory, exception))
+      return
+
+    packages = {}
+    for directory_entry in directory_entries:
+      if inventory_type == INVENTORY_TYPE_BINARIES_DIRECTORY:
+        if directory_entry.endswith(u'.dmg'):
+          directory_entry, _, _ = directory_entry.rpartition(u'.dmg')
+
+        elif directory_entry.endswith(u'.msi'):
+          for suffix in (u'.win32', u'.win-amd64'):
+            if suffix in directory_entry:
+              directory_entry, _, _ = directory_entry.rpartition(suffix)
+              break
+
+        else:
+          continue
+
+        name, _, version = directory_entry.rpartition(u'-')
+
+      elif inventory_type == INVENTORY_TYPE_DPKG_DIRECTORY:
+        # The directory contains various files and we are only interested
+        # in the source dpkg packages that use the naming convention:
+        # package_version-#ppa1~trusty_source.changes
+        if not directory_entry.endswith(u'ppa1~trusty_source.changes'):
+          continue
+
+        name, _, _ = directory_entry.rpartition(u'-')
+        name, _, version = name.rpartition(u'_')
+
+      elif inventory_type == INVENTORY_TYPE_RPM_DIRECTORY:
+        # The directory contains various files and we are only interested
+        # in the source RPM packages that use the naming convention:
+        # package-version-#.src.rpm
+        if not directory_entry.endswith(u'.src.rpm'):
+          continue
+
+        name, _, _ = directory_entry.rpartition(u'-')
+        name, _, version = name.rpartition(u'-')
+
+      elif inventory_type == INVENTORY_TYPE_SDIST_DIRECTORY:
+        if not directory_entry.endswith(u'.tar.gz'):
+          continue
+
+        directory_entry, _, _ = directory_entry.rpartition(u'.tar.gz')
+        name, _, version = directory_entry.rpartition(u'-')
+
+        if (name.endswith(u'-alpha') or name.endswith(u'-beta') or
+            name.endswith(u'-experimental')):
+          name, _, _ = name.rpartition(u'-')
+
+      else:
+        continue
+
+      packages[name] = version
+
+    return packages
+
+  def _GetInventory(self, inventory_key):
+    """Retrieves a package inventory.
+
+    This method is run in a worker thread.
+
+    Args:
+      inventory_key (tuple[str, str]): type of the repository or reference
+          directory, such as "copr", and name of the project, track, sub
+          directory or path of the reference directory, where the name is
+          None for PyPI.
 
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference packages but not in the packages.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference packages.
+    Returns:
+      tuple[tuple[str, str], dict[str, str]]: key of the inventory and
+          package names and versions or None if the packages cannot be
+          determined.
     """
-    new_packages = {}
-    new_versions = {}
-    for name, version in iter(reference_packages.items()):
-      if not packages or name not in packages:
-        new_packages[name] = version
-      elif version != packages[name]:
-        new_versions[name] = version
+    inventory_type, name = inventory_key
+
+    if self._snapshot:
+      if not self._snapshot.HasInventory(inventory_key):
+        logging.error(u'Missing inventory: {0:s} {1!s} in snapshot.'.format(
+            inventory_type, name))
+        return inventory_key, None
+
+      return inventory_key, self._snapshot.GetInventory(inventory_key)
+
+    if inventory_type in (
+        INVENTORY_TYPE_BINARIES_DIRECTORY, INVENTORY_TYPE_DPKG_DIRECTORY,
+        INVENTORY_TYPE_RPM_DIRECTORY, INVENTORY_TYPE_SDIST_DIRECTORY):
+      packages = self._GetDirectoryPackages(inventory_type, name)
 
-    return new_packages, new_versions
+    elif inventory_type == INVENTORY_TYPE_COPR:
+      packages = self._copr_project_manager.GetPackages(name)
+
+    elif inventory_type == INVENTORY_TYPE_GITHUB:
+      packages = self._github_repo_manager.GetPackages(name)
+
+    elif inventory_type == INVENTORY_TYPE_LAUNCHPAD:
+      packages = self._launchpad_ppa_manager.GetPackages(name)
+
+    elif inventory_type == INVENTORY_TYPE_PYPI:
+      packages = self._pypi_manager.GetPackages()
+
+    else:
+      logging.error(u'Unsupported inventory type: {0:s}.'.format(
+          inventory_type))
+      packages = None
+
+    return inventory_key, packages
 
   def CompareDirectoryWithCOPRProject(self, reference_directory, project):
     """Compares a directory containing source rpm packages with a COPR project.
 
     Args:
       reference_directory (str): path of the reference directory that contains
-          dpkg source packages.
+          source rpm packages.
       project (str): name of the COPR project.
 
     Returns:
-      tuple: containing:
-
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference directory but not in the project.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference directory.
+      InventoryDiff: difference between the reference directory and
+          the project.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      # The directory contains various files and we are only interested
-      # in the source RPM packages that use the naming convention:
-      # package-version-#.src.rpm
-      if not directory_entry.endswith(u'.src.rpm'):
-        continue
-
-      name, _, _ = directory_entry.rpartition(u'-')
-      name, _, version = name.rpartition(u'-')
+    reference_packages, packages = self.GetInventories([
+        (INVENTORY_TYPE_RPM_DIRECTORY, reference_directory),
+        (INVENTORY_TYPE_COPR, project)])
 
-      reference_packages[name] = version
-
-    packages = self._copr_project_manager.GetPackages(project)
-    return self._ComparePackages(reference_packages, packages)
+    return self._inventory_comparer.Compare(reference_packages, packages)
 
   def CompareDirectoryWithGithubRepo(self, reference_directory, sub_directory):
     """Compares a directory containing msi or dmg packages with a github repo.
@@ -503,34 +655,14 @@ class BinariesManager(object):
       sub_directory (str): name of the machine type sub directory.
 
     Returns:
-      tuple: containing:
-
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference directory but not in the sub
-            directory.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference directory.
+      InventoryDiff: difference between the reference directory and the sub
+          directory.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      if directory_entry.endswith(u'.dmg'):
-        directory_entry, _, _ = directory_entry.rpartition(u'.dmg')
-
-      elif directory_entry.endswith(u'.msi'):
-        if sub_directory == u'win32':
-          directory_entry, _, _ = directory_entry.rpartition(u'.win32')
-        elif sub_directory == u'win64':
-          directory_entry, _, _ = directory_entry.rpartition(u'.win-amd64')
-
-      else:
-        continue
+    reference_packages, packages = self.GetInventories([
+        (INVENTORY_TYPE_BINARIES_DIRECTORY, reference_directory),
+        (INVENTORY_TYPE_GITHUB, sub_directory)])
 
-      name, _, version = directory_entry.rpartition(u'-')
-      reference_packages[name] = version
-
-    packages = self._github_repo_manager.GetPackages(sub_directory)
-    return self._ComparePackages(reference_packages, packages)
+    return self._inventory_comparer.Compare(reference_packages, packages)
 
   def CompareDirectoryWithLaunchpadPPATrack(
       self, reference_directory, track):
@@ -542,29 +674,13 @@ class BinariesManager(object):
       track (str): name of the track.
 
     Returns:
-      tuple: containing:
-
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference directory but not in the track.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference directory.
+      InventoryDiff: difference between the reference directory and the track.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      # The directory contains various files and we are only interested
-      # in the source dpkg packages that use the naming convention:
-      # package_version-#ppa1~trusty_source.changes
-      if not directory_entry.endswith(u'ppa1~trusty_source.changes'):
-        continue
-
-      name, _, _ = directory_entry.rpartition(u'-')
-      name, _, version = name.rpartition(u'_')
+    reference_packages, packages = self.GetInventories([
+        (INVENTORY_TYPE_DPKG_DIRECTORY, reference_directory),
+        (INVENTORY_TYPE_LAUNCHPAD, track)])
 
-      reference_packages[name] = version
-
-    packages = self._launchpad_ppa_manager.GetPackages(track)
-    return self._ComparePackages(reference_packages, packages)
+    return self._inventory_comparer.Compare(reference_packages, packages)
 
   def CompareCOPRProjects(self, reference_project, project):
     """Compares two COPR projects.
@@ -574,19 +690,13 @@ class BinariesManager(object):
       project (str): name of the project.
 
     Returns:
-      tuple: containing:
-
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference project but not in the project.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference project.
+      InventoryDiff: difference between the reference project and the project.
     """
-    reference_packages = self._copr_project_manager.GetPackages(
-        reference_project)
-    packages = self._copr_project_manager.GetPackages(project)
+    reference_packages, packages = self.GetInventories([
+        (INVENTORY_TYPE_COPR, reference_project),
+        (INVENTORY_TYPE_COPR, project)])
 
-    return self._ComparePackages(reference_packages, packages)
+    return self._inventory_comparer.Compare(reference_packages, packages)
 
   def CompareLaunchpadPPATracks(self, reference_track, track):
     """Compares two Launchpad PPA tracks.
@@ -596,52 +706,87 @@ class BinariesManager(object):
       track (str): name of the track.
 
     Returns:
-      tuple: containing:
-
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference track but not in the track.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference track.
+      InventoryDiff: difference between the reference track and the track.
     """
-    reference_packages = self._launchpad_ppa_manager.GetPackages(
-        reference_track)
-    packages = self._launchpad_ppa_manager.GetPackages(track)
+    reference_packages, packages = self.GetInventories([
+        (INVENTORY_TYPE_LAUNCHPAD, reference_track),
+        (INVENTORY_TYPE_LAUNCHPAD, track)])
 
-    return self._ComparePackages(reference_packages, packages)
+    return self._inventory_comparer.Compare(reference_packages, packages)
 
   def CompareDirectoryWithPyPI(self, reference_directory):
     """Compares a directory containing .tar.gz packages with PyPI.
 
     Args:
       reference_directory (str): path of the reference directory that
-          contains msi or dmg packages.
+          contains .tar.gz packages.
 
     Returns:
-      tuple: containing:
+      InventoryDiff: difference between the reference directory and PyPI.
+    """
+    reference_packages, packages = self.GetInventories([
+        (INVENTORY_TYPE_SDIST_DIRECTORY, reference_directory),
+        (INVENTORY_TYPE_PYPI, None)])
+
+    return self._inventory_comparer.Compare(reference_packages, packages)
+
+  def GetInventories(self, inventory_keys):
+    """Retrieves package inventories.
+
+    The package inventories that were not retrieved before are downloaded
+    concurrently, or read from the snapshot if set, and are cached for
+    the lifetime of the binaries manager.
+
+    Args:
+      inventory_keys (list[tuple[str, str]]): keys of the inventories, which
+          consist of the type of the repository or reference directory, such
+          as "copr", and the name of the project, track, sub directory or
+          path of the reference directory, where the name is None for PyPI.
 
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference directory but not on PyPI.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference directory.
+    Returns:
+      list[dict[str, str]]: package names and versions of the inventories in
+          the order of the keys, where the packages are None if they cannot
+          be determined.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      if not directory_entry.endswith(u'.tar.gz'):
-        continue
+    missing_inventory_keys = []
+    for inventory_key in inventory_keys:
+      if (inventory_key not in self._inventories and
+          inventory_key not in missing_inventory_keys):
+        missing_inventory_keys.append(inventory_key)
+
+    if (len(missing_inventory_keys) > 1 and self._number_of_workers != 1 and
+        not self._snapshot):
+      pool = multiprocessing_pool.ThreadPool(processes=min(
+          self._number_of_workers or len(missing_inventory_keys),
+          len(missing_inventory_keys)))
+      try:
+        results = pool.map(self._GetInventory, missing_inventory_keys)
+      finally:
+        pool.close()
+        pool.join()
 
-      directory_entry, _, _ = directory_entry.rpartition(u'.tar.gz')
-      name, _, version = directory_entry.rpartition(u'-')
+    else:
+      results = [
+          self._GetInventory(inventory_key)
+          for inventory_key in missing_inventory_keys]
 
-      if (name.endswith(u'-alpha') or name.endswith(u'-beta') or
-          name.endswith(u'-experimental')):
-        name, _, _ = name.rpartition(u'-')
+    for inventory_key, packages in results:
+      self._inventories[inventory_key] = packages
 
-      reference_packages[name] = version
+    return [
+        self._inventories[inventory_key] for inventory_key in inventory_keys]
+
+  def GetSnapshot(self):
+    """Retrieves a snapshot of the package inventories retrieved before.
+
+    Returns:
+      InventorySnapshot: snapshot of the package inventories.
+    """
+    snapshot = inventories.InventorySnapshot()
+    for inventory_key, packages in self._inventories.items():
+      snapshot.AddInventory(inventory_key, packages)
 
-    packages = self._pypi_manager.GetPackages()
-    return self._ComparePackages(reference_packages, packages)
+    return snapshot
 
   def GetMachineTypeSubDirectory(
       self, preferred_machine_type=None, preferred_operating_system=None):
@@ -727,14 +872,29 @@ def Main():
       u'Manages the GIFT copr, launchpad PPA and l2tbinaries.'))
 
   argument_parser.add_argument(
-      u'action', choices=sorted(actions), action=u'store',
-      metavar=u'ACTION', default=None, help=u'The action.')
+      u'actions', choices=sorted(actions), action=u'store',
+      metavar=u'ACTION', nargs=u'+', help=(
+          u'The actions. The package inventories used by multiple actions '
+          u'are downloaded once.'))
 
   argument_parser.add_argument(
       u'--build-directory', u'--build_directory', action=u'store',
       metavar=u'DIRECTORY', dest=u'build_directory', type=str,
       default=u'build', help=u'The location of the build directory.')
 
+  argument_parser.add_argument(
+      u'--from-snapshot', u'--from_snapshot', action=u'store',
+      metavar=u'PATH', dest=u'from_snapshot', type=str, default=None, help=(
+          u'path of an inventory snapshot file to compare the package '
+          u'inventories from, instead of downloading them and reading '
+          u'the build directory.'))
+
+  argument_parser.add_argument(
+      u'-j', u'--jobs', dest=u'jobs', action=u'store', type=int,
+      metavar=u'NUMBER', default=None, help=(
+          u'maximum number of concurrent downloads. The default is to '
+          u'download all package inventories concurrently.'))
+
   argument_parser.add_argument(
       '--machine-type', '--machine_type', action=u'store', metavar=u'TYPE',
       dest=u'machine_type', type=unicode, default=None, help=(
@@ -743,115 +903,201 @@ def Main():
           u'unless want to force the installation of one machine type e.g. '
           u'\'x86\' onto another \'amd64\'.'))
 
+  argument_parser.add_argument(
+      u'--save-snapshot', u'--save_snapshot', action=u'store',
+      metavar=u'PATH', dest=u'save_snapshot', type=str, default=None, help=(
+          u'path of the inventory snapshot file to write the package '
+          u'inventories used by the actions to.'))
+
   options = argument_parser.parse_args()
 
-  if not options.action:
+  if not options.actions:
     print(u'Missing action.')
     print(u'')
     argument_parser.print_help()
     print(u'')
     return False
 
+  if options.jobs is not None and options.jobs < 1:
+    print(u'Unsupported number of concurrent downloads: {0:d}.'.format(
+        options.jobs))
+    print(u'')
+    return False
+
   # TODO: add action to upload files to PPA.
   # TODO: add action to copy files between PPA tracks.
   # TODO: add l2tbinaries support.
   # TODO: add pypi support.
 
-  binaries_manager = BinariesManager()
+  snapshot = None
+  if options.from_snapshot:
+    if not os.path.exists(options.from_snapshot):
+      print(u'No such inventory snapshot file: {0:s}.'.format(
+          options.from_snapshot))
+      print(u'')
+      return False
+
+    snapshot = inventories.InventorySnapshot()
+    if not snapshot.ReadFromFile(options.from_snapshot):
+      print(u'Unable to read inventory snapshot file: {0:s}.'.format(
+          options.from_snapshot))
+      print(u'')
+      return False
+
+  binaries_manager = BinariesManager(
+      number_of_workers=options.jobs, snapshot=snapshot)
+
+  comparisons = []
+  inventory_keys = []
+  for action in options.actions:
+    action_tuple = action.split(u'-')
+
+    if action_tuple[0] == u'copr' and action_tuple[1] == u'diff':
+      track = action_tuple[2]
+
+      if track == u'testing':
+        reference_directory = options.build_directory
+
+        compare_function = binaries_manager.CompareDirectoryWithCOPRProject
+        arguments = (reference_directory, track)
+        inventory_keys.extend([
+            (INVENTORY_TYPE_RPM_DIRECTORY, reference_directory),
+            (INVENTORY_TYPE_COPR, track)])
+
+        diff_header = (
+            u'Difference between: {0:s} and COPR project: {1:s}'.format(
+                reference_directory, track))
+
+      else:
+        if track == u'dev':
+          reference_track = u'testing'
+        else:
+          reference_track = u'dev'
 
-  action_tuple = options.action.split(u'-')
+        compare_function = binaries_manager.CompareCOPRProjects
+        arguments = (reference_track, track)
+        inventory_keys.extend([
+            (INVENTORY_TYPE_COPR, reference_track),
+            (INVENTORY_TYPE_COPR, track)])
 
-  if action_tuple[0] == u'copr' and action_tuple[1] == u'diff':
-    track = action_tuple[2]
+        diff_header = (
+            u'Difference between COPR project: {0:s} and {1:s}'.format(
+                reference_track, track))
+
+    elif action_tuple[0] == u'l2tbinaries' and action_tuple[1] == u'diff':
+      sub_directory = binaries_manager.GetMachineTypeSubDirectory(
+          preferred_machine_type=options.machine_type)
 
-    if track == u'testing':
       reference_directory = options.build_directory
 
-      new_packages, new_versions = (
-          binaries_manager.CompareDirectoryWithCOPRProject(
-              reference_directory, track))
+      # TODO: compare from l2tbinaries git repo.
+      compare_function = binaries_manager.CompareDirectoryWithGithubRepo
+      arguments = (reference_directory, sub_directory)
+      inventory_keys.extend([
+          (INVENTORY_TYPE_BINARIES_DIRECTORY, reference_directory),
+          (INVENTORY_TYPE_GITHUB, sub_directory)])
 
       diff_header = (
-          u'Difference between: {0:s} and COPR project: {1:s}'.format(
-              reference_directory, track))
+          u'Difference between: {0:s} and release'.format(reference_directory))
 
-    else:
-      if track == u'dev':
-        reference_track = u'testing'
-      else:
-        reference_track = u'dev'
+    elif action_tuple[0] == u'launchpad' and action_tuple[1] == u'diff':
+      track = action_tuple[2]
 
-      new_packages, new_versions = binaries_manager.CompareCOPRProjects(
-          reference_track, track)
+      if track == u'testing':
+        reference_directory = options.build_directory
 
-      diff_header = (
-          u'Difference between COPR project: {0:s} and {1:s}'.format(
-              reference_track, track))
+        compare_function = (
+            binaries_manager.CompareDirectoryWithLaunchpadPPATrack)
+        arguments = (reference_directory, track)
+        inventory_keys.extend([
+            (INVENTORY_TYPE_DPKG_DIRECTORY, reference_directory),
+            (INVENTORY_TYPE_LAUNCHPAD, track)])
 
-  elif action_tuple[0] == u'l2tbinaries' and action_tuple[1] == u'diff':
-    sub_directory = binaries_manager.GetMachineTypeSubDirectory(
-        preferred_machine_type=options.machine_type)
+        diff_header = (
+            u'Difference between: {0:s} and Launchpad track: {1:s}'.format(
+                reference_directory, track))
 
-    reference_directory = options.build_directory
+      else:
+        if track == u'dev':
+          reference_track = u'testing'
+        else:
+          reference_track = u'dev'
 
-    # TODO: compare from l2tbinaries git repo.
-    new_packages, new_versions = (
-        binaries_manager.CompareDirectoryWithGithubRepo(
-            reference_directory, sub_directory))
+        compare_function = binaries_manager.CompareLaunchpadPPATracks
+        arguments = (reference_track, track)
+        inventory_keys.extend([
+            (INVENTORY_TYPE_LAUNCHPAD, reference_track),
+            (INVENTORY_TYPE_LAUNCHPAD, track)])
 
-    diff_header = (
-        u'Difference between: {0:s} and release'.format(reference_directory))
+        diff_header = (
+            u'Difference between Launchpad tracks: {0:s} and {1:s}'.format(
+                reference_track, track))
 
-  elif action_tuple[0] == u'launchpad' and action_tuple[1] == u'diff':
-    track = action_tuple[2]
+    # elif action_tuple[0] == u'osb' and action_tuple[1] == u'diff':
 
-    if track == u'testing':
+    elif action_tuple[0] == u'pypi' and action_tuple[1] == u'diff':
       reference_directory = options.build_directory
 
-      new_packages, new_versions = (
-          binaries_manager.CompareDirectoryWithLaunchpadPPATrack(
-              reference_directory, track))
+      compare_function = binaries_manager.CompareDirectoryWithPyPI
+      arguments = (reference_directory, )
+      inventory_keys.extend([
+          (INVENTORY_TYPE_SDIST_DIRECTORY, reference_directory),
+          (INVENTORY_TYPE_PYPI, None)])
 
       diff_header = (
-          u'Difference between: {0:s} and Launchpad track: {1:s}'.format(
-              reference_directory, track))
+          u'Difference between: {0:s} and release'.format(reference_directory))
 
-    else:
-      if track == u'dev':
-        reference_track = u'testing'
-      else:
-        reference_track = u'dev'
+    comparisons.append((diff_header, compare_function, arguments))
 
-      new_packages, new_versions = binaries_manager.CompareLaunchpadPPATracks(
-          reference_track, track)
+  # The package inventories of all the actions are downloaded concurrently
+  # before the comparisons, which then use the cached inventories.
+  packages_per_inventory = binaries_manager.GetInventories(inventory_keys)
 
-      diff_header = (
-          u'Difference between Launchpad tracks: {0:s} and {1:s}'.format(
-              reference_track, track))
+  if options.save_snapshot:
+    snapshot = binaries_manager.GetSnapshot()
+    snapshot.WriteToFile(options.save_snapshot)
 
-  # elif action_tuple[0] == u'osb' and action_tuple[1] == u'diff':
+  # An inventory of which the packages could not be determined would be
+  # compared as an inventory without packages.
+  missing_inventory_keys = []
+  for inventory_key, packages in zip(inventory_keys, packages_per_inventory):
+    if packages is None and inventory_key not in missing_inventory_keys:
+      missing_inventory_keys.append(inventory_key)
 
-  elif action_tuple[0] == u'pypi' and action_tuple[1] == u'diff':
-    reference_directory = options.build_directory
+  if missing_inventory_keys:
+    for inventory_type, name in missing_inventory_keys:
+      print(u'Unable to determine package inventory: {0:s} {1!s}.'.format(
+          inventory_type, name))
+    print(u'')
 
-    new_packages, new_versions = (
-        binaries_manager.CompareDirectoryWithPyPI(reference_directory))
+    return False
 
-    diff_header = (
-        u'Difference between: {0:s} and release'.format(reference_directory))
+  for diff_header, compare_function, arguments in comparisons:
+    inventory_diff = compare_function(*arguments)
 
-  if action_tuple[1] == u'diff':
     print(diff_header)
     print(u'')
 
     print(u'New packages:')
-    for package in sorted(new_packages.keys()):
-      print(u'  {0:s}'.format(package))
+    for name, version in sorted(inventory_diff.new_packages.items()):
+      print(u'  {0:s} {1:s}'.format(name, version))
     print(u'')
 
     print(u'New versions:')
-    for package in sorted(new_versions.keys()):
-      print(u'  {0:s}'.format(package))
+    for name, versions in sorted(inventory_diff.newer_packages.items()):
+      reference_version, version = versions
+      print(u'  {0:s} {1:s} -> {2:s}'.format(name, version, reference_version))
+    print(u'')
+
+    print(u'Older versions:')
+    for name, versions in sorted(inventory_diff.older_packages.items()):
+      reference_version, version = versions
+      print(u'  {0:s} {1:s} -> {2:s}'.format(name, version, reference_version))
+    print(u'')
+
+    print(u'Removed packages:')
+    for name, version in sorted(inventory_diff.removed_packages.items()):
+      print(u'  {0:s} {1:s}'.format(name, version))
     print(u'')
 
   return True
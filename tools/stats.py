@@ -16,16 +16,7 @@ try:
 except ImportError:
   import configparser  # pylint: disable=import-error
 
-# pylint: disable=import-error
-# pylint: disable=no-name-in-module
-if sys.version_info[0] < 3:
-  # Keep urllib2 here since we this code should be able to be used
-  # by a default Python set up.
-  import urllib2 as urllib_error
-  from urllib2 import urlopen
-else:
-  import urllib.error as urllib_error
-  from urllib.request import urlopen
+from l2tdevtools import url_opener
 
 
 class StatsDefinitionReader(object):
@@ -133,24 +124,17 @@ class DownloadHelper(object):
       download_url (str): URL where to download the page content.
 
     Returns:
-      tuple[bytes, TODO]: page content and response headers if successful or
-          None otherwise.
+      tuple[bytes, dict[str, str]]: page content and response headers if
+          successful or None otherwise.
     """
     if not download_url:
       return None, None
 
-    try:
-      url_object = urlopen(download_url)
-    except urllib_error.URLError as exception:
-      logging.warning(
-          u'Unable to download URL: {0:s} with error: {1:s}'.format(
-              download_url, exception))
-      return None, None
-
-    if url_object.code != 200:
+    url_object = url_opener.GetURLOpener().Open(download_url)
+    if not url_object or url_object.code != 200:
       return None, None
 
-    return url_object.read(), url_object.info()
+    return url_object.read(), url_object.headers
 
 
 class GithubContributionsHelper(DownloadHelper):
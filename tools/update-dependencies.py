@@ -2,9 +2,14 @@
 # -*- coding: utf-8 -*-
 """Script to update the dependencies in various configuration files."""
 
+from __future__ import print_function
 from __future__ import unicode_literals
 
+import argparse
+import logging
+import multiprocessing
 import os
+import sys
 
 from l2tdevtools import dependencies
 from l2tdevtools import project_config
@@ -16,19 +21,119 @@ from l2tdevtools import project_config
 # pylint: disable=redefined-outer-name
 
 
+# Status values of the update of the dependencies of a project.
+STATUS_FAILED = 'failed'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_WRITTEN = 'written'
+
+
+def WriteFileIfChanged(path, file_content):
+  """Writes a file if its content has changed.
+
+  Args:
+    path (str): path of the file.
+    file_content (bytes): content of the file.
+
+  Returns:
+    bool: True if the file was written or False if its content was unchanged.
+  """
+  if os.path.exists(path):
+    with open(path, 'rb') as file_object:
+      if file_object.read() == file_content:
+        return False
+
+  with open(path, 'wb') as file_object:
+    file_object.write(file_content)
+
+  return True
+
+
+class DependencyModel(object):
+  """Dependency model.
+
+  The dependency model contains the views of the dependencies that are
+  rendered by the dependency file writers, such that every view is derived
+  from the dependencies configuration once per project.
+
+  Attributes:
+    dpkg_depends (tuple[str]): dependency definitions for the dpkg control
+        file.
+    dpkg_depends_without_version (tuple[str]): names of the dpkg packages.
+    install_requires (tuple[str]): dependency definitions for install_requires
+        for setup.py.
+    l2tbinaries (tuple[str]): names of the l2tbinaries packages.
+    rpm_requires (tuple[str]): dependency definitions for requires for
+        setup.cfg.
+    rpm_requires_without_version (tuple[str]): names of the RPM packages.
+  """
+
+  def __init__(self, dependency_helper):
+    """Initializes a dependency model.
+
+    Args:
+      dependency_helper (DependencyHelper): dependency helper.
+    """
+    super(DependencyModel, self).__init__()
+    self.dpkg_depends = tuple(dependency_helper.GetDPKGDepends())
+    self.dpkg_depends_without_version = tuple(
+        dependency_helper.GetDPKGDepends(exclude_version=True))
+    self.install_requires = tuple(dependency_helper.GetInstallRequires())
+    self.l2tbinaries = tuple(dependency_helper.GetL2TBinaries())
+    self.rpm_requires = tuple(dependency_helper.GetRPMRequires())
+    self.rpm_requires_without_version = tuple(
+        dependency_helper.GetRPMRequires(exclude_version=True))
+
+
 class DependencyFileWriter(object):
   """Dependency file writer."""
 
-  def __init__(self, project_definition, dependency_helper):
+  PATH = None
+
+  def __init__(self, project_path, project_definition, dependency_model):
     """Initializes a dependency file writer.
 
     Args:
+      project_path (str): path of the project directory.
       project_definition (ProjectDefinition): project definition.
-      dependency_helper (DependencyHelper): dependency helper.
+      dependency_model (DependencyModel): dependency model.
     """
     super(DependencyFileWriter, self).__init__()
-    self._dependency_helper = dependency_helper
+    self._dependency_model = dependency_model
     self._project_definition = project_definition
+    self._project_path = project_path
+
+  def _HasDirectory(self, name):
+    """Determines if the project directory contains a specific directory.
+
+    Args:
+      name (str): name of the directory.
+
+    Returns:
+      bool: True if the project directory contains the directory.
+    """
+    return os.path.isdir(os.path.join(self._project_path, name))
+
+  def _WriteFile(self, file_content):
+    """Writes the file if its content has changed.
+
+    Args:
+      file_content (bytes): content of the file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
+    path = os.path.join(self._project_path, self.PATH)
+    return WriteFileIfChanged(path, file_content)
+
+  def Write(self):
+    """Writes the file if its content has changed.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
+    raise NotImplementedError
 
 
 class AppveyorYmlWriter(DependencyFileWriter):
@@ -127,11 +232,16 @@ class AppveyorYmlWriter(DependencyFileWriter):
       '']
 
   def Write(self):
-    """Writes an appveyor.yml file."""
+    """Writes an appveyor.yml file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     file_content = []
     file_content.extend(self._FILE_HEADER)
 
-    dependencies = self._dependency_helper.GetL2TBinaries()
+    dependencies = list(self._dependency_model.l2tbinaries)
     dependencies.extend(['funcsigs', 'mock', 'pbr'])
 
     if 'six' not in dependencies:
@@ -149,8 +259,7 @@ class AppveyorYmlWriter(DependencyFileWriter):
     file_content = '\n'.join(file_content)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class DPKGControlWriter(DependencyFileWriter):
@@ -219,8 +328,13 @@ class DPKGControlWriter(DependencyFileWriter):
       '']
 
   def Write(self):
-    """Writes a dpkg control file."""
-    dependencies = self._dependency_helper.GetDPKGDepends()
+    """Writes a dpkg control file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
+    dependencies = list(self._dependency_model.dpkg_depends)
 
     file_content = []
 
@@ -229,7 +343,7 @@ class DPKGControlWriter(DependencyFileWriter):
     else:
       file_content.extend(self._PYTHON3_FILE_HEADER)
 
-    if os.path.isdir('data'):
+    if self._HasDirectory('data'):
       dependencies.insert(
           0, '{0:s}-data'.format(self._project_definition.name))
 
@@ -240,7 +354,7 @@ class DPKGControlWriter(DependencyFileWriter):
     if not self._project_definition.python2_only:
       file_content.extend(self._PYTHON3_PACKAGE)
 
-    if os.path.isdir('scripts') or os.path.isdir('tools'):
+    if self._HasDirectory('scripts') or self._HasDirectory('tools'):
       file_content.extend(self._TOOLS_PACKAGE)
 
     description_long = self._project_definition.description_long
@@ -271,8 +385,7 @@ class DPKGControlWriter(DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class GIFTCOPRInstallScriptWriter(DependencyFileWriter):
@@ -322,11 +435,16 @@ class GIFTCOPRInstallScriptWriter(DependencyFileWriter):
       '']
 
   def Write(self):
-    """Writes a gift_copr_install.sh file."""
+    """Writes a gift_copr_install.sh file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     file_content = []
     file_content.extend(self._FILE_HEADER)
 
-    dependencies = self._dependency_helper.GetRPMRequires(exclude_version=True)
+    dependencies = self._dependency_model.rpm_requires_without_version
     libyal_dependencies = []
     for index, dependency in enumerate(dependencies):
       if index == 0:
@@ -358,8 +476,7 @@ class GIFTCOPRInstallScriptWriter(DependencyFileWriter):
     file_content = '\n'.join(file_content)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class GIFTPPAInstallScriptWriter(DependencyFileWriter):
@@ -409,11 +526,16 @@ class GIFTPPAInstallScriptWriter(DependencyFileWriter):
       '']
 
   def Write(self):
-    """Writes a gift_ppa_install.sh file."""
+    """Writes a gift_ppa_install.sh file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     file_content = []
     file_content.extend(self._FILE_HEADER)
 
-    dependencies = self._dependency_helper.GetDPKGDepends(exclude_version=True)
+    dependencies = self._dependency_model.dpkg_depends_without_version
     libyal_dependencies = []
     for index, dependency in enumerate(dependencies):
       if index == 0:
@@ -445,8 +567,7 @@ class GIFTPPAInstallScriptWriter(DependencyFileWriter):
     file_content = '\n'.join(file_content)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class RequirementsWriter(DependencyFileWriter):
@@ -457,19 +578,23 @@ class RequirementsWriter(DependencyFileWriter):
   _FILE_HEADER = ['pip >= 7.0.0']
 
   def Write(self):
-    """Writes a requirements.txt file."""
+    """Writes a requirements.txt file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     file_content = []
     file_content.extend(self._FILE_HEADER)
 
-    dependencies = self._dependency_helper.GetInstallRequires()
+    dependencies = self._dependency_model.install_requires
     for dependency in dependencies:
       file_content.append('{0:s}'.format(dependency))
 
     file_content = '\n'.join(file_content)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class SetupCfgWriter(DependencyFileWriter):
@@ -498,15 +623,20 @@ class SetupCfgWriter(DependencyFileWriter):
       'build_requires = python-setuptools']
 
   def Write(self):
-    """Writes a setup.cfg file."""
+    """Writes a setup.cfg file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     file_content = []
 
-    if os.path.isdir('test_data'):
+    if self._HasDirectory('test_data'):
       file_content.extend(self._SDIST)
 
     file_content.extend(self._BDIST_RPM)
 
-    dependencies = self._dependency_helper.GetRPMRequires()
+    dependencies = self._dependency_model.rpm_requires
     for index, dependency in enumerate(dependencies):
       if index == 0:
         file_content.append('requires = {0:s}'.format(dependency))
@@ -521,8 +651,7 @@ class SetupCfgWriter(DependencyFileWriter):
     file_content = file_content.format(**kwargs)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class TravisBeforeInstallScriptWriter(DependencyFileWriter):
@@ -572,12 +701,16 @@ class TravisBeforeInstallScriptWriter(DependencyFileWriter):
       '']
 
   def Write(self):
-    """Writes an install.sh file."""
+    """Writes an install.sh file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     file_content = []
     file_content.extend(self._FILE_HEADER)
 
-    dependencies = self._dependency_helper.GetL2TBinaries()
-    dependencies = ' '.join(dependencies)
+    dependencies = ' '.join(self._dependency_model.l2tbinaries)
     file_content.append('L2TBINARIES_DEPENDENCIES="{0:s}";'.format(
         dependencies))
 
@@ -592,7 +725,7 @@ class TravisBeforeInstallScriptWriter(DependencyFileWriter):
 
     file_content.append('')
 
-    dependencies = self._dependency_helper.GetDPKGDepends(exclude_version=True)
+    dependencies = self._dependency_model.dpkg_depends_without_version
     dependencies = ' '.join(dependencies)
     file_content.append('PYTHON2_DEPENDENCIES="{0:s}";'.format(dependencies))
 
@@ -604,8 +737,7 @@ class TravisBeforeInstallScriptWriter(DependencyFileWriter):
     file_content = '\n'.join(file_content)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
 class ToxIniWriter(DependencyFileWriter):
@@ -645,42 +777,41 @@ class ToxIniWriter(DependencyFileWriter):
       ''])
 
   def Write(self):
-    """Writes a setup.cfg file."""
+    """Writes a tox.ini file.
+
+    Returns:
+      bool: True if the file was written or False if its content was
+          unchanged.
+    """
     kwargs = {'project_name': self._project_definition.name}
     file_content = self._FILE_CONTENT.format(**kwargs)
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    return self._WriteFile(file_content)
 
 
-if __name__ == '__main__':
-  project_file = os.getcwd()
-  project_file = os.path.basename(project_file)
-  project_file = '{0:s}.ini'.format(project_file)
-
-  project_reader = project_config.ProjectDefinitionReader()
-  with open(project_file, 'rb') as file_object:
-    project_definition = project_reader.Read(file_object)
+# Writers of the files that are written for every project.
+WRITER_CLASSES = (
+    AppveyorYmlWriter, RequirementsWriter, SetupCfgWriter,
+    TravisBeforeInstallScriptWriter, ToxIniWriter)
 
-  helper = dependencies.DependencyHelper()
+# Writers of the files that are only written if the project already
+# contains them.
+OPTIONAL_WRITER_CLASSES = (
+    DPKGControlWriter, GIFTCOPRInstallScriptWriter,
+    GIFTPPAInstallScriptWriter)
 
-  for writer_class in (
-      AppveyorYmlWriter, RequirementsWriter, SetupCfgWriter,
-      TravisBeforeInstallScriptWriter, ToxIniWriter):
-    writer = writer_class(project_definition, helper)
-    writer.Write()
 
-  for writer_class in (
-      DPKGControlWriter, GIFTCOPRInstallScriptWriter,
-      GIFTPPAInstallScriptWriter):
-    if not os.path.exists(writer_class.PATH):
-      continue
+def GetDependenciesModuleData():
+  """Retrieves the data of the dependencies module to copy to projects.
 
-    writer = writer_class(project_definition, helper)
-    writer.Write()
+  The data contains l2tdevtools/dependencies.py up to the functions that
+  are only used by this script.
 
+  Returns:
+    bytes: data of the dependencies module.
+  """
   l2tdevtools_path = os.path.abspath(__file__)
   l2tdevtools_path = os.path.dirname(l2tdevtools_path)
   l2tdevtools_path = os.path.dirname(l2tdevtools_path)
@@ -689,14 +820,198 @@ if __name__ == '__main__':
   file_data = []
   with open(path, 'rb') as file_object:
     for line in file_object.readlines():
-      if 'GetDPKGDepends' in line:
+      if b'GetDPKGDepends' in line:
         break
 
       file_data.append(line)
 
   file_data.pop()
-  file_data = ''.join(file_data)
+  return b''.join(file_data)
 
-  path = os.path.join('utils', 'dependencies.py')
-  with open(path, 'wb') as file_object:
-    file_object.write(file_data)
+
+def UpdateProject(arguments):
+  """Updates the dependencies in the configuration files of a project.
+
+  Only the files that have changed are written. This function is run in
+  a worker process.
+
+  Args:
+    arguments (tuple[str, bytes]): path of the project directory and data
+        of the dependencies module.
+
+  Returns:
+    tuple[str, str, str]: path of the project directory, status and message.
+  """
+  project_path, dependencies_module_data = arguments
+
+  project_name = os.path.basename(os.path.abspath(project_path))
+  project_file = os.path.join(project_path, '{0:s}.ini'.format(project_name))
+  if not os.path.exists(project_file):
+    return project_path, STATUS_FAILED, 'missing project file: {0:s}'.format(
+        project_file)
+
+  try:
+    project_reader = project_config.ProjectDefinitionReader()
+    with open(project_file, 'rb') as file_object:
+      project_definition = project_reader.Read(file_object)
+
+    dependency_helper = dependencies.DependencyHelper(
+        configuration_file=os.path.join(project_path, 'dependencies.ini'))
+
+    # The views of the dependencies are derived once and shared by all
+    # writers.
+    dependency_model = DependencyModel(dependency_helper)
+
+    written_paths = []
+    for writer_class in WRITER_CLASSES + OPTIONAL_WRITER_CLASSES:
+      if (writer_class in OPTIONAL_WRITER_CLASSES and
+          not os.path.exists(os.path.join(project_path, writer_class.PATH))):
+        continue
+
+      writer = writer_class(project_path, project_definition, dependency_model)
+      if writer.Write():
+        written_paths.append(writer_class.PATH)
+
+    path = os.path.join('utils', 'dependencies.py')
+    if WriteFileIfChanged(
+        os.path.join(project_path, path), dependencies_module_data):
+      written_paths.append(path)
+
+  except Exception as exception:  # pylint: disable=broad-except
+    # A failure of a single project should not stop the update of the
+    # other projects.
+    return project_path, STATUS_FAILED, (
+        'unable to update dependencies with error: {0!s}'.format(exception))
+
+  if not written_paths:
+    return project_path, STATUS_UNCHANGED, project_path
+
+  return project_path, STATUS_WRITTEN, '{0:s} ({1:s})'.format(
+      project_path, ', '.join(written_paths))
+
+
+def _GetProjectPaths(projects_path):
+  """Determines the project directories in a directory.
+
+  A project directory is a directory that contains a dependencies.ini file
+  and a {project name}.ini file.
+
+  Args:
+    projects_path (str): path of the directory that contains the project
+        directories.
+
+  Returns:
+    list[str]: paths of the project directories.
+  """
+  project_paths = []
+  for name in sorted(os.listdir(projects_path)):
+    path = os.path.join(projects_path, name)
+    if (os.path.exists(os.path.join(path, 'dependencies.ini')) and
+        os.path.exists(os.path.join(path, '{0:s}.ini'.format(name)))):
+      project_paths.append(path)
+
+  return project_paths
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Updates the dependencies in the configuration files of one or more '
+      'projects.'))
+
+  argument_parser.add_argument(
+      'project_paths', action='store', metavar='PATH', type=str, nargs='*',
+      help=(
+          'paths of the project directories. The default is the current '
+          'working directory.'))
+
+  argument_parser.add_argument(
+      '-j', '--jobs', dest='jobs', action='store', type=int,
+      metavar='NUMBER', default=None, help=(
+          'number of worker processes. The default is the number of CPUs.'))
+
+  argument_parser.add_argument(
+      '--projects-directory', '--projects_directory', action='store',
+      metavar='DIRECTORY', dest='projects_directory', type=str,
+      default=None, help=(
+          'path of a directory that contains project directories, such as '
+          'the checkouts of multiple projects, of which all project '
+          'directories should be updated.'))
+
+  options = argument_parser.parse_args()
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  project_paths = list(options.project_paths)
+  if options.projects_directory:
+    if not os.path.isdir(options.projects_directory):
+      print('No such directory: {0:s}.'.format(options.projects_directory))
+      print('')
+      return False
+
+    project_paths.extend(_GetProjectPaths(options.projects_directory))
+
+  elif not project_paths:
+    project_paths.append(os.getcwd())
+
+  if not project_paths:
+    print('No project directories found.')
+    print('')
+    return False
+
+  # The dependencies module is read once for all projects.
+  dependencies_module_data = GetDependenciesModuleData()
+
+  tasks = [
+      (project_path, dependencies_module_data)
+      for project_path in project_paths]
+
+  if len(tasks) > 1 and options.jobs != 1:
+    pool = multiprocessing.Pool(processes=options.jobs)
+    try:
+      results = pool.map(UpdateProject, tasks)
+    finally:
+      pool.close()
+      pool.join()
+
+  else:
+    results = [UpdateProject(task) for task in tasks]
+
+  failed_projects = []
+  unchanged_projects = []
+  written_projects = []
+  for project_path, status, message in results:
+    if status == STATUS_WRITTEN:
+      logging.info('Written: {0:s}'.format(message))
+      written_projects.append(project_path)
+
+    elif status == STATUS_UNCHANGED:
+      logging.info('Unchanged: {0:s}'.format(message))
+      unchanged_projects.append(project_path)
+
+    else:
+      print('Failed: {0:s}: {1:s}'.format(project_path, message))
+      failed_projects.append(project_path)
+
+  if len(results) > 1:
+    print('')
+    print((
+        'Updated dependencies of {0:d} projects: {1:d} written, '
+        '{2:d} unchanged, {3:d} failed.').format(
+            len(results), len(written_projects), len(unchanged_projects),
+            len(failed_projects)))
+    print('')
+
+  return not failed_projects
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -16,14 +16,9 @@ import subprocess
 import sys
 
 from l2tdevtools import download_helper
-from l2tdevtools import presets
 from l2tdevtools import projects
 
 
-if platform.system() == 'Windows':
-  import wmi  # pylint: disable=import-error
-
-
 def CompareVersions(first_version_list, second_version_list):
   """Compares two lists containing version parts.
 
@@ -716,6 +711,10 @@ class DependencyUpdater(object):
     Returns:
       bool: True if the uninstall was successful.
     """
+    # Import wmi on demand since it is only available on Windows and is
+    # only needed when uninstalling packages.
+    import wmi  # pylint: disable=import-error
+
     connection = wmi.WMI()
 
     query = 'SELECT Name FROM Win32_Product'
@@ -884,15 +883,26 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  presets_path = None
+  if os.path.exists(presets_file):
+    presets_path = presets_file
+
+  # If available keep the compiled project definitions in the download
+  # directory, such that the configuration files are only parsed when they
+  # have changed.
+  cache_path = None
+  if os.path.isdir(options.download_directory):
+    cache_path = os.path.abspath(os.path.join(
+        options.download_directory, 'projects.json'))
+
+  project_definition_store = projects.ProjectDefinitionStore(
+      projects_file, presets_path=presets_path, cache_path=cache_path)
+  project_definition_store.Read()
+
   project_names = []
   if options.preset:
-    with open(presets_file) as file_object:
-      preset_definition_reader = presets.PresetDefinitionReader()
-      for preset_definition in preset_definition_reader.Read(file_object):
-        if preset_definition.name == options.preset:
-          project_names = preset_definition.project_names
-          break
-
+    project_names = project_definition_store.GetPresetProjectNames(
+        options.preset)
     if not project_names:
       print('Undefined preset: {0:s}'.format(options.preset))
       print('')
@@ -911,15 +921,10 @@ def Main():
       preferred_machine_type=options.machine_type,
       verbose_output=options.verbose)
 
-  project_definitions = {}
-  with open(projects_file) as file_object:
-    project_definition_reader = projects.ProjectDefinitionReader()
-    for project_definition in project_definition_reader.Read(file_object):
-      project_definitions[project_definition.name] = project_definition
-
   package_names = []
   for project_name in project_names:
-    project_definition = project_definitions.get(project_name, None)
+    project_definition = project_definition_store.GetProjectDefinition(
+        project_name)
     if not project_definition:
       logging.error('Missing definition for project: {0:s}'.format(
           project_name))
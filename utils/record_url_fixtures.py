@@ -0,0 +1,114 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to record the URL fixtures of the project version resolution."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import logging
+import os
+import sys
+
+# Change PYTHONPATH to include l2tdevtools.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+# pylint: disable=wrong-import-position
+from l2tdevtools import download_helper
+from l2tdevtools import projects
+from l2tdevtools import url_opener
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Records the web content used to resolve the latest version and '
+      'download URL of the projects, such that it can be replayed with '
+      'L2TDEVTOOLS_URL_FIXTURES=replay:DIRECTORY.'))
+
+  argument_parser.add_argument(
+      'fixtures_directory', action='store', metavar='DIRECTORY',
+      help='path of the directory to record the URL fixtures to.')
+
+  argument_parser.add_argument(
+      '-c', '--config', dest='config_path', action='store',
+      metavar='CONFIG_PATH', default=None, help=(
+          'path of the directory containing the build configuration '
+          'files e.g. projects.ini.'))
+
+  argument_parser.add_argument(
+      '--projects', dest='projects', action='store',
+      metavar='PROJECT_NAME(S)', default=None, help=(
+          'comma separated list of specific project names to record. The '
+          'default is to record all project defined in the projects.ini '
+          'configuration file.'))
+
+  options = argument_parser.parse_args()
+
+  config_path = options.config_path
+  if not config_path:
+    config_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config_path = os.path.join(config_path, 'data')
+
+  projects_file = os.path.join(config_path, 'projects.ini')
+  if not os.path.exists(projects_file):
+    print('No such config file: {0:s}.'.format(projects_file))
+    print('')
+    return False
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  project_names = []
+  if options.projects:
+    project_names = options.projects.split(',')
+
+  fixture_store = url_opener.URLFixtureStore(options.fixtures_directory)
+  url_opener.SetURLOpener(url_opener.RecordingURLOpener(fixture_store))
+
+  failed_projects = []
+  with open(projects_file) as file_object:
+    project_definition_reader = projects.ProjectDefinitionReader()
+    for project_definition in project_definition_reader.Read(file_object):
+      if project_names and project_definition.name not in project_names:
+        continue
+
+      download_helper_object = (
+          download_helper.DownloadHelperFactory.NewDownloadHelper(
+              project_definition.download_url))
+      if not download_helper_object:
+        continue
+
+      logging.info('Recording: {0:s}'.format(project_definition.name))
+
+      # Note that the version definition is not passed, such that the web
+      # content is always retrieved.
+      project_version = download_helper_object.GetLatestVersion(
+          project_definition.name, None)
+
+      if project_version:
+        download_url = download_helper_object.GetDownloadURL(
+            project_definition.name, project_version)
+
+      if not project_version or not download_url:
+        failed_projects.append(project_definition.name)
+
+  if failed_projects:
+    print('')
+    print('Unable to resolve version and download URL of:')
+    for project_name in failed_projects:
+      print('\t{0:s}'.format(project_name))
+
+  return not failed_projects
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -6,8 +6,12 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import argparse
+import ast
+import hashlib
+import io
 import json
 import logging
+import multiprocessing
 import os
 import random
 import re
@@ -16,6 +20,8 @@ import subprocess
 import sys
 import time
 
+from multiprocessing import pool as multiprocessing_pool
+
 # pylint: disable=import-error
 # pylint: disable=no-name-in-module
 if sys.version_info[0] < 3:
@@ -460,8 +466,38 @@ class CodeReviewHelper(CLIHelper):
     return exit_code == 0
 
 
+class GitRepositorySnapshot(object):
+  """Snapshot of the state of a git repository.
+
+  Attributes:
+    active_branch (bytes): name of the active branch or None.
+    branches (list[bytes]): names of the branches.
+    changed_files (dict[str, list[bytes]]): names of the changed files per
+        diffbase, where None represents all files in the repository.
+    configuration (dict[bytes, bytes]): configuration values per key.
+    remotes (list[bytes]): remotes, formatted as by "git remote -v".
+    status (list[bytes]): short status of the uncommitted changes.
+  """
+
+  def __init__(self):
+    """Initializes a git repository snapshot."""
+    super(GitRepositorySnapshot, self).__init__()
+    self.active_branch = None
+    self.branches = []
+    self.changed_files = {}
+    self.configuration = {}
+    self.remotes = []
+    self.status = []
+
+
 class GitHelper(CLIHelper):
-  """Git command helper."""
+  """Git command helper.
+
+  The state of the git repository, such as its branches, remotes, status
+  and configuration, is read once into a snapshot that is used by the
+  queries for the rest of the run. The snapshot is invalidated by the
+  operations that change the state of the git repository.
+  """
 
   def __init__(self, git_repo_url):
     """Initializes a git helper.
@@ -471,7 +507,7 @@ class GitHelper(CLIHelper):
     """
     super(GitHelper, self).__init__()
     self._git_repo_url = git_repo_url
-    self._remotes = []
+    self._snapshot = None
 
   def _GetRemotes(self):
     """Retrieves the git repository remotes.
@@ -479,12 +515,63 @@ class GitHelper(CLIHelper):
     Returns:
       list[str]: git repository remotes or None.
     """
-    if not self._remotes:
-      exit_code, output, _ = self.RunCommand('git remote -v')
-      if exit_code == 0:
-        self._remotes = list(filter(None, output.split(b'\n')))
+    return self._GetSnapshot().remotes
+
+  def _GetSnapshot(self):
+    """Retrieves a snapshot of the state of the git repository.
+
+    Returns:
+      GitRepositorySnapshot: snapshot of the state of the git repository.
+    """
+    if self._snapshot:
+      return self._snapshot
 
-    return self._remotes
+    snapshot = GitRepositorySnapshot()
+
+    exit_code, output, _ = self.RunCommand('git branch')
+    if exit_code == 0:
+      for line in output.split(b'\n'):
+        if not line:
+          continue
+
+        # Ignore the first 2 characters of the line.
+        snapshot.branches.append(line[2:])
+        if line.startswith(b'* '):
+          snapshot.active_branch = line[2:]
+
+    exit_code, output, _ = self.RunCommand('git status -s')
+    if exit_code == 0:
+      snapshot.status = list(filter(None, output.split(b'\n')))
+
+    # The configuration contains both the email address and the remotes.
+    exit_code, output, _ = self.RunCommand('git config --list')
+    if exit_code == 0:
+      remote_names = []
+      for line in output.split(b'\n'):
+        key, separator, value = line.partition(b'=')
+        if not separator:
+          continue
+
+        # Later values, such as of the repository configuration, take
+        # precedence over earlier values, such as of the global
+        # configuration.
+        snapshot.configuration[key] = value
+
+        if key.startswith(b'remote.') and key.endswith(b'.url'):
+          remote_name = key[7:-4]
+          if remote_name not in remote_names:
+            remote_names.append(remote_name)
+
+      for remote_name in remote_names:
+        url = snapshot.configuration[b'remote.' + remote_name + b'.url']
+        push_url = snapshot.configuration.get(
+            b'remote.' + remote_name + b'.pushurl', url)
+        snapshot.remotes.append(b'\t'.join([remote_name, url + b' (fetch)']))
+        snapshot.remotes.append(b'\t'.join([
+            remote_name, push_url + b' (push)']))
+
+    self._snapshot = snapshot
+    return snapshot
 
   def AddPath(self, path):
     """Adds a specific path to be managed by git.
@@ -497,6 +584,7 @@ class GitHelper(CLIHelper):
     """
     command = 'git add -A {0:s}'.format(path)
     exit_code, _, _ = self.RunCommand(command)
+    self.Invalidate()
     return exit_code == 0
 
   def CheckHasBranch(self, branch):
@@ -508,16 +596,7 @@ class GitHelper(CLIHelper):
     Returns:
       bool: True if git repo has the specific branch.
     """
-    exit_code, output, _ = self.RunCommand('git branch')
-    if exit_code != 0:
-      return False
-
-    # Check for remote entries starting with upstream.
-    for line in output.split(b'\n'):
-      # Ignore the first 2 characters of the line.
-      if line[2:] == branch:
-        return True
-    return False
+    return branch in self._GetSnapshot().branches
 
   def CheckHasProjectOrigin(self):
     """Checks if the git repo has the project remote origin defined.
@@ -551,15 +630,7 @@ class GitHelper(CLIHelper):
     Returns:
       bool: True if the git repo has uncommitted changes.
     """
-    exit_code, output, _ = self.RunCommand('git status -s')
-    if exit_code != 0:
-      return False
-
-    # Check if 'git status -s' yielded any output.
-    for line in output.split(b'\n'):
-      if line:
-        return True
-    return False
+    return bool(self._GetSnapshot().status)
 
   def CheckSynchronizedWithUpstream(self):
     """Checks if the git repo is synchronized with upstream.
@@ -571,6 +642,7 @@ class GitHelper(CLIHelper):
     # the master branch. Otherwise the information about the current
     # upstream HEAD is not updated.
     exit_code, _, _ = self.RunCommand('git fetch upstream')
+    self.Invalidate()
     if exit_code != 0:
       return False
 
@@ -598,6 +670,7 @@ class GitHelper(CLIHelper):
         '-m "Code review: {1:s}: {2:s}"').format(
             author, codereview_issue_number, description)
     exit_code, _, _ = self.RunCommand(command)
+    self.Invalidate()
     if exit_code != 0:
       return False
 
@@ -611,6 +684,7 @@ class GitHelper(CLIHelper):
     """Drops the uncommitted changes."""
     self.RunCommand('git stash')
     self.RunCommand('git stash drop')
+    self.Invalidate()
 
   def GetActiveBranch(self):
     """Retrieves the active branch.
@@ -618,16 +692,7 @@ class GitHelper(CLIHelper):
     Returns:
       str: name of the active branch or None.
     """
-    exit_code, output, _ = self.RunCommand('git branch')
-    if exit_code != 0:
-      return False
-
-    # Check for remote entries starting with upstream.
-    for line in output.split(b'\n'):
-      if line.startswith(b'* '):
-        # Ignore the first 2 characters of the line.
-        return line[2:]
-    return
+    return self._GetSnapshot().active_branch
 
   def GetChangedFiles(self, diffbase=None):
     """Retrieves the changed files.
@@ -638,6 +703,11 @@ class GitHelper(CLIHelper):
     Returns:
       list[str]: names of the changed files.
     """
+    snapshot = self._GetSnapshot()
+    changed_files = snapshot.changed_files.get(diffbase, None)
+    if changed_files is not None:
+      return list(changed_files)
+
     if diffbase:
       command = 'git diff --name-only {0:s}'.format(diffbase)
     else:
@@ -647,7 +717,9 @@ class GitHelper(CLIHelper):
     if exit_code != 0:
       return []
 
-    return output.split(b'\n')
+    changed_files = output.split(b'\n')
+    snapshot.changed_files[diffbase] = changed_files
+    return list(changed_files)
 
   def GetChangedPythonFiles(self, diffbase=None):
     """Retrieves the changed Python files.
@@ -686,15 +758,7 @@ class GitHelper(CLIHelper):
     Returns:
       str: email address or None.
     """
-    exit_code, output, _ = self.RunCommand('git config user.email')
-    if exit_code != 0:
-      return
-
-    output_lines = output.split(b'\n')
-    if not output_lines:
-      return
-
-    return output_lines[0]
+    return self._GetSnapshot().configuration.get(b'user.email', None)
 
   def GetLastCommitMessage(self):
     """Retrieves the last commit message.
@@ -727,6 +791,15 @@ class GitHelper(CLIHelper):
         if len(values) == 3:
           return values[1]
 
+  def Invalidate(self):
+    """Invalidates the snapshot of the state of the git repository.
+
+    The operations of the helper that change the state of the git repository
+    invalidate the snapshot themselves. Callers that change the state of the
+    git repository otherwise should invalidate the snapshot.
+    """
+    self._snapshot = None
+
   def PullFromFork(self, git_repo_url, branch):
     """Pulls changes from a feature branch on a fork.
 
@@ -739,6 +812,7 @@ class GitHelper(CLIHelper):
     """
     command = 'git pull --squash {0:s} {1:s}'.format(git_repo_url, branch)
     exit_code, _, _ = self.RunCommand(command)
+    self.Invalidate()
     return exit_code == 0
 
   def PushToOrigin(self, branch, force=False):
@@ -757,6 +831,7 @@ class GitHelper(CLIHelper):
       command = 'git push -f --set-upstream origin {0:s}'.format(branch)
 
     exit_code, _, _ = self.RunCommand(command)
+    self.Invalidate()
     return exit_code == 0
 
   def RemoveFeatureBranch(self, branch):
@@ -770,6 +845,7 @@ class GitHelper(CLIHelper):
 
     self.RunCommand('git push origin --delete {0:s}'.format(branch))
     self.RunCommand('git branch -D {0:s}'.format(branch))
+    self.Invalidate()
 
   def SynchronizeWithOrigin(self):
     """Synchronizes git with origin.
@@ -783,6 +859,7 @@ class GitHelper(CLIHelper):
 
     exit_code, _, _ = self.RunCommand(
         'git pull --no-edit origin master')
+    self.Invalidate()
 
     return exit_code == 0
 
@@ -798,6 +875,7 @@ class GitHelper(CLIHelper):
 
     exit_code, _, _ = self.RunCommand(
         'git pull --no-edit --rebase upstream master')
+    self.Invalidate()
     if exit_code != 0:
       return False
 
@@ -812,6 +890,7 @@ class GitHelper(CLIHelper):
       bool: True if the git repository has switched to the master branch.
     """
     exit_code, _, _ = self.RunCommand('git checkout master')
+    self.Invalidate()
     return exit_code == 0
 
 
@@ -1172,10 +1251,222 @@ class ProjectHelper(CLIHelper):
 
 
 class PylintHelper(CLIHelper):
-  """Class that defines pylint helper functions."""
+  """Class that defines pylint helper functions.
+
+  The files are linted by multiple pylint processes concurrently. The names
+  and content hashes of the files that were linted without errors are cached,
+  such that these files are not linted again until their content, the pylint
+  configuration or the pylint version changes.
+  """
+
+  _CACHE_FORMAT_VERSION = 1
 
   _MINIMUM_VERSION_TUPLE = (1, 5, 0)
 
+  _RCFILE_PATH = '.pylintrc'
+
+  # Number of the slowest files of which the duration is printed.
+  _NUMBER_OF_SLOWEST_FILES = 5
+
+  def __init__(self, cache_path=None, number_of_workers=None):
+    """Initializes a pylint helper.
+
+    Args:
+      cache_path (Optional[str]): path of the file in which the files that
+          were linted without errors are cached, where None represents
+          no cache.
+      number_of_workers (Optional[int]): maximum number of pylint processes
+          that are run concurrently, where None represents the number of
+          CPUs.
+    """
+    super(PylintHelper, self).__init__()
+    self._cache_path = cache_path
+    self._number_of_workers = number_of_workers
+
+  def _GetCacheKey(self):
+    """Retrieves the key of the cache.
+
+    The cache is only valid for the same pylint version and configuration.
+
+    Returns:
+      dict[str, str]: pylint version and content hash of the pylint
+          configuration file.
+    """
+    rcfile_hash = None
+    if os.path.exists(self._RCFILE_PATH):
+      rcfile_hash = self._GetContentHash(self._RCFILE_PATH)
+
+    return {'rcfile_hash': rcfile_hash, 'version': self._GetVersion()}
+
+  def _GetContentHash(self, path):
+    """Calculates the hash of the content of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: SHA-256 hash of the content of the file or None if the file
+          cannot be read.
+    """
+    try:
+      with open(path, 'rb') as file_object:
+        return hashlib.sha256(file_object.read()).hexdigest()
+    except IOError:
+      return
+
+  def _GetVersion(self):
+    """Retrieves the pylint version.
+
+    Returns:
+      str: pylint version or None if not available.
+    """
+    exit_code, output, _ = self.RunCommand('pylint --version')
+    if exit_code != 0:
+      return
+
+    for line in output.split(b'\n'):
+      if line.startswith(b'pylint '):
+        _, _, version = line.partition(b' ')
+        # Remove a trailing comma.
+        version, _, _ = version.partition(b',')
+        return version.strip().decode('utf-8')
+
+  def _LintFile(self, filename):
+    """Lints a file using pylint.
+
+    This function is run in a worker thread.
+
+    Args:
+      filename (str): name of the file to lint.
+
+    Returns:
+      tuple[str, int, bytes, float]: name of the file, exit code of pylint,
+          output of pylint and duration of the linting in seconds.
+    """
+    start_time = time.time()
+
+    command = 'pylint --rcfile={0:s} {1:s}'.format(
+        self._RCFILE_PATH, filename)
+    try:
+      process = subprocess.Popen(
+          shlex.split(command), stderr=subprocess.STDOUT,
+          stdout=subprocess.PIPE)
+    except OSError as exception:
+      output = 'Running: "{0:s}" failed with error: {1!s}\n'.format(
+          command, exception)
+      return filename, 1, output.encode('utf-8'), time.time() - start_time
+
+    output, _ = process.communicate()
+    return filename, process.returncode, output, time.time() - start_time
+
+  def _PrintLintResults(self, results):
+    """Prints the results of the linting of files.
+
+    Args:
+      results (iterable[tuple[str, int, bytes, float]]): names of the files,
+          exit codes of pylint, output of pylint and durations of the linting
+          in seconds.
+
+    Yields:
+      tuple[str, int, bytes, float]: name of the file, exit code of pylint,
+          output of pylint and duration of the linting in seconds.
+    """
+    for filename, exit_code, output, duration in results:
+      print('Checking: {0:s}'.format(filename))
+      if output:
+        print(output.decode('utf-8', 'replace').rstrip())
+
+      yield filename, exit_code, output, duration
+
+  def _PrintTimingSummary(
+      self, durations, number_of_cached_files, total_duration):
+    """Prints a summary of the duration of the linting.
+
+    Args:
+      durations (dict[str, float]): durations of the linting of the files
+          in seconds per name of the file.
+      number_of_cached_files (int): number of files that were not linted
+          since they were cached.
+      total_duration (float): duration of the linting of all files in
+          seconds.
+    """
+    print('Linted {0:d} files in {1:.3f} seconds, skipped {2:d} unchanged '
+          'files.'.format(len(durations), total_duration,
+                          number_of_cached_files))
+
+    slowest_filenames = sorted(
+        durations, key=lambda filename: durations[filename], reverse=True)
+    for filename in slowest_filenames[:self._NUMBER_OF_SLOWEST_FILES]:
+      print('  {0:.3f}s {1:s}'.format(durations[filename], filename))
+
+  def _ReadCache(self, cache_key):
+    """Reads the content hashes of the files that were linted without errors.
+
+    Args:
+      cache_key (dict[str, str]): key of the cache.
+
+    Returns:
+      dict[str, str]: content hashes per name of the file.
+    """
+    if not self._cache_path or not os.path.exists(self._cache_path):
+      return {}
+
+    try:
+      with io.open(self._cache_path, 'r', encoding='utf-8') as file_object:
+        cache = json.load(file_object)
+    except (IOError, ValueError):
+      return {}
+
+    if (not isinstance(cache, dict) or
+        cache.get('format_version') != self._CACHE_FORMAT_VERSION or
+        cache.get('key') != cache_key):
+      return {}
+
+    return cache.get('files', None) or {}
+
+  def _WriteCache(self, cache_key, content_hashes):
+    """Writes the content hashes of the files that were linted without errors.
+
+    Args:
+      cache_key (dict[str, str]): key of the cache.
+      content_hashes (dict[str, str]): content hashes per name of the file.
+    """
+    if not self._cache_path:
+      return
+
+    cache = {
+        'files': content_hashes,
+        'format_version': self._CACHE_FORMAT_VERSION,
+        'key': cache_key}
+
+    data = json.dumps(
+        cache, indent=2, separators=(',', ': '), sort_keys=True)
+    if isinstance(data, bytes):
+      data = data.decode('utf-8')
+
+    cache_directory = os.path.dirname(self._cache_path)
+    temporary_path = '{0:s}.{1:d}'.format(self._cache_path, os.getpid())
+    try:
+      if cache_directory and not os.path.exists(cache_directory):
+        os.mkdir(cache_directory)
+
+      with io.open(temporary_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(data)
+
+      try:
+        os.rename(temporary_path, self._cache_path)
+      except OSError:
+        # On Windows rename fails if the destination exists.
+        os.remove(self._cache_path)
+        os.rename(temporary_path, self._cache_path)
+
+    except (IOError, OSError) as exception:
+      # Failing to write the cache should not fail the linting.
+      logging.warning('Unable to write cache: {0:s} with error: {1!s}'.format(
+          self._cache_path, exception))
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
   def CheckFiles(self, filenames):
     """Checks if the linting of the files is correct using pylint.
 
@@ -1186,14 +1477,66 @@ class PylintHelper(CLIHelper):
       bool: True if the files were linted without errors.
     """
     print('Running linter on changed files.')
-    failed_filenames = []
+    start_time = time.time()
+
+    cache_key = self._GetCacheKey()
+    cached_content_hashes = self._ReadCache(cache_key)
+
+    content_hashes = {}
+    filenames_to_lint = []
+    number_of_cached_files = 0
     for filename in filenames:
-      print('Checking: {0:s}'.format(filename))
+      content_hash = self._GetContentHash(filename)
+      if content_hash and cached_content_hashes.get(filename) == content_hash:
+        content_hashes[filename] = content_hash
+        number_of_cached_files += 1
+      else:
+        filenames_to_lint.append(filename)
+
+    number_of_workers = self._number_of_workers
+    if not number_of_workers:
+      number_of_workers = multiprocessing.cpu_count()
+
+    if len(filenames_to_lint) > 1 and number_of_workers > 1:
+      # The work is done by the pylint processes, hence worker threads
+      # suffice to run multiple pylint processes concurrently.
+      thread_pool = multiprocessing_pool.ThreadPool(
+          processes=min(number_of_workers, len(filenames_to_lint)))
+      try:
+        results = thread_pool.imap(self._LintFile, filenames_to_lint)
 
-      command = 'pylint --rcfile=.pylintrc {0:s}'.format(filename)
-      exit_code = subprocess.call(command, shell=True)
+        # Note that the results are printed in the order of the files.
+        results = list(self._PrintLintResults(results))
+      finally:
+        thread_pool.close()
+        thread_pool.join()
+
+    else:
+      results = list(self._PrintLintResults(
+          self._LintFile(filename) for filename in filenames_to_lint))
+
+    durations = {}
+    failed_filenames = []
+    for filename, exit_code, _, duration in results:
+      durations[filename] = duration
       if exit_code != 0:
         failed_filenames.append(filename)
+      else:
+        content_hash = self._GetContentHash(filename)
+        if content_hash:
+          content_hashes[filename] = content_hash
+
+    # Files linted without errors in previous runs, that were not part of
+    # this run, remain cached.
+    for filename, content_hash in cached_content_hashes.items():
+      if filename not in content_hashes and filename not in durations:
+        content_hashes[filename] = content_hash
+
+    if filenames_to_lint:
+      self._WriteCache(cache_key, content_hashes)
+
+    self._PrintTimingSummary(
+        durations, number_of_cached_files, time.time() - start_time)
 
     if failed_filenames:
       print('\nFiles with linter errors:\n{0:s}\n'.format(
@@ -1208,18 +1551,14 @@ class PylintHelper(CLIHelper):
     Returns:
       bool: True if the pylint version is up to date.
     """
-    exit_code, output, _ = self.RunCommand('pylint --version')
-    if exit_code != 0:
+    version = self._GetVersion()
+    if not version:
       return False
 
-    version_tuple = (0, 0, 0)
-    for line in output.split(b'\n'):
-      if line.startswith(b'pylint '):
-        _, _, version = line.partition(b' ')
-        # Remove a trailing comma.
-        version, _, _ = version.partition(b',')
-
-        version_tuple = tuple([int(digit) for digit in version.split(b'.')])
+    try:
+      version_tuple = tuple([int(digit) for digit in version.split('.')])
+    except ValueError:
+      return False
 
     return version_tuple >= self._MINIMUM_VERSION_TUPLE
 
@@ -1313,6 +1652,212 @@ class SphinxAPIDocHelper(CLIHelper):
     return exit_code == 0
 
 
+class UnitTestHelper(object):
+  """Class that defines unit test helper functions.
+
+  The tests that are affected by changed files are determined based on the
+  imports of the Python modules, where a test file is affected if it imports,
+  directly or indirectly, a changed Python module.
+  """
+
+  def __init__(self, tests_path='tests'):
+    """Initializes an unit test helper.
+
+    Args:
+      tests_path (Optional[str]): path of the directory that contains
+          the tests.
+    """
+    super(UnitTestHelper, self).__init__()
+    self._tests_path = tests_path
+
+  def _DefinesTests(self, path):
+    """Determines if a Python module defines tests.
+
+    Test files that do not define tests, such as tests/test_lib.py, are not
+    run since the test runner rejects test files without tests.
+
+    Args:
+      path (str): path of the Python module, relative to the root of
+          the project.
+
+    Returns:
+      bool: True if the module defines a class with a method of which
+          the name starts with "test" or if the module cannot be parsed.
+    """
+    try:
+      with open(path, 'rb') as file_object:
+        syntax_tree = ast.parse(file_object.read(), filename=path)
+    except (IOError, SyntaxError, TypeError, ValueError):
+      return True
+
+    for node in ast.walk(syntax_tree):
+      if isinstance(node, ast.ClassDef):
+        for class_node in node.body:
+          if (isinstance(class_node, ast.FunctionDef) and
+              class_node.name.startswith('test')):
+            return True
+
+    return False
+
+  def _GetImportedModuleNames(self, path):
+    """Retrieves the names of the modules imported by a Python module.
+
+    The imports are determined from the abstract syntax tree of the module,
+    such that aliased, multi-line and relative imports are supported.
+
+    Args:
+      path (str): path of the Python module, relative to the root of
+          the project.
+
+    Returns:
+      set[str]: names of the imported modules, which can include names of
+          imported attributes, or None if the module cannot be parsed.
+    """
+    try:
+      with open(path, 'rb') as file_object:
+        data = file_object.read()
+    except IOError:
+      return set()
+
+    try:
+      syntax_tree = ast.parse(data, filename=path)
+    except (SyntaxError, TypeError, ValueError) as exception:
+      logging.warning('Unable to parse: {0:s} with error: {1!s}'.format(
+          path, exception))
+      return
+
+    package_name = self._GetModuleName(path)
+    if os.path.basename(path) != '__init__.py':
+      package_name, _, _ = package_name.rpartition('.')
+
+    module_names = set()
+    for node in ast.walk(syntax_tree):
+      if isinstance(node, ast.Import):
+        for alias in node.names:
+          module_names.add(alias.name)
+
+      elif isinstance(node, ast.ImportFrom):
+        module_name = node.module or ''
+        if node.level:
+          # A relative import, such as "from . import module", is relative
+          # to the package of the module.
+          package_segments = package_name.split('.') if package_name else []
+          if node.level > 1:
+            package_segments = package_segments[:1 - node.level]
+          module_name = '.'.join(
+              [segment for segment in package_segments + [module_name]
+               if segment])
+
+        if not module_name:
+          continue
+
+        module_names.add(module_name)
+        for alias in node.names:
+          if alias.name != '*':
+            module_names.add('{0:s}.{1:s}'.format(module_name, alias.name))
+
+    return module_names
+
+  def _GetModuleName(self, path):
+    """Retrieves the name of a Python module.
+
+    Args:
+      path (str): path of the Python module, relative to the root of
+          the project.
+
+    Returns:
+      str: name of the module.
+    """
+    module_name, _ = os.path.splitext(os.path.normpath(path))
+    if os.path.basename(module_name) == '__init__':
+      module_name = os.path.dirname(module_name)
+
+    return module_name.replace(os.path.sep, '.')
+
+  def _IsTestFile(self, path):
+    """Determines if a path is a test file.
+
+    Args:
+      path (str): path, relative to the root of the project.
+
+    Returns:
+      bool: True if the path is a test file.
+    """
+    path = os.path.normpath(path)
+    return (
+        path.startswith('{0:s}{1:s}'.format(self._tests_path, os.path.sep)) and
+        path.endswith('.py') and os.path.basename(path) != '__init__.py')
+
+  def GetAffectedTestFiles(self, changed_files, python_files):
+    """Determines the test files affected by changed files.
+
+    Args:
+      changed_files (list[str]): paths of the changed files, relative to
+          the root of the project.
+      python_files (list[str]): paths of the Python files of the project,
+          relative to the root of the project.
+
+    Returns:
+      list[str]: paths of the affected test files or None if all tests are
+          affected, for example when a non-Python file used by the tests has
+          changed or when a Python file cannot be parsed.
+    """
+    changed_module_names = set()
+    for path in changed_files:
+      if not path.endswith('.py'):
+        # Changes of files in the root of the project, such as AUTHORS, and
+        # of the documentation do not affect the tests.
+        if not os.path.dirname(path) or path.startswith('docs/'):
+          continue
+
+        return
+
+      if os.path.dirname(path) == '':
+        # Python files in the root of the project, such as setup.py and
+        # run_tests.py, affect all tests.
+        return
+
+      changed_module_names.add(self._GetModuleName(path))
+
+    module_paths = {}
+    importers = {}
+    for path in python_files:
+      if not path.endswith('.py'):
+        continue
+
+      imported_module_names = self._GetImportedModuleNames(path)
+      if imported_module_names is None:
+        # Without the imports of a module the affected tests cannot be
+        # determined reliably.
+        return
+
+      module_name = self._GetModuleName(path)
+      module_paths[module_name] = path
+      for imported_module_name in imported_module_names:
+        importers.setdefault(imported_module_name, set()).add(module_name)
+
+    # Determine the modules that directly or indirectly import a changed
+    # module.
+    affected_module_names = set()
+    module_names = list(changed_module_names)
+    while module_names:
+      module_name = module_names.pop()
+      if module_name in affected_module_names:
+        continue
+
+      affected_module_names.add(module_name)
+      module_names.extend(importers.get(module_name, []))
+
+    test_files = []
+    for module_name in affected_module_names:
+      path = module_paths.get(module_name, None)
+      if (path and self._IsTestFile(path) and os.path.exists(path) and
+          self._DefinesTests(path)):
+        test_files.append(path)
+
+    return sorted(test_files)
+
+
 class NetRCFile(object):
   """Class that defines a .netrc file."""
 
@@ -1459,8 +2004,9 @@ class ReviewHelper(object):
       r'\[({0:s})\] '.format('|'.join(ProjectHelper.SUPPORTED_PROJECTS)))
 
   def __init__(
-      self, command, github_origin, feature_branch, diffbase, all_files=False,
-      no_browser=False, no_confirm=False):
+      self, command, github_origin, feature_branch, diffbase,
+      affected_tests_only=False, all_files=False, no_browser=False,
+      no_confirm=False):
     """Initializes a review helper.
 
     Args:
@@ -1468,6 +2014,9 @@ class ReviewHelper(object):
       github_origin (str): github origin.
       feature_branch (str): feature branch.
       diffbase (str): diffbase.
+      affected_tests_only (Optional[bool]): True if only the tests affected
+          by the changed files should be run. This does not affect the merge
+          command.
       all_files (Optional[bool]): True if the command should apply to all
           files. Currently this only affects the lint command.
       no_browser (Optional[bool]): True if the functionality to use the
@@ -1477,6 +2026,7 @@ class ReviewHelper(object):
     """
     super(ReviewHelper, self).__init__()
     self._active_branch = None
+    self._affected_tests_only = affected_tests_only
     self._all_files = all_files
     self._codereview_helper = None
     self._command = command
@@ -1500,6 +2050,27 @@ class ReviewHelper(object):
       self._fork_username, _, self._fork_feature_branch = (
           self._github_origin.partition(':'))
 
+  def _GetAffectedTestFiles(self):
+    """Determines the test files affected by the changed files.
+
+    Returns:
+      list[str]: paths of the affected test files or None if all tests are
+          affected.
+    """
+    changed_files = self._git_helper.GetChangedFiles(diffbase=self._diffbase)
+    python_files = self._git_helper.GetChangedFiles()
+
+    # Note that the output of git is a byte string.
+    changed_files = [
+        path.decode('utf-8') if isinstance(path, bytes) else path
+        for path in changed_files if path]
+    python_files = [
+        path.decode('utf-8') if isinstance(path, bytes) else path
+        for path in python_files if path]
+
+    unit_test_helper = UnitTestHelper()
+    return unit_test_helper.GetAffectedTestFiles(changed_files, python_files)
+
   def CheckLocalGitState(self):
     """Checks the state of the local git repository.
 
@@ -1750,7 +2321,10 @@ class ReviewHelper(object):
         'create', 'merge', 'lint', 'lint-test', 'lint_test', 'update'):
       return True
 
-    pylint_helper = PylintHelper()
+    # The files that were linted without errors are cached in the .review
+    # directory.
+    pylint_helper = PylintHelper(
+        cache_path=os.path.join('.review', 'pylint.json'))
     if not pylint_helper.CheckUpToDateVersion():
       print('{0:s} aborted - pylint verion 1.5.0 or later required.'.format(
           self._command.title()))
@@ -1939,6 +2513,17 @@ class ReviewHelper(object):
     # TODO: determine why this alters the behavior of argparse.
     # Currently affects this script being used in plaso.
     command = '{0:s} run_tests.py'.format(sys.executable)
+
+    if (self._affected_tests_only and not self._all_files and
+        self._command != 'merge'):
+      test_files = self._GetAffectedTestFiles()
+      if test_files is not None:
+        if not test_files:
+          print('No tests affected by the changed files.')
+          return True
+
+        command = '{0:s} {1:s}'.format(command, ' '.join(test_files))
+
     exit_code = subprocess.call(command, shell=True)
     if exit_code != 0:
       print('{0:s} aborted - unable to pass tests.'.format(
@@ -2036,6 +2621,12 @@ def Main():
 
   # TODO: add option to directly pass code review issue number.
 
+  argument_parser.add_argument(
+      '--affected-tests-only', '--affected_tests_only',
+      dest='affected_tests_only', action='store_true', default=False, help=(
+          'Only run the tests affected by the changed files, does not affect '
+          'the merge command.'))
+
   argument_parser.add_argument(
       '--allfiles', '--all-files', '--all_files', dest='all_files',
       action='store_true', default=False, help=(
@@ -2190,7 +2781,8 @@ def Main():
 
   review_helper = ReviewHelper(
       options.command, github_origin, feature_branch,
-      options.diffbase, all_files=options.all_files,
+      options.diffbase, affected_tests_only=options.affected_tests_only,
+      all_files=options.all_files,
       no_browser=options.no_browser, no_confirm=options.no_confirm)
 
   if not review_helper.InitializeHelpers():
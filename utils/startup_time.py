@@ -0,0 +1,242 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to measure the cold start up time of the tools."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import glob
+import logging
+import os
+import subprocess
+import sys
+import time
+
+
+class StartUpTimer(object):
+  """Measures the cold start up time of Python scripts.
+
+  Every measurement uses a new Python interpreter, so that the module imports
+  of the script are not cached.
+  """
+
+  # Python code to import a script without running its main program function.
+  _IMPORT_SCRIPT = (
+      'import runpy, sys; runpy.run_path(sys.argv[1], run_name="startup")')
+
+  def __init__(self, python_path=None, number_of_runs=5):
+    """Initializes a start up timer.
+
+    Args:
+      python_path (Optional[str]): path of the Python interpreter, where None
+          represents the current interpreter.
+      number_of_runs (Optional[int]): number of times to run every script.
+    """
+    super(StartUpTimer, self).__init__()
+    self._environment = dict(os.environ)
+    self._number_of_runs = number_of_runs
+    self._python_path = python_path or sys.executable
+
+    l2tdevtools_path = os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))
+
+    python_paths = [l2tdevtools_path]
+    if 'PYTHONPATH' in self._environment:
+      python_paths.append(self._environment['PYTHONPATH'])
+
+    self._environment['PYTHONPATH'] = os.pathsep.join(python_paths)
+
+  def _RunInterpreter(self, arguments):
+    """Runs the Python interpreter.
+
+    Args:
+      arguments (list[str]): interpreter arguments.
+
+    Returns:
+      tuple[int, bytes]: exit code and standard error output.
+    """
+    command = [self._python_path]
+    command.extend(arguments)
+
+    process = subprocess.Popen(
+        command, env=self._environment, stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE)
+    _, error = process.communicate()
+    return process.returncode, error
+
+  def _TimeInterpreter(self, arguments):
+    """Determines the fastest wall clock time of running the interpreter.
+
+    Args:
+      arguments (list[str]): interpreter arguments.
+
+    Returns:
+      float: fastest time in seconds or None if the interpreter failed.
+    """
+    timings = []
+    for _ in range(self._number_of_runs):
+      start_time = time.time()
+      exit_code, error = self._RunInterpreter(arguments)
+      timings.append(time.time() - start_time)
+
+      if exit_code != 0:
+        logging.error('Running interpreter failed with error:\n{0!s}'.format(
+            error))
+        return
+
+    return min(timings)
+
+  def GetInterpreterStartUpTime(self):
+    """Determines the start up time of the interpreter.
+
+    The start up time includes importing runpy, which is used to import
+    the scripts, such that it is not attributed to the scripts.
+
+    Returns:
+      float: fastest start up time in seconds or None on error.
+    """
+    return self._TimeInterpreter(['-c', 'import runpy'])
+
+  def GetScriptStartUpTime(self, script_path):
+    """Determines the cold start up time of a script.
+
+    The start up time includes starting the interpreter and importing
+    the script, but not running its main program function.
+
+    Args:
+      script_path (str): path of the script.
+
+    Returns:
+      float: fastest start up time in seconds or None on error.
+    """
+    return self._TimeInterpreter(['-c', self._IMPORT_SCRIPT, script_path])
+
+  def ProfileScriptImports(self, script_path, maximum_number_of_imports=10):
+    """Profiles the imports of a script.
+
+    This requires Python 3.7 or later, which supports "-X importtime".
+
+    Args:
+      script_path (str): path of the script.
+      maximum_number_of_imports (Optional[int]): maximum number of imports
+          to return.
+
+    Returns:
+      list[tuple[int, str]]: cumulative import time in microseconds and
+          module name, of the slowest top-level imports, or None if not
+          supported.
+    """
+    exit_code, error = self._RunInterpreter([
+        '-X', 'importtime', '-c', self._IMPORT_SCRIPT, script_path])
+    if exit_code != 0:
+      return
+
+    imports = []
+    for line in error.decode('utf-8').split('\n'):
+      if not line.startswith('import time:'):
+        continue
+
+      _, _, values = line.partition(':')
+      _, cumulative_time, module_name = values.split('|')
+
+      # Only nested imports are indented, where top-level imports have
+      # a single space.
+      if module_name.startswith('  '):
+        continue
+
+      try:
+        cumulative_time = int(cumulative_time, 10)
+      except ValueError:
+        # Skip the header line.
+        continue
+
+      imports.append((cumulative_time, module_name.strip()))
+
+    return sorted(imports, reverse=True)[:maximum_number_of_imports]
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Measures the cold start up time of the tools.'))
+
+  argument_parser.add_argument(
+      'scripts', nargs='*', action='store', metavar='SCRIPT', default=None,
+      help='paths of the scripts, where the default is all the tools.')
+
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False, help=(
+          'profile the slowest top-level imports of every script, which '
+          'requires Python 3.7 or later.'))
+
+  argument_parser.add_argument(
+      '--python', dest='python', action='store', metavar='PATH',
+      default=None, help='path of the Python interpreter to measure.')
+
+  argument_parser.add_argument(
+      '--runs', dest='runs', action='store', type=int, metavar='NUMBER',
+      default=5, help='number of times to run every script.')
+
+  options = argument_parser.parse_args()
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  script_paths = options.scripts
+  if not script_paths:
+    l2tdevtools_path = os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))
+    tools_path = os.path.join(l2tdevtools_path, 'tools', '*.py')
+    script_paths = [
+        path for path in sorted(glob.glob(tools_path))
+        if not path.endswith('__init__.py')]
+
+  start_up_timer = StartUpTimer(
+      python_path=options.python, number_of_runs=options.runs)
+
+  interpreter_time = start_up_timer.GetInterpreterStartUpTime()
+  if interpreter_time is None:
+    print('Unable to run the Python interpreter.')
+    return False
+
+  print('Interpreter start up: {0:.1f} ms'.format(interpreter_time * 1000))
+  print('')
+  print('{0:<32s} {1:>12s} {2:>12s}'.format('Script', 'Total', 'Import'))
+
+  result = True
+  for script_path in script_paths:
+    script_name = os.path.basename(script_path)
+
+    script_time = start_up_timer.GetScriptStartUpTime(script_path)
+    if script_time is None:
+      print('{0:<32s} {1:>12s}'.format(script_name, 'FAILED'))
+      result = False
+      continue
+
+    print('{0:<32s} {1:>9.1f} ms {2:>9.1f} ms'.format(
+        script_name, script_time * 1000,
+        (script_time - interpreter_time) * 1000))
+
+    if options.profile:
+      imports = start_up_timer.ProfileScriptImports(script_path)
+      if imports is None:
+        print('  import profile not supported by interpreter.')
+        continue
+
+      for cumulative_time, module_name in imports:
+        print('  {0:<30s} {1:>9.1f} ms'.format(
+            module_name, cumulative_time / 1000.0))
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -52,6 +52,7 @@ import re
 import socket
 import subprocess
 import sys
+import threading
 import urllib
 import urllib2
 import urlparse
@@ -433,6 +434,8 @@ class AbstractRpcServer(object):
     Args:
       request_path: The path to send the request to, eg /api/appversion/create.
       payload: The body of the request, or None to send an empty request.
+        The body can be a file-like object that supports len() and seek(),
+        such as a MultipartFormDataBody.
       content_type: The Content-Type header to use.
       timeout: timeout in seconds; default None i.e. no timeout.
         (Note: for large requests on OS X, the timeout doesn't work right.)
@@ -459,6 +462,9 @@ class AbstractRpcServer(object):
         url = "%s%s" % (self.host, request_path)
         if args:
           url += "?" + urllib.urlencode(args)
+        if hasattr(payload, "seek"):
+          # Send the body of a retry from the start.
+          payload.seek(0)
         req = self._CreateRequest(url=url, data=payload)
         req.add_header("Content-Type", content_type)
         if extra_headers:
@@ -964,6 +970,78 @@ def GetRpcServer(server, email=None, host_override=None, save_cookies=True,
                        account_type=account_type)
 
 
+class MultipartFormDataBody(object):
+  """File-like object that streams a multipart/form-data request body.
+
+  The body consists of the chunks of the encoded form, which refer to the
+  values of the form instead of copying them, such that the body is never
+  materialised in memory. httplib sends file-like objects in blocks and
+  urllib2 uses the length of the body for the Content-Length header.
+  """
+
+  def __init__(self, chunks):
+    """Constructor.
+
+    Args:
+      chunks: A list of strings that make up the body.
+    """
+    self._chunks = [chunk for chunk in chunks if chunk]
+    self._length = sum(len(chunk) for chunk in self._chunks)
+    self._chunk_index = 0
+    self._chunk_offset = 0
+    self._offset = 0
+
+  def __len__(self):
+    return self._length
+
+  def __str__(self):
+    # Note that this materialises the body.
+    return "".join(self._chunks)
+
+  def read(self, size=-1):
+    """Reads at most size bytes, or the remainder of the body if negative."""
+    if size is None or size < 0:
+      size = self._length - self._offset
+    data = []
+    while size > 0 and self._chunk_index < len(self._chunks):
+      chunk = self._chunks[self._chunk_index]
+      end_offset = min(self._chunk_offset + size, len(chunk))
+      if self._chunk_offset == 0 and end_offset == len(chunk):
+        data.append(chunk)
+      else:
+        data.append(chunk[self._chunk_offset:end_offset])
+      size -= end_offset - self._chunk_offset
+      self._offset += end_offset - self._chunk_offset
+      if end_offset == len(chunk):
+        self._chunk_index += 1
+        self._chunk_offset = 0
+      else:
+        self._chunk_offset = end_offset
+    return "".join(data)
+
+  def seek(self, offset, whence=0):
+    """Seeks to an offset, relative to the start of the body by default."""
+    if whence == 1:
+      offset += self._offset
+    elif whence == 2:
+      offset += self._length
+    offset = max(0, min(offset, self._length))
+    self._chunk_index = 0
+    self._chunk_offset = 0
+    self._offset = 0
+    while self._chunk_index < len(self._chunks):
+      chunk_size = len(self._chunks[self._chunk_index])
+      if self._offset + chunk_size > offset:
+        self._chunk_offset = offset - self._offset
+        self._offset = offset
+        break
+      self._offset += chunk_size
+      self._chunk_index += 1
+
+  def tell(self):
+    return self._offset
+
+
 def EncodeMultipartFormData(fields, files):
   """Encode form fields for multipart/form-data.
 
@@ -972,7 +1050,8 @@ def EncodeMultipartFormData(fields, files):
     files: A sequence of (name, filename, value) elements for data to be
            uploaded as files.
   Returns:
-    (content_type, body) ready for httplib.HTTP instance.
+    (content_type, body) ready for httplib.HTTP instance, where body is a
+    MultipartFormDataBody that streams the encoded form.
 
   Source:
     http://aspn.activestate.com/ASPN/Cookbook/Python/Recipe/146306
@@ -998,7 +1077,13 @@ def EncodeMultipartFormData(fields, files):
     lines.append(value)
   lines.append('--' + BOUNDARY + '--')
   lines.append('')
-  body = CRLF.join(lines)
+  # Interleave the lines with CRLF without copying the values.
+  chunks = []
+  for line in lines:
+    if chunks:
+      chunks.append(CRLF)
+    chunks.append(line)
+  body = MultipartFormDataBody(chunks)
   content_type = 'multipart/form-data; boundary=%s' % BOUNDARY
   return content_type, body
 
@@ -1522,6 +1607,76 @@ class SubversionVCS(VersionControlSystem):
     return base_content, new_content, is_binary, status[0:5]
 
 
+class GitBatchObjectReader(object):
+  """Reads the content of git objects using a single git process.
+
+  The names of the objects are written to "git cat-file --batch" by a
+  separate thread, such that the process does not block on a full pipe
+  while the content of the objects is read.
+  """
+
+  def ReadObjects(self, object_names):
+    """Returns the content of git objects.
+
+    Args:
+      object_names: List of object names, such as blob hashes or
+        "HEAD:filename".
+
+    Returns:
+      A dictionary that maps from object name to content. Objects that
+      do not exist are not included. None if the objects could not be read.
+    """
+    contents = {}
+    if not object_names:
+      return contents
+
+    LOGGER.info("Running git cat-file --batch for %d objects",
+                len(object_names))
+    try:
+      p = subprocess.Popen(["git", "cat-file", "--batch"],
+                           stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                           shell=use_shell)
+    except OSError, e:
+      LOGGER.info("Unable to run git cat-file: %s", e)
+      return None
+
+    def WriteObjectNames():
+      try:
+        for object_name in object_names:
+          p.stdin.write(object_name + "\n")
+      except IOError:
+        # The process has stopped before all object names were written.
+        pass
+      finally:
+        p.stdin.close()
+
+    writer = threading.Thread(target=WriteObjectNames)
+    writer.daemon = True
+    writer.start()
+
+    try:
+      for object_name in object_names:
+        # The header looks like "<hash> <type> <size>" or
+        # "<object name> missing".
+        header = p.stdout.readline()
+        if not header:
+          LOGGER.info("Unexpected end of git cat-file output")
+          return None
+        header_values = header.split()
+        if header_values[-1] in ("missing", "ambiguous"):
+          continue
+        size = int(header_values[-1])
+        contents[object_name] = p.stdout.read(size)
+        # The content is followed by an end-of-line.
+        p.stdout.read(1)
+    finally:
+      p.stdout.close()
+      writer.join()
+      p.wait()
+
+    return contents
+
+
 class GitVCS(VersionControlSystem):
   """Implementation of the VersionControlSystem interface for Git."""
 
@@ -1532,6 +1687,8 @@ class GitVCS(VersionControlSystem):
     self.hashes = {}
     # Map of new filename -> old filename for renames.
     self.renames = {}
+    # Map of object name -> content of objects read in advance.
+    self.object_contents = {}
 
   def GetGUID(self):
     revlist = RunShell("git rev-list --parents HEAD".split()).splitlines()
@@ -1647,8 +1804,29 @@ class GitVCS(VersionControlSystem):
                       silent_ok=True)
     return status.splitlines()
 
+  def GetBaseFiles(self, diff):
+    """Reads the content of all files in the patch in advance.
+
+    The content of the files is read using a single git process instead of
+    a git process per file.
+    """
+    object_names = set()
+    for filename, (hash_before, hash_after) in self.hashes.items():
+      object_names.update([hash_before, hash_after])
+    for filename in self.renames:
+      if filename not in self.hashes:
+        object_names.add("HEAD:" + filename)
+    object_names.discard(None)
+
+    object_contents = GitBatchObjectReader().ReadObjects(sorted(object_names))
+    if object_contents:
+      self.object_contents = object_contents
+    return super(GitVCS, self).GetBaseFiles(diff)
+
   def GetFileContent(self, file_hash):
     """Returns the content of a file identified by its git hash."""
+    if file_hash in self.object_contents:
+      return self.object_contents[file_hash]
     data, retcode = RunShellWithReturnCode(["git", "show", file_hash],
                                             universal_newlines=False)
     if retcode:
@@ -1665,9 +1843,11 @@ class GitVCS(VersionControlSystem):
       status = "A +"  # Match svn attribute name for renames.
       if filename not in self.hashes:
         # If a rename doesn't change the content, we never get a hash.
-        base_content = RunShell(
-            ["git", "show", "HEAD:" + filename], silent_ok=True,
-            universal_newlines=False)
+        base_content = self.object_contents.get("HEAD:" + filename)
+        if base_content is None:
+          base_content = RunShell(
+              ["git", "show", "HEAD:" + filename], silent_ok=True,
+              universal_newlines=False)
     elif not hash_before:
       status = "A"
       base_content = ""